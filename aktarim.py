@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Telemetri Dışa Aktarım Modülü
+Kara kutu kayıtlarını CSV, NDJSON veya ikili olarak parça parça üretir
+
+Kayıtlar diskten sırayla okunup küçük parçalar halinde yield edildiği
+için bellek kullanımı zaman aralığının büyüklüğünden bağımsızdır.
+İstenirse çıktı gzip ile anında sıkıştırılır.
+"""
+
+import io
+import csv
+import json
+import time
+import zlib
+
+import kayit
+import kodlama
+
+# Dışa aktarılabilir alanlar (sıra CSV sütun sırasını belirler)
+EXPORT_FIELDS = ("time", "mono", "seq", "distance", "accel_x", "accel_y",
+                 "accel_z", "gyro_x", "gyro_y", "gyro_z", "servo_angle",
+                 "motor_state", "motor_speed", "motor_duty", "sensor_active")
+FORMATS = ("csv", "ndjson", "bin")
+
+CHUNK_SIZE = 64 * 1024      # Bu boyuta ulaşan çıktı tek parça olarak gönderilir
+YIELD_EVERY = 2048          # Bu kadar kayıtta bir diğer thread'lere GIL bırakılır
+
+
+def parse_fields(value):
+    """
+    Virgülle ayrılmış alan listesini doğrula
+    
+    Returns:
+        tuple: Alan adları
+    
+    Raises:
+        ValueError: Bilinmeyen alan varsa
+    """
+    if not value:
+        return EXPORT_FIELDS
+    fields = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in fields if name not in EXPORT_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Bilinmeyen alan: {', '.join(unknown) or '-'}")
+    return fields
+
+
+def flatten_record(record):
+    """kayit.decode_record() çıktısını düz alanlara çevir"""
+    imu_data = record["imu"]
+    motor = record["motor"]
+    return {
+        "time": round(record["wall"], 3),
+        "mono": round(record["mono"], 6),
+        "seq": record["seq"],
+        "distance": record["distance"],
+        "accel_x": imu_data["accel_x"],
+        "accel_y": imu_data["accel_y"],
+        "accel_z": imu_data["accel_z"],
+        "gyro_x": imu_data["gyro_x"],
+        "gyro_y": imu_data["gyro_y"],
+        "gyro_z": imu_data["gyro_z"],
+        "servo_angle": record["servo_angle"],
+        "motor_state": motor["state"],
+        "motor_speed": motor["speed"],
+        "motor_duty": motor["duty"],
+        "sensor_active": record["sensor_active"]
+    }
+
+
+def _iter_lines(records, fields, fmt):
+    """Kayıtları seçilen formatta metin satırlarına çevir"""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(fields)
+        yield buffer.getvalue()
+        for record in records:
+            flat = flatten_record(record)
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow([flat[name] for name in fields])
+            yield buffer.getvalue()
+    elif fmt == "ndjson":
+        for record in records:
+            flat = flatten_record(record)
+            yield json.dumps({name: flat[name] for name in fields},
+                             separators=(",", ":")) + "\n"
+    else:
+        # İkili akış sabit düzen kullanır, alan seçimi uygulanmaz
+        yield kodlama.stream_header()
+        for record in records:
+            yield kodlama.encode_stream_record(flatten_record(record))
+
+
+def generate(start=None, end=None, fields=EXPORT_FIELDS, fmt="csv",
+             compress=False, directory=None):
+    """
+    Dışa aktarım çıktısını parça parça üret
+    
+    Args:
+        start, end: Unix zaman aralığı
+        fields: Çıktıya dahil edilecek alanlar
+        fmt: "csv", "ndjson" veya "bin" (kodlama.py akış düzeni)
+        compress: True ise gzip ile sıkıştır
+        directory: Kayıt dizini (None ise kaydedicinin dizini)
+    
+    Yields:
+        bytes: Yaklaşık CHUNK_SIZE boyutunda parçalar
+    """
+    if fmt not in FORMATS:
+        raise ValueError("Format 'csv', 'ndjson' veya 'bin' olmalı")
+    
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    records = kayit.read_records(directory or kayit.record_dir, start, end)
+    
+    join = b"".join if fmt == "bin" else lambda parts: "".join(parts).encode()
+    pending = []
+    size = 0
+    for count, line in enumerate(_iter_lines(records, fields, fmt)):
+        pending.append(line)
+        size += len(line)
+        
+        if size >= CHUNK_SIZE:
+            chunk = join(pending)
+            pending, size = [], 0
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+        
+        if count % YIELD_EVERY == 0:
+            # Uzun aktarımlar örnekleyici ve diğer istekleri aç bırakmasın
+            time.sleep(0)
+    
+    tail = join(pending)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
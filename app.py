@@ -4,15 +4,37 @@ Raspberry Pi 4 - Flask Web Sunucusu
 Sensör Okuma, Servo Motor, DC Motor ve IMU Kontrolü
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import (Flask, render_template, jsonify, request, Response, stream_with_context,
+                   url_for, send_from_directory)
 import time
+import logging
 import threading
 
 # Modülleri içe aktar
-import servo
 import dcmotor
-import imu
-import dijital_metre
+import pid_kontrol
+import refleks
+import sekans
+import kayit
+import arsiv
+import aktarim
+import seri
+import kodlama
+import fark
+import sikistirma
+import ornekleme
+import saglik
+import gunluk
+import cihazlar
+import mesafe_dizisi
+import veriyolu
+import yayin
+import kumanda
+import mqtt_yayinci
+import izleme
+import varliklar
+
+logger = logging.getLogger(__name__)
 
 # Raspberry Pi üzerinde çalışıp çalışmadığını kontrol et
 try:
@@ -20,39 +42,38 @@ try:
     RPI_AVAILABLE = True
 except ImportError:
     RPI_AVAILABLE = False
-    print("UYARI: RPi.GPIO bulunamadı. Simülasyon modu aktif.")
+    logger.warning("RPi.GPIO bulunamadı. Simülasyon modu aktif.")
 
 app = Flask(__name__)
 
 # ==================== PIN TANIMLARI ====================
-# Tüm pin tanımları ilgili modüllerde yapılmaktadır:
-# - servo.py: GPIO 18 (Servo PWM)
-# - dcmotor.py: GPIO 16, 20, 21 (Motor kontrolü)
-# - dijital_metre.py: GPIO 23, 24 (Ultrasonik sensör)
-# - imu.py: I2C (SDA/SCL)
+# Pinler ve cihaz listesi config.py'de tanımlıdır (config.DEVICES).
+# Varsayılan düzen:
+# - Servo: GPIO 18 (PWM)
+# - DC motor: GPIO 16, 20, 21
+# - Ultrasonik sensör: GPIO 23, 24
+# - IMU: I2C (SDA/SCL)
+
+# ==================== CİHAZ KAYDI ====================
+# Her cihaz kendi kilidini tutar; farklı cihazlara gelen komutlar
+# birbirini beklemez. Kurulum ve temizlik tanım sırasıyla yapılır.
+devices = cihazlar.load()
 
 # ==================== GLOBAL DEĞİŞKENLER ====================
-sensor_data = {
-    "distance": 0.0,          # Ultrasonik sensör mesafe (cm)
-    "imu": {
-        "accel_x": 0.0,
-        "accel_y": 0.0,
-        "accel_z": 9.81,       # Mock değer (yerçekimi)
-        "gyro_x": 0.0,
-        "gyro_y": 0.0,
-        "gyro_z": 0.0
-    },
-    "sensor_active": True,     # Ultrasonik sensör durumu
-    "servo_angle": 90,         # Mevcut servo açısı
-    "motor": {                 # DC Motor durumu
-        "state": "stopped",
-        "speed": 0,
-        "is_running": False,
-        "direction": None
-    }
+DEFAULT_IMU = {
+    "accel_x": 0.0,
+    "accel_y": 0.0,
+    "accel_z": 9.81,           # Mock değer (yerçekimi)
+    "gyro_x": 0.0,
+    "gyro_y": 0.0,
+    "gyro_z": 0.0
 }
 
-# Thread kilidi
+# Sensör döngüsünün son okumaları: cihaz id -> {"distance" | "imu", "stale"}
+# (servo, motor ve sensör açık/kapalı durumu cihaz nesnelerinden okunur)
+sensor_readings = {}
+
+# Thread kilidi (yalnızca sensor_readings'i korur)
 data_lock = threading.Lock()
 
 # Sensör okuma thread'i çalışıyor mu?
@@ -64,80 +85,148 @@ sensor_thread = None
 def setup_gpio():
     """GPIO pinlerini ayarla"""
     
-    # Servo modülünü başlat
-    servo.setup_servo()
+    # Servo, DC motor, IMU ve dijital metre (ultrasonik sensör) nesneleri
+    cihazlar.setup_all()
     
-    # DC Motor modülünü başlat
-    dcmotor.setup_motor()
+    # Engel güvenlik refleksini ölçüm akışına bağla
+    refleks.enable()
     
-    # IMU modülünü başlat
-    imu.setup_imu()
-    
-    # Dijital metre (ultrasonik sensör) modülünü başlat
-    dijital_metre.setup_sensor()
+    # Arızalı sensörleri arka planda yeniden başlatan sağlık thread'i
+    saglik.start()
     
     if not RPI_AVAILABLE:
-        print("GPIO kurulumu simüle ediliyor...")
+        logger.info("GPIO kurulumu simüle ediliyor...")
         return
     
-    print("Tüm GPIO modülleri başlatıldı.")
+    logger.info("Tüm GPIO modülleri başlatıldı.")
 
 
 def cleanup_gpio():
     """GPIO kaynaklarını temizle"""
     
-    # Servo modülünü temizle
-    servo.cleanup_servo()
-    
-    # DC Motor modülünü temizle
-    dcmotor.cleanup_motor()
+    # Yeniden başlatma denemeleri temizlikle çakışmasın
+    saglik.stop()
     
-    # IMU modülünü temizle
-    imu.cleanup_imu()
+    cihazlar.cleanup_all()
     
-    # Dijital metre modülünü temizle
-    dijital_metre.cleanup_sensor()
+    logger.info("Tüm GPIO kaynakları temizlendi.")
+
+
+# ==================== SENSÖR OKUMA ====================
+def read_sensors():
+    """
+    Tüm mesafe sensörlerini ve IMU'ları oku
     
-    print("Tüm GPIO kaynakları temizlendi.")
+    Returns:
+        dict: cihaz id -> okuma
+    """
+    readings = {}
+    # Ultrasonik sensörler dizi zamanlayıcısıyla slot slot ateşlenir
+    frame = mesafe_dizisi.measure_frame()
+    sensors = cihazlar.of_type("ultrasonic")
+    for device_id, distance in frame["readings"].items():
+        readings[device_id] = {
+            "distance": distance,
+            "stale": sensors[device_id].is_stale()
+        }
+    for device_id, unit in cihazlar.of_type("imu").items():
+        readings[device_id] = {
+            "imu": unit.get_imu_data(),
+            "stale": unit.is_stale()
+        }
+    return readings
 
 
-# ==================== ULTRASONİK SENSÖR ====================
-def measure_distance():
-    """HC-SR04 ile mesafe ölç (dijital_metre modülünü kullanarak)"""
-    return dijital_metre.measure_distance()
+# ==================== DURUM ANLIK GÖRÜNTÜSÜ ====================
+def _device_snapshot(kind, device, reading):
+    """Tek cihazın /api/data içindeki özeti"""
+    if kind == "servo":
+        return {"type": kind, "angle": device.get_angle()}
+    if kind == "motor":
+        return {"type": kind, **device.status()}
+    if kind == "ultrasonic":
+        return {
+            "type": kind,
+            "active": device.is_active,
+            "distance": reading.get("distance", 0.0) if device.is_active else 0.0,
+            "stale": reading.get("stale", False)
+        }
+    return {"type": kind, "stale": reading.get("stale", False),
+            **reading.get("imu", DEFAULT_IMU)}
 
 
-# ==================== IMU SENSÖR ====================
-def read_imu_data():
+def get_snapshot():
     """
-    MPU-6050 IMU verisi oku
-    imu modülünü kullanarak gerçek veya simüle edilmiş veri döndürür
+    Sensör okumaları ve cihaz durumlarından tek bir durum sözlüğü oluştur
+    
+    Üst düzey alanlar (distance, imu, servo_angle, motor) her türün
+    birincil cihazını gösterir; "devices" tüm cihazları id ile içerir.
+    Servo ve motor durumu her seferinde cihazın kendi anlık görüntüsünden
+    alınır, böylece /api/data ile /api/motor/status aynı değeri gösterir.
     """
-    # imu modülünden veri al
-    return imu.get_imu_data()
+    with data_lock:
+        readings = dict(sensor_readings)
+    
+    ultrasonic = cihazlar.primary("ultrasonic")
+    distance = readings.get(cihazlar.primary_id("ultrasonic"), {})
+    imu_reading = readings.get(cihazlar.primary_id("imu"), {})
+    
+    return {
+        "distance": distance.get("distance", 0.0) if ultrasonic.is_active else 0.0,
+        "imu": imu_reading.get("imu", DEFAULT_IMU),
+        "sensor_active": ultrasonic.is_active,
+        "stale": {                 # Devre kesici açık olan sensörlerin verisi bayattır
+            "distance": distance.get("stale", False),
+            "imu": imu_reading.get("stale", False)
+        },
+        "servo_angle": cihazlar.primary("servo").get_angle(),
+        "motor": cihazlar.primary("motor").status(),
+        "devices": {
+            device_id: _device_snapshot(cihazlar.device_types[device_id], device,
+                                        readings.get(device_id, {}))
+            for device_id, device in devices.items()
+        }
+    }
 
 
 # ==================== SENSÖR OKUMA THREAD'İ ====================
 def sensor_reading_loop():
-    """Arka planda sensörleri sürekli oku"""
-    global sensor_data, sensor_thread_running
+    """
+    Arka planda sensörleri oku
+    
+    Örnekleme hızı bağlı tüketicilerin talebine göre ornekleme modülü
+    tarafından belirlenir; kimse dinlemiyorsa döngü boşta hıza düşer.
+    """
+    global sensor_thread_running
     
+    next_tick = time.monotonic()
     while sensor_thread_running:
+        readings = read_sensors()
         with data_lock:
-            is_active = sensor_data["sensor_active"]
+            sensor_readings.update(readings)
         
-        if is_active:
-            # Ultrasonik sensör oku
-            distance = measure_distance()
-            
-            # IMU verisi oku
-            imu_data = read_imu_data()
-            
-            with data_lock:
-                sensor_data["distance"] = distance
-                sensor_data["imu"] = imu_data
+        sample = get_snapshot()
+        sample["mono"] = time.monotonic()
+        sample["wall"] = time.time()
         
-        time.sleep(0.3)  # 300ms aralıkla oku
+        # Kara kutu kaydı ve uzun süreli arşiv (sadece kuyruğa ekler,
+        # disk işlemleri kendi thread'lerinde yapılır)
+        kayit.record_sample(sample)
+        arsiv.add_sample(sample["wall"], arsiv.flatten_sample(sample))
+        
+        # Canlı akış istemcilerine dağıt (yavaş istemci döngüyü bekletmez)
+        yayin.publish("sample", sample)
+        mqtt_yayinci.add_sample(sample)
+        
+        # Bir sonraki örnek anını bekle (talep yoksa None döner, bayrak kontrol edilir).
+        # IMU'lar talep varken tam güçte, yokken düşük güç döngü modunda tutulur.
+        tick = None
+        while tick is None and sensor_thread_running:
+            tick = ornekleme.wait_for_next(next_tick)
+            active = ornekleme.has_demand()
+            for unit in cihazlar.of_type("imu").values():
+                unit.update_power(active)
+        next_tick = tick
 
 
 def start_sensor_thread():
@@ -148,42 +237,258 @@ def start_sensor_thread():
         sensor_thread_running = True
         sensor_thread = threading.Thread(target=sensor_reading_loop, daemon=True)
         sensor_thread.start()
-        print("Sensör okuma thread'i başlatıldı.")
+        logger.info("Sensör okuma thread'i başlatıldı.")
 
 
 def stop_sensor_thread():
     """Sensör okuma thread'ini durdur"""
     global sensor_thread_running
     sensor_thread_running = False
-    print("Sensör okuma thread'i durduruldu.")
+    logger.info("Sensör okuma thread'i durduruldu.")
 
 
 # ==================== FLASK ROUTE'LARI ====================
 
 @app.route('/')
 def index():
-    """Ana sayfa"""
-    return render_template('index.html')
+    """
+    Ana sayfa
+    
+    Son anlık görüntü ve ikili şema sayfaya gömülür; arayüz ilk değerleri
+    ek bir istek beklemeden gösterir ve yoklamaya fark (since) ile başlar.
+    Sayfa özetli varlık adlarını taşıdığından her seferinde doğrulanır.
+    """
+    data = get_snapshot()
+    data["seq"] = fark.observe(data)
+    response = Response(render_template('index.html', initial_state={
+        "data": data,
+        "schema": kodlama.get_schema()
+    }))
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.template_global()
+def asset_url(filename):
+    """Şablonlar için özetli varlık adresi (yapılmadıysa normal statik adres)"""
+    return varliklar.url(filename) or url_for('static', filename=filename)
+
+
+@app.route('/assets/<path:filename>', methods=['GET'])
+def serve_asset(filename):
+    """
+    Özetli statik varlığı süresiz önbellek başlığıyla sun
+    
+    İstemci kabul ediyorsa yapım sırasında sıkıştırılmış .br / .gz sürümü
+    gönderilir (istek başına sıkıştırma yapılmaz).
+    """
+    resolved = varliklar.resolve(filename, request.accept_encodings)
+    if resolved is None:
+        return jsonify({"success": False, "message": f"Varlık bulunamadı: {filename}"}), 404
+    
+    path, mimetype, encoding = resolved
+    response = send_from_directory(varliklar.DIST_DIR, path, mimetype=mimetype,
+                                   max_age=varliklar.MAX_AGE)
+    response.cache_control.immutable = True
+    response.vary.add("Accept-Encoding")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def _binary_response(payload, mimetype):
+    """Kodlanmış yanıtı döndür (önbellekler Accept'e göre ayırsın)"""
+    response = Response(payload, mimetype=mimetype)
+    response.headers["Vary"] = "Accept"
+    return response
+
+
+@app.before_request
+def start_trace():
+    """
+    Komut isteklerinin gecikme izini başlat (bkz. izleme.py)
+    
+    X-Trace-Id başlığı taşıyan istekler ve tüm POST komutları izlenir.
+    """
+    trace_id = request.headers.get('X-Trace-Id')
+    if request.path.startswith('/api/debug/') or (trace_id is None and request.method != 'POST'):
+        return
+    izleme.begin(trace_id, request.path, request.method, request.headers.get('X-Trace-Client'))
+
+
+@app.after_request
+def finish_trace(response):
+    """İzi tamamla, id'yi ve aşama sürelerini yanıt başlıklarına ekle"""
+    trace = izleme.current()
+    if trace is not None:
+        izleme.finish(trace, response.status_code)
+        response.headers["X-Trace-Id"] = trace.id
+        response.headers["Server-Timing"] = izleme.server_timing(trace)
+    return response
+
+
+@app.teardown_request
+def end_trace(exc=None):
+    """İzi bağlamdan ayır (thread bir sonraki isteğe taşımasın)"""
+    izleme.end()
+
+
+@app.after_request
+def compress_response(response):
+    """Büyük metin yanıtlarını ve statik dosyaları sıkıştır"""
+    return sikistirma.compress_response(response, request)
 
 
 @app.route('/api/data', methods=['GET'])
 def get_sensor_data():
-    """Sensör verilerini JSON olarak döndür"""
-    with data_lock:
-        data = sensor_data.copy()
+    """
+    Sensör verilerini döndür (Accept başlığına göre JSON veya ikili)
+    
+    Parametreler:
+        since (opsiyonel) - istemcinin bildiği son sıra numarası;
+            verilirse JSON yanıtı yalnızca değişen alanları içerir
+        rate (opsiyonel) - istemcinin ihtiyaç duyduğu örnekleme hızı (Hz)
+    """
+    # Her istek istemcinin örnekleme talebini yeniler
+    try:
+        rate = float(request.args.get('rate', ornekleme.DEFAULT_CLIENT_RATE))
+    except ValueError:
+        rate = ornekleme.DEFAULT_CLIENT_RATE
+    ornekleme.subscribe(f"http:{request.remote_addr}", rate, ttl=ornekleme.CLIENT_TTL)
+    
+    data = get_snapshot()
+    
+    mimetype = kodlama.negotiate(request.accept_mimetypes)
+    if mimetype != kodlama.MIME_JSON:
+        return _binary_response(kodlama.encode_sample(data, time.time(), mimetype), mimetype)
+    
+    since = request.args.get('since', type=int)
+    if since is not None:
+        return jsonify(fark.changes_since(data, since))
+    
+    data["seq"] = fark.observe(data)
     return jsonify(data)
 
 
-@app.route('/api/sensor/on', methods=['POST'])
-def sensor_on():
-    """Ultrasonik sensörü aktif et"""
-    global sensor_data
+def stream_params(args):
+    """
+    /api/stream sorgu parametrelerini çözümle (Flask ve asyncio sunucu ortak)
     
-    # dijital_metre modülünü kullanarak sensörü aktif et
-    dijital_metre.set_active(True)
+    Returns:
+        tuple: (hız (Hz), kip)
     
-    with data_lock:
-        sensor_data["sensor_active"] = True
+    Raises:
+        ValueError: Hız veya kip geçersizse
+    """
+    rate = float(args.get('rate', ornekleme.DEFAULT_CLIENT_RATE))
+    mode = args.get('mode', 'latest')
+    if mode not in yayin.MODES:
+        raise ValueError(f"Geçersiz kip: {mode}")
+    return rate, mode
+
+
+@app.route('/api/stream', methods=['GET'])
+def stream_samples():
+    """
+    Canlı örnek akışı (Server-Sent Events)
+    
+    Parametreler:
+        rate (opsiyonel) - istemcinin istediği örnekleme hızı (Hz)
+        mode (opsiyonel) - "latest" (yalnızca güncel örnek) veya "queue"
+    
+    Bu sunucuda her bağlantı bir thread tutar; çok sayıda istemci için
+    asyncio sunucusu (sunucu.py) kullanılmalıdır.
+    """
+    try:
+        rate, mode = stream_params(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    
+    subscriber = yayin.subscribe(("sample",), mode=mode)
+    name = f"stream:{subscriber.id}"
+    ornekleme.subscribe(name, rate)
+    
+    def generate():
+        try:
+            yield b"retry: 2000\n\n"
+            while not subscriber.closed:
+                message = subscriber.get(timeout=yayin.KEEPALIVE)
+                yield message.sse() if message is not None else b": keepalive\n\n"
+        finally:
+            yayin.unsubscribe(subscriber)
+            ornekleme.unsubscribe(name)
+    
+    return Response(generate(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.route('/api/control/status', methods=['GET'])
+def control_status():
+    """WebSocket kumanda oturumları, düşürülen ayar noktaları ve gecikme"""
+    return jsonify(kumanda.get_status())
+
+
+@app.route('/api/stream/status', methods=['GET'])
+def stream_status():
+    """Akış abonelerini ve düşürülen mesaj sayılarını döndür"""
+    return jsonify(yayin.get_status(details=request.args.get('details') == '1'))
+
+
+@app.route('/api/mqtt', methods=['GET', 'POST'])
+def mqtt_status():
+    """MQTT yayıncısı bağlantısı, disk kuyruğu ve yayın hızı; POST ile ayar"""
+    if request.method == 'GET':
+        return jsonify(mqtt_yayinci.get_status())
+    
+    data = request.get_json() or {}
+    try:
+        status = mqtt_yayinci.configure(
+            qos=data.get('qos'),
+            batch_interval=data.get('batch_interval')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "success": False,
+            "message": f"Geçersiz MQTT ayarı: {e}"
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "message": "MQTT ayarları güncellendi",
+        "mqtt": status
+    })
+
+
+@app.route('/api/schema', methods=['GET'])
+def get_schema():
+    """İkili telemetri düzeninin tanımını döndür"""
+    return jsonify(kodlama.get_schema())
+
+
+# ==================== CİHAZ ÇÖZÜMLEME ====================
+
+def _device_not_found(kind, device_id):
+    return jsonify({
+        "success": False,
+        "message": f"{kind} türünde '{device_id}' cihazı bulunamadı"
+    }), 404
+
+
+@app.route('/api/devices', methods=['GET'])
+def list_devices():
+    """Kayıtlı cihazları ve durumlarını döndür"""
+    return jsonify(cihazlar.get_status())
+
+
+@app.route('/api/sensor/on', methods=['POST'], defaults={'device_id': None})
+@app.route('/api/sensor/<device_id>/on', methods=['POST'])
+def sensor_on(device_id):
+    """Ultrasonik sensörü aktif et"""
+    sensor = cihazlar.get(device_id, "ultrasonic")
+    if sensor is None:
+        return _device_not_found("ultrasonic", device_id)
+    
+    sensor.set_active(True)
     
     return jsonify({
         "success": True,
@@ -192,17 +497,15 @@ def sensor_on():
     })
 
 
-@app.route('/api/sensor/off', methods=['POST'])
-def sensor_off():
-    """Ultrasonik sensörü kapat"""
-    global sensor_data
+@app.route('/api/sensor/off', methods=['POST'], defaults={'device_id': None})
+@app.route('/api/sensor/<device_id>/off', methods=['POST'])
+def sensor_off(device_id):
+    """Ultrasonik sensörü kapat (kapalıyken mesafe 0 gösterilir)"""
+    sensor = cihazlar.get(device_id, "ultrasonic")
+    if sensor is None:
+        return _device_not_found("ultrasonic", device_id)
     
-    # dijital_metre modülünü kullanarak sensörü kapat
-    dijital_metre.set_active(False)
-    
-    with data_lock:
-        sensor_data["sensor_active"] = False
-        sensor_data["distance"] = 0.0  # Sensör kapalıyken 0 göster
+    sensor.set_active(False)
     
     return jsonify({
         "success": True,
@@ -211,10 +514,39 @@ def sensor_off():
     })
 
 
-@app.route('/api/servo/move', methods=['POST'])
-def move_servo():
+@app.route('/api/ultrasonic/array', methods=['GET', 'POST'])
+def ultrasonic_array():
+    """Sensör dizisi planı, çerçeve hızı ve son çerçeve; POST ile ayar"""
+    if request.method == 'GET':
+        return jsonify(mesafe_dizisi.get_status())
+    
+    data = request.get_json() or {}
+    try:
+        status = mesafe_dizisi.configure(
+            crosstalk_angle=data.get('crosstalk_angle'),
+            slot_gap=data.get('slot_gap')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "success": False,
+            "message": f"Geçersiz dizi ayarı: {e}"
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "message": "Sensör dizisi ayarları güncellendi",
+        "array": status
+    })
+
+
+@app.route('/api/servo/move', methods=['POST'], defaults={'device_id': None})
+@app.route('/api/servo/<device_id>/move', methods=['POST'])
+def move_servo(device_id):
     """Servo motoru belirtilen açıya getir"""
-    global sensor_data
+    target = cihazlar.get(device_id, "servo")
+    if target is None:
+        return _device_not_found("servo", device_id)
+    
     data = request.get_json()
     
     if not data or 'angle' not in data:
@@ -231,12 +563,8 @@ def move_servo():
                 "message": "Açı 0-180 arasında olmalı"
             }), 400
         
-        # servo.py modülünü kullan
-        new_angle = servo.set_angle(angle)
-        
-        # Global state'i güncelle
-        with data_lock:
-            sensor_data["servo_angle"] = new_angle
+        izleme.mark("validate")
+        new_angle = target.set_angle(angle)
         
         return jsonify({
             "success": True,
@@ -253,10 +581,37 @@ def move_servo():
 
 # ==================== DC MOTOR API ====================
 
-@app.route('/api/motor/forward', methods=['POST'])
-def motor_forward():
+def _take_manual_control(motor=None):
+    """
+    Manuel motor komutundan önce otomatik kontrolleri (PID, sekans) bırak
+    
+    PID ve sekanslar birincil motoru sürer; diğer motorlara gelen
+    komutlar onları durdurmaz.
+    """
+    if motor is not None and motor is not cihazlar.primary("motor"):
+        return
+    pid_kontrol.stop()
+    sekans.abort()
+
+
+def _forward_blocked(motor, error):
+    """Refleks korumasının reddettiği ileri komut (motor sürülmedi)"""
+    return jsonify({
+        "success": False,
+        "blocked": True,
+        "message": str(error),
+        "motor": motor.status()
+    }), 409
+
+
+@app.route('/api/motor/forward', methods=['POST'], defaults={'device_id': None})
+@app.route('/api/motor/<device_id>/forward', methods=['POST'])
+def motor_forward(device_id):
     """DC Motoru ileri yönde çalıştır"""
-    global sensor_data
+    motor = cihazlar.get(device_id, "motor")
+    if motor is None:
+        return _device_not_found("motor", device_id)
+    
     data = request.get_json() or {}
     speed = data.get('speed', 50)
     
@@ -268,10 +623,9 @@ def motor_forward():
                 "message": "Hız 0-100 arasında olmalı"
             }), 400
         
-        status = dcmotor.forward(speed)
-        
-        with data_lock:
-            sensor_data["motor"] = status
+        izleme.mark("validate")
+        _take_manual_control(motor)
+        status = motor.forward(speed)
         
         return jsonify({
             "success": True,
@@ -279,6 +633,9 @@ def motor_forward():
             "motor": status
         })
     
+    except dcmotor.ForwardBlocked as e:
+        return _forward_blocked(motor, e)
+    
     except ValueError:
         return jsonify({
             "success": False,
@@ -286,10 +643,14 @@ def motor_forward():
         }), 400
 
 
-@app.route('/api/motor/backward', methods=['POST'])
-def motor_backward():
+@app.route('/api/motor/backward', methods=['POST'], defaults={'device_id': None})
+@app.route('/api/motor/<device_id>/backward', methods=['POST'])
+def motor_backward(device_id):
     """DC Motoru geri yönde çalıştır"""
-    global sensor_data
+    motor = cihazlar.get(device_id, "motor")
+    if motor is None:
+        return _device_not_found("motor", device_id)
+    
     data = request.get_json() or {}
     speed = data.get('speed', 50)
     
@@ -301,10 +662,9 @@ def motor_backward():
                 "message": "Hız 0-100 arasında olmalı"
             }), 400
         
-        status = dcmotor.backward(speed)
-        
-        with data_lock:
-            sensor_data["motor"] = status
+        izleme.mark("validate")
+        _take_manual_control(motor)
+        status = motor.backward(speed)
         
         return jsonify({
             "success": True,
@@ -319,15 +679,17 @@ def motor_backward():
         }), 400
 
 
-@app.route('/api/motor/stop', methods=['POST'])
-def motor_stop():
+@app.route('/api/motor/stop', methods=['POST'], defaults={'device_id': None})
+@app.route('/api/motor/<device_id>/stop', methods=['POST'])
+def motor_stop(device_id):
     """DC Motoru durdur"""
-    global sensor_data
-    
-    status = dcmotor.stop()
+    motor = cihazlar.get(device_id, "motor")
+    if motor is None:
+        return _device_not_found("motor", device_id)
     
-    with data_lock:
-        sensor_data["motor"] = status
+    izleme.mark("validate")
+    _take_manual_control(motor)
+    status = motor.stop()
     
     return jsonify({
         "success": True,
@@ -336,15 +698,17 @@ def motor_stop():
     })
 
 
-@app.route('/api/motor/brake', methods=['POST'])
-def motor_brake():
+@app.route('/api/motor/brake', methods=['POST'], defaults={'device_id': None})
+@app.route('/api/motor/<device_id>/brake', methods=['POST'])
+def motor_brake(device_id):
     """DC Motoru frenle"""
-    global sensor_data
-    
-    status = dcmotor.brake()
+    motor = cihazlar.get(device_id, "motor")
+    if motor is None:
+        return _device_not_found("motor", device_id)
     
-    with data_lock:
-        sensor_data["motor"] = status
+    izleme.mark("validate")
+    _take_manual_control(motor)
+    status = motor.brake()
     
     return jsonify({
         "success": True,
@@ -353,10 +717,14 @@ def motor_brake():
     })
 
 
-@app.route('/api/motor/speed', methods=['POST'])
-def motor_set_speed():
+@app.route('/api/motor/speed', methods=['POST'], defaults={'device_id': None})
+@app.route('/api/motor/<device_id>/speed', methods=['POST'])
+def motor_set_speed(device_id):
     """DC Motor hızını ayarla"""
-    global sensor_data
+    motor = cihazlar.get(device_id, "motor")
+    if motor is None:
+        return _device_not_found("motor", device_id)
+    
     data = request.get_json()
     
     if not data or 'speed' not in data:
@@ -373,10 +741,9 @@ def motor_set_speed():
                 "message": "Hız 0-100 arasında olmalı"
             }), 400
         
-        new_speed = dcmotor.set_speed(speed)
-        
-        with data_lock:
-            sensor_data["motor"]["speed"] = new_speed
+        izleme.mark("validate")
+        _take_manual_control(motor)
+        new_speed = motor.set_speed(speed)
         
         return jsonify({
             "success": True,
@@ -384,6 +751,9 @@ def motor_set_speed():
             "speed": new_speed
         })
     
+    except dcmotor.ForwardBlocked as e:
+        return _forward_blocked(motor, e)
+    
     except ValueError:
         return jsonify({
             "success": False,
@@ -391,11 +761,819 @@ def motor_set_speed():
         }), 400
 
 
-@app.route('/api/motor/status', methods=['GET'])
-def motor_get_status():
+@app.route('/api/motor/status', methods=['GET'], defaults={'device_id': None})
+@app.route('/api/motor/<device_id>/status', methods=['GET'])
+def motor_get_status(device_id):
     """DC Motor durumunu döndür"""
-    status = dcmotor.get_status()
-    return jsonify(status)
+    motor = cihazlar.get(device_id, "motor")
+    if motor is None:
+        return _device_not_found("motor", device_id)
+    return jsonify(motor.status())
+
+
+@app.route('/api/motor/config', methods=['GET', 'POST'], defaults={'device_id': None})
+@app.route('/api/motor/<device_id>/config', methods=['GET', 'POST'])
+def motor_config(device_id):
+    """DC Motor rampa ayarlarını döndür veya güncelle"""
+    motor = cihazlar.get(device_id, "motor")
+    if motor is None:
+        return _device_not_found("motor", device_id)
+    
+    if request.method == 'GET':
+        return jsonify(motor.get_config())
+    
+    data = request.get_json() or {}
+    
+    try:
+        config = motor.configure(
+            slew_rate=data.get('slew_rate'),
+            dead_time=data.get('dead_time'),
+            brake_duration=data.get('brake_duration')
+        )
+    except (TypeError, ValueError):
+        return jsonify({
+            "success": False,
+            "message": "Geçersiz rampa ayarı"
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "message": "Motor rampa ayarları güncellendi",
+        "config": config
+    })
+
+
+# ==================== PID MESAFE KONTROLÜ API ====================
+
+@app.route('/api/pid/start', methods=['POST'])
+def pid_start():
+    """Mesafe tutma PID kontrolünü başlat"""
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        config = pid_kontrol.configure(**_pid_config_args(data))
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "success": False,
+            "message": f"Geçersiz PID ayarı: {e}"
+        }), 400
+    
+    started = pid_kontrol.start()
+    
+    return jsonify({
+        "success": True,
+        "message": "PID kontrolü başlatıldı" if started else "PID kontrolü zaten çalışıyor",
+        "config": config
+    })
+
+
+@app.route('/api/pid/stop', methods=['POST'])
+def pid_stop():
+    """Mesafe tutma PID kontrolünü durdur"""
+    pid_kontrol.stop()
+    
+    return jsonify({
+        "success": True,
+        "message": "PID kontrolü durduruldu",
+        "motor": cihazlar.primary("motor").status()
+    })
+
+
+@app.route('/api/pid/config', methods=['GET', 'POST'])
+def pid_config():
+    """PID ayarlarını döndür veya güncelle"""
+    if request.method == 'GET':
+        return jsonify(pid_kontrol.get_config())
+    
+    data = request.get_json() or {}
+    
+    try:
+        config = pid_kontrol.configure(**_pid_config_args(data))
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "success": False,
+            "message": f"Geçersiz PID ayarı: {e}"
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "message": "PID ayarları güncellendi",
+        "config": config
+    })
+
+
+@app.route('/api/pid/status', methods=['GET'])
+def pid_status():
+    """PID durumunu ve döngü telemetrisini döndür"""
+    return jsonify(pid_kontrol.get_status())
+
+
+def _pid_config_args(data):
+    """İstek gövdesinden tanınan PID ayarlarını ayıkla"""
+    keys = ("setpoint", "kp", "ki", "kd", "output_limit", "min_output",
+            "deadband", "stale_timeout", "loop_rate")
+    return {key: data[key] for key in keys if key in data}
+
+
+# ==================== GÜVENLİK REFLEKSİ API ====================
+
+@app.route('/api/reflex', methods=['GET'])
+def reflex_status():
+    """Refleks ayarlarını, gecikme istatistiklerini ve son olayları döndür"""
+    return jsonify(refleks.get_status())
+
+
+@app.route('/api/reflex/config', methods=['POST'])
+def reflex_config():
+    """Refleks eşiklerini güncelle veya refleksi aç/kapat"""
+    data = request.get_json() or {}
+    
+    try:
+        config = refleks.configure(
+            stop_distance=data.get('stop_distance'),
+            speed_margin=data.get('speed_margin')
+        )
+    except (TypeError, ValueError):
+        return jsonify({
+            "success": False,
+            "message": "Geçersiz refleks ayarı"
+        }), 400
+    
+    if 'enabled' in data:
+        if data['enabled']:
+            refleks.enable()
+        else:
+            refleks.disable()
+        config = refleks.get_config()
+    
+    return jsonify({
+        "success": True,
+        "message": "Refleks ayarları güncellendi",
+        "config": config
+    })
+
+
+# ==================== ÖRNEKLEME API ====================
+
+@app.route('/api/sampling', methods=['GET'])
+def sampling_status():
+    """Güncel örnekleme hızını ve tüketici taleplerini döndür"""
+    return jsonify(ornekleme.get_status())
+
+
+@app.route('/api/sampling/subscribe', methods=['POST'])
+def sampling_subscribe():
+    """
+    Dış tüketici için örnekleme talebi bildir
+    
+    JSON: {"name": "grafik", "rate": 5, "ttl": 10}
+    rate 0 ise abonelik kaldırılır; ttl verilmezse CLIENT_TTL kullanılır.
+    """
+    data = request.get_json() or {}
+    name = data.get('name')
+    
+    try:
+        if not name:
+            raise ValueError
+        rate = float(data.get('rate', ornekleme.DEFAULT_CLIENT_RATE))
+        ttl = float(data.get('ttl', ornekleme.CLIENT_TTL))
+        if rate < 0 or ttl <= 0:
+            raise ValueError
+    except (TypeError, ValueError):
+        return jsonify({
+            "success": False,
+            "message": "Geçersiz abonelik (name, rate >= 0, ttl > 0)"
+        }), 400
+    
+    if rate == 0:
+        ornekleme.unsubscribe(f"client:{name}")
+    else:
+        ornekleme.subscribe(f"client:{name}", rate, ttl=ttl)
+    
+    return jsonify({
+        "success": True,
+        "message": f"Örnekleme talebi güncellendi: {name}",
+        "sampling": ornekleme.get_status()
+    })
+
+
+@app.route('/api/sampling/config', methods=['POST'])
+def sampling_config():
+    """Boşta ve en yüksek örnekleme hızlarını ayarla"""
+    data = request.get_json() or {}
+    
+    try:
+        ornekleme.configure(
+            idle_rate=data.get('idle_rate'),
+            max_rate=data.get('max_rate')
+        )
+    except (TypeError, ValueError):
+        return jsonify({
+            "success": False,
+            "message": "Geçersiz örnekleme ayarı"
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "message": "Örnekleme ayarları güncellendi",
+        "sampling": ornekleme.get_status()
+    })
+
+
+# ==================== CİHAZ SAĞLIĞI API ====================
+
+@app.route('/api/health', methods=['GET'])
+def health_status():
+    """Sensör devre kesicilerinin durumunu döndür"""
+    return jsonify(saglik.get_status())
+
+
+@app.route('/api/health/<name>/reset', methods=['POST'])
+def health_reset(name):
+    """Devre kesiciyi elle kapat (cihaz bir sonraki okumada yeniden denenir)"""
+    breaker = saglik.breakers.get(name)
+    if breaker is None:
+        return jsonify({
+            "success": False,
+            "message": "Cihaz bulunamadı"
+        }), 404
+    
+    breaker.reset()
+    return jsonify({
+        "success": True,
+        "message": f"{name} devresi sıfırlandı",
+        "health": breaker.status()
+    })
+
+
+# ==================== GECİKME İZLEME API ====================
+
+@app.route('/api/debug/latency', methods=['GET', 'POST'])
+def debug_latency():
+    """
+    Son komutların aşama dökümü ve yüzdelik özetleri
+    
+    GET parametreleri: limit (son iz sayısı, varsayılan 20), route (yol filtresi)
+    POST: tarayıcının ölçtüğü gidiş-dönüş {"id", "rtt_ms", "client_ms"}
+    """
+    if request.method == 'GET':
+        limit = request.args.get('limit', 20, type=int)
+        return jsonify(izleme.get_status(limit=max(0, limit), route=request.args.get('route')))
+    
+    # sendBeacon gövdeyi text/plain gönderebilir
+    data = request.get_json(force=True, silent=True) or {}
+    try:
+        found = izleme.report_client(str(data.get('id')), data.get('rtt_ms'), data.get('client_ms'))
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "success": False,
+            "message": f"Geçersiz ölçüm: {e}"
+        }), 400
+    
+    if not found:
+        return jsonify({
+            "success": False,
+            "message": "İz bulunamadı"
+        }), 404
+    return jsonify({"success": True})
+
+
+# ==================== GÜNLÜK API ====================
+
+@app.route('/api/logs', methods=['GET'])
+def get_logs():
+    """
+    Son günlük olaylarını döndür
+    
+    Parametreler: limit (varsayılan 100), level (bu seviye ve üstü),
+    module (logger adı), after (bu id'den sonraki olaylar)
+    """
+    try:
+        logs = gunluk.get_logs(
+            limit=request.args.get('limit', 100, type=int),
+            level=request.args.get('level'),
+            module=request.args.get('module'),
+            after=request.args.get('after', type=int)
+        )
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
+    
+    return jsonify({
+        "logs": logs,
+        "status": gunluk.get_status()
+    })
+
+
+@app.route('/api/logs/level', methods=['POST'])
+def set_log_level():
+    """
+    Modülün günlük seviyesini değiştir
+    
+    JSON: {"module": "dijital_metre", "level": "DEBUG"}
+    """
+    data = request.get_json() or {}
+    
+    try:
+        gunluk.set_level(data.get('module', 'root'), data.get('level'))
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "message": "Günlük seviyesi güncellendi",
+        "levels": gunluk.get_status()["levels"]
+    })
+
+
+# ==================== IMU GÜÇ YÖNETİMİ API ====================
+
+@app.route('/api/imu/power', methods=['GET', 'POST'], defaults={'device_id': None})
+@app.route('/api/imu/<device_id>/power', methods=['GET', 'POST'])
+def imu_power(device_id):
+    """
+    IMU güç durumunu döndür veya ayarlarını güncelle
+    
+    POST JSON: {"low_power_wake_hz": 5, "idle_delay": 5}
+    """
+    unit = cihazlar.get(device_id, "imu")
+    if unit is None:
+        return _device_not_found("imu", device_id)
+    
+    if request.method == 'GET':
+        return jsonify(unit.get_power_status())
+    
+    data = request.get_json() or {}
+    try:
+        status = unit.configure_power(
+            low_power_wake_hz=data.get('low_power_wake_hz'),
+            idle_delay=data.get('idle_delay')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "success": False,
+            "message": str(e) or "Geçersiz güç ayarı"
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "message": "IMU güç ayarları güncellendi",
+        "power": status
+    })
+
+
+@app.route('/api/i2c', methods=['GET'])
+def i2c_status():
+    """I2C bus kuyruğu, birleştirilen okumalar ve cihaz başına bus kullanımı"""
+    return jsonify(veriyolu.get_status())
+
+
+# ==================== HAREKET SEKANSI API ====================
+
+@app.route('/api/sequences', methods=['GET'])
+def sequence_list():
+    """Kayıtlı sekansları listele"""
+    return jsonify(sekans.list_sequences())
+
+
+@app.route('/api/sequences/<name>', methods=['GET', 'PUT', 'DELETE'])
+def sequence_item(name):
+    """Sekansı döndür, yükle (PUT) veya sil"""
+    if request.method == 'GET':
+        steps = sekans.get_sequence(name)
+        if steps is None:
+            return jsonify({
+                "success": False,
+                "message": "Sekans bulunamadı"
+            }), 404
+        return jsonify({"name": name, "steps": steps})
+    
+    if request.method == 'DELETE':
+        if not sekans.delete(name):
+            return jsonify({
+                "success": False,
+                "message": "Sekans bulunamadı veya çalışıyor"
+            }), 409
+        return jsonify({
+            "success": True,
+            "message": f"Sekans '{name}' silindi"
+        })
+    
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        steps = sekans.save(name, data.get('steps'))
+    except sekans.SequenceError as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
+    
+    return jsonify({
+        "success": True,
+        "message": f"Sekans '{name}' kaydedildi ({len(steps)} adım)",
+        "steps": steps
+    })
+
+
+@app.route('/api/sequences/<name>/start', methods=['POST'])
+def sequence_start(name):
+    """Kayıtlı sekansı başlat"""
+    ok, message = sekans.start(name)
+    
+    return jsonify({
+        "success": ok,
+        "message": message
+    }), 200 if ok else 409
+
+
+@app.route('/api/sequences/pause', methods=['POST'])
+def sequence_pause():
+    """Çalışan sekansı duraklat"""
+    ok = sekans.pause()
+    return jsonify({
+        "success": ok,
+        "message": "Sekans duraklatıldı" if ok else "Çalışan sekans yok"
+    })
+
+
+@app.route('/api/sequences/resume', methods=['POST'])
+def sequence_resume():
+    """Duraklatılmış sekansı devam ettir"""
+    ok = sekans.resume()
+    return jsonify({
+        "success": ok,
+        "message": "Sekans devam ediyor" if ok else "Duraklatılmış sekans yok"
+    })
+
+
+@app.route('/api/sequences/abort', methods=['POST'])
+def sequence_abort():
+    """Çalışan sekansı iptal et"""
+    ok = sekans.abort()
+    return jsonify({
+        "success": ok,
+        "message": "Sekans iptal edildi" if ok else "Çalışan sekans yok"
+    })
+
+
+@app.route('/api/sequences/status', methods=['GET'])
+def sequence_status():
+    """Sekans çalışma durumu ve adım zamanlama raporu"""
+    return jsonify(sekans.get_status())
+
+
+# ==================== TOPLU KOMUT API ====================
+
+MAX_BATCH_OPS = 50         # Tek istekte en fazla işlem sayısı
+MAX_BATCH_DELAY = 10.0     # Toplam bekleme süresi sınırı (saniye)
+MOTOR_ACTIONS = ("forward", "backward", "stop", "brake", "speed")
+SENSOR_FIELDS = ("distance", "imu", "all")
+
+
+def _validate_batch_op(op):
+    """
+    Toplu komuttaki tek işlemi doğrula ve normalize et
+    
+    Returns:
+        tuple: (normalize edilmiş işlem, hata mesajı veya None)
+    """
+    if not isinstance(op, dict):
+        return None, "İşlem bir nesne olmalı"
+    
+    try:
+        delay = float(op.get('delay', 0))
+    except (TypeError, ValueError):
+        return None, "Geçersiz bekleme değeri"
+    if delay < 0 or delay > MAX_BATCH_DELAY:
+        return None, f"Bekleme 0-{MAX_BATCH_DELAY:g} saniye arasında olmalı"
+    
+    kind = op.get('op')
+    
+    # Servo ve motor işlemleri opsiyonel "device" alanıyla cihaz seçer
+    device_id = op.get('device')
+    if kind in ('servo', 'motor') and cihazlar.get(device_id, kind) is None:
+        return None, f"{kind} türünde '{device_id}' cihazı bulunamadı"
+    
+    if kind == 'servo':
+        try:
+            angle = int(op['angle'])
+        except (KeyError, TypeError, ValueError):
+            return None, "Geçersiz açı değeri"
+        if angle < 0 or angle > 180:
+            return None, "Açı 0-180 arasında olmalı"
+        return {"op": "servo", "device": device_id, "angle": angle, "delay": delay}, None
+    
+    if kind == 'motor':
+        action = op.get('action')
+        if action not in MOTOR_ACTIONS:
+            return None, "Geçersiz motor komutu"
+        normalized = {"op": "motor", "device": device_id, "action": action, "delay": delay}
+        if action in ("forward", "backward", "speed"):
+            try:
+                speed = int(op.get('speed', 50))
+            except (TypeError, ValueError):
+                return None, "Geçersiz hız değeri"
+            if speed < 0 or speed > 100:
+                return None, "Hız 0-100 arasında olmalı"
+            normalized["speed"] = speed
+        return normalized, None
+    
+    if kind == 'sensor':
+        field = op.get('field', 'all')
+        if field not in SENSOR_FIELDS:
+            return None, "Geçersiz sensör alanı"
+        return {"op": "sensor", "field": field, "delay": delay}, None
+    
+    return None, "Bilinmeyen işlem tipi"
+
+
+def _execute_batch_op(op):
+    """Doğrulanmış tek işlemi çalıştır ve sonucunu döndür"""
+    if op["op"] == "servo":
+        new_angle = cihazlar.get(op["device"], "servo").set_angle(op["angle"])
+        return {"angle": new_angle}
+    
+    if op["op"] == "motor":
+        motor = cihazlar.get(op["device"], "motor")
+        _take_manual_control(motor)
+        action = op["action"]
+        if action == "forward":
+            status = motor.forward(op["speed"])
+        elif action == "backward":
+            status = motor.backward(op["speed"])
+        elif action == "stop":
+            status = motor.stop()
+        elif action == "brake":
+            status = motor.brake()
+        else:
+            motor.set_speed(op["speed"])
+            status = motor.status()
+        return {"motor": status}
+    
+    data = get_snapshot()
+    if op["field"] == "distance":
+        return {"distance": data["distance"]}
+    if op["field"] == "imu":
+        return {"imu": dict(data["imu"])}
+    return {
+        "distance": data["distance"],
+        "imu": dict(data["imu"]),
+        "servo_angle": data["servo_angle"],
+        "motor": data["motor"]
+    }
+
+
+@app.route('/api/batch', methods=['POST'])
+def run_batch():
+    """
+    Sıralı servo, motor ve sensör işlemlerini tek istekte çalıştır
+    
+    Gövde: {"mode": "atomic" | "best_effort", "ops": [...]}
+    Her işlem opsiyonel "delay" (saniye) alanı ile bir önceki işlemden
+    sonra bekler. "atomic" modda tek bir geçersiz işlem tüm paketi reddeder
+    ve çalışma sırasında hata olursa kalan işlemler iptal edilir.
+    """
+    data = request.get_json(silent=True)
+    
+    if not data or not isinstance(data.get('ops'), list) or not data['ops']:
+        return jsonify({
+            "success": False,
+            "message": "İşlem listesi (ops) gerekli"
+        }), 400
+    
+    mode = data.get('mode', 'atomic')
+    if mode not in ('atomic', 'best_effort'):
+        return jsonify({
+            "success": False,
+            "message": "Mod 'atomic' veya 'best_effort' olmalı"
+        }), 400
+    
+    if len(data['ops']) > MAX_BATCH_OPS:
+        return jsonify({
+            "success": False,
+            "message": f"En fazla {MAX_BATCH_OPS} işlem gönderilebilir"
+        }), 400
+    
+    # Önce tüm işlemleri doğrula
+    validated = [_validate_batch_op(op) for op in data['ops']]
+    errors = [
+        {"index": i, "message": error}
+        for i, (_, error) in enumerate(validated) if error
+    ]
+    
+    total_delay = sum(op["delay"] for op, error in validated if not error)
+    if total_delay > MAX_BATCH_DELAY:
+        return jsonify({
+            "success": False,
+            "message": f"Toplam bekleme {MAX_BATCH_DELAY:g} saniyeyi aşamaz"
+        }), 400
+    
+    if errors and mode == 'atomic':
+        return jsonify({
+            "success": False,
+            "message": "Geçersiz işlem var, hiçbir işlem çalıştırılmadı",
+            "errors": errors
+        }), 400
+    
+    results = []
+    aborted = False
+    batch_start = time.monotonic()
+    
+    for i, (op, error) in enumerate(validated):
+        if aborted:
+            results.append({"index": i, "success": False, "message": "İptal edildi"})
+            continue
+        
+        if error:
+            results.append({"index": i, "success": False, "message": error})
+            continue
+        
+        if op["delay"] > 0:
+            time.sleep(op["delay"])
+        
+        started_ms = round((time.monotonic() - batch_start) * 1000, 1)
+        try:
+            result = _execute_batch_op(op)
+            results.append({
+                "index": i,
+                "op": op["op"],
+                "success": True,
+                "started_ms": started_ms,
+                "result": result
+            })
+        except Exception as e:
+            results.append({
+                "index": i,
+                "op": op["op"],
+                "success": False,
+                "started_ms": started_ms,
+                "message": str(e)
+            })
+            if mode == 'atomic':
+                aborted = True
+    
+    succeeded = all(result["success"] for result in results)
+    
+    return jsonify({
+        "success": succeeded,
+        "mode": mode,
+        "message": "Tüm işlemler tamamlandı" if succeeded else "Bazı işlemler başarısız",
+        "duration_ms": round((time.monotonic() - batch_start) * 1000, 1),
+        "results": results
+    })
+
+
+# ==================== TELEMETRİ KAYDI API ====================
+
+@app.route('/api/recorder', methods=['GET'])
+def recorder_status():
+    """Telemetri kaydedici durumunu döndür"""
+    return jsonify(kayit.get_status())
+
+
+@app.route('/api/recorder/start', methods=['POST'])
+def recorder_start():
+    """Telemetri kaydını başlat"""
+    started = kayit.start_recorder()
+    return jsonify({
+        "success": True,
+        "message": "Telemetri kaydı başlatıldı" if started else "Telemetri kaydı zaten açık",
+        "recorder": kayit.get_status()
+    })
+
+
+@app.route('/api/recorder/stop', methods=['POST'])
+def recorder_stop():
+    """Telemetri kaydını durdur"""
+    stopped = kayit.stop_recorder()
+    return jsonify({
+        "success": True,
+        "message": "Telemetri kaydı durduruldu" if stopped else "Telemetri kaydı zaten kapalı",
+        "recorder": kayit.get_status()
+    })
+
+
+# ==================== TELEMETRİ ARŞİVİ API ====================
+
+@app.route('/api/archive', methods=['GET'])
+def archive_status():
+    """Arşiv katmanları ve sıkıştırma istatistiklerini döndür"""
+    return jsonify(arsiv.get_status())
+
+
+@app.route('/api/archive/query', methods=['GET'])
+def archive_query():
+    """
+    Arşivden alan sorgula
+    
+    Parametreler: field, from, to (unix saniye), tier (opsiyonel)
+    """
+    field = request.args.get('field', 'distance')
+    tier = request.args.get('tier') or None
+    
+    try:
+        end = float(request.args.get('to', time.time()))
+        start = float(request.args.get('from', end - 3600))
+        result = arsiv.query(field, start, end, tier=tier)
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
+    
+    mimetype = kodlama.negotiate(request.accept_mimetypes)
+    if mimetype != kodlama.MIME_JSON:
+        columns = kodlama.table_columns(result["tier"])
+        meta = {key: value for key, value in result.items() if key != "points"}
+        payload = kodlama.encode_table(columns, result["points"], mimetype, meta)
+        return _binary_response(payload, mimetype)
+    return jsonify(result)
+
+
+@app.route('/api/series', methods=['GET'])
+def archive_series():
+    """
+    Grafik için örnek sayısı azaltılmış seri döndür
+    
+    Parametreler: field, from, to (unix saniye), points (hedef nokta),
+    method (lttb | minmax), tier (opsiyonel)
+    """
+    field = request.args.get('field', 'distance')
+    method = request.args.get('method', 'lttb')
+    tier = request.args.get('tier') or None
+    
+    try:
+        end = float(request.args.get('to', time.time()))
+        start = float(request.args.get('from', end - 3600))
+        points = int(request.args.get('points', 500))
+        result = seri.get_series(field, start, end, points, method, tier)
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
+    
+    mimetype = kodlama.negotiate(request.accept_mimetypes)
+    if mimetype != kodlama.MIME_JSON:
+        columns = kodlama.table_columns(result["tier"], method)
+        meta = {key: value for key, value in result.items() if key != "points"}
+        payload = kodlama.encode_table(columns, result["points"], mimetype, meta)
+        return _binary_response(payload, mimetype)
+    return jsonify(result)
+
+
+# ==================== DIŞA AKTARIM API ====================
+
+@app.route('/api/export', methods=['GET'])
+def export_telemetry():
+    """
+    Kayıtlı telemetriyi CSV/NDJSON/ikili olarak akış halinde indir
+    
+    Parametreler: from, to (unix saniye), fields (virgülle ayrılmış),
+    format (csv | ndjson | bin), gzip (1 ise sıkıştırılmış dosya).
+    format verilmezse Accept başlığı ikili düzeni isteyebilir.
+    """
+    default_fmt = "csv"
+    if kodlama.negotiate(request.accept_mimetypes) == kodlama.MIME_BINARY:
+        default_fmt = "bin"
+    fmt = request.args.get('format', default_fmt)
+    compress = request.args.get('gzip', '0') in ('1', 'true')
+    
+    try:
+        start = float(request.args['from']) if request.args.get('from') else None
+        end = float(request.args['to']) if request.args.get('to') else None
+        fields = aktarim.parse_fields(request.args.get('fields'))
+        if fmt not in aktarim.FORMATS:
+            raise ValueError("Format 'csv', 'ndjson' veya 'bin' olmalı")
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "message": str(e)
+        }), 400
+    
+    filename = f"telemetri.{fmt}"
+    mimetypes = {
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson",
+        "bin": kodlama.MIME_BINARY
+    }
+    mimetype = mimetypes[fmt]
+    if compress:
+        filename += ".gz"
+        mimetype = "application/gzip"
+    
+    stream = aktarim.generate(start, end, fields, fmt, compress)
+    return Response(
+        stream_with_context(stream),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 
 @app.route('/api/status', methods=['GET'])
@@ -404,29 +1582,66 @@ def get_status():
     return jsonify({
         "rpi_available": RPI_AVAILABLE,
         "sensor_thread_running": sensor_thread_running,
-        "gpio_pins": {
-            "servo": servo.SERVO_PIN,
-            "motor_in1": dcmotor.MOTOR1_IN1,
-            "motor_in2": dcmotor.MOTOR1_IN2,
-            "motor_ena": dcmotor.MOTOR1_ENA,
-            "trig": dijital_metre.TRIG_PIN,
-            "echo": dijital_metre.ECHO_PIN
+        "pid_running": pid_kontrol.is_running(),
+        "sequence_running": sekans.is_running(),
+        "recording": kayit.is_recording(),
+        "sampling_rate": ornekleme.current_rate(),
+        "compression": sikistirma.get_status(),
+        "assets": varliklar.get_status(),
+        "devices": cihazlar.get_status(),
+        "gpio_pins": {             # Birincil cihazların pinleri
+            "servo": cihazlar.primary("servo").pin,
+            "motor_in1": cihazlar.primary("motor").in1,
+            "motor_in2": cihazlar.primary("motor").in2,
+            "motor_ena": cihazlar.primary("motor").ena,
+            "trig": cihazlar.primary("ultrasonic").trig,
+            "echo": cihazlar.primary("ultrasonic").echo
         }
     })
 
 
 # ==================== UYGULAMA BAŞLATMA ====================
 
+def start_services():
+    """Donanımı, kayıt thread'lerini ve sensör döngüsünü başlat (her iki sunucu için)"""
+    # GPIO kurulumu
+    setup_gpio()
+    
+    # Özetli statik varlıklar (manifest yoksa veya kaynak değiştiyse yeniden yapılır)
+    varliklar.load()
+    
+    # Kara kutu telemetri kaydını ve uzun süreli arşivi başlat
+    kayit.start_recorder()
+    arsiv.start_archive()
+    
+    # MQTT_BROKER tanımlıysa telemetri MQTT'ye de yayınlanır
+    mqtt_yayinci.start()
+    
+    # Sensör thread'ini başlat
+    start_sensor_thread()
+    
+    # Servo'yu başlangıç pozisyonuna getir (90 derece)
+    for device in cihazlar.of_type("servo").values():
+        device.set_angle(90)
+
+
+def stop_services():
+    """Çalışan işleri durdurup donanımı güvenli duruma al"""
+    sekans.abort()
+    pid_kontrol.stop()
+    stop_sensor_thread()
+    kayit.stop_recorder()
+    arsiv.stop_archive()
+    mqtt_yayinci.stop()
+    cleanup_gpio()
+
+
 if __name__ == '__main__':
+    # Günlük kayıtları arka plan thread'inde yazılır (donanım thread'leri beklemez)
+    gunluk.setup()
+    
     try:
-        # GPIO kurulumu
-        setup_gpio()
-        
-        # Sensör thread'ini başlat
-        start_sensor_thread()
-        
-        # Servo'yu başlangıç pozisyonuna getir (90 derece)
-        servo.set_angle(90)
+        start_services()
         
         print("\n" + "="*50)
         print("Flask Web Sunucusu Başlatılıyor...")
@@ -440,6 +1655,6 @@ if __name__ == '__main__':
         print("\nUygulama kapatılıyor...")
     
     finally:
-        stop_sensor_thread()
-        cleanup_gpio()
+        stop_services()
+        gunluk.shutdown()
         print("Uygulama sonlandırıldı.")
@@ -0,0 +1,661 @@
+#!/usr/bin/env python3
+"""
+Sıkıştırılmış Uzun Süreli Telemetri Arşivi
+Zaman serisi sütunlarını Gorilla tarzı kodlama ile sıkıştırır:
+zaman damgaları delta-of-delta + zigzag varint, değerler ise bir önceki
+değerle XOR alınarak bit düzeyinde paketlenir
+
+Ham örneklerin yanında 1 saniye, 1 dakika ve 1 saat çözünürlüklü
+min/max/ortalama özetleri (rollup) otomatik üretilir. Her katmanın kendi
+saklama süresi vardır; uzun aralıklı sorgular sadece kaba katmanı okur.
+
+Yazımlar bellekte bloklar halinde biriktirilip seyrek ve büyük parçalar
+halinde diske eklenir (SD kart yazma hacmini ve aşınmayı azaltır).
+Son blok diske yazılmadan önce çökme olursa bu veriler kaybolur; kısa
+vadeli kayıt için kayit.py (kara kutu) kullanılır.
+"""
+
+import logging
+import os
+import glob
+import time
+import queue
+import struct
+import zlib
+import threading
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# ==================== AYARLAR ====================
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "arsiv_veri")
+BLOCK_SIZE = 1024           # Diske yazmadan önce biriktirilen en fazla satır
+FLUSH_INTERVAL = 60.0       # En geç bu kadar saniyede bir bloklar diske yazılır
+QUEUE_SIZE = 4096           # Örnekleyiciden gelen örnek kuyruğu
+
+# Katman adı -> (kova genişliği saniye, saklama süresi gün)
+TIERS = {
+    "raw": (0, 2),
+    "1s": (1, 7),
+    "1m": (60, 90),
+    "1h": (3600, 3650)
+}
+ROLLUP_TIERS = ("1s", "1m", "1h")
+
+FIELDS = ("distance", "accel_x", "accel_y", "accel_z", "gyro_x", "gyro_y",
+          "gyro_z", "servo_angle", "motor_speed", "motor_duty")
+
+FRAME_HEADER = struct.Struct("<II")   # yük uzunluğu, crc32
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+sample_queue = queue.Queue(maxsize=QUEUE_SIZE)
+worker_thread = None
+worker_running = False
+archive_dir = ARCHIVE_DIR
+
+pending = {tier: [] for tier in TIERS}      # Diske yazılmayı bekleyen satırlar
+open_buckets = {tier: None for tier in ROLLUP_TIERS}
+last_flush = 0.0
+last_retention_check = 0.0
+
+stats = {
+    "samples": 0,
+    "dropped": 0,
+    "frames_written": 0,
+    "bytes_written": 0,
+    "raw_bytes_equivalent": 0,
+    "last_error": None
+}
+
+
+# ==================== BİT DÜZEYİ YAZMA/OKUMA ====================
+
+class BitWriter:
+    """MSB önce bit yazıcı"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.acc = 0
+        self.nbits = 0
+
+    def write(self, value, nbits):
+        """value'nun en düşük nbits bitini yaz"""
+        self.acc = (self.acc << nbits) | (value & ((1 << nbits) - 1))
+        self.nbits += nbits
+        while self.nbits >= 8:
+            self.nbits -= 8
+            self.buffer.append((self.acc >> self.nbits) & 0xFF)
+        self.acc &= (1 << self.nbits) - 1
+
+    def getvalue(self):
+        """Yazılan bitleri (bayt sınırına tamamlanmış) döndür"""
+        data = bytearray(self.buffer)
+        if self.nbits:
+            data.append((self.acc << (8 - self.nbits)) & 0xFF)
+        return bytes(data)
+
+
+class BitReader:
+    """MSB önce bit okuyucu"""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def read(self, nbits):
+        """nbits bit oku ve tamsayı olarak döndür"""
+        if nbits == 0:
+            return 0
+        start = self.pos >> 3
+        end = (self.pos + nbits + 7) >> 3
+        chunk = int.from_bytes(self.data[start:end], "big")
+        shift = (end - start) * 8 - (self.pos & 7) - nbits
+        self.pos += nbits
+        return (chunk >> shift) & ((1 << nbits) - 1)
+
+
+# ==================== SÜTUN KODLAMA ====================
+
+def _write_varint(out, value):
+    """İşaretsiz LEB128 varint yaz"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    """Varint oku, (değer, yeni konum) döndür"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def encode_timestamps(timestamps):
+    """Milisaniye zaman damgalarını delta-of-delta + zigzag varint ile kodla"""
+    out = bytearray()
+    prev = prev_delta = 0
+    for i, ts in enumerate(timestamps):
+        if i == 0:
+            _write_varint(out, ts)
+        else:
+            delta = ts - prev
+            _write_varint(out, _zigzag(delta - prev_delta))
+            prev_delta = delta
+        prev = ts
+    return bytes(out)
+
+
+def decode_timestamps(data, count):
+    """encode_timestamps() çıktısını çöz"""
+    timestamps = []
+    pos = 0
+    prev = prev_delta = 0
+    for i in range(count):
+        value, pos = _read_varint(data, pos)
+        if i == 0:
+            ts = value
+        else:
+            prev_delta += _unzigzag(value)
+            ts = prev + prev_delta
+        timestamps.append(ts)
+        prev = ts
+    return timestamps
+
+
+def _float_bits(value):
+    return struct.unpack("<Q", struct.pack("<d", value))[0]
+
+
+def _bits_float(bits):
+    return struct.unpack("<d", struct.pack("<Q", bits))[0]
+
+
+def encode_values(values):
+    """Float değerleri Gorilla XOR yöntemiyle kodla"""
+    writer = BitWriter()
+    prev = 0
+    prev_lead = prev_trail = -1
+    
+    for i, value in enumerate(values):
+        bits = _float_bits(float(value))
+        if i == 0:
+            writer.write(bits, 64)
+            prev = bits
+            continue
+        
+        xor = bits ^ prev
+        prev = bits
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+        
+        lead = min(31, 64 - xor.bit_length())
+        trail = (xor & -xor).bit_length() - 1
+        
+        if prev_lead >= 0 and lead >= prev_lead and trail >= prev_trail:
+            # Önceki anlamlı bit penceresine sığıyor
+            writer.write(0b10, 2)
+            writer.write(xor >> prev_trail, 64 - prev_lead - prev_trail)
+        else:
+            meaningful = 64 - lead - trail
+            writer.write(0b11, 2)
+            writer.write(lead, 5)
+            writer.write(meaningful & 0x3F, 6)   # 64 -> 0 olarak saklanır
+            writer.write(xor >> trail, meaningful)
+            prev_lead, prev_trail = lead, trail
+    
+    return writer.getvalue()
+
+
+def decode_values(data, count):
+    """encode_values() çıktısını çöz"""
+    reader = BitReader(data)
+    values = []
+    prev = 0
+    lead = trail = 0
+    
+    for i in range(count):
+        if i == 0:
+            prev = reader.read(64)
+        elif reader.read(1):
+            if reader.read(1):
+                lead = reader.read(5)
+                meaningful = reader.read(6) or 64
+                trail = 64 - lead - meaningful
+            prev ^= reader.read(64 - lead - trail) << trail
+        values.append(_bits_float(prev))
+    
+    return values
+
+
+def encode_block(rows, columns):
+    """
+    Satırları sütun bazlı sıkıştırılmış bloğa çevir
+    
+    Args:
+        rows: [(ts_ms, {sütun: değer}), ...]
+        columns: Sütun adları
+    
+    Returns:
+        bytes: Blok yükü
+    """
+    out = bytearray()
+    _write_varint(out, len(rows))
+    _write_varint(out, len(columns))
+    for name in columns:
+        encoded = name.encode()
+        _write_varint(out, len(encoded))
+        out += encoded
+    
+    parts = [encode_timestamps([ts for ts, _ in rows])]
+    for name in columns:
+        parts.append(encode_values([row.get(name, 0.0) for _, row in rows]))
+    
+    for part in parts:
+        _write_varint(out, len(part))
+        out += part
+    return bytes(out)
+
+
+def decode_block(data, wanted=None):
+    """
+    Bloğu çöz
+    
+    Args:
+        wanted: Sadece bu sütunları çöz (None ise hepsi)
+    
+    Returns:
+        tuple: (zaman damgaları, {sütun: değer listesi})
+    """
+    count, pos = _read_varint(data, 0)
+    ncols, pos = _read_varint(data, pos)
+    columns = []
+    for _ in range(ncols):
+        length, pos = _read_varint(data, pos)
+        columns.append(data[pos:pos + length].decode())
+        pos += length
+    
+    length, pos = _read_varint(data, pos)
+    timestamps = decode_timestamps(data[pos:pos + length], count)
+    pos += length
+    
+    decoded = {}
+    for name in columns:
+        length, pos = _read_varint(data, pos)
+        if wanted is None or name in wanted:
+            decoded[name] = decode_values(data[pos:pos + length], count)
+        pos += length
+    
+    return timestamps, decoded
+
+
+# ==================== ROLLUP ====================
+
+def _new_bucket(start):
+    return {"start": start, "count": 0, "min": {}, "max": {}, "sum": {}}
+
+
+def _merge_into(bucket, count, mins, maxs, sums):
+    """Bir kovaya örnek veya alt kova özetini ekle"""
+    bucket["count"] += count
+    for name in mins:
+        if name in bucket["min"]:
+            bucket["min"][name] = min(bucket["min"][name], mins[name])
+            bucket["max"][name] = max(bucket["max"][name], maxs[name])
+            bucket["sum"][name] += sums[name]
+        else:
+            bucket["min"][name] = mins[name]
+            bucket["max"][name] = maxs[name]
+            bucket["sum"][name] = sums[name]
+
+
+def _bucket_row(bucket):
+    """Kapanan kovayı rollup satırına çevir"""
+    row = {"count": float(bucket["count"])}
+    for name in bucket["min"]:
+        row[f"{name}.min"] = bucket["min"][name]
+        row[f"{name}.max"] = bucket["max"][name]
+        row[f"{name}.mean"] = bucket["sum"][name] / bucket["count"]
+    return (bucket["start"], row)
+
+
+def _feed_rollup(level, ts_ms, count, mins, maxs, sums):
+    """
+    Örneği veya alt katman özetini level numaralı rollup katmanına ekle;
+    kapanan kovalar bir üst katmana aktarılır
+    """
+    tier = ROLLUP_TIERS[level]
+    width_ms = TIERS[tier][0] * 1000
+    start = ts_ms - ts_ms % width_ms
+    
+    bucket = open_buckets[tier]
+    if bucket is not None and bucket["start"] != start:
+        _close_bucket(level)
+        bucket = None
+    if bucket is None:
+        bucket = open_buckets[tier] = _new_bucket(start)
+    
+    _merge_into(bucket, count, mins, maxs, sums)
+
+
+def _close_bucket(level):
+    """Açık kovayı kapat, satırını kaydet ve üst katmana aktar"""
+    tier = ROLLUP_TIERS[level]
+    bucket = open_buckets[tier]
+    if bucket is None or bucket["count"] == 0:
+        return
+    open_buckets[tier] = None
+    pending[tier].append(_bucket_row(bucket))
+    
+    if level + 1 < len(ROLLUP_TIERS):
+        _feed_rollup(level + 1, bucket["start"], bucket["count"],
+                     bucket["min"], bucket["max"], bucket["sum"])
+
+
+# ==================== DOSYA İŞLEMLERİ ====================
+
+def _day_of(ts_ms):
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _tier_path(tier, day, directory=None):
+    return os.path.join(directory or archive_dir, tier, f"{day}.gor")
+
+
+def _write_frame(tier, rows):
+    """Satırları tek bir sıkıştırılmış çerçeve olarak gün dosyasına ekle"""
+    if not rows:
+        return
+    columns = sorted({name for _, row in rows for name in row})
+    payload = encode_block(rows, columns)
+    path = _tier_path(tier, _day_of(rows[0][0]))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    
+    with open(path, "ab") as f:
+        f.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+    
+    stats["frames_written"] += 1
+    stats["bytes_written"] += FRAME_HEADER.size + len(payload)
+
+
+def _read_frames(path):
+    """Dosyadaki geçerli çerçeveleri üret (yarım kalan son çerçeve atlanır)"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return
+    
+    pos = 0
+    while pos + FRAME_HEADER.size <= len(data):
+        length, crc = FRAME_HEADER.unpack_from(data, pos)
+        payload = data[pos + FRAME_HEADER.size:pos + FRAME_HEADER.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        yield payload
+        pos += FRAME_HEADER.size + length
+
+
+def flush(force=False):
+    """Bekleyen satırları diske yaz"""
+    global last_flush
+    
+    now = time.monotonic()
+    due = force or now - last_flush >= FLUSH_INTERVAL
+    
+    for tier, rows in pending.items():
+        if rows and (due or len(rows) >= BLOCK_SIZE):
+            _write_frame(tier, rows)
+            pending[tier] = []
+    
+    if due:
+        last_flush = now
+
+
+def apply_retention(now=None):
+    """Saklama süresini aşan gün dosyalarını sil"""
+    now = now or time.time()
+    removed = 0
+    for tier, (_, days) in TIERS.items():
+        cutoff = _day_of((now - days * 86400) * 1000)
+        for path in glob.glob(os.path.join(archive_dir, tier, "*.gor")):
+            if os.path.basename(path)[:10] < cutoff:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+    return removed
+
+
+# ==================== ÖRNEK GİRİŞİ ====================
+
+def flatten_sample(sample):
+    """app.sensor_data biçimindeki örneği düz sayısal alanlara çevir"""
+    imu_data = sample.get("imu") or {}
+    motor = sample.get("motor") or {}
+    values = {
+        "distance": sample.get("distance", 0.0),
+        "servo_angle": sample.get("servo_angle", 0),
+        "motor_speed": motor.get("speed", 0),
+        "motor_duty": motor.get("duty", 0.0)
+    }
+    for axis in ("accel_x", "accel_y", "accel_z", "gyro_x", "gyro_y", "gyro_z"):
+        values[axis] = imu_data.get(axis, 0.0)
+    return values
+
+
+def add_sample(wall, values):
+    """
+    Örneği arşiv kuyruğuna ekle (asla bloklamaz)
+    
+    Args:
+        wall: Unix zaman damgası (saniye)
+        values: {alan: sayısal değer}
+    
+    Returns:
+        bool: Kuyruğa eklendiyse True
+    """
+    if not worker_running:
+        return False
+    try:
+        sample_queue.put_nowait((int(wall * 1000), values))
+        return True
+    except queue.Full:
+        stats["dropped"] += 1
+        return False
+
+
+def _ingest(ts_ms, values):
+    """Örneği ham katmana ve rollup zincirine ekle"""
+    row = {name: float(values[name]) for name in FIELDS if name in values}
+    pending["raw"].append((ts_ms, row))
+    _feed_rollup(0, ts_ms, 1, row, row, row)
+    
+    stats["samples"] += 1
+    stats["raw_bytes_equivalent"] += 8 * (len(row) + 1)
+
+
+def worker_loop():
+    """Kuyruktaki örnekleri işle, blokları ve saklama süresini yönet"""
+    global last_retention_check
+    
+    while worker_running or not sample_queue.empty():
+        try:
+            item = sample_queue.get(timeout=0.5)
+        except queue.Empty:
+            item = None
+        
+        try:
+            if item is not None:
+                _ingest(*item)
+            
+            # Sessiz dönemlerde kovaların süresiz açık kalmaması için zamanla kapat
+            now_ms = int(time.time() * 1000)
+            for level, tier in enumerate(ROLLUP_TIERS):
+                bucket = open_buckets[tier]
+                if bucket and now_ms - bucket["start"] >= 2 * TIERS[tier][0] * 1000:
+                    _close_bucket(level)
+            
+            flush()
+            
+            if time.monotonic() - last_retention_check > 3600:
+                last_retention_check = time.monotonic()
+                apply_retention()
+        except Exception as e:
+            stats["last_error"] = str(e)
+            logger.error("Arşiv hatası: %s", e)
+    
+    # Kapanışta açık kovaları ve bekleyen satırları yaz
+    for level in range(len(ROLLUP_TIERS)):
+        _close_bucket(level)
+    flush(force=True)
+
+
+def start_archive(directory=None):
+    """Arşiv işleyicisini başlat"""
+    global worker_thread, worker_running, archive_dir, last_flush
+    
+    if worker_running:
+        return False
+    
+    archive_dir = directory or ARCHIVE_DIR
+    os.makedirs(archive_dir, exist_ok=True)
+    last_flush = time.monotonic()
+    
+    worker_running = True
+    worker_thread = threading.Thread(target=worker_loop, daemon=True)
+    worker_thread.start()
+    logger.info("Telemetri arşivi başlatıldı: %s", archive_dir)
+    return True
+
+
+def stop_archive():
+    """Arşiv işleyicisini durdur ve bekleyen verileri yaz"""
+    global worker_thread, worker_running
+    
+    if not worker_running:
+        return False
+    
+    worker_running = False
+    if worker_thread:
+        worker_thread.join(timeout=10.0)
+    worker_thread = None
+    logger.info("Telemetri arşivi durduruldu.")
+    return True
+
+
+def is_running():
+    """Arşiv işleyicisi çalışıyor mu?"""
+    return worker_running
+
+
+# ==================== SORGULAMA ====================
+
+def choose_tier(start, end):
+    """Zaman aralığına göre okunacak en uygun katmanı seç"""
+    span = end - start
+    if span > 2 * 86400:
+        return "1h"
+    if span > 6 * 3600:
+        return "1m"
+    if span > 600:
+        return "1s"
+    return "raw"
+
+
+def _days_between(start, end):
+    """Aralığı kapsayan gün adlarını üret"""
+    day = int(start // 86400) - 1
+    last = int(end // 86400)
+    while day <= last:
+        yield _day_of(day * 86400 * 1000)
+        day += 1
+
+
+def query(field, start, end, tier=None, directory=None):
+    """
+    Arşivden alan sorgula
+    
+    Args:
+        field: Alan adı (FIELDS içinden)
+        start, end: Unix zaman aralığı (saniye)
+        tier: "raw", "1s", "1m", "1h" veya None (otomatik)
+    
+    Returns:
+        dict: {"tier", "points"} - ham katmanda [t, değer], rollup
+              katmanlarında [t, min, max, ortalama, adet]
+    """
+    tier = tier or choose_tier(start, end)
+    if tier not in TIERS:
+        raise ValueError("Geçersiz katman")
+    if field not in FIELDS:
+        raise ValueError("Geçersiz alan")
+    
+    start_ms, end_ms = int(start * 1000), int(end * 1000)
+    if tier == "raw":
+        wanted = {field}
+    else:
+        wanted = {f"{field}.min", f"{field}.max", f"{field}.mean", "count"}
+    
+    points = []
+    for day in _days_between(start, end):
+        for payload in _read_frames(_tier_path(tier, day, directory)):
+            timestamps, columns = decode_block(payload, wanted)
+            if not timestamps or timestamps[-1] < start_ms or timestamps[0] > end_ms:
+                continue
+            for i, ts in enumerate(timestamps):
+                if ts < start_ms or ts > end_ms:
+                    continue
+                if tier == "raw":
+                    if field in columns:
+                        points.append([ts / 1000, columns[field][i]])
+                elif f"{field}.mean" in columns:
+                    points.append([
+                        ts / 1000,
+                        columns[f"{field}.min"][i],
+                        columns[f"{field}.max"][i],
+                        round(columns[f"{field}.mean"][i], 4),
+                        int(columns["count"][i])
+                    ])
+    
+    points.sort(key=lambda point: point[0])
+    return {"tier": tier, "field": field, "points": points}
+
+
+def get_status():
+    """Arşiv durumunu ve sıkıştırma istatistiklerini döndür"""
+    tiers = {}
+    for tier, (width, days) in TIERS.items():
+        files = glob.glob(os.path.join(archive_dir, tier, "*.gor"))
+        tiers[tier] = {
+            "bucket_seconds": width,
+            "retention_days": days,
+            "files": len(files),
+            "bytes": sum(os.path.getsize(path) for path in files),
+            "pending_rows": len(pending[tier])
+        }
+    
+    written = stats["bytes_written"]
+    return {
+        "running": worker_running,
+        "directory": archive_dir,
+        "tiers": tiers,
+        "stats": dict(stats),
+        "compression_ratio": round(stats["raw_bytes_equivalent"] / written, 2) if written else None
+    }
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Cihaz Kaydı Modülü
+config.DEVICES listesinden servo, motor, ultrasonik ve IMU nesnelerini oluşturur
+
+Her türün ilk cihazı birincil cihazdır ve ilgili modülün `default`
+nesnesi olur; böylece modül fonksiyonlarını kullanan PID, refleks ve
+sekanslar yapılandırılan ilk cihazı sürer. Diğer cihazlara id ile erişilir.
+
+Cihaz tanımı: {"id": "motor_sag", "type": "motor", ...}; kalan alanlar
+cihaz sınıfının kurucusuna aynen geçirilir (servo: pin, button_pin,
+led_pin; motor: in1, in2, ena; ultrasonic: trig, echo, heading, group;
+imu: address, bus_number, mux_address, mux_channel).
+"""
+
+import os
+import json
+import logging
+
+import config
+import servo
+import dcmotor
+import imu
+import dijital_metre
+
+logger = logging.getLogger(__name__)
+
+# ==================== CİHAZ TÜRLERİ ====================
+MODULES = {
+    "servo": servo,
+    "motor": dcmotor,
+    "ultrasonic": dijital_metre,
+    "imu": imu,
+}
+
+CLASSES = {
+    "servo": servo.Servo,
+    "motor": dcmotor.DCMotor,
+    "ultrasonic": dijital_metre.UltrasonicSensor,
+    "imu": imu.MPU6050,
+}
+
+# Çakışma kontrolü yapılan pin alanları
+PIN_FIELDS = ("pin", "button_pin", "led_pin", "in1", "in2", "ena", "trig", "echo")
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+devices = {}                # id -> cihaz nesnesi (tanım sırasıyla)
+device_types = {}           # id -> tür
+primary_ids = {}            # tür -> birincil cihaz id'si
+
+
+def _load_specs():
+    """Cihaz tanımlarını DEVICES_FILE (JSON) veya config.DEVICES'tan oku"""
+    path = os.environ.get("DEVICES_FILE")
+    if not path:
+        return config.DEVICES
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def validate(specs):
+    """
+    Cihaz tanımlarını doğrula
+    
+    Raises:
+        ValueError: Tür bilinmiyorsa, id tekrarlanıyorsa veya pin çakışıyorsa
+    """
+    ids = set()
+    pins = {}
+    addresses = {}
+    for spec in specs:
+        device_id = spec.get("id")
+        kind = spec.get("type")
+        if not device_id:
+            raise ValueError("Cihaz id'si gerekli")
+        if kind not in CLASSES:
+            raise ValueError(f"{device_id}: bilinmeyen cihaz türü: {kind}")
+        if device_id in ids:
+            raise ValueError(f"Cihaz id'si tekrarlanıyor: {device_id}")
+        ids.add(device_id)
+        
+        for field in PIN_FIELDS:
+            pin = spec.get(field)
+            if pin is None:
+                continue
+            if pin in pins:
+                raise ValueError(f"GPIO {pin} hem {pins[pin]} hem {device_id} tarafından kullanılıyor")
+            pins[pin] = device_id
+        
+        if kind == "imu":
+            # Çoğaltıcının farklı kanallarındaki cihazlar aynı adresi kullanabilir
+            key = (spec.get("bus_number", imu.I2C_BUS), spec.get("mux_address"),
+                   spec.get("mux_channel"), spec.get("address", imu.MPU6050_ADDR))
+            if key in addresses:
+                raise ValueError(f"I2C adresi {key[3]:#x} hem {addresses[key]} hem {device_id} tarafından kullanılıyor")
+            addresses[key] = device_id
+
+
+def load(specs=None):
+    """
+    Cihaz nesnelerini oluştur (uygulama başında, kurulumdan önce çağrılır)
+    
+    Args:
+        specs: Cihaz tanımları (None ise DEVICES_FILE veya config.DEVICES)
+    
+    Returns:
+        dict: id -> cihaz nesnesi
+    """
+    if specs is None:
+        specs = _load_specs()
+    validate(specs)
+    
+    devices.clear()
+    device_types.clear()
+    primary_ids.clear()
+    
+    for spec in specs:
+        kind = spec["type"]
+        options = {key: value for key, value in spec.items() if key not in ("id", "type")}
+        device = CLASSES[kind](name=spec["id"], **options)
+        devices[spec["id"]] = device
+        device_types[spec["id"]] = kind
+        
+        # Türün ilk cihazı modül fonksiyonlarının hedefi olur
+        if kind not in primary_ids:
+            primary_ids[kind] = spec["id"]
+            MODULES[kind].default = device
+    
+    logger.info("%d cihaz yüklendi: %s", len(devices), ", ".join(devices))
+    return devices
+
+
+def get(device_id, kind=None):
+    """
+    Cihazı id ile bul
+    
+    Args:
+        device_id: Cihaz id'si (None ise türün birincil cihazı)
+        kind: Beklenen tür (verilirse farklı türdeki cihaz bulunmaz)
+    
+    Returns:
+        Cihaz nesnesi veya None
+    """
+    if device_id is None:
+        return primary(kind) if kind else None
+    if kind is not None and device_types.get(device_id) != kind:
+        return None
+    return devices.get(device_id)
+
+
+def primary(kind):
+    """Türün birincil cihazı (yapılandırılmamışsa modülün varsayılan nesnesi)"""
+    return MODULES[kind].default
+
+
+def primary_id(kind):
+    """Türün birincil cihaz id'si (yoksa None)"""
+    return primary_ids.get(kind)
+
+
+def of_type(kind):
+    """Türdeki tüm cihazlar (id -> nesne, tanım sırasıyla)"""
+    return {device_id: devices[device_id]
+            for device_id, device_kind in device_types.items() if device_kind == kind}
+
+
+def setup_all():
+    """Tüm cihazları tanım sırasıyla başlat"""
+    for device in devices.values():
+        device.setup()
+
+
+def cleanup_all():
+    """Tüm cihazları ters sırada temizle"""
+    for device in reversed(list(devices.values())):
+        device.cleanup()
+
+
+def get_status():
+    """Kayıtlı cihazları ve durumlarını döndür"""
+    return {
+        device_id: {
+            "type": device_types[device_id],
+            "primary": primary_ids.get(device_types[device_id]) == device_id,
+            **device.status()
+        }
+        for device_id, device in devices.items()
+    }
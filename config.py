@@ -3,7 +3,8 @@
 Raspberry Pi GPIO Pin Yapılandırması
 Tüm pin tanımlarının merkezi dosyası
 
-DİKKAT: Bu dosyayı değiştirdikten sonra ilgili modülleri de güncellemeyi unutmayın!
+Cihaz modülleri varsayılan pin ve PWM değerlerini buradan okur; uygulama
+DEVICES listesindeki her cihaz için bir nesne oluşturur (cihazlar.py).
 """
 
 # ==================== SERVO MOTOR ====================
@@ -26,6 +27,7 @@ ULTRASONIC_ECHO = 24    # Echo pini (voltaj bölücü kullanın!)
 # ==================== IMU (MPU-6050) ====================
 # I2C üzerinden bağlı (GPIO 2 = SDA, GPIO 3 = SCL)
 MPU6050_ADDRESS = 0x68  # I2C adresi
+I2C_BUS = 1             # Raspberry Pi'de genellikle bus 1
 
 # ==================== I2C PINLERI ====================
 # Raspberry Pi'de sabit (değiştirilemez)
@@ -54,3 +56,40 @@ NOT: GPIO 23 ve 24 ultrasonik sensör için ayrılmıştır.
 # ==================== PWM AYARLARI ====================
 SERVO_PWM_FREQ = 50     # Hz (Servo için standart)
 MOTOR_PWM_FREQ = 1000   # Hz (DC motor için)
+
+# ==================== MOTOR RAMPA AYARLARI ====================
+# dcmotor.py bu değerleri başlangıç ayarı olarak okur; slew/dead-time/fren
+# süresi çalışırken /api/motor/config ile değiştirilebilir.
+MOTOR_CONTROL_PERIOD = 0.02   # Kontrol döngüsü periyodu (saniye)
+MOTOR_SLEW_RATE = 200.0       # Duty cycle değişim hızı (%/saniye)
+MOTOR_DEAD_TIME = 0.1         # Yön değişiminde sıfırda bekleme (saniye)
+MOTOR_BRAKE_DURATION = 0.1    # Frenleme süresi (saniye)
+
+# ==================== CİHAZ LİSTESİ ====================
+# Uygulama bu listedeki her cihaz için bir nesne oluşturur. Her türün ilk
+# cihazı birincil cihazdır: id'siz API yolları (/api/servo/move), PID,
+# refleks ve sekanslar onu kullanır. Diğerlerine id ile erişilir
+# (/api/servo/<id>/move). Listeyi değiştirmek için DEVICES_FILE ortam
+# değişkeniyle aynı yapıda bir JSON dosyası da verilebilir.
+#
+# Örnek: ikinci motor ve ikinci mesafe sensörü
+#     {"id": "motor_sag", "type": "motor", "in1": 5, "in2": 6, "ena": 13},
+#     {"id": "mesafe_arka", "type": "ultrasonic", "trig": 17, "echo": 27},
+#
+# Ultrasonik sensörlere bakış yönü (derece, "heading") verilirse yönleri
+# birbirinden yeterince ayrık olanlar aynı anda ateşlenir (mesafe_dizisi.py).
+# "group" ile aynı anda ateşlenecek sensörler elle de belirlenebilir.
+#     {"id": "mesafe_arka", "type": "ultrasonic", "trig": 17, "echo": 27, "heading": 180},
+#
+# IMU'lar paylaşımlı I2C bus üzerinden okunur (veriyolu.py). İkinci bir
+# MPU-6050 AD0 pini HIGH ile 0x69 adresinde, aynı adresli cihazlar ise
+# TCA9548A çoğaltıcının farklı kanallarında kullanılabilir:
+#     {"id": "imu_2", "type": "imu", "address": 0x69},
+#     {"id": "imu_kol", "type": "imu", "address": 0x68, "mux_address": 0x70, "mux_channel": 2},
+DEVICES = [
+    {"id": "servo", "type": "servo", "pin": SERVO_PIN,
+     "button_pin": SERVO_BUTTON_PIN, "led_pin": SERVO_LED_PIN},
+    {"id": "motor", "type": "motor", "in1": MOTOR_IN1, "in2": MOTOR_IN2, "ena": MOTOR_ENA},
+    {"id": "ultrasonic", "type": "ultrasonic", "trig": ULTRASONIC_TRIG, "echo": ULTRASONIC_ECHO},
+    {"id": "imu", "type": "imu", "address": MPU6050_ADDRESS, "bus_number": I2C_BUS},
+]
@@ -3,9 +3,22 @@
 DC Motor Kontrol Modülü
 Web arayüzünden gelen komutlarla DC motoru kontrol eder
 L298N Motor Sürücü ile çalışır
+
+API fonksiyonları (forward, backward, stop, brake, set_speed) sadece hedef
+değerleri ayarlar. Asıl GPIO/PWM yazımı arka plandaki kontrol döngüsü
+tarafından yapılır: duty cycle hedefe belirli bir eğimle (slew rate)
+yaklaşır, yön değişimlerinde önce sıfıra inilir ve ölü zaman beklenir,
+frenleme ise istek thread'ini bloklamadan zaman profiline göre uygulanır.
 """
 
+import logging
 import time
+import threading
+
+import config
+import izleme
+
+logger = logging.getLogger(__name__)
 
 # Raspberry Pi üzerinde çalışıp çalışmadığını kontrol et
 try:
@@ -13,228 +26,571 @@ try:
     RPI_AVAILABLE = True
 except ImportError:
     RPI_AVAILABLE = False
-    print("UYARI: RPi.GPIO bulunamadı. DC Motor simülasyon modu aktif.")
+    logger.warning("RPi.GPIO bulunamadı. DC Motor simülasyon modu aktif.")
 
-# GPIO pin tanımları (BCM numaralandırma)
+# GPIO pin tanımları (BCM numaralandırma, config.py, birincil motor)
 # L298N Motor Sürücü bağlantıları
-MOTOR1_IN1 = 16      # Motor 1 Giriş 1 (Yön)
-MOTOR1_IN2 = 20      # Motor 1 Giriş 2 (Yön)
-MOTOR1_ENA = 21      # Motor 1 Enable (PWM ile hız kontrolü)
+MOTOR1_IN1 = config.MOTOR_IN1   # Motor 1 Giriş 1 (Yön)
+MOTOR1_IN2 = config.MOTOR_IN2   # Motor 1 Giriş 2 (Yön)
+MOTOR1_ENA = config.MOTOR_ENA   # Motor 1 Enable (PWM ile hız kontrolü)
+PWM_FREQ = config.MOTOR_PWM_FREQ
 
-# Global değişkenler
-motor_pwm = None
-is_initialized = False
-current_state = "stopped"  # stopped, forward, backward
-current_speed = 0          # 0-100 arası hız
+# Rampa kontrol ayarları (varsayılanlar, motor başına configure() ile değiştirilebilir)
+CONTROL_PERIOD = config.MOTOR_CONTROL_PERIOD    # Kontrol döngüsü periyodu (saniye)
+SLEW_RATE = config.MOTOR_SLEW_RATE              # Duty cycle değişim hızı (%/saniye)
+DEAD_TIME = config.MOTOR_DEAD_TIME              # Yön değişiminde sıfırda bekleme süresi (saniye)
+BRAKE_DURATION = config.MOTOR_BRAKE_DURATION    # Frenleme süresi (saniye)
+BRAKE_DUTY = 100                                # Frenleme sırasında ENA duty cycle (%)
 
 
-def setup_motor():
-    """DC Motor GPIO kurulumunu yap"""
-    global motor_pwm, is_initialized
+class ForwardBlocked(RuntimeError):
+    """İleri komut güvenlik koruması (refleks) tarafından reddedildi"""
+
+
+class DCMotor:
+    """
+    L298N üzerinden sürülen tek bir DC motor
     
-    if not RPI_AVAILABLE:
-        print("DC Motor simülasyon modunda başlatıldı")
-        is_initialized = True
-        return True
+    Her motorun kendi kilitleri ve kontrol döngüsü thread'i vardır;
+    farklı motorlara gelen komutlar birbirini beklemez.
     
-    try:
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
+    Kilit sırası: output_lock -> control_lock
+    """
+
+    def __init__(self, name="motor", in1=MOTOR1_IN1, in2=MOTOR1_IN2, ena=MOTOR1_ENA):
+        self.name = name
+        self.in1 = in1
+        self.in2 = in2
+        self.ena = ena
+        
+        # Rampa ayarları (configure() ile değiştirilebilir)
+        self.slew_rate = SLEW_RATE
+        self.dead_time = DEAD_TIME
+        self.brake_duration = BRAKE_DURATION
+        
+        self.pwm = None
+        self.is_initialized = False
+        self.current_state = "stopped"  # stopped, forward, backward (hedef durum)
+        self.current_speed = 0          # 0-100 arası hız (hedef hız)
+        
+        # Kontrol döngüsü durumu
+        self.control_lock = threading.Lock()    # Hedef değerler
+        self.output_lock = threading.Lock()     # Donanım çıkışlarına tek seferde tek yazıcı
+        self.control_thread = None
+        self.control_running = False
+        self.applied_duty = 0.0         # Şu an uygulanan duty cycle (%)
+        self.output_direction = None    # Pinlere uygulanan yön: "forward", "backward" veya None
+        self.dead_time_until = 0.0      # Bu zamana kadar yeni yön uygulanmaz (monotonic)
+        self.brake_until = None         # Frenleme bitiş zamanı (monotonic), None ise fren yok
+        self.brake_requested = False    # Kontrol döngüsü bir sonraki adımda freni başlatır
+        self.trace = None               # Son komutun gecikme izi (gpio/complete döngüde işaretlenir)
+        self.forward_guard = None       # guard(hız) True dönerse ileri komut reddedilir (refleks)
+        self.blocked_commands = 0
+
+    def setup(self):
+        """DC Motor GPIO kurulumunu yap"""
+        if not RPI_AVAILABLE:
+            logger.info("DC Motor simülasyon modunda başlatıldı")
+            self.is_initialized = True
+            self.start_control_loop()
+            return True
+        
+        try:
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setwarnings(False)
+            
+            with self.output_lock:
+                # Motor pinlerini ayarla
+                GPIO.setup(self.in1, GPIO.OUT)
+                GPIO.setup(self.in2, GPIO.OUT)
+                GPIO.setup(self.ena, GPIO.OUT)
+                
+                # PWM başlat (Enable pin için)
+                self.pwm = GPIO.PWM(self.ena, PWM_FREQ)
+                self.pwm.start(0)
+                
+                # Motoru durdur
+                GPIO.output(self.in1, GPIO.LOW)
+                GPIO.output(self.in2, GPIO.LOW)
+                
+                self.is_initialized = True
+            self.start_control_loop()
+            logger.info("DC Motor GPIO kurulumu tamamlandı.")
+            return True
+        
+        except Exception as e:
+            logger.error("DC Motor kurulum hatası: %s", e)
+            return False
+
+    def cleanup(self):
+        """DC Motor GPIO kaynaklarını temizle"""
+        # Kontrol döngüsünü durdur ve çıkışları hemen sıfırla
+        self.stop_control_loop()
+        self.stop()
+        with self.output_lock:
+            self._write_outputs(None, 0)
+        
+        if not RPI_AVAILABLE:
+            self.is_initialized = False
+            return
+        
+        try:
+            with self.output_lock:
+                if self.pwm:
+                    self.pwm.stop()
+                
+                # Motor pinlerini temizle
+                GPIO.cleanup([self.in1, self.in2, self.ena])
+                self.is_initialized = False
+            logger.info("DC Motor kaynakları temizlendi.")
+        except Exception as e:
+            logger.error("DC Motor temizleme hatası: %s", e)
+    
+    # ==================== KONTROL DÖNGÜSÜ ====================
+
+    def _write_outputs(self, direction, duty):
+        """
+        Yön pinlerini ve PWM duty cycle'ı donanıma yaz (output_lock tutulurken)
+        
+        Args:
+            direction: "forward", "backward", "brake" veya None (boşta)
+            duty: Duty cycle (0-100)
+        """
+        if RPI_AVAILABLE and self.is_initialized:
+            if direction == "forward":
+                GPIO.output(self.in1, GPIO.HIGH)
+                GPIO.output(self.in2, GPIO.LOW)
+            elif direction == "backward":
+                GPIO.output(self.in1, GPIO.LOW)
+                GPIO.output(self.in2, GPIO.HIGH)
+            elif direction == "brake":
+                # Her iki pini de HIGH yaparak frenleme
+                GPIO.output(self.in1, GPIO.HIGH)
+                GPIO.output(self.in2, GPIO.HIGH)
+            else:
+                GPIO.output(self.in1, GPIO.LOW)
+                GPIO.output(self.in2, GPIO.LOW)
+            if self.pwm:
+                self.pwm.ChangeDutyCycle(duty)
+        
+        self.applied_duty = float(duty)
+        self.output_direction = direction if direction != "brake" else None
+        if self.trace is not None:
+            izleme.mark("gpio", self.trace)
+
+    def _write_duty(self, duty):
+        """Sadece PWM duty cycle'ı güncelle (yön pinlerine dokunmadan)"""
+        if RPI_AVAILABLE and self.pwm and self.is_initialized:
+            self.pwm.ChangeDutyCycle(duty)
+        self.applied_duty = float(duty)
+        if self.trace is not None:
+            izleme.mark("gpio", self.trace)
+
+    def _control_step(self, now, dt):
+        """
+        Kontrol döngüsünün tek adımı (output_lock tutulurken)
+        
+        Args:
+            now: Şu anki monotonic zaman
+            dt: Bir önceki adımdan bu yana geçen süre (saniye)
+        """
+        with self.control_lock:
+            target_dir = self.current_state if self.current_state != "stopped" else None
+            target_duty = float(self.current_speed) if target_dir else 0.0
+            start_brake = self.brake_requested
+            self.brake_requested = False
+        
+        # Frenleme profili: başlat, süre dolana kadar tut, sonra bırak
+        if start_brake:
+            self._write_outputs("brake", BRAKE_DUTY)
+            self.brake_until = now + self.brake_duration
+            return
+        
+        if self.brake_until is not None:
+            if now < self.brake_until:
+                return
+            self.brake_until = None
+            self._write_outputs(None, 0)
+            self.dead_time_until = now + self.dead_time
+        
+        max_step = self.slew_rate * dt
+        
+        if self.output_direction is not None and self.output_direction != target_dir:
+            # Yön değişimi veya durma: önce sıfıra rampala
+            new_duty = max(0.0, self.applied_duty - max_step)
+            if new_duty <= 0.0:
+                self._write_outputs(None, 0)
+                self.dead_time_until = now + self.dead_time
+            else:
+                self._write_duty(new_duty)
+            return
+        
+        if self.output_direction is None:
+            if target_dir is None or now < self.dead_time_until:
+                return
+            # Ölü zaman bitti, yeni yönü sıfır duty ile uygula
+            self._write_outputs(target_dir, 0)
+        
+        # Aynı yönde hedef duty'ye doğru rampala
+        if self.applied_duty != target_duty:
+            if self.applied_duty < target_duty:
+                new_duty = min(target_duty, self.applied_duty + max_step)
+            else:
+                new_duty = max(target_duty, self.applied_duty - max_step)
+            self._write_duty(new_duty)
+
+    def control_loop(self):
+        """Arka planda motor çıkışlarını hedef değerlere doğru sür"""
+        last = time.monotonic()
+        next_tick = last
         
-        # Motor pinlerini ayarla
-        GPIO.setup(MOTOR1_IN1, GPIO.OUT)
-        GPIO.setup(MOTOR1_IN2, GPIO.OUT)
-        GPIO.setup(MOTOR1_ENA, GPIO.OUT)
+        while self.control_running:
+            now = time.monotonic()
+            try:
+                with self.output_lock:
+                    self._control_step(now, now - last)
+                    if self.trace is not None:
+                        self._complete_trace()
+            except Exception as e:
+                logger.error("Motor kontrol döngüsü hatası: %s", e)
+            last = now
+            
+            # Sabit periyot: kaymayı önlemek için bir sonraki adımı mutlak zamana göre planla
+            next_tick += CONTROL_PERIOD
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+
+    def start_control_loop(self):
+        """Motor kontrol döngüsü thread'ini başlat"""
+        if self.control_running:
+            return
         
-        # PWM başlat (Enable pin için)
-        motor_pwm = GPIO.PWM(MOTOR1_ENA, 1000)  # 1000 Hz frekans
-        motor_pwm.start(0)
+        self.control_running = True
+        self.control_thread = threading.Thread(target=self.control_loop, daemon=True)
+        self.control_thread.start()
+        logger.info("Motor kontrol döngüsü başlatıldı.")
+
+    def stop_control_loop(self):
+        """Motor kontrol döngüsü thread'ini durdur"""
+        self.control_running = False
+        if self.control_thread and self.control_thread is not threading.current_thread():
+            self.control_thread.join(timeout=1.0)
+        self.control_thread = None
+
+    def configure(self, slew_rate=None, dead_time=None, brake_duration=None):
+        """
+        Rampa kontrol ayarlarını güncelle
         
-        # Motoru durdur
-        GPIO.output(MOTOR1_IN1, GPIO.LOW)
-        GPIO.output(MOTOR1_IN2, GPIO.LOW)
+        Args:
+            slew_rate: Duty cycle değişim hızı (%/saniye)
+            dead_time: Yön değişiminde bekleme süresi (saniye)
+            brake_duration: Frenleme süresi (saniye)
         
-        is_initialized = True
-        print("DC Motor GPIO kurulumu tamamlandı.")
-        return True
+        Returns:
+            dict: Güncel ayarlar
+        """
+        with self.output_lock:
+            if slew_rate is not None:
+                self.slew_rate = max(1.0, float(slew_rate))
+            if dead_time is not None:
+                self.dead_time = max(0.0, float(dead_time))
+            if brake_duration is not None:
+                self.brake_duration = max(0.0, float(brake_duration))
         
-    except Exception as e:
-        print(f"DC Motor kurulum hatası: {e}")
+        return self.get_config()
+
+    def get_config(self):
+        """Rampa kontrol ayarlarını döndür"""
+        return {
+            "control_period": CONTROL_PERIOD,
+            "slew_rate": self.slew_rate,
+            "dead_time": self.dead_time,
+            "brake_duration": self.brake_duration
+        }
+
+    def wait_until_settled(self, timeout=5.0):
+        """
+        Uygulanan çıkışlar hedefe ulaşana kadar bekle
+        
+        Args:
+            timeout: Maksimum bekleme süresi (saniye)
+        
+        Returns:
+            bool: Hedefe ulaşıldıysa True
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.is_ramping():
+                return True
+            time.sleep(CONTROL_PERIOD)
         return False
 
+    def _ramping_locked(self):
+        """Çıkışlar hedefte değilse True (output_lock ve control_lock tutulurken)"""
+        target_dir = self.current_state if self.current_state != "stopped" else None
+        target_duty = float(self.current_speed) if target_dir else 0.0
+        return (self.brake_requested or self.brake_until is not None
+                or self.output_direction != target_dir
+                or self.applied_duty != target_duty)
 
-def cleanup_motor():
-    """DC Motor GPIO kaynaklarını temizle"""
-    global motor_pwm, is_initialized
-    
-    if not RPI_AVAILABLE:
-        is_initialized = False
-        return
+    def is_ramping(self):
+        """Çıkışlar henüz hedefe ulaşmadıysa True döndür"""
+        with self.output_lock, self.control_lock:
+            return self._ramping_locked()
+
+    def _complete_trace(self):
+        """Çıkışlar hedefe ulaştıysa komutun izini tamamla (output_lock tutulurken)"""
+        with self.control_lock:
+            if not self._ramping_locked():
+                izleme.mark("complete", self.trace)
+                self.trace = None
     
-    try:
-        # Önce motoru durdur
-        stop()
+    # ==================== MOTOR KOMUTLARI ====================
+
+    def _check_forward(self, speed):
+        """
+        İleri sürüşe izin var mı? (refleks freni mandalı, tüm sürücüler için tek yer)
+        
+        Raises:
+            ForwardBlocked: Koruma ileri komutu reddettiyse
+        """
+        guard = self.forward_guard
+        if speed > 0 and guard is not None and guard(speed):
+            self.blocked_commands += 1
+            logger.warning("Engel fren eşiğinin içinde, ileri komut reddedildi (Hız: %%%s)", speed)
+            raise ForwardBlocked("Engel fren eşiğinin içinde, motor ileri sürülemez")
+
+    def set_speed(self, speed):
+        """
+        Motor hızını ayarla
+        
+        Args:
+            speed: Hız değeri (0-100)
         
-        if motor_pwm:
-            motor_pwm.stop()
+        Returns:
+            int: Ayarlanan hız değeri
         
-        # Motor pinlerini temizle
-        GPIO.cleanup([MOTOR1_IN1, MOTOR1_IN2, MOTOR1_ENA])
-        is_initialized = False
-        print("DC Motor kaynakları temizlendi.")
-    except Exception as e:
-        print(f"DC Motor temizleme hatası: {e}")
+        Raises:
+            ForwardBlocked: Motor ileri giderken refleks koruması hızı reddettiyse
+        """
+        # Hızı sınırla (0-100)
+        speed = max(0, min(100, int(speed)))
+        if self.current_state == "forward":
+            self._check_forward(speed)
+        
+        trace = izleme.current()
+        with self.control_lock:
+            self.current_speed = speed
+            self.trace = trace
+            izleme.mark("queue", trace)
+        logger.info("Motor hızı: %%%s", speed)
+        return speed
+
+    def _drive(self, direction, speed):
+        """Hedef yön ve hızı tek adımda ayarla (döngü ara durumu görmez)"""
+        speed = max(0, min(100, int(speed)))
+        if direction == "forward":
+            self._check_forward(speed)
+        
+        if not (RPI_AVAILABLE and self.is_initialized):
+            logger.debug("[SİMÜLASYON] Motor %s hareket ediyor...",
+                         "ileri" if direction == "forward" else "geri")
+        
+        trace = izleme.current()
+        with self.control_lock:
+            self.current_speed = speed
+            self.current_state = direction
+            self.trace = trace
+            izleme.mark("queue", trace)
+        logger.info("Motor %s hareket ediyor (Hız: %%%s)",
+                    "ileri" if direction == "forward" else "geri", speed)
+        
+        return self.status()
+
+    def forward(self, speed=50):
+        """
+        Motoru ileri yönde çalıştır
+        
+        Args:
+            speed: Hız değeri (0-100), varsayılan 50
+        
+        Returns:
+            dict: Motor durumu
+        
+        Raises:
+            ForwardBlocked: Engel refleks fren eşiğinin içindeyse
+        """
+        return self._drive("forward", speed)
+
+    def backward(self, speed=50):
+        """
+        Motoru geri yönde çalıştır
+        
+        Args:
+            speed: Hız değeri (0-100), varsayılan 50
+        
+        Returns:
+            dict: Motor durumu
+        """
+        return self._drive("backward", speed)
+
+    def stop(self):
+        """
+        Motoru durdur (duty cycle rampa ile sıfıra iner)
+        
+        Returns:
+            dict: Motor durumu
+        """
+        if not (RPI_AVAILABLE and self.is_initialized):
+            logger.debug("[SİMÜLASYON] Motor durduruluyor...")
+        
+        trace = izleme.current()
+        with self.control_lock:
+            self.current_state = "stopped"
+            self.current_speed = 0
+            self.trace = trace
+            izleme.mark("queue", trace)
+        logger.info("Motor durduruldu")
+        
+        return self.status()
+
+    def brake(self, immediate=False):
+        """
+        Motoru frenle (hızlı durdurma)
+        
+        Frenleme kontrol döngüsünde brake_duration süresince uygulanır,
+        bu fonksiyon beklemeden döner.
+        
+        Args:
+            immediate: True ise fren pinleri kontrol döngüsünü beklemeden
+                       çağıran thread içinde hemen yazılır (güvenlik refleksi)
+        
+        Returns:
+            dict: Motor durumu
+        """
+        if not (RPI_AVAILABLE and self.is_initialized):
+            logger.debug("[SİMÜLASYON] Motor frenleniyor...")
+        
+        trace = izleme.current()
+        with self.control_lock:
+            self.current_state = "stopped"
+            self.current_speed = 0
+            self.brake_requested = True
+            self.trace = trace
+            izleme.mark("queue", trace)
+        
+        if immediate:
+            with self.output_lock:
+                self._write_outputs("brake", BRAKE_DUTY)
+        logger.info("Motor frenlendi")
+        
+        return self.status()
+
+    def is_moving_forward(self):
+        """Hedef veya uygulanan yön ileri mi? (refleks için kilitsiz hızlı kontrol)"""
+        return self.current_state == "forward" or self.output_direction == "forward"
+
+    def status(self):
+        """
+        Motor durumunun tutarlı anlık görüntüsü
+        
+        Returns:
+            dict: Motor durum bilgileri
+        """
+        with self.output_lock, self.control_lock:
+            state = self.current_state
+            return {
+                "state": state,
+                "speed": self.current_speed,
+                "is_running": state != "stopped",
+                "direction": state if state != "stopped" else None,
+                "duty": round(self.applied_duty, 1),
+                "output_direction": self.output_direction,
+                "braking": self.brake_requested or self.brake_until is not None,
+                "blocked_commands": self.blocked_commands
+            }
+
+
+# Varsayılan cihaz (modül fonksiyonları bu örneğe yönlendirilir)
+default = DCMotor()
+
+
+def setup_motor():
+    """DC Motor GPIO kurulumunu yap"""
+    return default.setup()
+
+
+def cleanup_motor():
+    """DC Motor GPIO kaynaklarını temizle"""
+    default.cleanup()
+
+
+def configure(slew_rate=None, dead_time=None, brake_duration=None):
+    """Rampa kontrol ayarlarını güncelle (bkz. DCMotor.configure)"""
+    return default.configure(slew_rate, dead_time, brake_duration)
+
+
+def get_config():
+    """Rampa kontrol ayarlarını döndür"""
+    return default.get_config()
+
+
+def wait_until_settled(timeout=5.0):
+    """Uygulanan çıkışlar hedefe ulaşana kadar bekle"""
+    return default.wait_until_settled(timeout)
+
+
+def is_ramping():
+    """Çıkışlar henüz hedefe ulaşmadıysa True döndür"""
+    return default.is_ramping()
 
 
 def set_speed(speed):
-    """
-    Motor hızını ayarla
-    
-    Args:
-        speed: Hız değeri (0-100)
-    
-    Returns:
-        int: Ayarlanan hız değeri
-    """
-    global current_speed
-    
-    # Hızı sınırla (0-100)
-    speed = max(0, min(100, int(speed)))
-    
-    if RPI_AVAILABLE and motor_pwm and is_initialized:
-        motor_pwm.ChangeDutyCycle(speed)
-    
-    current_speed = speed
-    print(f"Motor hızı: %{speed}")
-    return speed
+    """Motor hızını ayarla (bkz. DCMotor.set_speed)"""
+    return default.set_speed(speed)
 
 
 def forward(speed=50):
-    """
-    Motoru ileri yönde çalıştır
-    
-    Args:
-        speed: Hız değeri (0-100), varsayılan 50
-    
-    Returns:
-        dict: Motor durumu
-    """
-    global current_state
-    
-    if RPI_AVAILABLE and is_initialized:
-        GPIO.output(MOTOR1_IN1, GPIO.HIGH)
-        GPIO.output(MOTOR1_IN2, GPIO.LOW)
-    else:
-        print("[SİMÜLASYON] Motor ileri hareket ediyor...")
-    
-    set_speed(speed)
-    current_state = "forward"
-    print(f"Motor ileri hareket ediyor (Hız: %{speed})")
-    
-    return get_status()
+    """Motoru ileri yönde çalıştır"""
+    return default.forward(speed)
 
 
 def backward(speed=50):
-    """
-    Motoru geri yönde çalıştır
-    
-    Args:
-        speed: Hız değeri (0-100), varsayılan 50
-    
-    Returns:
-        dict: Motor durumu
-    """
-    global current_state
-    
-    if RPI_AVAILABLE and is_initialized:
-        GPIO.output(MOTOR1_IN1, GPIO.LOW)
-        GPIO.output(MOTOR1_IN2, GPIO.HIGH)
-    else:
-        print("[SİMÜLASYON] Motor geri hareket ediyor...")
-    
-    set_speed(speed)
-    current_state = "backward"
-    print(f"Motor geri hareket ediyor (Hız: %{speed})")
-    
-    return get_status()
+    """Motoru geri yönde çalıştır"""
+    return default.backward(speed)
 
 
 def stop():
-    """
-    Motoru durdur
-    
-    Returns:
-        dict: Motor durumu
-    """
-    global current_state, current_speed
-    
-    if RPI_AVAILABLE and is_initialized:
-        GPIO.output(MOTOR1_IN1, GPIO.LOW)
-        GPIO.output(MOTOR1_IN2, GPIO.LOW)
-        if motor_pwm:
-            motor_pwm.ChangeDutyCycle(0)
-    else:
-        print("[SİMÜLASYON] Motor durduruluyor...")
-    
-    current_state = "stopped"
-    current_speed = 0
-    print("Motor durduruldu")
-    
-    return get_status()
+    """Motoru durdur (duty cycle rampa ile sıfıra iner)"""
+    return default.stop()
 
 
-def brake():
-    """
-    Motoru frenle (hızlı durdurma)
-    
-    Returns:
-        dict: Motor durumu
-    """
-    global current_state, current_speed
-    
-    if RPI_AVAILABLE and is_initialized:
-        # Her iki pini de HIGH yaparak frenleme
-        GPIO.output(MOTOR1_IN1, GPIO.HIGH)
-        GPIO.output(MOTOR1_IN2, GPIO.HIGH)
-        time.sleep(0.1)
-        # Sonra durdur
-        GPIO.output(MOTOR1_IN1, GPIO.LOW)
-        GPIO.output(MOTOR1_IN2, GPIO.LOW)
-        if motor_pwm:
-            motor_pwm.ChangeDutyCycle(0)
-    else:
-        print("[SİMÜLASYON] Motor frenleniyor...")
-    
-    current_state = "stopped"
-    current_speed = 0
-    print("Motor frenlendi")
-    
-    return get_status()
+def brake(immediate=False):
+    """Motoru frenle (bkz. DCMotor.brake)"""
+    return default.brake(immediate)
+
+
+def is_moving_forward():
+    """Hedef veya uygulanan yön ileri mi?"""
+    return default.is_moving_forward()
 
 
 def get_status():
-    """
-    Motor durumunu döndür
-    
-    Returns:
-        dict: Motor durum bilgileri
-    """
-    return {
-        "state": current_state,
-        "speed": current_speed,
-        "is_running": current_state != "stopped",
-        "direction": current_state if current_state != "stopped" else None
-    }
+    """Motor durumunu döndür"""
+    return default.status()
 
 
 def get_current_state():
     """Mevcut motor durumunu döndür"""
-    return current_state
+    return default.current_state
 
 
 def get_current_speed():
     """Mevcut motor hızını döndür"""
-    return current_speed
+    return default.current_speed
 
 
 # Modül doğrudan çalıştırılırsa test modu
@@ -262,11 +618,12 @@ if __name__ == '__main__':
         
         print("\n4. Frenle...")
         brake()
+        wait_until_settled()
         
         print("\nTest tamamlandı.")
-        
+    
     except KeyboardInterrupt:
         print("\nTest sonlandırılıyor...")
     
     finally:
-        cleanup_motor()
\ No newline at end of file
+        cleanup_motor()
@@ -4,7 +4,15 @@ Dijital Metre Modülü (HC-SR04 Ultrasonik Sensör)
 Web arayüzünden mesafe ölçümü için modül
 """
 
+import logging
 import time
+import threading
+import contextlib
+
+import config
+import saglik
+
+logger = logging.getLogger(__name__)
 
 # Raspberry Pi üzerinde çalışıp çalışmadığını kontrol et
 try:
@@ -12,175 +20,416 @@ try:
     RPI_AVAILABLE = True
 except ImportError:
     RPI_AVAILABLE = False
-    print("UYARI: RPi.GPIO bulunamadı. Dijital metre simülasyon modu aktif.")
+    logger.warning("RPi.GPIO bulunamadı. Dijital metre simülasyon modu aktif.")
 
-# GPIO pin tanımları (BCM numaralandırma)
-TRIG_PIN = 23
-ECHO_PIN = 24
-
-# Global değişkenler
-is_initialized = False
-is_active = True
-last_distance = 0.0
+# GPIO pin tanımları (BCM numaralandırma, config.py, birincil sensör)
+TRIG_PIN = config.ULTRASONIC_TRIG
+ECHO_PIN = config.ULTRASONIC_ECHO
 
 # Timeout değerleri
 TIMEOUT = 0.1  # 100ms timeout
 
 
-def setup_sensor():
-    """Ultrasonik sensörü başlat"""
-    global is_initialized
-    
-    if not RPI_AVAILABLE:
-        print("Dijital metre simülasyon modunda başlatıldı")
-        is_initialized = True
-        return True
+class UltrasonicSensor:
+    """
+    Tek bir HC-SR04 ultrasonik sensör
     
-    try:
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-        
-        # Pin kurulumu
-        GPIO.setup(TRIG_PIN, GPIO.OUT)
-        GPIO.setup(ECHO_PIN, GPIO.IN)
+    io_lock aynı sensörde iki ölçümün üst üste binmesini (yankıların
+    karışmasını) önler; lock yalnızca durum alanlarını korur, böylece
+    süren bir ölçüm durum okumasını bekletmez.
+    """
+
+    def __init__(self, name="ultrasonic", trig=TRIG_PIN, echo=ECHO_PIN, heading=None, group=None):
+        self.name = name
+        self.trig = trig
+        self.echo = echo
+        self.heading = heading      # Bakış yönü (derece), dizi zamanlayıcısı için
+        self.group = group          # Elle verilen ateşleme grubu (aynı gruptakiler birlikte ateşlenir)
+        self.lock = threading.Lock()
+        self.io_lock = threading.Lock()
         
-        # TRIG pinini LOW yap
-        GPIO.output(TRIG_PIN, False)
+        self.is_initialized = False
+        self.is_active = True
+        self.last_distance = 0.0
+        self.last_measurement_time = None  # Son geçerli ölçümün zamanı (time.monotonic)
         
-        # Sensörün hazır olması için bekle
-        time.sleep(0.5)
+        # Her geçerli ölçümde, ölçümü yapan thread içinde çağrılan fonksiyonlar
+        self.sample_listeners = []
         
-        is_initialized = True
-        print("HC-SR04 Ultrasonik Sensör başlatıldı.")
-        return True
+        # Simülasyon modunda rastgele değer yerine kullanılacak kaynak (kayıt tekrarı için)
+        self.simulation_source = None
         
-    except Exception as e:
-        print(f"Sensör başlatma hatası: {e}")
-        return False
+        # Art arda zaman aşımında sensöre erişimi kesen devre
+        self.breaker = saglik.register(name, reinit=self._reinit)
 
-
-def cleanup_sensor():
-    """Sensör kaynaklarını temizle"""
-    global is_initialized
-    
-    if not RPI_AVAILABLE:
-        is_initialized = False
-        return
-    
-    try:
-        GPIO.cleanup([TRIG_PIN, ECHO_PIN])
-        is_initialized = False
-        print("Dijital metre kaynakları temizlendi.")
-    except Exception as e:
-        print(f"Sensör temizleme hatası: {e}")
-
-
-def measure_distance():
-    """
-    Ultrasonik sensör ile mesafe ölç
-    
-    Returns:
-        float: Mesafe (cm cinsinden), hata durumunda -1
-    """
-    global last_distance
-    
-    if not is_active:
-        return 0.0
-    
-    if not RPI_AVAILABLE or not is_initialized:
-        # Simülasyon modu - rastgele mesafe
-        import random
-        distance = round(random.uniform(5.0, 200.0), 2)
-        last_distance = distance
-        return distance
-    
-    try:
-        # TRIG pinine 10µs pulse gönder
-        GPIO.output(TRIG_PIN, True)
-        time.sleep(0.00001)  # 10 mikrosaniye
-        GPIO.output(TRIG_PIN, False)
+    def setup(self):
+        """Ultrasonik sensörü başlat"""
+        if not RPI_AVAILABLE:
+            logger.info("Dijital metre simülasyon modunda başlatıldı")
+            self.is_initialized = True
+            return True
         
-        # ECHO pininin HIGH olmasını bekle
-        pulse_start = time.time()
-        timeout_start = pulse_start
+        try:
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setwarnings(False)
+            
+            with self.io_lock:
+                # Pin kurulumu
+                GPIO.setup(self.trig, GPIO.OUT)
+                GPIO.setup(self.echo, GPIO.IN)
+                
+                # TRIG pinini LOW yap
+                GPIO.output(self.trig, False)
+                
+                # Sensörün hazır olması için bekle
+                time.sleep(0.5)
+                
+                self.is_initialized = True
+            logger.info("HC-SR04 Ultrasonik Sensör başlatıldı.")
+            return True
         
-        while GPIO.input(ECHO_PIN) == 0:
-            pulse_start = time.time()
-            if pulse_start - timeout_start > TIMEOUT:
-                print("ECHO timeout (waiting for HIGH)")
-                return -1
+        except Exception as e:
+            logger.error("Sensör başlatma hatası: %s", e)
+            return False
+
+    def cleanup(self):
+        """Sensör kaynaklarını temizle"""
+        if not RPI_AVAILABLE:
+            self.is_initialized = False
+            return
         
-        # ECHO pininin LOW olmasını bekle
-        pulse_end = time.time()
-        timeout_start = pulse_end
+        try:
+            with self.io_lock:
+                GPIO.cleanup([self.trig, self.echo])
+                self.is_initialized = False
+            logger.info("Dijital metre kaynakları temizlendi.")
+        except Exception as e:
+            logger.error("Sensör temizleme hatası: %s", e)
+
+    def _reinit(self):
+        """
+        Sensör pinlerini yeniden kur ve ECHO hattını kontrol et
+        (sağlık recovery thread'inde çağrılır)
         
-        while GPIO.input(ECHO_PIN) == 1:
-            pulse_end = time.time()
-            if pulse_end - timeout_start > TIMEOUT:
-                print("ECHO timeout (waiting for LOW)")
-                return -1
+        Raises:
+            IOError: ECHO hattı hâlâ HIGH'ta takılıysa
+        """
+        if not RPI_AVAILABLE:
+            return
         
-        # Süreyi hesapla
-        pulse_duration = pulse_end - pulse_start
+        with self.io_lock:
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setup(self.trig, GPIO.OUT)
+            GPIO.setup(self.echo, GPIO.IN)
+            GPIO.output(self.trig, False)
+            time.sleep(0.05)
+            
+            if GPIO.input(self.echo) == 1:
+                raise IOError("ECHO hattı HIGH'ta takılı")
+
+    def is_stale(self):
+        """Ultrasonik sensör devresi açık mı? (son mesafe bayat)"""
+        return not self.breaker.is_healthy()
+
+    def measure_distance(self):
+        """
+        Ultrasonik sensör ile mesafe ölç
+        
+        Returns:
+            float: Mesafe (cm cinsinden), hata durumunda -1
+        """
+        if not self.is_active:
+            return 0.0
+        return self.record_measurement(ping_group([self])[self])
+
+    def simulated_distance(self):
+        """Simülasyon modu - kayıt kaynağı varsa onu, yoksa rastgele mesafe kullan"""
+        if self.simulation_source is not None:
+            distance = self.simulation_source()
+            if distance is None or distance < 0:
+                return None
+            return distance
+        import random
+        return round(random.uniform(5.0, 200.0), 2)
+
+    def record_measurement(self, distance):
+        """
+        Ham ölçümü menzil kontrolünden geçirip kaydet
         
-        # Mesafeyi hesapla (ses hızı: 34300 cm/s, gidiş-dönüş için /2)
-        # distance = (time * speed) / 2
-        distance = (pulse_duration * 34300) / 2
+        Args:
+            distance: ping_group() sonucu (cm) veya None
         
-        # Kalibre edilmiş değer (sensöre göre ayarlanabilir)
-        distance = round(distance, 2)
+        Returns:
+            float: Geçerli mesafe (cm), değilse -1
+        """
+        if distance is None:
+            return -1
         
         # Menzil kontrolü (2cm - 400cm)
         if distance < 2 or distance > 400:
-            print(f"Menzil aşıldı: {distance}cm")
+            logger.debug("Menzil aşıldı: %scm", distance)
             return -1
         
-        last_distance = distance
+        self._store(distance)
         return distance
+
+    def _store(self, distance):
+        """Geçerli ölçümü kaydet ve dinleyicilere bildir"""
+        timestamp = time.monotonic()
+        with self.lock:
+            self.last_distance = distance
+            self.last_measurement_time = timestamp
+        self._notify_listeners(distance, timestamp)
+
+    def add_sample_listener(self, callback):
+        """
+        Her geçerli ölçümden hemen sonra çağrılacak fonksiyon ekle
+        
+        Fonksiyon ölçümü yapan thread içinde çalışır, bu yüzden hızlı olmalıdır.
         
-    except Exception as e:
-        print(f"Mesafe ölçüm hatası: {e}")
-        return -1
+        Args:
+            callback: callback(distance, timestamp) şeklinde çağrılır
+        """
+        with self.lock:
+            if callback not in self.sample_listeners:
+                self.sample_listeners.append(callback)
+
+    def remove_sample_listener(self, callback):
+        """Ölçüm dinleyicisini kaldır"""
+        with self.lock:
+            if callback in self.sample_listeners:
+                self.sample_listeners.remove(callback)
+
+    def _notify_listeners(self, distance, timestamp):
+        """Kayıtlı dinleyicileri yeni ölçümle çağır"""
+        with self.lock:
+            listeners = list(self.sample_listeners)
+        for callback in listeners:
+            try:
+                callback(distance, timestamp)
+            except Exception as e:
+                logger.error("Ölçüm dinleyicisi hatası: %s", e)
+
+    def get_distance_age(self):
+        """
+        Son geçerli ölçümün yaşını döndür
+        
+        Returns:
+            float: Saniye cinsinden yaş, hiç ölçüm yoksa None
+        """
+        measured = self.last_measurement_time
+        if measured is None:
+            return None
+        return time.monotonic() - measured
+
+    def set_active(self, active):
+        """
+        Sensörü aktif/pasif yap
+        
+        Args:
+            active: True ise sensör aktif, False ise pasif
+        """
+        with self.lock:
+            self.is_active = bool(active)
+            if not self.is_active:
+                self.last_distance = 0.0  # Sensör kapalıyken 0 göster
+        return self.is_active
+
+    def status(self):
+        """Sensör durumunun tutarlı anlık görüntüsü"""
+        with self.lock:
+            return {
+                "active": self.is_active,
+                "initialized": self.is_initialized,
+                "last_distance": self.last_distance,
+                "stale": self.is_stale(),
+                "heading": self.heading,
+                "group": self.group,
+                "pins": {
+                    "trig": self.trig,
+                    "echo": self.echo
+                }
+            }
+
+
+# ==================== YANKI ZAMANLAMA ====================
+
+def ping_group(sensors):
+    """
+    Sensörleri aynı anda tetikle ve yankılarını tek döngüde zamanla
+    
+    Tek sensörlük ölçüm de dizi zamanlayıcısı da bu fonksiyonu kullanır.
+    Birbirini duyabilecek sensörleri aynı grupta ateşlemek çağıranın
+    sorumluluğundadır (bkz. mesafe_dizisi).
+    
+    Args:
+        sensors: UltrasonicSensor listesi
+    
+    Returns:
+        dict: sensör -> ham mesafe (cm), zaman aşımı veya hata durumunda None
+    """
+    results = {sensor: None for sensor in sensors}
+    hardware = []
+    for sensor in sensors:
+        if not RPI_AVAILABLE or not sensor.is_initialized:
+            results[sensor] = sensor.simulated_distance()
+        elif sensor.breaker.allow():
+            # Devre açıksa TIMEOUT beklemeden atla (örnekleyici zamanı harcanmaz)
+            hardware.append(sensor)
+    
+    if not hardware:
+        return results
+    
+    # Kilitler ad sırasıyla alınır (iki grup üst üste gelirse kilitlenme olmasın)
+    hardware.sort(key=lambda sensor: sensor.name)
+    with contextlib.ExitStack() as stack:
+        for sensor in hardware:
+            stack.enter_context(sensor.io_lock)
+        try:
+            results.update(_time_echoes(hardware))
+        except Exception as e:
+            for sensor in hardware:
+                if not sensor.breaker.record_failure(e):
+                    logger.error("Mesafe ölçüm hatası (%s): %s", sensor.name, e)
+    return results
+
+
+def _fail(sensor, reason):
+    """Zaman aşımını devreye bildir (devre açıldıysa ayrıca uyarı yazılmaz)"""
+    if not sensor.breaker.record_failure(reason):
+        # Sabit mesaj şablonu: günlük hız sınırı nedene göre ayrı işlesin
+        logger.warning(reason + " (%s)", sensor.name)
+
+
+def _time_echoes(sensors):
+    """
+    Tetikleme ve ECHO kenar zamanlaması (io_lock'lar tutulurken)
+    
+    Tüm ECHO pinleri tek döngüde yoklanır; her sensörün yükselen ve
+    düşen kenarı ayrı ayrı kaydedilir.
+    """
+    results = {}
+    ready = []
+    for sensor in sensors:
+        # ECHO ölçümden önce HIGH ise hat takılı, 100ms beklemeye gerek yok
+        if GPIO.input(sensor.echo) == 1:
+            _fail(sensor, "ECHO hattı HIGH'ta takılı")
+            results[sensor] = None
+        else:
+            ready.append(sensor)
+    
+    if not ready:
+        return results
+    
+    # TRIG pinlerine 10µs pulse gönder
+    for sensor in ready:
+        GPIO.output(sensor.trig, True)
+    time.sleep(0.00001)  # 10 mikrosaniye
+    for sensor in ready:
+        GPIO.output(sensor.trig, False)
+    
+    started = time.perf_counter()
+    rise = {}
+    pending = list(ready)
+    while pending:
+        now = time.perf_counter()
+        for sensor in list(pending):
+            level = GPIO.input(sensor.echo)
+            if sensor not in rise:
+                # ECHO pininin HIGH olmasını bekle
+                if level == 1:
+                    rise[sensor] = now
+                elif now - started > TIMEOUT:
+                    _fail(sensor, "ECHO timeout (waiting for HIGH)")
+                    results[sensor] = None
+                    pending.remove(sensor)
+            elif level == 0:
+                # Sensör yanıt verdi (menzil dışı olsa bile cihaz sağlıklı)
+                sensor.breaker.record_success()
+                # Mesafeyi hesapla (ses hızı: 34300 cm/s, gidiş-dönüş için /2)
+                results[sensor] = round((now - rise[sensor]) * 34300 / 2, 2)
+                pending.remove(sensor)
+            elif now - rise[sensor] > TIMEOUT:
+                # ECHO pininin LOW olmasını bekle
+                _fail(sensor, "ECHO timeout (waiting for LOW)")
+                results[sensor] = None
+                pending.remove(sensor)
+    return results
+
+
+# Varsayılan cihaz (modül fonksiyonları bu örneğe yönlendirilir)
+default = UltrasonicSensor()
+
+
+def setup_sensor():
+    """Ultrasonik sensörü başlat"""
+    return default.setup()
+
+
+def cleanup_sensor():
+    """Sensör kaynaklarını temizle"""
+    default.cleanup()
+
+
+def is_stale():
+    """Ultrasonik sensör devresi açık mı? (son mesafe bayat)"""
+    return default.is_stale()
+
+
+def measure_distance():
+    """Ultrasonik sensör ile mesafe ölç (cm, hata durumunda -1)"""
+    return default.measure_distance()
+
+
+def add_sample_listener(callback):
+    """Her geçerli ölçümden hemen sonra çağrılacak fonksiyon ekle"""
+    default.add_sample_listener(callback)
+
+
+def remove_sample_listener(callback):
+    """Ölçüm dinleyicisini kaldır"""
+    default.remove_sample_listener(callback)
+
+
+def set_simulation_source(source):
+    """
+    Simülasyon modunda kullanılacak mesafe kaynağını ayarla
+    
+    Args:
+        source: Parametresiz çağrılıp mesafe (cm) döndüren fonksiyon,
+                None ise rastgele değer üretimine dönülür
+    """
+    default.simulation_source = source
 
 
 def get_distance():
     """Mesafe ölç ve döndür (web API için wrapper)"""
-    return measure_distance()
+    return default.measure_distance()
 
 
 def get_last_distance():
     """Son ölçülen mesafeyi döndür"""
-    return last_distance
+    return default.last_distance
+
+
+def get_distance_age():
+    """Son geçerli ölçümün yaşını döndür (saniye, hiç ölçüm yoksa None)"""
+    return default.get_distance_age()
 
 
 def set_active(active):
-    """
-    Sensörü aktif/pasif yap
-    
-    Args:
-        active: True ise sensör aktif, False ise pasif
-    """
-    global is_active
-    is_active = active
-    return is_active
+    """Sensörü aktif/pasif yap"""
+    return default.set_active(active)
 
 
 def is_sensor_active():
     """Sensör aktif mi?"""
-    return is_active
+    return default.is_active
 
 
 def get_status():
     """Sensör durumunu döndür"""
-    return {
-        "active": is_active,
-        "initialized": is_initialized,
-        "last_distance": last_distance,
-        "pins": {
-            "trig": TRIG_PIN,
-            "echo": ECHO_PIN
-        }
-    }
+    return default.status()
 
 
 def continuous_measure(callback=None, interval=0.5, duration=None):
@@ -195,7 +444,7 @@ def continuous_measure(callback=None, interval=0.5, duration=None):
     start_time = time.time()
     
     while True:
-        if not is_active:
+        if not is_sensor_active():
             time.sleep(interval)
             continue
         
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Telemetri Fark (Delta) Modülü
+İstemcinin bildiği sıra numarasından bu yana değişen alanları hesaplar
+
+Her farklı durum anlık görüntüsü yeni bir sıra numarası alır. İstemci
+/api/data?since=<seq> ile son bildiği numarayı gönderir ve yalnızca
+değişen alanları (iç içe yapı korunarak) geri alır. Numara geçmişte
+bulunamazsa tam belge gönderilir.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+# ==================== AYARLAR ====================
+HISTORY_SIZE = 64           # Saklanan en fazla anlık görüntü
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+history = OrderedDict()     # seq -> anlık görüntü
+current_seq = 0
+history_lock = threading.Lock()
+
+
+def diff(old, new):
+    """
+    İki sözlük arasındaki değişen alanları döndür
+    
+    İç içe sözlükler özyinelemeli karşılaştırılır; kaldırılan
+    anahtarlar None değeriyle bildirilir.
+    
+    Returns:
+        dict: Yalnızca değişen alanlar (değişiklik yoksa boş)
+    """
+    changes = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff(previous, value)
+            if nested:
+                changes[key] = nested
+        elif key not in old or previous != value:
+            changes[key] = value
+    for key in old:
+        if key not in new:
+            changes[key] = None
+    return changes
+
+
+def observe(snapshot):
+    """
+    Güncel durumu kaydet, değiştiyse yeni sıra numarası ver
+    
+    Args:
+        snapshot: Durum sözlüğü
+    
+    Returns:
+        int: Durumun sıra numarası
+    """
+    global current_seq
+    
+    with history_lock:
+        if history and not diff(history[current_seq], snapshot):
+            return current_seq
+        
+        current_seq += 1
+        history[current_seq] = copy.deepcopy(snapshot)
+        while len(history) > HISTORY_SIZE:
+            history.popitem(last=False)
+        return current_seq
+
+
+def changes_since(snapshot, since):
+    """
+    İstemcinin bildiği durumdan bu yana değişiklikleri döndür
+    
+    Args:
+        snapshot: Güncel durum sözlüğü
+        since: İstemcinin son bildiği sıra numarası
+    
+    Returns:
+        dict: {"seq", "delta": True, "changes"} veya
+              bilinmeyen numarada {"seq", "delta": False, "data"}
+    """
+    seq = observe(snapshot)
+    
+    with history_lock:
+        base = history.get(since)
+    
+    if base is None:
+        return {"seq": seq, "delta": False, "data": snapshot}
+    return {"seq": seq, "delta": True, "changes": diff(base, snapshot)}
+
+
+def get_status():
+    """Fark geçmişinin durumunu döndür"""
+    with history_lock:
+        return {
+            "seq": current_seq,
+            "history": len(history),
+            "oldest": next(iter(history), None)
+        }
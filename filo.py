@@ -0,0 +1,977 @@
+#!/usr/bin/env python3
+"""
+Filo (Çoklu Düğüm) Toplayıcı
+Birden çok Pi'deki sunucuları tek bir filo görünümünde ve API'de birleştirir
+
+Her Pi'de app.py / sunucu.py çalışır; toplayıcı ayrı bir makinede tek bir
+olay döngüsüyle tüm düğümlere bağlanır:
+
+- "stream" kipinde (varsayılan) her düğüme tek bir /api/stream (SSE)
+  aboneliği açılır; düğüm örneği kendisi iter, toplayıcı yoklama yapmaz.
+  Aynı TCP okumasında gelen birden çok örnekten yalnızca sonuncusu
+  çözümlenir.
+- "poll" kipinde düğüm başına keep-alive bağlantı havuzu üzerinden
+  /api/data?since=<seq> ile yalnızca değişen alanlar alınır (bkz. fark.py).
+- Toplu komutlar (POST /api/fleet/command) seçilen düğümlere eşzamanlı,
+  her düğümün havuzundaki açık bağlantılardan gönderilir.
+
+Ops ekranı düğüm başına ayrı sekme ve 500 ms yoklama yerine tek bir
+/api/fleet (veya /api/fleet/stream) bağlantısı kullanır.
+
+Düğümler FLEET_NODES ortam değişkeniyle verilir:
+    FLEET_NODES="pi1=192.168.1.11:5000,pi2=192.168.1.12:5000" python filo.py
+
+Tek makinede sahte düğümlerle deneme ve ölçeklenme raporu:
+    python filo.py simulate 20          # 20 sahte düğümle filo API'si
+    python filo.py bench 1,10,50,100    # düğüm sayısına göre ölçeklenme
+    python filo.py bench 10,50 poll     # yoklama kipiyle karşılaştırma
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import random
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from urllib.parse import parse_qsl, urlencode
+
+import fark
+import izleme
+
+logger = logging.getLogger(__name__)
+
+try:
+    import uvicorn
+    UVICORN_AVAILABLE = True
+except ImportError:
+    UVICORN_AVAILABLE = False
+
+# ==================== AYARLAR ====================
+HOST = "0.0.0.0"
+PORT = 5100
+NODES_ENV = "FLEET_NODES"   # "id=host:port,..." (id verilmezse host:port)
+MODE = "stream"             # "stream" (SSE aboneliği) veya "poll" (keep-alive yoklama)
+MODES = ("stream", "poll")
+NODE_RATE = 2.0             # Düğümden istenen örnek hızı (Hz)
+POLL_INTERVAL = 0.5         # "poll" kipinde yoklama aralığı (saniye)
+POOL_SIZE = 4               # Düğüm başına en fazla eşzamanlı istek (açık bağlantı)
+CONNECT_TIMEOUT = 2.0       # Bağlantı kurma zaman aşımı (saniye)
+REQUEST_TIMEOUT = 3.0       # İstek zaman aşımı (saniye)
+STREAM_TIMEOUT = 35.0       # Akışta bu süre hiç veri gelmezse bağlantı yenilenir
+STALE_AFTER = 3.0           # Bu süre örnek gelmeyen düğüm "stale" sayılır
+RECONNECT_MIN = 0.5         # Yeniden bağlanma bekleme süresi (üstel artar)
+RECONNECT_MAX = 10.0
+PUBLISH_INTERVAL = 0.5      # /api/fleet/stream güncelleme aralığı (saniye)
+KEEPALIVE = 15.0            # Değişiklik yoksa akışa yorum satırı gönderme aralığı
+LATENCY_SAMPLES = 200       # Düğüm başına saklanan gecikme ölçümü
+COMMAND_METHODS = ("GET", "POST", "PUT", "DELETE")
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+# Tüm durum tek olay döngüsünde değiştirilir, kilit gerekmez
+nodes = {}                  # id -> Node
+node_specs = None           # configure() ile verilen düğüm listesi
+tasks = []
+command_latency = deque(maxlen=LATENCY_SAMPLES)     # Toplu komut süresi (ms)
+loop_lag = deque(maxlen=LATENCY_SAMPLES)            # Olay döngüsü gecikmesi (ms)
+stats = {"started": None, "updates": 0, "bytes": 0, "commands": 0, "cpu_started": 0.0}
+
+
+class ProtocolError(ConnectionError):
+    """Düğümden beklenmeyen HTTP yanıtı"""
+
+
+# ==================== HTTP İSTEMCİSİ ====================
+
+class Connection:
+    """
+    Tek bir keep-alive HTTP/1.1 bağlantısı
+    
+    Yanıt gövdesi Content-Length, chunked veya bağlantı kapanışıyla
+    sınırlanabilir; read_chunk() üçünü de parça parça okur.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.reusable = False
+        self._chunked = False
+        self._remaining = None      # Content-Length'ten kalan (None: kapanışa kadar)
+        self._done = True
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), CONNECT_TIMEOUT)
+
+    @property
+    def closed(self):
+        return self.writer is None or self.writer.is_closing()
+
+    async def send(self, method, path, body=None):
+        """İstek satırını, başlıkları ve gövdeyi gönder"""
+        head = (f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Accept: application/json, text/event-stream\r\n"
+                "Connection: keep-alive\r\n")
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        self.writer.write(head.encode("latin-1") + b"\r\n" + (body or b""))
+        await self.writer.drain()
+
+    async def read_head(self):
+        """
+        Durum satırını ve başlıkları oku
+        
+        Returns:
+            tuple: (durum kodu, başlıklar sözlüğü)
+        """
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionResetError("Düğüm bağlantıyı kapattı")
+        parts = line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+            raise ProtocolError(f"Geçersiz durum satırı: {line[:40]!r}")
+        
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        self._chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+        length = headers.get("content-length")
+        self._remaining = int(length) if length is not None and not self._chunked else None
+        self._done = self._remaining == 0
+        self.reusable = (parts[0] == "HTTP/1.1"
+                         and headers.get("connection", "").lower() != "close"
+                         and (self._chunked or self._remaining is not None))
+        return int(parts[1]), headers
+
+    async def read_chunk(self):
+        """
+        Gövdenin sıradaki parçasını oku
+        
+        Returns:
+            bytes: Parça, gövde bittiyse b""
+        """
+        if self._done:
+            return b""
+        if self._chunked:
+            size = int((await self.reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass    # Trailer başlıkları
+                self._done = True
+                return b""
+            data = await self.reader.readexactly(size)
+            await self.reader.readexactly(2)
+            return data
+        if self._remaining is not None:
+            data = await self.reader.readexactly(self._remaining)
+            self._done = True
+            return data
+        data = await self.reader.read(65536)
+        self._done = not data
+        return data
+
+    async def request(self, method, path, body=None):
+        """
+        İsteği gönder ve yanıtın tamamını oku
+        
+        Returns:
+            tuple: (durum kodu, gövde)
+        """
+        await self.send(method, path, body)
+        status, _ = await self.read_head()
+        parts = []
+        while True:
+            chunk = await self.read_chunk()
+            if not chunk:
+                break
+            parts.append(chunk)
+        return status, b"".join(parts)
+
+    def close(self):
+        self.reusable = False
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class ConnectionPool:
+    """Tek düğüme açık tutulan keep-alive bağlantıları"""
+
+    def __init__(self, host, port, size=POOL_SIZE):
+        self.host = host
+        self.port = port
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+        self.stats = {"opened": 0, "reused": 0, "requests": 0, "errors": 0}
+
+    async def request(self, method, path, body=None, timeout=REQUEST_TIMEOUT):
+        """
+        Havuzdaki bir bağlantıyla istek gönder
+        
+        Boşta beklerken düğümün kapattığı bağlantı ilk yazmada anlaşılır;
+        istek bu durumda bir kez yeni bağlantıyla tekrarlanır.
+        
+        Returns:
+            tuple: (durum kodu, gövde)
+        
+        Raises:
+            OSError, asyncio.TimeoutError: Düğüme ulaşılamazsa
+        """
+        async with self.slots:
+            while True:
+                connection = None
+                while self.idle and connection is None:
+                    candidate = self.idle.pop()
+                    connection = None if candidate.closed else candidate
+                reused = connection is not None
+                if connection is None:
+                    connection = Connection(self.host, self.port)
+                    await connection.open()
+                    self.stats["opened"] += 1
+                else:
+                    self.stats["reused"] += 1
+                
+                try:
+                    result = await asyncio.wait_for(connection.request(method, path, body), timeout)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    connection.close()
+                    if reused and not isinstance(e, ProtocolError):
+                        continue    # Bayat keep-alive bağlantısı
+                    self.stats["errors"] += 1
+                    raise
+                except BaseException:
+                    connection.close()
+                    self.stats["errors"] += 1
+                    raise
+                
+                self.stats["requests"] += 1
+                if connection.reusable:
+                    self.idle.append(connection)
+                else:
+                    connection.close()
+                return result
+
+    def close(self):
+        for connection in self.idle:
+            connection.close()
+        self.idle.clear()
+
+    def status(self):
+        return {"idle": sum(not connection.closed for connection in self.idle), **self.stats}
+
+
+# ==================== DÜĞÜM ====================
+
+def apply_delta(base, changes):
+    """
+    fark.diff() çıktısını önceki anlık görüntüye uygula
+    
+    None değeri alanın kaldırıldığını gösterir.
+    """
+    result = dict(base or {})
+    for key, value in changes.items():
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = apply_delta(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+class Node:
+    """Tek bir cihaz sunucusunun bağlantısı ve son durumu"""
+
+    def __init__(self, node_id, host, port):
+        self.id = node_id
+        self.host = host
+        self.port = port
+        self.pool = ConnectionPool(host, port)
+        self.data = None            # Son tam anlık görüntü
+        self.seq = None             # Düğümün sıra numarası
+        self.updated = None         # Son örneğin alındığı an (monotonic)
+        self.connected = False
+        self.error = None
+        self.version = 0            # Görünümü her değiştiğinde artar (akış istemcileri için)
+        self.backoff = RECONNECT_MIN
+        self.latency = deque(maxlen=LATENCY_SAMPLES)
+        self.stats = {"updates": 0, "bytes": 0, "errors": 0, "connects": 0}
+
+    def state(self, now=None):
+        """online / stale / offline / connecting"""
+        now = now if now is not None else time.monotonic()
+        if self.updated is None:
+            return "offline" if self.error else "connecting"
+        if not self.connected:
+            return "offline"
+        return "stale" if now - self.updated > STALE_AFTER else "online"
+
+    def _received(self, size):
+        self.stats["bytes"] += size
+        stats["bytes"] += size
+
+    def _update(self, data, seq, latency_ms):
+        self.data = data
+        self.seq = seq
+        self.updated = time.monotonic()
+        self.connected = True
+        self.error = None
+        self.backoff = RECONNECT_MIN
+        self.version += 1
+        self.latency.append(latency_ms)
+        self.stats["updates"] += 1
+        stats["updates"] += 1
+
+    def _fail(self, error):
+        message = str(error) or type(error).__name__
+        if self.connected or self.error != message:
+            logger.warning("Filo düğümü %s (%s:%s): %s", self.id, self.host, self.port, message)
+        self.connected = False
+        self.error = message
+        self.version += 1
+        self.stats["errors"] += 1
+
+    async def run(self, mode):
+        """Düğüme bağlı kal; bağlantı koparsa artan aralıklarla yeniden dene"""
+        while True:
+            try:
+                if mode == "stream":
+                    await self._stream()
+                else:
+                    await self._poll()
+                self._fail(ConnectionResetError("Akış sona erdi"))
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                self._fail(e)
+            await asyncio.sleep(self.backoff * random.uniform(0.8, 1.2))
+            self.backoff = min(self.backoff * 2, RECONNECT_MAX)
+
+    async def _stream(self):
+        """/api/stream aboneliği: düğüm örnekleri iter"""
+        connection = Connection(self.host, self.port)
+        await connection.open()
+        try:
+            await connection.send("GET", "/api/stream?" + urlencode({"rate": NODE_RATE, "mode": "latest"}))
+            status, headers = await asyncio.wait_for(connection.read_head(), REQUEST_TIMEOUT)
+            if status != 200 or not headers.get("content-type", "").startswith("text/event-stream"):
+                raise ProtocolError(f"Akış açılamadı: HTTP {status}")
+            self.connected = True
+            self.stats["connects"] += 1
+            self.version += 1
+            
+            buffer = b""
+            while True:
+                chunk = await asyncio.wait_for(connection.read_chunk(), STREAM_TIMEOUT)
+                if not chunk:
+                    return
+                self._received(len(chunk))
+                buffer += chunk
+                if b"\n\n" not in buffer:
+                    continue
+                *events, buffer = buffer.split(b"\n\n")
+                # Aynı okumada biriken örneklerden yalnızca en yenisi çözümlenir
+                for event in reversed(events):
+                    sample = self._parse_event(event)
+                    if sample is not None:
+                        seq, data = sample
+                        lag = (time.time() - data["wall"]) * 1000 if "wall" in data else 0.0
+                        self._update(data, seq, round(lag, 3))
+                        break
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _parse_event(event):
+        """SSE olayından (seq, örnek) çıkar; örnek değilse None"""
+        fields = {}
+        for line in event.decode("utf-8").splitlines():
+            name, _, value = line.partition(":")
+            if name in ("id", "event", "data"):
+                fields[name] = fields.get(name, "") + value.lstrip(" ")
+        if fields.get("event") != "sample" or "data" not in fields:
+            return None
+        return int(fields.get("id") or 0), json.loads(fields["data"])
+
+    async def _poll(self):
+        """Keep-alive bağlantıyla /api/data?since=<seq> yoklaması (yalnızca değişenler)"""
+        self.stats["connects"] += 1
+        while True:
+            started = time.perf_counter()
+            query = urlencode({"since": self.seq or 0, "rate": NODE_RATE})
+            status, body = await self.pool.request("GET", f"/api/data?{query}")
+            if status != 200:
+                raise ProtocolError(f"HTTP {status}")
+            self._received(len(body))
+            payload = json.loads(body)
+            elapsed = time.perf_counter() - started
+            if payload.get("delta"):
+                data = apply_delta(self.data, payload["changes"]) if payload["changes"] else self.data
+            else:
+                data = payload["data"]
+            self._update(data, payload["seq"], round(elapsed * 1000, 3))
+            await asyncio.sleep(max(0.0, POLL_INTERVAL - elapsed))
+
+    def view(self, now=None, data=True):
+        """Filo görünümündeki düğüm özeti"""
+        now = now if now is not None else time.monotonic()
+        view = {
+            "address": f"{self.host}:{self.port}",
+            "state": self.state(now),
+            "seq": self.seq,
+            "age": round(now - self.updated, 2) if self.updated is not None else None,
+            "latency_ms": self.latency[-1] if self.latency else None,
+            "error": self.error
+        }
+        if data:
+            view["data"] = self.data
+        return view
+
+    def status(self):
+        return {
+            "address": f"{self.host}:{self.port}",
+            "state": self.state(),
+            "latency_ms": izleme.percentiles(self.latency),
+            "pool": self.pool.status(),
+            **self.stats
+        }
+
+
+# ==================== FİLO ====================
+
+def parse_nodes(text):
+    """
+    "id=host:port,host:port" biçimindeki düğüm listesini çözümle
+    
+    Returns:
+        list: [(id, host, port), ...]
+    
+    Raises:
+        ValueError: Biçim geçersizse veya id tekrarlanırsa
+    """
+    specs = []
+    for item in filter(None, (part.strip() for part in (text or "").split(","))):
+        node_id, _, address = item.rpartition("=")
+        host, _, port = address.rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Geçersiz düğüm adresi: {item}")
+        specs.append((node_id or address, host, int(port)))
+    ids = [spec[0] for spec in specs]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Düğüm id'leri benzersiz olmalı")
+    return specs
+
+
+def configure(specs=None, mode=None):
+    """
+    Düğüm listesini ve bağlantı kipini ayarla (start() öncesi)
+    
+    Args:
+        specs: [(id, host, port), ...] veya "id=host:port,..." metni
+        mode: "stream" veya "poll"
+    """
+    global node_specs, MODE
+    
+    if mode is not None:
+        if mode not in MODES:
+            raise ValueError(f"Geçersiz kip: {mode}")
+        MODE = mode
+    if specs is not None:
+        node_specs = parse_nodes(specs) if isinstance(specs, str) else list(specs)
+
+
+async def _monitor_loop():
+    """Olay döngüsünün zamanında uyanıp uyanamadığını ölç (ölçeklenme göstergesi)"""
+    interval = 0.1
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        loop_lag.append(round((time.perf_counter() - started - interval) * 1000, 3))
+
+
+async def start():
+    """Tüm düğümlere bağlan (çalışan olay döngüsünde)"""
+    specs = node_specs if node_specs is not None else parse_nodes(os.environ.get(NODES_ENV, ""))
+    if not specs:
+        logger.warning("Filo düğümü tanımlı değil (%s)", NODES_ENV)
+    
+    for node_id, host, port in specs:
+        node = Node(node_id, host, port)
+        nodes[node_id] = node
+        tasks.append(asyncio.ensure_future(node.run(MODE)))
+    tasks.append(asyncio.ensure_future(_monitor_loop()))
+    reset_stats()
+    logger.info("Filo toplayıcı başlatıldı: %d düğüm, %s kipi", len(nodes), MODE)
+
+
+async def stop():
+    """Bağlantıları kapat"""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    tasks.clear()
+    for node in nodes.values():
+        node.pool.close()
+    nodes.clear()
+
+
+def reset_stats():
+    """Toplu istatistikleri sıfırla (ölçüm penceresini yeniden başlat)"""
+    stats.update(started=time.monotonic(), updates=0, bytes=0, commands=0,
+                 cpu_started=time.process_time())
+    command_latency.clear()
+    loop_lag.clear()
+    for node in nodes.values():
+        node.latency.clear()
+
+
+def fleet_view(data=True):
+    """Tüm düğümlerin birleşik görünümü"""
+    now = time.monotonic()
+    views = {node_id: node.view(now, data) for node_id, node in nodes.items()}
+    summary = {"online": 0, "stale": 0, "offline": 0, "connecting": 0}
+    for view in views.values():
+        summary[view["state"]] += 1
+    return {"time": time.time(), "mode": MODE, "summary": summary, "nodes": views}
+
+
+async def fan_out(path, body=None, targets=None, method="POST", timeout=REQUEST_TIMEOUT):
+    """
+    Komutu seçilen düğümlere eşzamanlı gönder
+    
+    Args:
+        path: Düğümdeki API yolu (ör. "/api/motor/stop")
+        body: JSON gövdesi (tüm düğümlere aynı, bir kez kodlanır)
+        targets: Düğüm id'leri (None ise tümü)
+        method: HTTP metodu
+        timeout: Düğüm başına zaman aşımı (saniye)
+    
+    Returns:
+        dict: {"success", "nodes", "failed", "duration_ms", "results"}
+    
+    Raises:
+        ValueError: Yol, metod veya düğüm id'si geçersizse
+    """
+    if not isinstance(path, str) or not path.startswith("/api/") or path.startswith("/api/fleet"):
+        raise ValueError("Komut yolu /api/ ile başlamalı")
+    if method not in COMMAND_METHODS:
+        raise ValueError(f"Geçersiz metod: {method}")
+    selected = list(nodes.values()) if targets is None else []
+    for node_id in targets or ():
+        if node_id not in nodes:
+            raise ValueError(f"Bilinmeyen düğüm: {node_id}")
+        selected.append(nodes[node_id])
+    payload = json.dumps(body).encode() if body is not None else None
+
+    async def send_one(node):
+        started = time.perf_counter()
+        try:
+            status, response = await node.pool.request(method, path, payload, timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            return node.id, {"success": False, "message": str(e) or type(e).__name__,
+                             "ms": round((time.perf_counter() - started) * 1000, 3)}
+        try:
+            response = json.loads(response)
+        except ValueError:
+            response = None
+        return node.id, {"success": 200 <= status < 300, "status": status, "response": response,
+                         "ms": round((time.perf_counter() - started) * 1000, 3)}
+    
+    started = time.perf_counter()
+    results = dict(await asyncio.gather(*(send_one(node) for node in selected)))
+    duration_ms = round((time.perf_counter() - started) * 1000, 3)
+    command_latency.append(duration_ms)
+    stats["commands"] += 1
+    failed = [node_id for node_id, result in results.items() if not result["success"]]
+    return {"success": not failed, "nodes": len(results), "failed": failed,
+            "duration_ms": duration_ms, "results": results}
+
+
+def get_status(details=False):
+    """Bağlantılar, güncelleme hızı, gecikmeler ve işlemci kullanımı"""
+    elapsed = max(1e-6, time.monotonic() - stats["started"]) if stats["started"] else None
+    latencies = [value for node in nodes.values() for value in node.latency]
+    status = {
+        "mode": MODE,
+        "nodes": len(nodes),
+        "summary": fleet_view(data=False)["summary"],
+        "connections": sum(node.connected and MODE == "stream" for node in nodes.values())
+                       + sum(node.pool.status()["idle"] for node in nodes.values()),
+        "window": round(elapsed, 1) if elapsed else None,
+        "updates_per_s": round(stats["updates"] / elapsed, 1) if elapsed else None,
+        "kbytes_per_s": round(stats["bytes"] / elapsed / 1024, 1) if elapsed else None,
+        "cpu_percent": round((time.process_time() - stats["cpu_started"]) / elapsed * 100, 1)
+                       if elapsed else None,
+        "commands": stats["commands"],
+        "latency_ms": izleme.percentiles(latencies),
+        "command_ms": izleme.percentiles(command_latency),
+        "loop_lag_ms": izleme.percentiles(loop_lag)
+    }
+    if details:
+        status["details"] = {node_id: node.status() for node_id, node in nodes.items()}
+    return status
+
+
+# ==================== ASGI UYGULAMASI ====================
+
+async def _read_body(receive):
+    body = bytearray()
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return bytes(body)
+
+
+async def _send_json(send, status, payload):
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _fleet_stream(receive, send):
+    """/api/fleet/stream: ilk olayda tüm filo, sonra yalnızca değişen düğümler"""
+    closed = asyncio.Event()
+
+    async def watch_disconnect():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        closed.set()
+    
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream"),
+                                (b"cache-control", b"no-cache"),
+                                (b"x-accel-buffering", b"no")]})
+        sent = {node_id: node.version for node_id, node in nodes.items()}
+        view = json.dumps(fleet_view(), separators=(",", ":"), default=str)
+        await send({"type": "http.response.body", "more_body": True,
+                    "body": f"retry: 2000\n\nevent: fleet\ndata: {view}\n\n".encode()})
+        last_send = time.monotonic()
+        
+        while not closed.is_set():
+            try:
+                await asyncio.wait_for(closed.wait(), PUBLISH_INTERVAL)
+                break
+            except asyncio.TimeoutError:
+                pass
+            now = time.monotonic()
+            changed = {node_id: node.view(now) for node_id, node in nodes.items()
+                       if sent.get(node_id) != node.version}
+            if changed:
+                sent.update((node_id, nodes[node_id].version) for node_id in changed)
+                update = json.dumps({"time": time.time(), "summary": fleet_view(data=False)["summary"],
+                                     "nodes": changed}, separators=(",", ":"), default=str)
+                payload = f"event: update\ndata: {update}\n\n".encode()
+            elif now - last_send >= KEEPALIVE:
+                payload = b": keepalive\n\n"
+            else:
+                continue
+            await send({"type": "http.response.body", "body": payload, "more_body": True})
+            last_send = now
+    except OSError:
+        pass    # İstemci bağlantıyı kapattı
+    finally:
+        watcher.cancel()
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    """
+    ASGI giriş noktası
+    
+    GET  /api/fleet            Birleşik filo görünümü (since=<seq> ile yalnızca değişenler,
+                               data=0 ile anlık görüntüler olmadan)
+    GET  /api/fleet/<id>       Tek düğümün görünümü
+    GET  /api/fleet/stream     Filo görünümü akışı (Server-Sent Events)
+    GET  /api/fleet/status     Ölçeklenme istatistikleri (details=1 ile düğüm bazında)
+    POST /api/fleet/command    Toplu komut: {"path", "body", "nodes", "method", "timeout"}
+    """
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        await send({"type": "websocket.close", "code": 1008})
+        return
+    
+    path = scope["path"].rstrip("/")
+    method = scope["method"]
+    args = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+    
+    if path == "/api/fleet/stream" and method == "GET":
+        await _fleet_stream(receive, send)
+    elif path == "/api/fleet/command" and method == "POST":
+        try:
+            request = json.loads(await _read_body(receive) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("JSON nesnesi gerekli")
+            targets = request.get("nodes")
+            if targets is not None and not isinstance(targets, list):
+                raise ValueError("nodes bir liste olmalı")
+            result = await fan_out(request.get("path"), request.get("body"), targets,
+                                   str(request.get("method", "POST")).upper(),
+                                   float(request.get("timeout", REQUEST_TIMEOUT)))
+        except (ValueError, TypeError) as e:
+            await _send_json(send, 400, {"success": False, "message": str(e)})
+            return
+        await _send_json(send, 200, result)
+    elif path == "/api/fleet/status" and method == "GET":
+        await _send_json(send, 200, get_status(details=args.get("details") == "1"))
+    elif path == "/api/fleet" and method == "GET":
+        view = fleet_view(data=args.get("data") != "0")
+        since = args.get("since")
+        if since is not None and since.lstrip("-").isdigit():
+            view = fark.changes_since(view, int(since))
+        else:
+            view["seq"] = fark.observe(view)
+        await _send_json(send, 200, view)
+    elif path.startswith("/api/fleet/") and method == "GET":
+        node = nodes.get(path[len("/api/fleet/"):])
+        if node is None:
+            await _send_json(send, 404, {"success": False, "message": "Düğüm bulunamadı"})
+        else:
+            await _send_json(send, 200, {"id": node.id, **node.view(), "status": node.status()})
+    else:
+        await _send_json(send, 404, {"success": False, "message": "Bulunamadı"})
+
+
+# ==================== SAHTE DÜĞÜMLER (TEST) ====================
+
+class SimulatedNode:
+    """
+    Tek makinede filo testleri için sahte cihaz sunucusu
+    
+    /api/data (since ile fark), /api/stream (SSE) ve komut POST'larını
+    keep-alive HTTP/1.1 ile yanıtlar; anlık görüntü app.get_snapshot()
+    ile aynı yapıdadır.
+    """
+
+    def __init__(self, index, rate=10.0):
+        self.index = index
+        self.rate = rate            # Sahte sensör döngüsünün hızı (Hz)
+        self.server = None
+        self.port = None
+        self.history = {}           # seq -> anlık görüntü (since yanıtları için)
+        self.commands = 0
+
+    async def start(self, host="127.0.0.1"):
+        self.server = await asyncio.start_server(self._handle, host, 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def snapshot(self):
+        now = time.time()
+        seq = int(now * self.rate)
+        phase = seq / self.rate + self.index
+        distance = round(60 + 40 * math.sin(phase / 3), 1)
+        data = {
+            "distance": distance,
+            "imu": {"accel_x": round(math.sin(phase), 3), "accel_y": 0.0, "accel_z": 9.81,
+                    "gyro_x": 0.0, "gyro_y": 0.0, "gyro_z": round(math.cos(phase), 3)},
+            "sensor_active": True,
+            "stale": {"distance": False, "imu": False},
+            "servo_angle": 90,
+            "motor": {"state": "stopped", "speed": 0, "duty": 0.0},
+            "devices": {"ultrasonic": {"type": "ultrasonic", "active": True,
+                                       "distance": distance, "stale": False}},
+            "mono": time.monotonic(),
+            "wall": now
+        }
+        self.history[seq] = data
+        if len(self.history) > 64:
+            self.history.pop(next(iter(self.history)))
+        return seq, data
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                method, target, _ = line.decode("latin-1").split(" ", 2)
+                length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                if length:
+                    await reader.readexactly(length)
+                
+                path, _, query = target.partition("?")
+                args = dict(parse_qsl(query))
+                if path == "/api/stream":
+                    await self._stream(writer, float(args.get("rate", self.rate)))
+                    return
+                if path == "/api/data":
+                    seq, data = self.snapshot()
+                    since = int(args.get("since", 0))
+                    if since in self.history:
+                        body = {"seq": seq, "delta": True, "changes": fark.diff(self.history[since], data)}
+                    else:
+                        body = {"seq": seq, "delta": False, "data": data}
+                    status = "200 OK"
+                elif method == "POST" and path.startswith("/api/"):
+                    self.commands += 1
+                    body, status = {"success": True, "message": "OK"}, "200 OK"
+                else:
+                    body, status = {"success": False, "message": "Bulunamadı"}, "404 Not Found"
+                payload = json.dumps(body, separators=(",", ":")).encode()
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+                await writer.drain()
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, writer, rate):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Transfer-Encoding: chunked\r\n\r\n")
+        interval = 1.0 / min(max(rate, 0.1), self.rate)
+        while True:
+            seq, data = self.snapshot()
+            event = f"id: {seq}\nevent: sample\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+            writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+            await writer.drain()
+            await asyncio.sleep(interval)
+
+
+def _run_simulators(count, pipe, rate=10.0):
+    """Sahte düğümleri ayrı süreçte çalıştır (toplayıcının işlemci ölçümü karışmasın)"""
+    async def main():
+        simulators = [SimulatedNode(index, rate) for index in range(count)]
+        for simulator in simulators:
+            await simulator.start()
+        pipe.send([simulator.port for simulator in simulators])
+        # Ana süreç boruyu kapatana kadar çalış
+        await asyncio.get_running_loop().run_in_executor(None, pipe.recv)
+    
+    try:
+        asyncio.run(main())
+    except (EOFError, KeyboardInterrupt):
+        pass
+
+
+def start_simulators(count, rate=10.0):
+    """
+    count adet sahte düğümü ayrı bir süreçte başlat
+    
+    Returns:
+        tuple: (süreç, boru, [(id, host, port), ...])
+    """
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_run_simulators, args=(count, child, rate), daemon=True)
+    process.start()
+    ports = parent.recv()
+    return process, parent, [(f"sim{index:03d}", "127.0.0.1", port) for index, port in enumerate(ports)]
+
+
+def stop_simulators(process, pipe):
+    pipe.close()
+    process.terminate()
+    process.join(timeout=2)
+
+
+async def benchmark(counts, mode=MODE, duration=5.0, commands=5):
+    """
+    Düğüm sayısı arttıkça toplayıcının ölçeklenmesini ölç
+    
+    Returns:
+        list: Her düğüm sayısı için get_status() çıktısı
+    """
+    results = []
+    for count in counts:
+        process, pipe, specs = start_simulators(count)
+        try:
+            configure(specs, mode)
+            await start()
+            await asyncio.sleep(1.5)        # Bağlantılar kurulsun, ilk örnekler gelsin
+            reset_stats()
+            for _ in range(commands):
+                await asyncio.sleep(duration / commands)
+                await fan_out("/api/motor/stop")
+            result = get_status()
+            result["fleet"] = fleet_view(data=False)["summary"]
+            results.append(result)
+        finally:
+            await stop()
+            stop_simulators(process, pipe)
+    return results
+
+
+def _print_report(results):
+    def p(value, key):
+        return f"{value[key]:.1f}" if value else "-"
+    
+    print(f"{'düğüm':>6} {'kip':>7} {'bağlantı':>9} {'çevrimiçi':>10} {'güncelleme/s':>13} "
+          f"{'KB/s':>7} {'gecikme p50/p95':>16} {'döngü max':>10} {'CPU %':>6} {'komut p50/max':>14}")
+    for result in results:
+        print(f"{result['nodes']:>6} {result['mode']:>7} {result['connections']:>9} "
+              f"{result['fleet']['online']:>10} {result['updates_per_s']:>13} {result['kbytes_per_s']:>7} "
+              f"{p(result['latency_ms'], 'p50') + '/' + p(result['latency_ms'], 'p95'):>16} "
+              f"{p(result['loop_lag_ms'], 'max'):>10} {result['cpu_percent']:>6} "
+              f"{p(result['command_ms'], 'p50') + '/' + p(result['command_ms'], 'max'):>14}")
+
+
+# Modül doğrudan çalıştırılırsa filo sunucusu veya ölçeklenme testi
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
+    if command == "bench":
+        counts = [int(value) for value in (sys.argv[2] if len(sys.argv) > 2 else "1,10,50").split(",")]
+        mode = sys.argv[3] if len(sys.argv) > 3 else MODE
+        logging.getLogger(__name__).setLevel(logging.ERROR)
+        print(f"Ölçeklenme testi ({mode} kipi, düğüm hızı {NODE_RATE:g} Hz, sahte düğümler ayrı süreçte)...")
+        _print_report(asyncio.run(benchmark(counts, mode)))
+    
+    elif command in ("serve", "simulate"):
+        if not UVICORN_AVAILABLE:
+            print("uvicorn bulunamadı. Kurulum: pip install uvicorn")
+            sys.exit(1)
+        
+        simulators = None
+        if command == "simulate":
+            simulators = start_simulators(int(sys.argv[2]) if len(sys.argv) > 2 else 10)
+            configure(simulators[2])
+        try:
+            print("\n" + "="*50)
+            print("Filo Toplayıcı Başlatılıyor...")
+            print(f"URL: http://{HOST}:{PORT}/api/fleet")
+            print("="*50 + "\n")
+            uvicorn.run(application, host=HOST, port=PORT, log_config=None, lifespan="on")
+        finally:
+            if simulators is not None:
+                stop_simulators(*simulators[:2])
+            print("Uygulama sonlandırıldı.")
+    
+    else:
+        print("Kullanım: python filo.py [serve | simulate <n> | bench <n1,n2,...> [stream|poll]]")
+        sys.exit(1)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Asenkron Günlük (Logging) Modülü
+Donanım ve istek thread'lerindeki print() çağrılarının yerini alır
+
+Modüller standart logging.getLogger(__name__) kullanır. setup() kök
+logger'a engellemeyen bir kuyruk handler'ı bağlar; kayıtlar arka plan
+thread'inde terminale/journald'a yazılır ve son olaylar bellekteki halka
+tampona eklenir (/api/logs). Kuyruk dolarsa kayıt bekletilmeden düşürülür.
+
+Aynı mesaj kısa sürede çok tekrar ederse (ör. ECHO timeout) pencere
+başına RATE_LIMIT_COUNT kayıttan sonrası bastırılır ve bastırılan sayı
+bir sonraki kayda eklenir.
+"""
+
+import sys
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+
+# ==================== AYARLAR ====================
+LOG_LEVEL = "INFO"
+MODULE_LEVELS = {
+    "werkzeug": "WARNING",  # Her polling isteğini günlüğe yazma
+}
+QUEUE_SIZE = 1000           # Yazılmayı bekleyen en fazla kayıt
+RING_SIZE = 500             # /api/logs için saklanan son olay sayısı
+RATE_LIMIT_COUNT = 5        # Pencere başına aynı mesajdan en fazla kayıt
+RATE_LIMIT_WINDOW = 10.0    # Hız sınırı penceresi (saniye)
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+listener = None
+ring = deque(maxlen=RING_SIZE)
+ring_lock = threading.Lock()
+stats = {"dropped": 0, "suppressed": 0, "seq": 0}
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Kuyruk doluysa çağıran thread'i bekletmeden kaydı düşüren handler"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            stats["dropped"] += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """Aynı kaynaktan tekrar eden mesajları pencere başına sınırla"""
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.windows = {}   # (logger, mesaj şablonu) -> [pencere başı, adet, bastırılan]
+
+    def filter(self, record):
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            window = self.windows.get(key)
+            if window is None or now - window[0] >= RATE_LIMIT_WINDOW:
+                suppressed = window[2] if window else 0
+                self.windows[key] = [now, 1, 0]
+                if len(self.windows) > 1000:
+                    self.windows.clear()
+            elif window[1] < RATE_LIMIT_COUNT:
+                window[1] += 1
+                suppressed = 0
+            else:
+                window[2] += 1
+                stats["suppressed"] += 1
+                return False
+        
+        if suppressed:
+            record.msg = f"{record.getMessage()} (+{suppressed} benzer mesaj bastırıldı)"
+            record.args = None
+        return True
+
+
+class RingHandler(logging.Handler):
+    """Son olayları /api/logs için bellekte tutan handler"""
+
+    def emit(self, record):
+        with ring_lock:
+            stats["seq"] += 1
+            ring.append({
+                "id": stats["seq"],
+                "time": round(record.created, 3),
+                "level": record.levelname,
+                "module": record.name,
+                "message": record.getMessage()
+            })
+
+
+def setup(level=None, module_levels=None, stream=None):
+    """
+    Asenkron günlüğü başlat (uygulama başında bir kez çağrılır)
+    
+    Args:
+        level: Kök seviye (varsayılan LOG_LEVEL)
+        module_levels: {"dijital_metre": "WARNING", ...} modül seviyeleri
+        stream: Çıktı akışı (varsayılan stderr, systemd altında journald'a gider)
+    """
+    global listener
+    
+    if listener is not None:
+        return False
+    
+    console = logging.StreamHandler(stream or sys.stderr)
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(queue.Queue(QUEUE_SIZE), console, RingHandler(),
+                             respect_handler_level=True)
+    
+    handler = DroppingQueueHandler(listener.queue)
+    handler.addFilter(RateLimitFilter())
+    
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level or LOG_LEVEL)
+    for name, module_level in {**MODULE_LEVELS, **(module_levels or {})}.items():
+        logging.getLogger(name).setLevel(module_level)
+    
+    listener.start()
+    return True
+
+
+def shutdown():
+    """Kuyruktaki kayıtları yazıp arka plan thread'ini durdur"""
+    global listener
+    
+    if listener is None:
+        return
+    listener.stop()
+    listener = None
+
+
+def set_level(module, level):
+    """
+    Modülün günlük seviyesini değiştir
+    
+    Args:
+        module: Logger adı ("root" kök logger)
+        level: "DEBUG", "INFO", "WARNING", "ERROR"
+    
+    Raises:
+        ValueError: Seviye geçersizse
+    """
+    level = str(level).upper()
+    if level not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+        raise ValueError(f"Geçersiz seviye: {level}")
+    logger = logging.getLogger() if module == "root" else logging.getLogger(module)
+    logger.setLevel(level)
+
+
+def get_logs(limit=100, level=None, module=None, after=None):
+    """
+    Son olayları döndür (en yenisi sonda)
+    
+    Args:
+        limit: En fazla olay sayısı
+        level: Bu seviye ve üstü
+        module: Yalnızca bu logger
+        after: Bu id'den sonraki olaylar (dashboard artımlı okuma için)
+    """
+    min_level = logging.getLevelName(level.upper()) if level else 0
+    if not isinstance(min_level, int):
+        raise ValueError(f"Geçersiz seviye: {level}")
+    
+    with ring_lock:
+        entries = list(ring)
+    selected = [
+        entry for entry in entries
+        if (after is None or entry["id"] > after)
+        and (module is None or entry["module"] == module)
+        and logging.getLevelName(entry["level"]) >= min_level
+    ]
+    return selected[-limit:] if limit else selected
+
+
+def get_status():
+    """Günlük kuyruğu ve seviyelerini döndür"""
+    levels = {"root": logging.getLevelName(logging.getLogger().level)}
+    for name, logger in logging.Logger.manager.loggerDict.items():
+        if isinstance(logger, logging.Logger) and logger.level:
+            levels[name] = logging.getLevelName(logger.level)
+    return {
+        "running": listener is not None,
+        "queued": listener.queue.qsize() if listener else 0,
+        "dropped": stats["dropped"],
+        "suppressed": stats["suppressed"],
+        "levels": levels
+    }
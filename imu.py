@@ -3,23 +3,49 @@
 IMU Sensör Modülü (MPU-6050)
 Web arayüzünden IMU verilerini okumak için modül
 I2C üzerinden MPU-6050 ile iletişim kurar
+
+Bus'a doğrudan değil, paylaşımlı veriyolu yöneticisi (veriyolu.py)
+üzerinden erişilir; aynı bus'taki veya TCA9548A arkasındaki birden
+fazla IMU birbirinin okumasını bozmaz.
 """
 
+import logging
 import math
 import time
+import struct
+import threading
+
+import config
+import saglik
+import veriyolu
+
+logger = logging.getLogger(__name__)
 
 # Raspberry Pi üzerinde çalışıp çalışmadığını kontrol et
-try:
-    import smbus
-    SMBUS_AVAILABLE = True
-except ImportError:
-    SMBUS_AVAILABLE = False
-    print("UYARI: smbus bulunamadı. IMU simülasyon modu aktif.")
+SMBUS_AVAILABLE = veriyolu.SMBUS_AVAILABLE
+if not SMBUS_AVAILABLE:
+    logger.warning("smbus bulunamadı. IMU simülasyon modu aktif.")
 
 # MPU-6050 I2C Adresi ve Register'lar
-MPU6050_ADDR = 0x68
+MPU6050_ADDR = config.MPU6050_ADDRESS
+I2C_BUS = config.I2C_BUS
 POWER_MGMT_1 = 0x6B
 POWER_MGMT_2 = 0x6C
+INT_ENABLE = 0x38
+INT_STATUS = 0x3A
+WHO_AM_I = 0x75
+WHO_AM_I_VALUE = 0x68    # AD0 pininden bağımsız kimlik değeri
+
+# POWER_MGMT_1 bitleri
+PWR1_SLEEP = 0x40
+PWR1_CYCLE = 0x20
+PWR1_TEMP_DIS = 0x08
+
+# POWER_MGMT_2 bitleri: LP_WAKE_CTRL (7:6) ve eksen bekleme bitleri
+PWR2_STBY_GYRO = 0x07       # STBY_XG | STBY_YG | STBY_ZG
+LP_WAKE_CTRL = {1.25: 0, 5.0: 1, 20.0: 2, 40.0: 3}  # Düşük güç uyanma frekansı (Hz) -> bitler
+
+INT_DATA_RDY = 0x01
 
 # Gyroscope register'ları
 GYRO_XOUT_H = 0x43
@@ -31,89 +57,28 @@ ACCEL_XOUT_H = 0x3B
 ACCEL_YOUT_H = 0x3D
 ACCEL_ZOUT_H = 0x3F
 
-# Global değişkenler
-bus = None
-is_initialized = False
-
-# Son okunan değerler (cache)
-last_reading = {
-    "accel_x": 0.0,
-    "accel_y": 0.0,
-    "accel_z": 9.81,
-    "gyro_x": 0.0,
-    "gyro_y": 0.0,
-    "gyro_z": 0.0,
-    "rotation_x": 0.0,
-    "rotation_y": 0.0,
-    "temperature": 25.0
-}
-
-
-def setup_imu():
-    """IMU sensörünü başlat"""
-    global bus, is_initialized
-    
-    if not SMBUS_AVAILABLE:
-        print("IMU simülasyon modunda başlatıldı")
-        is_initialized = True
-        return True
-    
-    try:
-        # I2C bus'ı aç (Raspberry Pi'de genellikle bus 1)
-        bus = smbus.SMBus(1)
-        
-        # MPU-6050'yi uyandır (sleep modundan çıkar)
-        bus.write_byte_data(MPU6050_ADDR, POWER_MGMT_1, 0)
-        
-        time.sleep(0.1)  # Başlatma için bekle
-        
-        is_initialized = True
-        print("IMU (MPU-6050) başlatıldı.")
-        return True
-        
-    except Exception as e:
-        print(f"IMU başlatma hatası: {e}")
-        print("IMU simülasyon moduna geçiliyor...")
-        is_initialized = True  # Simülasyon modunda devam et
-        return False
-
-
-def cleanup_imu():
-    """IMU kaynaklarını temizle"""
-    global bus, is_initialized
-    
-    if bus:
-        try:
-            bus.close()
-        except:
-            pass
-    
-    is_initialized = False
-    print("IMU kaynakları temizlendi.")
-
-
-def read_byte(register):
-    """Tek byte oku"""
-    if not SMBUS_AVAILABLE or not bus:
-        return 0
-    return bus.read_byte_data(MPU6050_ADDR, register)
+# ==================== GÜÇ YÖNETİMİ AYARLARI ====================
+POWER_STATES = ("full", "low_power", "sleep")
+LOW_POWER_WAKE_HZ = 5.0     # Düşük güç döngü modunda ivmeölçer uyanma frekansı
+IDLE_DELAY = 5.0            # Talep bittikten bu süre sonra düşük güce geçilir (saniye)
+WAKE_TIMEOUT = 0.2          # Uyanma gecikmesi ölçümünde en fazla bekleme (saniye)
+SIM_WAKE_LATENCY = {"low_power": 0.03, "sleep": 0.035}  # Simülasyonda uyanma süresi (gyro başlangıcı)
 
 
-def read_word(register):
-    """16-bit word oku (big-endian)"""
-    if not SMBUS_AVAILABLE or not bus:
-        return 0
-    high = bus.read_byte_data(MPU6050_ADDR, register)
-    low = bus.read_byte_data(MPU6050_ADDR, register + 1)
-    return (high << 8) + low
+def _power_registers(state, wake_hz=None):
+    """Güç durumu için (POWER_MGMT_1, POWER_MGMT_2) değerleri"""
+    if state == "full":
+        return 0x00, 0x00
+    if state == "low_power":
+        # Yalnızca ivmeölçer: döngü modu, sıcaklık sensörü kapalı, gyro beklemede
+        wake_bits = LP_WAKE_CTRL[wake_hz or LOW_POWER_WAKE_HZ] << 6
+        return PWR1_CYCLE | PWR1_TEMP_DIS, wake_bits | PWR2_STBY_GYRO
+    return PWR1_SLEEP, 0x00
 
 
-def read_word_2c(register):
-    """16-bit signed word oku (2's complement)"""
-    val = read_word(register)
-    if val >= 0x8000:
-        return -((65535 - val) + 1)
-    return val
+def _scale(raw, lsb, digits):
+    """Ham (x, y, z) değerlerini birime çevir"""
+    return {axis: round(value / lsb, digits) for axis, value in zip("xyz", raw)}
 
 
 def dist(a, b):
@@ -133,183 +98,568 @@ def get_y_rotation(x, y, z):
     return math.degrees(radians)
 
 
-def read_gyroscope():
+class MPU6050:
     """
-    Gyroscope değerlerini oku
+    Tek bir MPU-6050 IMU
     
-    Returns:
-        dict: x, y, z gyro değerleri (derece/saniye)
+    Güç durumu cihazın kendi kilidiyle korunur; bus erişimleri veriyolu
+    yöneticisinin kuyruğunda sıralanır. İvme ve gyro blokları tek işlemde
+    istenir ve yönetici tarafından tek 14 byte'lık okumada birleştirilir.
+    Son okuma her seferinde yeni bir sözlükle değiştirilir, okuyanlar
+    yarım güncellenmiş değer görmez.
     """
-    if not SMBUS_AVAILABLE or not bus or not is_initialized:
-        # Simülasyon modu - rastgele değerler
-        import random
-        return {
-            "x": round(random.uniform(-1, 1), 2),
-            "y": round(random.uniform(-1, 1), 2),
-            "z": round(random.uniform(-1, 1), 2)
+
+    def __init__(self, name="imu", address=MPU6050_ADDR, bus_number=I2C_BUS,
+                 mux_address=None, mux_channel=None):
+        self.name = name
+        self.address = address
+        self.bus_number = bus_number
+        self.mux_address = mux_address      # TCA9548A arkasındaysa çoğaltıcı adresi
+        self.mux_channel = mux_channel
+        self.lock = threading.RLock()
+        
+        self.bus = None                     # veriyolu.BusDevice
+        self.is_initialized = False
+        
+        # Güç durumu
+        self.low_power_wake_hz = LOW_POWER_WAKE_HZ
+        self.idle_delay = IDLE_DELAY
+        self.power_state = "sleep"
+        self.idle_since = None
+        self.power_stats = {
+            "transitions": 0,
+            "last_wake_ms": None,
+            "max_wake_ms": 0.0,
+            "wake_ms": {}           # "önceki->yeni" -> son ölçülen uyanma süresi
         }
-    
-    try:
-        # Ham gyro verilerini oku
-        gyro_x = read_word_2c(GYRO_XOUT_H)
-        gyro_y = read_word_2c(GYRO_YOUT_H)
-        gyro_z = read_word_2c(GYRO_ZOUT_H)
         
-        # Ölçekleme (±250°/s için 131 LSB/°/s)
-        return {
-            "x": round(gyro_x / 131.0, 2),
-            "y": round(gyro_y / 131.0, 2),
-            "z": round(gyro_z / 131.0, 2)
+        # Simülasyon modunda rastgele değer yerine kullanılacak kaynak (kayıt tekrarı için)
+        # Parametresiz çağrılır ve {"accel": {x,y,z} (g), "gyro": {x,y,z} (°/s)} döndürür
+        self.simulation_source = None
+        
+        # Son okunan değerler (cache)
+        self.last_reading = {
+            "accel_x": 0.0,
+            "accel_y": 0.0,
+            "accel_z": 9.81,
+            "gyro_x": 0.0,
+            "gyro_y": 0.0,
+            "gyro_z": 0.0,
+            "rotation_x": 0.0,
+            "rotation_y": 0.0,
+            "temperature": 25.0
         }
-    except Exception as e:
-        print(f"Gyro okuma hatası: {e}")
-        return {"x": 0.0, "y": 0.0, "z": 0.0}
+        
+        # Art arda okuma hatasında cihaza erişimi kesen devre
+        self.breaker = saglik.register(name, reinit=self._reinit)
+
+    def setup(self):
+        """IMU sensörünü başlat"""
+        if not SMBUS_AVAILABLE:
+            logger.info("IMU simülasyon modunda başlatıldı")
+            self.is_initialized = True
+            self.set_power_state("full")
+            return True
+        
+        try:
+            with self.lock:
+                # Paylaşımlı I2C bus'ta tutamaç al (Raspberry Pi'de genellikle bus 1)
+                self.bus = veriyolu.open_device(self.name, self.address, self.bus_number,
+                                                self.mux_address, self.mux_channel)
+                
+                # Uyanma gecikmesini ölçebilmek için veri hazır bayrağını etkinleştir
+                self.bus.write_byte_data(INT_ENABLE, INT_DATA_RDY)
+                
+                # MPU-6050'yi uyandır (sleep modundan çıkar)
+                self.is_initialized = True
+                self.set_power_state("full")
+            
+            time.sleep(0.1)  # Başlatma için bekle
+            
+            logger.info("IMU (MPU-6050) başlatıldı.")
+            return True
+        
+        except Exception as e:
+            logger.error("IMU başlatma hatası: %s", e)
+            logger.warning("IMU simülasyon moduna geçiliyor...")
+            with self.lock:
+                if self.bus:
+                    self.bus.close()
+                self.bus = None
+                self.is_initialized = True  # Simülasyon modunda devam et
+                self.set_power_state("full")
+            return False
+
+    def cleanup(self):
+        """IMU'yu uyku moduna al ve kaynakları temizle"""
+        with self.lock:
+            if self.is_initialized:
+                try:
+                    self.set_power_state("sleep")
+                except Exception as e:
+                    logger.error("IMU uyku moduna alınamadı: %s", e)
+            
+            if self.bus:
+                try:
+                    self.bus.close()
+                except:
+                    pass
+                self.bus = None
+            
+            self.is_initialized = False
+        logger.info("IMU kaynakları temizlendi.")
 
+    def _reinit(self):
+        """
+        I2C bus'ı yeniden açıp MPU-6050'yi başlat (sağlık recovery thread'inde çağrılır)
+        
+        Bus yöneticinin işçi thread'inde yeniden açılır; aynı bus'taki
+        diğer cihazların bekleyen işlemleri bundan sonra yürütülür.
+        
+        Raises:
+            Exception: Cihaz yanıt vermiyorsa
+        """
+        if not SMBUS_AVAILABLE:
+            return
+        
+        with self.lock:
+            if self.bus:
+                self.bus.reopen()
+            else:
+                self.bus = veriyolu.open_device(self.name, self.address, self.bus_number,
+                                                self.mux_address, self.mux_channel)
+            
+            identity = self.bus.read_byte_data(WHO_AM_I)
+            if identity & 0x7E != WHO_AM_I_VALUE:
+                raise IOError(f"Beklenmeyen WHO_AM_I: {identity:#x}")
+            
+            self.bus.write_byte_data(INT_ENABLE, INT_DATA_RDY)
+            # Cihaz güç kesintisinden sonra uykuda açılır, kayıtları yeniden yaz
+            self.power_state = "sleep"
+            self.set_power_state("full")
+    
+    # ==================== GÜÇ YÖNETİMİ ====================
+
+    def _wait_data_ready(self):
+        """İlk veri hazır bayrağına kadar bekle (uyanma gecikmesi ölçümü)"""
+        deadline = time.monotonic() + WAKE_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.bus.read_byte_data(INT_STATUS) & INT_DATA_RDY:
+                return True
+            time.sleep(0.001)
+        return False
 
-def read_accelerometer():
-    """
-    Accelerometer değerlerini oku
+    def set_power_state(self, state):
+        """
+        IMU güç durumunu değiştir
+        
+        full      - İvmeölçer ve gyro tam hızda
+        low_power - Yalnızca ivmeölçer, low_power_wake_hz ile döngü modu
+        sleep     - Tüm sensörler kapalı
+        
+        Düşük güç veya uykudan tam güce dönerken ilk veri hazır olana kadar
+        geçen süre ölçülür ve kaydedilir.
+        
+        Returns:
+            float | None: Ölçülen uyanma süresi (ms), uyanma yoksa None
+        """
+        if state not in POWER_STATES:
+            raise ValueError(f"Geçersiz güç durumu: {state}")
+        
+        with self.lock:
+            previous = self.power_state
+            if state == previous:
+                return None
+            
+            pwr1, pwr2 = _power_registers(state, self.low_power_wake_hz)
+            waking = state == "full"
+            started = time.monotonic()
+            
+            if SMBUS_AVAILABLE and self.bus:
+                if waking:
+                    self.bus.read_byte_data(INT_STATUS)  # Okuma bayrağı temizler
+                # İki register tek işlemde yazılır (arada başka cihaz erişimi olmaz)
+                self.bus.transaction([("write_byte", POWER_MGMT_1, pwr1),
+                                      ("write_byte", POWER_MGMT_2, pwr2)])
+                if waking and not self._wait_data_ready():
+                    logger.warning("IMU uyanma zaman aşımı")
+            elif waking:
+                time.sleep(SIM_WAKE_LATENCY.get(previous, 0.0))
+            
+            self.power_state = state
+            self.power_stats["transitions"] += 1
+            
+            if not waking:
+                return None
+            
+            wake_ms = round((time.monotonic() - started) * 1000, 2)
+            self.power_stats["last_wake_ms"] = wake_ms
+            self.power_stats["max_wake_ms"] = max(self.power_stats["max_wake_ms"], wake_ms)
+            self.power_stats["wake_ms"][f"{previous}->{state}"] = wake_ms
+            return wake_ms
+
+    def update_power(self, active):
+        """
+        Tüketici talebine göre güç durumunu güncelle (sensör döngüsünden çağrılır)
+        
+        Talep varsa hemen tam güce geçilir; talep idle_delay boyunca
+        yoksa düşük güç döngü moduna inilir (kısa boşluklarda gidip gelmesin).
+        
+        Args:
+            active: En az bir tüketici örnek istiyor mu?
+        """
+        if not self.is_initialized or not self.breaker.is_healthy():
+            return
+        
+        try:
+            if active:
+                self.idle_since = None
+                if self.power_state != "full":
+                    self.set_power_state("full")
+                return
+            
+            now = time.monotonic()
+            if self.idle_since is None:
+                self.idle_since = now
+            elif self.power_state == "full" and now - self.idle_since >= self.idle_delay:
+                self.set_power_state("low_power")
+        except Exception as e:
+            self.breaker.record_failure(e)
+
+    def configure_power(self, low_power_wake_hz=None, idle_delay=None):
+        """
+        Güç yönetimi ayarlarını güncelle
+        
+        Raises:
+            ValueError: Uyanma frekansı desteklenmiyorsa (1.25, 5, 20, 40 Hz)
+        """
+        if low_power_wake_hz is not None:
+            wake_hz = float(low_power_wake_hz)
+            if wake_hz not in LP_WAKE_CTRL:
+                raise ValueError("Uyanma frekansı 1.25, 5, 20 veya 40 Hz olmalı")
+            with self.lock:
+                self.low_power_wake_hz = wake_hz
+                # Düşük güçteyken yeni frekansı hemen uygula
+                if self.power_state == "low_power" and SMBUS_AVAILABLE and self.bus:
+                    self.bus.write_byte_data(POWER_MGMT_2, _power_registers("low_power", wake_hz)[1])
+        if idle_delay is not None:
+            self.idle_delay = max(0.0, float(idle_delay))
+        return self.get_power_status()
+
+    def get_power_status(self):
+        """IMU güç durumunu ve uyanma gecikmesi ölçümlerini döndür"""
+        with self.lock:
+            return {
+                "state": self.power_state,
+                "low_power_wake_hz": self.low_power_wake_hz,
+                "idle_delay": self.idle_delay,
+                "transitions": self.power_stats["transitions"],
+                "last_wake_ms": self.power_stats["last_wake_ms"],
+                "max_wake_ms": self.power_stats["max_wake_ms"],
+                "wake_ms": dict(self.power_stats["wake_ms"])
+            }
     
-    Returns:
-        dict: x, y, z ivme değerleri (g cinsinden)
-    """
-    if not SMBUS_AVAILABLE or not bus or not is_initialized:
-        # Simülasyon modu - mock değerler
+    # ==================== OKUMA ====================
+
+    def read_byte(self, register):
+        """Tek byte oku"""
+        if not SMBUS_AVAILABLE or not self.bus:
+            return 0
+        return self.bus.read_byte_data(register)
+
+    def read_word(self, register):
+        """16-bit word oku (big-endian, tek blok okuma)"""
+        if not SMBUS_AVAILABLE or not self.bus:
+            return 0
+        high, low = self.bus.read_i2c_block_data(register, 2)
+        return (high << 8) + low
+
+    def read_word_2c(self, register):
+        """16-bit signed word oku (2's complement)"""
+        val = self.read_word(register)
+        if val >= 0x8000:
+            return -((65535 - val) + 1)
+        return val
+
+    def _simulated_motion(self, accel, gyro):
+        """Simülasyon modu - kayıt kaynağı varsa onu, yoksa rastgele değerler"""
+        if self.simulation_source is not None:
+            source = self.simulation_source()
+            return (dict(source["accel"]) if accel else None,
+                    dict(source["gyro"]) if gyro else None)
         import random
-        return {
+        return ({
             "x": round(random.uniform(-0.1, 0.1), 3),
             "y": round(random.uniform(-0.1, 0.1), 3),
             "z": round(1.0 + random.uniform(-0.05, 0.05), 3)  # ~1g (yerçekimi)
+        } if accel else None, {
+            "x": round(random.uniform(-1, 1), 2),
+            "y": round(random.uniform(-1, 1), 2),
+            "z": round(random.uniform(-1, 1), 2)
+        } if gyro else None)
+
+    def _read_motion(self, accel=True, gyro=True):
+        """
+        İvme ve/veya gyro eksenlerini oku
+        
+        İkisi birlikte istendiğinde bloklar tek bus işleminde gönderilir,
+        veriyolu yöneticisi bunları tek 14 byte'lık okumada birleştirir.
+        
+        Returns:
+            tuple: (ivme dict (g) veya None, gyro dict (°/s) veya None)
+        """
+        if not SMBUS_AVAILABLE or not self.bus or not self.is_initialized:
+            return self._simulated_motion(accel, gyro)
+        
+        if not self.breaker.allow():
+            # Devre açık: cihaza gitme, son bilinen değeri döndür
+            last = self.last_reading
+            return ({"x": last["accel_x"], "y": last["accel_y"], "z": last["accel_z"]} if accel else None,
+                    {"x": last["gyro_x"], "y": last["gyro_y"], "z": last["gyro_z"]} if gyro else None)
+        
+        registers = [register for register, wanted in ((ACCEL_XOUT_H, accel), (GYRO_XOUT_H, gyro))
+                     if wanted]
+        try:
+            blocks = self.bus.read_blocks([(register, 6) for register in registers])
+            self.breaker.record_success()
+        except Exception as e:
+            if not self.breaker.record_failure(e):
+                logger.warning("IMU okuma hatası: %s", e)
+            return ({"x": 0.0, "y": 0.0, "z": 1.0} if accel else None,
+                    {"x": 0.0, "y": 0.0, "z": 0.0} if gyro else None)
+        
+        # Register'lar big-endian signed 16-bit
+        raw = iter(struct.unpack(">hhh", bytes(block)) for block in blocks)
+        # Ölçekleme: ±2g için 16384 LSB/g, ±250°/s için 131 LSB/°/s
+        return (_scale(next(raw), 16384.0, 3) if accel else None,
+                _scale(next(raw), 131.0, 2) if gyro else None)
+
+    def read_gyroscope(self):
+        """
+        Gyroscope değerlerini oku
+        
+        Returns:
+            dict: x, y, z gyro değerleri (derece/saniye)
+        """
+        if self.power_state != "full":
+            # Düşük güç modunda gyro beklemede, bus'ı boşuna meşgul etme
+            return {"x": 0.0, "y": 0.0, "z": 0.0}
+        return self._read_motion(accel=False)[1]
+
+    def read_accelerometer(self):
+        """
+        Accelerometer değerlerini oku
+        
+        Returns:
+            dict: x, y, z ivme değerleri (g cinsinden)
+        """
+        return self._read_motion(gyro=False)[0]
+
+    def read_all(self):
+        """
+        Tüm IMU verilerini oku
+        
+        Returns:
+            dict: Tüm sensör verileri
+        """
+        # Devre açıksa son okuma bayat olarak kalır (örnekleyiciye maliyeti yok)
+        if SMBUS_AVAILABLE and self.bus and not self.breaker.allow():
+            return self.last_reading
+        
+        # İvme ve gyro tek bus işleminde (düşük güçte gyro beklemede)
+        full_power = self.power_state == "full"
+        accel, gyro = self._read_motion(gyro=full_power)
+        if not full_power:
+            gyro = {"x": 0.0, "y": 0.0, "z": 0.0}
+        
+        # Rotasyon açılarını hesapla
+        rotation_x = get_x_rotation(accel["x"], accel["y"], accel["z"])
+        rotation_y = get_y_rotation(accel["x"], accel["y"], accel["z"])
+        
+        # Son okumayı tek atamada değiştir
+        self.last_reading = {
+            "accel_x": accel["x"],
+            "accel_y": accel["y"],
+            "accel_z": accel["z"],
+            "gyro_x": gyro["x"],
+            "gyro_y": gyro["y"],
+            "gyro_z": gyro["z"],
+            "rotation_x": round(rotation_x, 2),
+            "rotation_y": round(rotation_y, 2)
         }
-    
-    try:
-        # Ham ivme verilerini oku
-        accel_x = read_word_2c(ACCEL_XOUT_H)
-        accel_y = read_word_2c(ACCEL_YOUT_H)
-        accel_z = read_word_2c(ACCEL_ZOUT_H)
         
-        # Ölçekleme (±2g için 16384 LSB/g)
+        return self.last_reading
+
+    def get_imu_data(self):
+        """
+        Web API için IMU verisi döndür
+        
+        Returns:
+            dict: IMU verileri (m/s² cinsinden ivme)
+        """
+        data = self.read_all()
+        
+        # g'den m/s²'ye çevir (1g = 9.81 m/s²)
+        return {
+            "accel_x": round(data["accel_x"] * 9.81, 3),
+            "accel_y": round(data["accel_y"] * 9.81, 3),
+            "accel_z": round(data["accel_z"] * 9.81, 3),
+            "gyro_x": data["gyro_x"],
+            "gyro_y": data["gyro_y"],
+            "gyro_z": data["gyro_z"],
+            "rotation_x": data["rotation_x"],
+            "rotation_y": data["rotation_y"]
+        }
+
+    def is_stale(self):
+        """IMU devresi açık mı? (son okuma bayat)"""
+        return not self.breaker.is_healthy()
+
+    def calibrate(self):
+        """
+        IMU'yu kalibre et (basit offset kalibrasyonu)
+        Not: Gerçek kalibrasyonda daha gelişmiş yöntemler kullanılmalı
+        """
+        if not self.is_initialized:
+            return False
+        
+        logger.info("IMU kalibrasyonu başlıyor, sensörü düz ve hareketsiz tutun...")
+        
+        samples = 100
+        accel_sum = {"x": 0, "y": 0, "z": 0}
+        gyro_sum = {"x": 0, "y": 0, "z": 0}
+        
+        for i in range(samples):
+            accel = self.read_accelerometer()
+            gyro = self.read_gyroscope()
+            
+            accel_sum["x"] += accel["x"]
+            accel_sum["y"] += accel["y"]
+            accel_sum["z"] += accel["z"]
+            
+            gyro_sum["x"] += gyro["x"]
+            gyro_sum["y"] += gyro["y"]
+            gyro_sum["z"] += gyro["z"]
+            
+            time.sleep(0.01)
+        
+        # Ortalama offset değerlerini hesapla
+        accel_offset = {
+            "x": accel_sum["x"] / samples,
+            "y": accel_sum["y"] / samples,
+            "z": (accel_sum["z"] / samples) - 1.0  # Z'de 1g bekliyoruz
+        }
+        
+        gyro_offset = {
+            "x": gyro_sum["x"] / samples,
+            "y": gyro_sum["y"] / samples,
+            "z": gyro_sum["z"] / samples
+        }
+        
+        logger.info("Kalibrasyon tamamlandı. İvme offset: %s, Gyro offset: %s",
+                    accel_offset, gyro_offset)
+        
         return {
-            "x": round(accel_x / 16384.0, 3),
-            "y": round(accel_y / 16384.0, 3),
-            "z": round(accel_z / 16384.0, 3)
+            "accel_offset": accel_offset,
+            "gyro_offset": gyro_offset
         }
-    except Exception as e:
-        print(f"İvme okuma hatası: {e}")
-        return {"x": 0.0, "y": 0.0, "z": 1.0}
+
+    def status(self):
+        """IMU durumunun tutarlı anlık görüntüsü"""
+        with self.lock:
+            return {
+                "initialized": self.is_initialized,
+                "address": self.address,
+                "power_state": self.power_state,
+                "stale": self.is_stale(),
+                "bus": self.bus.status() if self.bus else None,
+                "last_reading": dict(self.last_reading)
+            }
+
+
+# Varsayılan cihaz (modül fonksiyonları bu örneğe yönlendirilir)
+default = MPU6050()
+
+
+def setup_imu():
+    """IMU sensörünü başlat"""
+    return default.setup()
+
+
+def cleanup_imu():
+    """IMU'yu uyku moduna al ve kaynakları temizle"""
+    default.cleanup()
+
+
+def set_power_state(state):
+    """IMU güç durumunu değiştir (bkz. MPU6050.set_power_state)"""
+    return default.set_power_state(state)
+
+
+def update_power(active):
+    """Tüketici talebine göre güç durumunu güncelle"""
+    default.update_power(active)
+
+
+def configure_power(low_power_wake_hz=None, idle_delay=None):
+    """Güç yönetimi ayarlarını güncelle (bkz. MPU6050.configure_power)"""
+    return default.configure_power(low_power_wake_hz, idle_delay)
+
+
+def get_power_status():
+    """IMU güç durumunu ve uyanma gecikmesi ölçümlerini döndür"""
+    return default.get_power_status()
+
+
+def read_gyroscope():
+    """Gyroscope değerlerini oku (derece/saniye)"""
+    return default.read_gyroscope()
+
+
+def read_accelerometer():
+    """Accelerometer değerlerini oku (g cinsinden)"""
+    return default.read_accelerometer()
 
 
 def read_all():
-    """
-    Tüm IMU verilerini oku
-    
-    Returns:
-        dict: Tüm sensör verileri
-    """
-    global last_reading
-    
-    # İvme verilerini oku
-    accel = read_accelerometer()
-    
-    # Gyro verilerini oku
-    gyro = read_gyroscope()
-    
-    # Rotasyon açılarını hesapla
-    rotation_x = get_x_rotation(accel["x"], accel["y"], accel["z"])
-    rotation_y = get_y_rotation(accel["x"], accel["y"], accel["z"])
-    
-    # Son okumayı güncelle
-    last_reading = {
-        "accel_x": accel["x"],
-        "accel_y": accel["y"],
-        "accel_z": accel["z"],
-        "gyro_x": gyro["x"],
-        "gyro_y": gyro["y"],
-        "gyro_z": gyro["z"],
-        "rotation_x": round(rotation_x, 2),
-        "rotation_y": round(rotation_y, 2)
-    }
-    
-    return last_reading
+    """Tüm IMU verilerini oku"""
+    return default.read_all()
 
 
 def get_imu_data():
-    """
-    Web API için IMU verisi döndür
-    
-    Returns:
-        dict: IMU verileri (m/s² cinsinden ivme)
-    """
-    data = read_all()
-    
-    # g'den m/s²'ye çevir (1g = 9.81 m/s²)
-    return {
-        "accel_x": round(data["accel_x"] * 9.81, 3),
-        "accel_y": round(data["accel_y"] * 9.81, 3),
-        "accel_z": round(data["accel_z"] * 9.81, 3),
-        "gyro_x": data["gyro_x"],
-        "gyro_y": data["gyro_y"],
-        "gyro_z": data["gyro_z"],
-        "rotation_x": data["rotation_x"],
-        "rotation_y": data["rotation_y"]
-    }
+    """Web API için IMU verisi döndür (m/s² cinsinden ivme)"""
+    return default.get_imu_data()
 
 
 def get_last_reading():
     """Son okunan değerleri döndür"""
-    return last_reading
+    return default.last_reading
 
 
-def calibrate():
-    """
-    IMU'yu kalibre et (basit offset kalibrasyonu)
-    Not: Gerçek kalibrasyonda daha gelişmiş yöntemler kullanılmalı
+def is_stale():
+    """IMU devresi açık mı? (son okuma bayat)"""
+    return default.is_stale()
+
+
+def set_simulation_source(source):
     """
-    if not is_initialized:
-        return False
-    
-    print("IMU kalibrasyonu başlıyor...")
-    print("Sensörü düz ve hareketsiz tutun...")
-    
-    samples = 100
-    accel_sum = {"x": 0, "y": 0, "z": 0}
-    gyro_sum = {"x": 0, "y": 0, "z": 0}
-    
-    for i in range(samples):
-        accel = read_accelerometer()
-        gyro = read_gyroscope()
-        
-        accel_sum["x"] += accel["x"]
-        accel_sum["y"] += accel["y"]
-        accel_sum["z"] += accel["z"]
-        
-        gyro_sum["x"] += gyro["x"]
-        gyro_sum["y"] += gyro["y"]
-        gyro_sum["z"] += gyro["z"]
-        
-        time.sleep(0.01)
-    
-    # Ortalama offset değerlerini hesapla
-    accel_offset = {
-        "x": accel_sum["x"] / samples,
-        "y": accel_sum["y"] / samples,
-        "z": (accel_sum["z"] / samples) - 1.0  # Z'de 1g bekliyoruz
-    }
-    
-    gyro_offset = {
-        "x": gyro_sum["x"] / samples,
-        "y": gyro_sum["y"] / samples,
-        "z": gyro_sum["z"] / samples
-    }
+    Simülasyon modunda kullanılacak IMU veri kaynağını ayarla
     
-    print(f"Kalibrasyon tamamlandı.")
-    print(f"İvme offset: {accel_offset}")
-    print(f"Gyro offset: {gyro_offset}")
-    
-    return {
-        "accel_offset": accel_offset,
-        "gyro_offset": gyro_offset
-    }
+    Args:
+        source: Parametresiz çağrılıp {"accel": {...}, "gyro": {...}} döndüren
+                fonksiyon, None ise rastgele değer üretimine dönülür
+    """
+    default.simulation_source = source
+
+
+def calibrate():
+    """IMU'yu kalibre et (basit offset kalibrasyonu)"""
+    return default.calibrate()
+
+
+def get_status():
+    """IMU durumunu döndür"""
+    return default.status()
 
 
 # Modül doğrudan çalıştırılırsa test modu
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Komut Gecikmesi İzleme Modülü
+Tıklamadan GPIO yazımına kadar her komutun aşamalarını zaman damgalar
+
+Tarayıcı her komut isteğine bir X-Trace-Id başlığı ekler. Flask isteği
+alınca izi başlatır (receive); iz aynı thread'de contextvars ile taşınır,
+route'lar ve cihaz sınıfları aşamaları işaretler:
+
+    receive   İstek Flask'a ulaştı
+    validate  Route girdiyi doğruladı
+    queue     Komut cihaza teslim edildi (cihaz kilidi alındı / hedef ayarlandı)
+    gpio      PWM / pin yazımı yapıldı
+    complete  Fiziksel hareket bitti (servo bekleme süresi, motor rampası)
+    respond   Yanıt hazırlandı
+
+Motor rampası kontrol döngüsü thread'inde yürüdüğünden iz komutla birlikte
+motora bırakılır; gpio ve complete o thread'de işaretlenir. Tarayıcı yanıtı
+alınca ölçtüğü gidiş-dönüş süresini bildirir; sunucu süresinden farkı ağ
+(tarayıcı, ngrok, WSGI) payıdır.
+"""
+
+import re
+import time
+import uuid
+import threading
+import contextvars
+from collections import OrderedDict
+
+# ==================== AYARLAR ====================
+HISTORY_SIZE = 200          # Saklanan son iz sayısı
+STAGES = ("receive", "validate", "queue", "gpio", "complete", "respond")
+ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+# Özet dilimleri: (ad, başlangıç aşaması, bitiş aşaması)
+SEGMENTS = (
+    ("validate", "receive", "validate"),
+    ("queue", "validate", "queue"),
+    ("gpio", "queue", "gpio"),
+    ("physical", "gpio", "complete"),
+    ("server", "receive", "respond")
+)
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+traces = OrderedDict()      # id -> Trace
+traces_lock = threading.Lock()
+current_trace = contextvars.ContextVar("izleme_trace", default=None)
+
+
+class Trace:
+    """Tek bir komutun aşama zaman damgaları (perf_counter)"""
+    
+    __slots__ = ("id", "route", "method", "wall", "marks", "status", "client_ms", "rtt_ms")
+
+    def __init__(self, trace_id, route, method, client_ms=None):
+        self.id = trace_id
+        self.route = route
+        self.method = method
+        self.wall = time.time()
+        self.marks = {"receive": time.perf_counter()}
+        self.status = None
+        self.client_ms = client_ms      # Tarayıcıda tıklamadan isteğin gönderilmesine kadar
+        self.rtt_ms = None              # Tarayıcının ölçtüğü gidiş-dönüş
+
+    def offsets(self):
+        """Aşamaların alımdan itibaren süresi (ms)"""
+        marks = dict(self.marks)
+        start = marks["receive"]
+        return {stage: round((marks[stage] - start) * 1000, 3) for stage in STAGES if stage in marks}
+
+    def segments(self):
+        """Aşamalar arası süreler (ms); eksik aşama varsa dilim yok"""
+        offsets = self.offsets()
+        result = {name: round(offsets[end] - offsets[begin], 3)
+                  for name, begin, end in SEGMENTS if begin in offsets and end in offsets}
+        if self.client_ms is not None:
+            result["client"] = self.client_ms
+        if self.rtt_ms is not None and "server" in result:
+            result["network"] = round(max(0.0, self.rtt_ms - result["server"]), 3)
+        return result
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "route": self.route,
+            "method": self.method,
+            "time": round(self.wall, 3),
+            "status": self.status,
+            "stages": self.offsets(),
+            "segments": self.segments(),
+            "rtt_ms": self.rtt_ms
+        }
+
+
+def begin(trace_id, route, method="POST", client_ms=None):
+    """
+    İstek için iz başlat ve geçerli bağlama bağla
+    
+    Args:
+        trace_id: İstemcinin verdiği id (geçersiz veya None ise üretilir)
+        route: İstek yolu
+        client_ms: Tarayıcıda tıklamadan gönderime kadar geçen süre
+    
+    Returns:
+        Trace: Başlatılan iz
+    """
+    if not trace_id or not ID_PATTERN.fullmatch(trace_id):
+        trace_id = uuid.uuid4().hex[:16]
+    try:
+        client_ms = round(float(client_ms), 3) if client_ms is not None else None
+    except ValueError:
+        client_ms = None
+    
+    trace = Trace(trace_id, route, method, client_ms)
+    with traces_lock:
+        traces[trace_id] = trace
+        traces.move_to_end(trace_id)
+        while len(traces) > HISTORY_SIZE:
+            traces.popitem(last=False)
+    current_trace.set(trace)
+    return trace
+
+
+def current():
+    """Geçerli bağlamdaki iz (yoksa None)"""
+    return current_trace.get()
+
+
+def mark(stage, trace=None):
+    """
+    Aşamayı işaretle (her aşamanın yalnızca ilk işareti tutulur)
+    
+    Args:
+        stage: STAGES'teki aşama adı
+        trace: İz (None ise geçerli bağlamdaki)
+    """
+    trace = trace if trace is not None else current_trace.get()
+    if trace is not None and stage not in trace.marks:
+        trace.marks[stage] = time.perf_counter()
+
+
+def finish(trace, status):
+    """Yanıt hazır: respond aşamasını işaretle"""
+    mark("respond", trace)
+    trace.status = status
+
+
+def end():
+    """İsteğin izini bağlamdan ayır (thread sonraki isteğe taşımasın)"""
+    current_trace.set(None)
+
+
+def server_timing(trace):
+    """
+    Server-Timing başlığı (tarayıcı geliştirici araçlarında görünür)
+    
+    Returns:
+        str: ör. "validate;dur=0.1, queue;dur=0.3, server;dur=301.2"
+    """
+    return ", ".join(f"{name};dur={value}" for name, value in trace.segments().items()
+                     if name not in ("client", "network"))
+
+
+def report_client(trace_id, rtt_ms, client_ms=None):
+    """
+    Tarayıcının ölçtüğü gidiş-dönüş süresini ize ekle
+    
+    Returns:
+        bool: İz bulunduysa True
+    
+    Raises:
+        ValueError: Süre geçersizse
+    """
+    rtt_ms = float(rtt_ms)
+    if not 0 <= rtt_ms < 600000:
+        raise ValueError("rtt_ms 0-600000 arasında olmalı")
+    with traces_lock:
+        trace = traces.get(trace_id)
+    if trace is None:
+        return False
+    trace.rtt_ms = round(rtt_ms, 3)
+    if client_ms is not None:
+        trace.client_ms = round(float(client_ms), 3)
+    return True
+
+
+def percentiles(samples):
+    """
+    Gecikme örneklerinin özeti
+    
+    Returns:
+        dict | None: {"p50", "p95", "max", "count"}, örnek yoksa None
+    """
+    values = sorted(samples)
+    if not values:
+        return None
+    return {
+        "p50": values[len(values) // 2],
+        "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+        "max": values[-1],
+        "count": len(values)
+    }
+
+
+def get_status(limit=20, route=None):
+    """
+    Son komutların aşama dökümü ve dilim bazında yüzdelikler
+    
+    Args:
+        limit: Döndürülecek son iz sayısı
+        route: Yalnızca bu yolu içeren izler (ör. "/api/servo")
+    """
+    with traces_lock:
+        selected = [trace for trace in traces.values() if route is None or route in trace.route]
+    
+    by_segment = {}
+    for trace in selected:
+        for name, value in trace.segments().items():
+            by_segment.setdefault(name, []).append(value)
+    
+    order = [name for name, _, _ in SEGMENTS] + ["client", "network"]
+    return {
+        "traces": len(selected),
+        "history_size": HISTORY_SIZE,
+        "summary": {name: percentiles(by_segment[name]) for name in order if name in by_segment},
+        "recent": [trace.summary() for trace in selected[-limit:]][::-1] if limit > 0 else []
+    }
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Telemetri Kayıt Modülü (Kara Kutu)
+Sensör örneklerini önceden ayrılmış, bellek eşlemeli (mmap) segment
+dosyalarına sabit boyutlu ikili kayıtlar olarak ekler
+
+Örnekleyici sadece bir kuyruğa ekleme yapar; disk işlemleri ayrı bir
+yazıcı thread'inde yürür. Her kayıt kendi CRC32 değerini taşıdığından
+çökme sonrası dosya, ilk bozuk/boş kayda kadar güvenle okunabilir.
+
+Komut satırı:
+    python kayit.py dump [dizin]               Kayıtları yazdır
+    python kayit.py replay [dizin] [hız]       Kayıtları simülasyon yoluna geri besle
+"""
+
+import logging
+import os
+import sys
+import mmap
+import glob
+import time
+import queue
+import struct
+import zlib
+import threading
+
+logger = logging.getLogger(__name__)
+
+# ==================== KAYIT FORMATI ====================
+SEGMENT_MAGIC = b"TLMS"
+SEGMENT_VERSION = 1
+HEADER_FORMAT = "<4sHHIIdd"   # magic, sürüm, kayıt boyutu, kapasite, segment no, oluşturma (wall), (ayrılmış)
+HEADER_SIZE = 64
+
+# monotonic, wall, sıra no, mesafe, accel xyz, gyro xyz, servo açısı,
+# motor durumu, motor hızı, bayraklar, motor duty
+RECORD_FORMAT = "<ddIf6fhBBBf"
+RECORD_STRUCT = struct.Struct(RECORD_FORMAT)
+CRC_STRUCT = struct.Struct("<I")
+RECORD_SIZE = RECORD_STRUCT.size + CRC_STRUCT.size
+
+MOTOR_STATES = {"stopped": 0, "forward": 1, "backward": 2}
+MOTOR_STATE_NAMES = {v: k for k, v in MOTOR_STATES.items()}
+FLAG_SENSOR_ACTIVE = 0x01
+
+# ==================== AYARLAR ====================
+RECORD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kayitlar")
+SEGMENT_RECORDS = 65536     # Segment başına kayıt (~4 MB)
+MAX_SEGMENTS = 32           # Saklanan en fazla segment (eskiler silinir)
+QUEUE_SIZE = 4096           # Yazıcı kuyruğu kapasitesi
+FLUSH_INTERVAL = 1.0        # mmap'in diske senkronlanma aralığı (saniye)
+READ_CHUNK = 1024           # Okurken tek seferde okunan kayıt sayısı
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+write_queue = queue.Queue(maxsize=QUEUE_SIZE)
+writer_thread = None
+writer_running = False
+record_dir = RECORD_DIR
+
+segment_file = None
+segment_map = None
+segment_index = 0
+segment_position = 0
+sequence = 0
+
+stats = {
+    "queued": 0,
+    "written": 0,
+    "dropped": 0,
+    "segments_rotated": 0,
+    "last_error": None
+}
+
+
+# ==================== KODLAMA ====================
+
+def encode_record(sample, seq):
+    """
+    Örnek sözlüğünü CRC'li ikili kayda çevir
+    
+    Args:
+        sample: {"mono", "wall", "distance", "imu", "servo_angle", "motor", "sensor_active"}
+        seq: Kayıt sıra numarası
+    
+    Returns:
+        bytes: RECORD_SIZE uzunluğunda kayıt
+    """
+    imu_data = sample.get("imu") or {}
+    motor = sample.get("motor") or {}
+    flags = FLAG_SENSOR_ACTIVE if sample.get("sensor_active", True) else 0
+    
+    payload = RECORD_STRUCT.pack(
+        sample["mono"],
+        sample["wall"],
+        seq & 0xFFFFFFFF,
+        float(sample.get("distance", 0.0)),
+        float(imu_data.get("accel_x", 0.0)),
+        float(imu_data.get("accel_y", 0.0)),
+        float(imu_data.get("accel_z", 0.0)),
+        float(imu_data.get("gyro_x", 0.0)),
+        float(imu_data.get("gyro_y", 0.0)),
+        float(imu_data.get("gyro_z", 0.0)),
+        int(sample.get("servo_angle", 0)),
+        MOTOR_STATES.get(motor.get("state"), 0),
+        max(0, min(255, int(motor.get("speed", 0)))),
+        flags,
+        float(motor.get("duty", 0.0))
+    )
+    return payload + CRC_STRUCT.pack(zlib.crc32(payload))
+
+
+def decode_record(data):
+    """
+    İkili kaydı sözlüğe çevir
+    
+    Returns:
+        dict: Kayıt, CRC tutmuyorsa (boş veya yarım yazılmış) None
+    """
+    payload = data[:RECORD_STRUCT.size]
+    (crc,) = CRC_STRUCT.unpack_from(data, RECORD_STRUCT.size)
+    if crc != zlib.crc32(payload) or not any(payload):
+        return None
+    
+    (mono, wall, seq, distance, ax, ay, az, gx, gy, gz,
+     servo_angle, motor_state, motor_speed, flags, motor_duty) = RECORD_STRUCT.unpack(payload)
+    
+    return {
+        "mono": mono,
+        "wall": wall,
+        "seq": seq,
+        "distance": round(distance, 2),
+        "imu": {
+            "accel_x": round(ax, 3),
+            "accel_y": round(ay, 3),
+            "accel_z": round(az, 3),
+            "gyro_x": round(gx, 2),
+            "gyro_y": round(gy, 2),
+            "gyro_z": round(gz, 2)
+        },
+        "servo_angle": servo_angle,
+        "motor": {
+            "state": MOTOR_STATE_NAMES.get(motor_state, "stopped"),
+            "speed": motor_speed,
+            "duty": round(motor_duty, 1)
+        },
+        "sensor_active": bool(flags & FLAG_SENSOR_ACTIVE)
+    }
+
+
+# ==================== SEGMENT YÖNETİMİ ====================
+
+def _segment_path(index, directory=None):
+    """Segment dosya yolunu döndür"""
+    return os.path.join(directory or record_dir, f"seg_{index:06d}.tlm")
+
+
+def list_segments(directory=None):
+    """Dizindeki segment dosyalarını sıralı olarak döndür"""
+    return sorted(glob.glob(os.path.join(directory or record_dir, "seg_*.tlm")))
+
+
+def _open_segment(index):
+    """Yeni segment dosyası oluştur, önceden ayır ve mmap ile aç"""
+    global segment_file, segment_map, segment_index, segment_position
+    
+    path = _segment_path(index)
+    size = HEADER_SIZE + SEGMENT_RECORDS * RECORD_SIZE
+    
+    f = open(path, "w+b")
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+    except (AttributeError, OSError):
+        f.truncate(size)
+    
+    mm = mmap.mmap(f.fileno(), size)
+    header = struct.pack(HEADER_FORMAT, SEGMENT_MAGIC, SEGMENT_VERSION, RECORD_SIZE,
+                         SEGMENT_RECORDS, index, time.time(), 0.0)
+    mm[:len(header)] = header
+    mm.flush()
+    
+    segment_file, segment_map = f, mm
+    segment_index, segment_position = index, 0
+    
+    # Saklama sınırını aşan eski segmentleri sil
+    segments = list_segments()
+    for old in segments[:max(0, len(segments) - MAX_SEGMENTS)]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+def _close_segment():
+    """Açık segmenti diske senkronla ve kapat"""
+    global segment_file, segment_map
+    
+    if segment_map is not None:
+        try:
+            segment_map.flush()
+            segment_map.close()
+        except (ValueError, OSError):
+            pass
+    if segment_file is not None:
+        segment_file.close()
+    segment_file, segment_map = None, None
+
+
+def _next_segment_index():
+    """Mevcut segmentlerin devamı olacak segment numarasını bul"""
+    segments = list_segments()
+    if not segments:
+        return 0
+    name = os.path.basename(segments[-1])
+    return int(name[4:10]) + 1
+
+
+# ==================== YAZICI THREAD ====================
+
+def writer_loop():
+    """Kuyruktaki kayıtları mmap segmentine yaz"""
+    global segment_position
+    
+    last_flush = time.monotonic()
+    
+    while writer_running or not write_queue.empty():
+        try:
+            record = write_queue.get(timeout=0.2)
+        except queue.Empty:
+            record = None
+        
+        try:
+            if record is not None:
+                if segment_position >= SEGMENT_RECORDS:
+                    _close_segment()
+                    _open_segment(segment_index + 1)
+                    stats["segments_rotated"] += 1
+                
+                offset = HEADER_SIZE + segment_position * RECORD_SIZE
+                segment_map[offset:offset + RECORD_SIZE] = record
+                segment_position += 1
+                stats["written"] += 1
+            
+            now = time.monotonic()
+            if now - last_flush >= FLUSH_INTERVAL and segment_map is not None:
+                segment_map.flush()
+                last_flush = now
+        except Exception as e:
+            stats["last_error"] = str(e)
+            logger.error("Kayıt yazma hatası: %s", e)
+
+
+def record_sample(sample):
+    """
+    Örneği kayıt kuyruğuna ekle (asla bloklamaz)
+    
+    Args:
+        sample: encode_record() ile uyumlu örnek sözlüğü
+    
+    Returns:
+        bool: Kuyruğa eklendiyse True, kuyruk doluysa veya kayıt kapalıysa False
+    """
+    global sequence
+    
+    if not writer_running:
+        return False
+    
+    try:
+        write_queue.put_nowait(encode_record(sample, sequence))
+    except queue.Full:
+        stats["dropped"] += 1
+        return False
+    
+    sequence += 1
+    stats["queued"] += 1
+    return True
+
+
+def start_recorder(directory=None):
+    """Kaydediciyi başlat (her başlatma yeni bir segment açar)"""
+    global writer_thread, writer_running, record_dir, sequence
+    
+    if writer_running:
+        return False
+    
+    record_dir = directory or RECORD_DIR
+    os.makedirs(record_dir, exist_ok=True)
+    _open_segment(_next_segment_index())
+    sequence = 0
+    
+    writer_running = True
+    writer_thread = threading.Thread(target=writer_loop, daemon=True)
+    writer_thread.start()
+    logger.info("Telemetri kaydı başlatıldı: %s", _segment_path(segment_index))
+    return True
+
+
+def stop_recorder():
+    """Kuyruğu boşalt, segmenti senkronla ve kaydediciyi durdur"""
+    global writer_thread, writer_running
+    
+    if not writer_running:
+        return False
+    
+    writer_running = False
+    if writer_thread:
+        writer_thread.join(timeout=5.0)
+    writer_thread = None
+    _close_segment()
+    logger.info("Telemetri kaydı durduruldu.")
+    return True
+
+
+def is_recording():
+    """Kaydedici çalışıyor mu?"""
+    return writer_running
+
+
+def get_status():
+    """Kaydedici durumunu döndür"""
+    return {
+        "recording": writer_running,
+        "directory": record_dir,
+        "segment": segment_index,
+        "segment_position": segment_position,
+        "segment_capacity": SEGMENT_RECORDS,
+        "record_size": RECORD_SIZE,
+        "queue_depth": write_queue.qsize(),
+        "segments": len(list_segments()),
+        "stats": dict(stats)
+    }
+
+
+# ==================== OKUMA ====================
+
+def _read_header(f, path):
+    """Segment başlığını doğrula, kapasiteyi döndür (geçersizse None)"""
+    header = f.read(HEADER_SIZE)
+    if len(header) < struct.calcsize(HEADER_FORMAT):
+        return None
+    magic, version, record_size, capacity = struct.unpack_from(HEADER_FORMAT, header)[:4]
+    if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION or record_size != RECORD_SIZE:
+        logger.warning("Tanınmayan segment atlandı: %s", path)
+        return None
+    return capacity
+
+
+def _record_at(f, index):
+    """Segmentteki index numaralı kaydı oku (geçersizse None)"""
+    f.seek(HEADER_SIZE + index * RECORD_SIZE)
+    data = f.read(RECORD_SIZE)
+    if len(data) < RECORD_SIZE:
+        return None
+    return decode_record(data)
+
+
+def _find_start(f, capacity, start):
+    """
+    wall >= start olan ilk kaydın konumunu ikili arama ile bul
+    
+    Geçerli kayıtlar segmentin başında kesintisiz durduğundan geçersiz
+    (henüz yazılmamış) kayıtlar aralığın sonundaymış gibi değerlendirilir.
+    """
+    low, high = 0, capacity
+    while low < high:
+        mid = (low + high) // 2
+        record = _record_at(f, mid)
+        if record is not None and record["wall"] < start:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+def read_segment(path, start=None):
+    """
+    Segment dosyasındaki geçerli kayıtları sırayla üret
+    
+    Dosya yazılırken okunabilir; ilk geçersiz kayıtta durur. Kayıtlar
+    parça parça okunduğundan bellek kullanımı segment boyutundan bağımsızdır.
+    
+    Args:
+        path: Segment dosyası
+        start: Verilirse bu zamandan (unix) önceki kayıtlar atlanır
+    """
+    with open(path, "rb") as f:
+        capacity = _read_header(f, path)
+        if capacity is None:
+            return
+        
+        index = _find_start(f, capacity, start) if start is not None else 0
+        f.seek(HEADER_SIZE + index * RECORD_SIZE)
+        
+        while index < capacity:
+            count = min(READ_CHUNK, capacity - index)
+            data = f.read(count * RECORD_SIZE)
+            for offset in range(0, len(data) - RECORD_SIZE + 1, RECORD_SIZE):
+                record = decode_record(data[offset:offset + RECORD_SIZE])
+                if record is None:
+                    return
+                yield record
+            if len(data) < count * RECORD_SIZE:
+                return
+            index += count
+
+
+def _first_wall(path):
+    """Segmentin ilk kaydının zamanını döndür (boşsa None)"""
+    try:
+        with open(path, "rb") as f:
+            if _read_header(f, path) is None:
+                return None
+            record = _record_at(f, 0)
+            return record["wall"] if record else None
+    except OSError:
+        return None
+
+
+def read_records(directory=None, start=None, end=None):
+    """
+    Tüm segmentlerdeki kayıtları zaman sırasıyla üret
+    
+    Args:
+        directory: Kayıt dizini
+        start: Başlangıç zamanı (unix, wall clock), None ise baştan
+        end: Bitiş zamanı (unix, wall clock), None ise sona kadar
+    """
+    segments = list_segments(directory)
+    
+    for i, path in enumerate(segments):
+        if start is not None and i + 1 < len(segments):
+            # Sonraki segment de aralık başlangıcından önce başlıyorsa bu segmenti atla
+            next_first = _first_wall(segments[i + 1])
+            if next_first is not None and next_first <= start:
+                continue
+        
+        for record in read_segment(path, start):
+            if end is not None and record["wall"] > end:
+                return
+            yield record
+
+
+# ==================== TEKRAR OYNATMA ====================
+
+def replay(directory=None, speed=1.0, start=None, end=None, callback=None):
+    """
+    Kayıtlı örnekleri simüle edilmiş donanım yolundan geri besle
+    
+    Mesafe ve IMU değerleri dijital_metre/imu modüllerinin simülasyon
+    kaynağı olarak ayarlanır ve gerçek ölçüm fonksiyonları çağrılır;
+    böylece ölçüm dinleyicileri (refleks vb.) kayıttaki gibi tetiklenir.
+    Donanım bağlı değilken (simülasyon modunda) çalıştırılmalıdır.
+    
+    Args:
+        directory: Kayıt dizini
+        speed: Oynatma hızı çarpanı (2.0 = iki kat hızlı, 0 = beklemeden)
+        start, end: Zaman aralığı (unix)
+        callback: callback(record, distance, imu_data) her örnekten sonra çağrılır
+    
+    Returns:
+        int: Oynatılan kayıt sayısı
+    """
+    import dijital_metre
+    import imu
+    
+    current = {}
+
+    def distance_source():
+        return current["distance"]
+
+    def imu_source():
+        data = current["imu"]
+        return {
+            "accel": {axis: data[f"accel_{axis}"] / 9.81 for axis in "xyz"},
+            "gyro": {axis: data[f"gyro_{axis}"] for axis in "xyz"}
+        }
+    
+    dijital_metre.set_simulation_source(distance_source)
+    imu.set_simulation_source(imu_source)
+    
+    count = 0
+    first_mono = None
+    replay_start = time.monotonic()
+    
+    try:
+        for record in read_records(directory, start, end):
+            if first_mono is None:
+                first_mono = record["mono"]
+            
+            if speed > 0:
+                due = replay_start + (record["mono"] - first_mono) / speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            
+            current.update(record)
+            dijital_metre.set_active(record["sensor_active"])
+            distance = dijital_metre.measure_distance()
+            imu_data = imu.get_imu_data()
+            count += 1
+            
+            if callback:
+                callback(record, distance, imu_data)
+    finally:
+        dijital_metre.set_simulation_source(None)
+        imu.set_simulation_source(None)
+    
+    return count
+
+
+# Modül doğrudan çalıştırılırsa kayıt aracı
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else "dump"
+    directory = sys.argv[2] if len(sys.argv) > 2 else RECORD_DIR
+    
+    if command == "dump":
+        for record in read_records(directory):
+            imu_data = record["imu"]
+            print(f"#{record['seq']:<8} {time.strftime('%H:%M:%S', time.localtime(record['wall']))} "
+                  f"mesafe={record['distance']:7.2f}cm  "
+                  f"ivme=({imu_data['accel_x']:.2f}, {imu_data['accel_y']:.2f}, {imu_data['accel_z']:.2f})  "
+                  f"servo={record['servo_angle']:3d}°  motor={record['motor']['state']}/{record['motor']['speed']}%")
+    
+    elif command == "replay":
+        import dcmotor
+        import refleks
+        
+        speed = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+        print(f"Kayıt tekrar oynatılıyor ({directory}, hız x{speed:g})...")
+        
+        # Motor kayıttaki durumu takip eder, refleks gerçek zamanlı olarak değerlendirilir
+        dcmotor.setup_motor()
+        refleks.enable()
+
+        def follow_motor(record, distance, imu_data):
+            motor = record["motor"]
+            if motor["state"] != dcmotor.get_current_state() or motor["speed"] != dcmotor.get_current_speed():
+                if motor["state"] == "forward":
+                    dcmotor.forward(motor["speed"])
+                elif motor["state"] == "backward":
+                    dcmotor.backward(motor["speed"])
+                else:
+                    dcmotor.stop()
+        
+        try:
+            total = replay(directory, speed=speed, callback=follow_motor)
+            print(f"\n{total} kayıt oynatıldı.")
+            print(f"Refleks: {refleks.get_status()['stats']}")
+        except KeyboardInterrupt:
+            print("\nTekrar oynatma durduruldu.")
+        finally:
+            dcmotor.cleanup_motor()
+    
+    else:
+        print(__doc__)
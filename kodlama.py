@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Telemetri İkili Kodlama Modülü
+JSON yerine sürümlü sabit struct düzeni (veya MessagePack) ile kodlama
+
+İstemci Accept başlığıyla formatı seçer:
+    application/vnd.telemetri+bin  - Sabit struct düzeni (main.js çözer)
+    application/msgpack            - MessagePack (msgpack paketi kuruluysa)
+    application/json               - Varsayılan
+
+Struct düzeni /api/schema üzerinden tanımlanır. Tüm sayılar little-endian.
+Her mesaj 2 baytlık başlıkla başlar: şema sürümü ve mesaj tipi.
+"""
+
+import struct
+
+import kayit
+
+# msgpack opsiyonel: kurulu değilse yalnızca struct ve JSON sunulur
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# ==================== FORMATLAR ====================
+SCHEMA_VERSION = 1
+
+MIME_JSON = "application/json"
+MIME_BINARY = "application/vnd.telemetri+bin"
+MIME_MSGPACK = "application/msgpack"
+
+# Mesaj tipleri
+TYPE_SAMPLE = 1             # Tek örnek (/api/data)
+TYPE_TABLE = 2              # Zaman serisi tablosu (arşiv sorgusu, grafik serisi)
+TYPE_STREAM = 3             # Ardışık örnek akışı (/api/export?format=bin)
+
+HEADER_STRUCT = struct.Struct("<BB")
+
+# Örnek düzeni: (alan adı, struct tipi)
+SAMPLE_FIELDS = (
+    ("time", "d"),
+    ("distance", "f"),
+    ("accel_x", "f"),
+    ("accel_y", "f"),
+    ("accel_z", "f"),
+    ("gyro_x", "f"),
+    ("gyro_y", "f"),
+    ("gyro_z", "f"),
+    ("motor_duty", "f"),
+    ("servo_angle", "h"),
+    ("motor_state", "B"),
+    ("motor_speed", "B"),
+    ("flags", "B"),
+)
+SAMPLE_STRUCT = struct.Struct("<" + "".join(code for _, code in SAMPLE_FIELDS))
+
+# Tablo başlığı: sütun sayısı, satır sayısı; ardından satırlar
+# (ilk sütun float64 zaman, diğerleri float32)
+TABLE_HEADER_STRUCT = struct.Struct("<BI")
+
+FLAG_SENSOR_ACTIVE = 0x01
+FLAG_MOTOR_RUNNING = 0x02
+FLAG_DISTANCE_STALE = 0x04
+FLAG_IMU_STALE = 0x08
+
+TYPE_NAMES = {"d": "f64", "f": "f32", "h": "i16", "B": "u8", "I": "u32"}
+
+
+# ==================== İÇERİK PAZARLIĞI ====================
+
+def offered_mimetypes():
+    """Sunucunun üretebildiği formatlar (tercih sırasıyla)"""
+    offered = [MIME_JSON, MIME_BINARY]
+    if MSGPACK_AVAILABLE:
+        offered.append(MIME_MSGPACK)
+    return offered
+
+
+def negotiate(accept):
+    """
+    Accept başlığına göre yanıt formatını seç
+    
+    Args:
+        accept: werkzeug MIMEAccept nesnesi (request.accept_mimetypes)
+    
+    Returns:
+        str: Seçilen MIME tipi (eşleşme yoksa JSON)
+    """
+    return accept.best_match(offered_mimetypes(), default=MIME_JSON)
+
+
+# ==================== ÖRNEK ====================
+
+def _pack_sample(flat):
+    """Düz örnek sözlüğünü başlıksız struct'a çevir"""
+    return SAMPLE_STRUCT.pack(
+        float(flat["time"]),
+        float(flat["distance"]),
+        float(flat["accel_x"]),
+        float(flat["accel_y"]),
+        float(flat["accel_z"]),
+        float(flat["gyro_x"]),
+        float(flat["gyro_y"]),
+        float(flat["gyro_z"]),
+        float(flat["motor_duty"]),
+        int(flat["servo_angle"]),
+        kayit.MOTOR_STATES.get(flat["motor_state"], 0),
+        max(0, min(255, int(flat["motor_speed"]))),
+        flat["flags"]
+    )
+
+
+def flatten_data(data, timestamp):
+    """/api/data sözlüğünü düz alanlara çevir"""
+    imu_data = data["imu"]
+    motor = data["motor"]
+    flags = 0
+    if data.get("sensor_active"):
+        flags |= FLAG_SENSOR_ACTIVE
+    if motor.get("is_running"):
+        flags |= FLAG_MOTOR_RUNNING
+    stale = data.get("stale", {})
+    if stale.get("distance"):
+        flags |= FLAG_DISTANCE_STALE
+    if stale.get("imu"):
+        flags |= FLAG_IMU_STALE
+    return {
+        "time": timestamp,
+        "distance": data["distance"],
+        "accel_x": imu_data["accel_x"],
+        "accel_y": imu_data["accel_y"],
+        "accel_z": imu_data["accel_z"],
+        "gyro_x": imu_data["gyro_x"],
+        "gyro_y": imu_data["gyro_y"],
+        "gyro_z": imu_data["gyro_z"],
+        "motor_duty": motor.get("duty", 0.0),
+        "servo_angle": data["servo_angle"],
+        "motor_state": motor.get("state", "stopped"),
+        "motor_speed": motor.get("speed", 0),
+        "flags": flags
+    }
+
+
+def _with_flags(flat):
+    """aktarim.flatten_record() çıktısına bayrak alanını ekle"""
+    flags = FLAG_SENSOR_ACTIVE if flat["sensor_active"] else 0
+    if flat["motor_state"] != "stopped":
+        flags |= FLAG_MOTOR_RUNNING
+    return dict(flat, flags=flags)
+
+
+def encode_sample(data, timestamp, mimetype):
+    """
+    /api/data yanıtını seçilen formatta kodla
+    
+    Returns:
+        bytes
+    """
+    flat = flatten_data(data, timestamp)
+    if mimetype == MIME_MSGPACK:
+        return msgpack.packb(flat)
+    return HEADER_STRUCT.pack(SCHEMA_VERSION, TYPE_SAMPLE) + _pack_sample(flat)
+
+
+# ==================== TABLO ====================
+
+def encode_table(columns, rows, mimetype, meta=None):
+    """
+    Zaman serisi satırlarını kodla
+    
+    Args:
+        columns: Sütun adları (ilki zaman)
+        rows: [[t, v1, v2, ...], ...]
+        mimetype: MIME_BINARY veya MIME_MSGPACK
+        meta: MessagePack çıktısına eklenecek ek alanlar
+    
+    Returns:
+        bytes
+    """
+    if mimetype == MIME_MSGPACK:
+        payload = dict(meta or {})
+        payload["columns"] = list(columns)
+        payload["points"] = rows
+        return msgpack.packb(payload)
+    
+    row_struct = struct.Struct("<d" + "f" * (len(columns) - 1))
+    parts = [
+        HEADER_STRUCT.pack(SCHEMA_VERSION, TYPE_TABLE),
+        TABLE_HEADER_STRUCT.pack(len(columns), len(rows))
+    ]
+    parts.extend(row_struct.pack(*row) for row in rows)
+    return b"".join(parts)
+
+
+def table_columns(tier, method=None):
+    """Arşiv/grafik satırlarının sütun adları"""
+    if method == "minmax":
+        return ("time", "min", "max")
+    if tier == "raw" or method == "lttb":
+        return ("time", "value")
+    return ("time", "min", "max", "mean", "count")
+
+
+# ==================== AKIŞ ====================
+
+def stream_header():
+    """İkili akışın başlığı: sürüm, tip ve kayıt boyutu"""
+    return HEADER_STRUCT.pack(SCHEMA_VERSION, TYPE_STREAM) + struct.pack("<H", SAMPLE_STRUCT.size)
+
+
+def encode_stream_record(flat):
+    """aktarim düz kaydını akış kaydına çevir"""
+    return _pack_sample(_with_flags(flat))
+
+
+# ==================== ŞEMA ====================
+
+def get_schema():
+    """İkili düzenin tanımını döndür (istemci çözücüleri bunu kullanır)"""
+    fields = []
+    offset = 0
+    for name, code in SAMPLE_FIELDS:
+        fields.append({"name": name, "type": TYPE_NAMES[code], "offset": offset})
+        offset += struct.calcsize("<" + code)
+    
+    return {
+        "version": SCHEMA_VERSION,
+        "endianness": "little",
+        "mimetypes": offered_mimetypes(),
+        "header": {
+            "size": HEADER_STRUCT.size,
+            "fields": [
+                {"name": "version", "type": "u8", "offset": 0},
+                {"name": "type", "type": "u8", "offset": 1}
+            ]
+        },
+        "types": {
+            "sample": TYPE_SAMPLE,
+            "table": TYPE_TABLE,
+            "stream": TYPE_STREAM
+        },
+        "sample": {
+            "size": SAMPLE_STRUCT.size,
+            "fields": fields
+        },
+        "table": {
+            "header": [
+                {"name": "columns", "type": "u8", "offset": 0},
+                {"name": "rows", "type": "u32", "offset": 1}
+            ],
+            "row": "ilk sütun f64 zaman, diğer sütunlar f32"
+        },
+        "stream": {
+            "header": [{"name": "record_size", "type": "u16", "offset": 0}],
+            "record": "sample düzeni, başlıksız"
+        },
+        "motor_states": kayit.MOTOR_STATE_NAMES,
+        "flags": {
+            "sensor_active": FLAG_SENSOR_ACTIVE,
+            "motor_running": FLAG_MOTOR_RUNNING,
+            "distance_stale": FLAG_DISTANCE_STALE,
+            "imu_stale": FLAG_IMU_STALE
+        }
+    }
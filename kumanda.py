@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Uzaktan Kumanda Modülü
+Joystick/gamepad ile sürekli servo ve motor kontrolü için oturum mantığı
+
+Her WebSocket bağlantısı bir ControlSession'dır (taşıma sunucu.py'de).
+İstemci sıra numaralı küçük ayar noktası mesajları gönderir:
+
+    Metin (JSON):  {"s": 42, "m": -35, "a": 120, "t": 51234}
+        s - sıra numarası (oturum içinde artan)
+        m - motor hızı -100..100 (negatif geri, 0 dur), opsiyonel
+        a - servo açısı 0..180, opsiyonel
+        t - istemci zaman damgası (ms), onayda aynen geri döner
+        r - istemcinin ölçtüğü son gidiş-dönüş süresi (ms), opsiyonel
+    
+    İkili (8 byte, little-endian): <IbBH = s, m (-128 = değişmez),
+        a (255 = değişmez), t (ms, 16 bit)
+
+Sırası eski mesajlar kanal bazında düşürülür (ağda sırası karışan eski
+ayar noktası yenisini ezmez). Uygulama sürerken gelen ayar noktaları
+birleştirilir, yalnızca en yenisi uygulanır. Motorun güncel hedefi
+(yön ve hız) zaten istenen değerse cihaza yeniden yazılmaz; başka bir
+yerden (HTTP, refleks) durdurulan motor aynı değer tekrar gönderilince
+yeniden sürülür. Refleks fren eşiğinin içindeyken ileri komut motorda
+reddedilir.
+
+Her uygulanan ayar noktası {"type": "ack", "s", "t", "lat"} ile onaylanır;
+lat mesajın alınmasından aktüatöre yazılmasına kadar geçen süredir (ms).
+Refleks freni ileri komutu reddettiyse onayda "blocked": true bulunur.
+DEADMAN_TIMEOUT boyunca mesaj gelmezse veya bağlantı koparsa motor durdurulur.
+İstemci yalnızca giriş değişince gönderiyorsa (slider basılı tutulurken)
+DEADMAN_TIMEOUT'tan kısa aralıklarla m/a içermeyen {"s": n} canlılık
+mesajı göndermelidir; bu mesaj cihaza bir şey yazmaz, yalnızca bekçiyi
+sıfırlar (ikili biçimde m = -128, a = 255).
+"""
+
+import json
+import time
+import struct
+import logging
+import threading
+from collections import deque
+
+import dcmotor
+import izleme
+
+logger = logging.getLogger(__name__)
+
+# ==================== AYARLAR ====================
+DEADMAN_TIMEOUT = 0.5       # Bu süre mesaj gelmezse motor durdurulur (saniye)
+LATENCY_SAMPLES = 500       # İstatistik için saklanan son gecikme ölçümü
+BINARY_FORMAT = struct.Struct("<IbBH")
+MOTOR_UNCHANGED = -128
+ANGLE_UNCHANGED = 255
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+sessions = set()
+sessions_lock = threading.Lock()
+apply_latency = deque(maxlen=LATENCY_SAMPLES)   # Alım -> aktüatör (ms)
+client_rtt = deque(maxlen=LATENCY_SAMPLES)      # İstemcinin bildirdiği gidiş-dönüş (ms)
+stats = {"sessions": 0, "received": 0, "applied": 0, "stale": 0, "superseded": 0,
+         "duplicates": 0, "blocked": 0, "invalid": 0, "deadman_stops": 0}
+
+
+def parse(text=None, data=None):
+    """
+    Ayar noktası mesajını çözümle
+    
+    Returns:
+        dict: {"s", "m" (opsiyonel), "a" (opsiyonel), "t", "r"}
+    
+    Raises:
+        ValueError: Mesaj geçersizse
+    """
+    if data is not None:
+        if len(data) != BINARY_FORMAT.size:
+            raise ValueError(f"İkili mesaj {BINARY_FORMAT.size} byte olmalı")
+        seq, motor, angle, stamp = BINARY_FORMAT.unpack(data)
+        setpoint = {"s": seq, "t": stamp}
+        if motor != MOTOR_UNCHANGED:
+            setpoint["m"] = motor
+        if angle != ANGLE_UNCHANGED:
+            setpoint["a"] = angle
+    else:
+        try:
+            message = json.loads(text)
+        except (TypeError, json.JSONDecodeError):
+            raise ValueError("Geçersiz JSON")
+        if not isinstance(message, dict) or not isinstance(message.get("s"), int):
+            raise ValueError("Sıra numarası (s) gerekli")
+        setpoint = {key: message[key] for key in ("s", "m", "a", "t", "r") if key in message}
+    
+    try:
+        for key, convert in (("m", int), ("a", int), ("r", float)):
+            if key in setpoint:
+                setpoint[key] = convert(setpoint[key])
+    except (TypeError, ValueError):
+        raise ValueError(f"Geçersiz sayı: {key}")
+    if "m" in setpoint and not -100 <= setpoint["m"] <= 100:
+        raise ValueError("Motor hızı -100..100 arasında olmalı")
+    if "a" in setpoint and not 0 <= setpoint["a"] <= 180:
+        raise ValueError("Servo açısı 0..180 arasında olmalı")
+    return setpoint
+
+
+class ControlSession:
+    """
+    Tek bir kumanda bağlantısının durumu
+    
+    accept() alım thread'inde/görevinde, apply_pending() uygulayıcıda,
+    check_deadman() bekçi görevinde çağrılır. Aktüatör yazımları ve bekçi
+    kontrolü actuator_lock altında sıralanır.
+    """
+
+    def __init__(self, motor=None, servo=None, on_motor_control=None):
+        self.motor = motor
+        self.servo = servo
+        self.on_motor_control = on_motor_control  # İlk motor komutunda (ör. PID'i bırak)
+        self.lock = threading.Lock()
+        self.actuator_lock = threading.Lock()   # Ayar noktası yazımı ile bekçi durdurması
+        
+        self.last_seq = {"m": -1, "a": -1}      # Kanal başına kabul edilen son sıra
+        self.applied = {"m": None, "a": None}   # Cihaza yazılan son değerler
+        self.pending = None                     # Uygulanmayı bekleyen en yeni ayar noktası
+        self.last_input = time.monotonic()
+        self.motor_claimed = False
+        self.stats = {"received": 0, "applied": 0, "stale": 0, "superseded": 0,
+                      "duplicates": 0, "blocked": 0, "invalid": 0}
+        
+        with sessions_lock:
+            sessions.add(self)
+            stats["sessions"] += 1
+
+    def _count(self, key):
+        self.stats[key] += 1
+        stats[key] += 1
+
+    def reject(self):
+        """Geçersiz mesajı say"""
+        self._count("invalid")
+
+    def accept(self, setpoint, received=None):
+        """
+        Ayar noktasını kabul et veya eski ise düşür
+        
+        Args:
+            setpoint: parse() çıktısı
+            received: Alım anı (time.perf_counter, gecikme ölçümü için)
+        
+        Returns:
+            bool: Uygulanacak yeni değer varsa True
+        """
+        received = received if received is not None else time.perf_counter()
+        with self.lock:
+            self._count("received")
+            self.last_input = time.monotonic()
+            if "r" in setpoint:
+                client_rtt.append(setpoint["r"])
+            
+            channels = {}
+            for channel in ("m", "a"):
+                if channel in setpoint:
+                    if setpoint["s"] <= self.last_seq[channel]:
+                        continue    # Bu kanala daha yeni bir değer zaten geldi
+                    self.last_seq[channel] = setpoint["s"]
+                    channels[channel] = setpoint[channel]
+            if not channels:
+                if "m" in setpoint or "a" in setpoint:
+                    self._count("stale")
+                return False
+            
+            if self.pending is not None:
+                # Önceki ayar noktası henüz uygulanmadı: yenisiyle birleştir
+                self._count("superseded")
+                self.pending["values"].update(channels)
+                self.pending.update(s=setpoint["s"], t=setpoint.get("t"), received=received)
+            else:
+                self.pending = {"s": setpoint["s"], "t": setpoint.get("t"),
+                                "values": channels, "received": received}
+            return True
+
+    def apply_pending(self):
+        """
+        Bekleyen en yeni ayar noktasını cihazlara yaz
+        
+        Returns:
+            dict | None: İstemciye gönderilecek onay, bekleyen yoksa None
+        """
+        with self.lock:
+            pending, self.pending = self.pending, None
+        if pending is None:
+            return None
+        
+        values = pending["values"]
+        wrote = blocked = False
+        with self.actuator_lock:
+            if "m" in values and self.motor is not None:
+                try:
+                    wrote |= self._apply_motor(values["m"])
+                except dcmotor.ForwardBlocked:
+                    # Refleks freni mandallı: motor engele doğru sürülmedi
+                    blocked = True
+                    self._count("blocked")
+            if "a" in values and self.servo is not None:
+                wrote |= self._apply_servo(values["a"])
+        
+        latency_ms = round((time.perf_counter() - pending["received"]) * 1000, 3)
+        if wrote:
+            apply_latency.append(latency_ms)
+            self._count("applied")
+        elif not blocked:
+            self._count("duplicates")
+        ack = {"type": "ack", "s": pending["s"], "t": pending["t"], "lat": latency_ms}
+        if blocked:
+            ack["blocked"] = True
+        return ack
+
+    def _motor_target(self):
+        """Motorun güncel hedefi işaretli hız olarak (-100..100, 0 = duruyor)"""
+        status = self.motor.status()
+        if status["state"] == "forward":
+            return status["speed"]
+        if status["state"] == "backward":
+            return -status["speed"]
+        return 0
+
+    def _apply_motor(self, speed):
+        # Oturumun son yazdığı değer değil motorun gerçek hedefi karşılaştırılır
+        # (motor başka yerden durdurulduysa aynı değer yeniden yazılır)
+        if self.motor_claimed and self._motor_target() == speed:
+            self.applied["m"] = speed
+            return False
+        if not self.motor_claimed:
+            self.motor_claimed = True
+            if self.on_motor_control is not None:
+                self.on_motor_control(self.motor)
+        if speed > 0:
+            self.motor.forward(speed)
+        elif speed < 0:
+            self.motor.backward(-speed)
+        else:
+            self.motor.stop()
+        self.applied["m"] = speed
+        return True
+
+    def _apply_servo(self, angle):
+        if self.applied["a"] == angle:
+            return False
+        # Sürekli kontrolde hareket beklenmez, darbe açık kalır
+        self.servo.set_angle(angle, wait=False)
+        self.applied["a"] = angle
+        return True
+
+    def check_deadman(self):
+        """
+        Mesaj akışı kesildiyse motoru durdur
+        
+        Returns:
+            bool: Motor durdurulduysa True
+        """
+        # Kontrol ile durdurma aynı kilit altında: arada uygulanan yeni ayar
+        # noktası durdurmayla ezilmez (kilidi bekleyip durdurmadan sonra yazılır)
+        with self.actuator_lock:
+            with self.lock:
+                idle = time.monotonic() - self.last_input
+            if idle < DEADMAN_TIMEOUT or self.applied["m"] in (None, 0):
+                return False
+            if self._motor_target() == 0:
+                self.applied["m"] = 0
+                return False
+            self.motor.stop()
+            self.applied["m"] = 0
+        stats["deadman_stops"] += 1
+        logger.warning("Kumanda sinyali %.0fms kesildi, motor durduruldu", idle * 1000)
+        return True
+
+    def close(self):
+        """Bağlantı kapandı: sürdüğü motoru durdur, servo darbesini kes"""
+        with sessions_lock:
+            sessions.discard(self)
+        with self.actuator_lock:
+            if self.motor is not None and self.applied["m"] not in (None, 0):
+                self.motor.stop()
+            if self.servo is not None and self.applied["a"] is not None:
+                self.servo.release()
+
+    def status(self):
+        return {
+            "motor": getattr(self.motor, "name", None),
+            "servo": getattr(self.servo, "name", None),
+            "applied": dict(self.applied),
+            "idle": round(time.monotonic() - self.last_input, 2),
+            **self.stats
+        }
+
+
+def get_status():
+    """Açık oturumlar, düşürülen mesajlar ve giriş-aktüatör gecikmesi"""
+    with sessions_lock:
+        active = list(sessions)
+    return {
+        "active": len(active),
+        "deadman_timeout": DEADMAN_TIMEOUT,
+        **stats,
+        "apply_latency_ms": izleme.percentiles(apply_latency),
+        "client_rtt_ms": izleme.percentiles(client_rtt),
+        "connections": [session.status() for session in active]
+    }
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Ultrasonik Sensör Dizisi Zamanlayıcısı
+Birden fazla HC-SR04'ü yankı karışmasını (crosstalk) önleyerek ateşler
+
+Sensörleri sırayla ölçmek güncelleme hızını sensör sayısına böler;
+hepsini aynı anda ateşlemek ise birinin darbesinin diğerine yankı olarak
+dönmesine yol açar. Zamanlayıcı sensörleri geometriye göre gruplar:
+bakış yönleri CROSSTALK_ANGLE'dan fazla ayrık olanlar aynı slotta
+birlikte ateşlenir, birbirini duyabilecek olanlar ayrı slotlara
+kaydırılır. Her döngüde tüm dizinin okumalarını içeren bir çerçeve
+yayınlanır.
+
+Yönü (heading) verilmeyen sensörlerin birbirini duyabileceği varsayılır.
+Elle verilen "group" değeri geometriye göre gruplamanın yerine geçer.
+
+Aynı slotta ateşlenen bir sensörün okuması bir önceki değerinden
+JUMP_THRESHOLD'dan fazla sıçrar ve slottaki başka bir sensörün okumasıyla
+CROSSTALK_TOLERANCE içinde örtüşürse başka sensörün yankısı kabul edilir
+ve reddedilir.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+
+import cihazlar
+import dijital_metre
+
+logger = logging.getLogger(__name__)
+
+# ==================== AYARLAR ====================
+CROSSTALK_ANGLE = 60.0      # Bakış yönleri bundan yakın sensörler birbirini duyar (derece)
+SLOT_GAP = 0.01             # Slotlar arası yankı sönümlenme beklemesi (saniye)
+CROSSTALK_TOLERANCE = 3.0   # Komşu okumayla bu kadar örtüşen sıçrama şüphelidir (cm)
+JUMP_THRESHOLD = 20.0       # Önceki okumadan bu kadar sıçrama şüphelidir (cm)
+RATE_WINDOW = 5.0           # Çerçeve hızı ölçüm penceresi (saniye)
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+plan_cache = {"key": None, "slots": []}
+last_frame = None
+frame_times = deque()       # Son çerçevelerin zamanları (monotonic)
+frame_listeners = []
+state_lock = threading.Lock()
+stats = {"frames": 0, "readings": 0, "rejected": 0, "last_frame_ms": None}
+
+
+def _interferes(a, b):
+    """İki sensör birbirinin yankısını duyabilir mi?"""
+    if a.heading is None or b.heading is None:
+        return True
+    difference = abs(a.heading - b.heading) % 360.0
+    return min(difference, 360.0 - difference) < CROSSTALK_ANGLE
+
+
+def plan(sensors):
+    """
+    Sensörleri ateşleme slotlarına ayır
+    
+    Elle grubu verilenler kendi grubunda toplanır; diğerleri açgözlü
+    graf boyama ile birbirini duymayanlar aynı slota düşecek şekilde
+    yerleştirilir.
+    
+    Args:
+        sensors: {id: UltrasonicSensor}
+    
+    Returns:
+        list: Slotlar, her biri [(id, sensör), ...]
+    """
+    slots = []
+    groups = {}
+    for device_id, sensor in sensors.items():
+        if sensor.group is not None:
+            if sensor.group not in groups:
+                groups[sensor.group] = []
+                slots.append(groups[sensor.group])
+            groups[sensor.group].append((device_id, sensor))
+    
+    automatic = []
+    for device_id, sensor in sensors.items():
+        if sensor.group is not None:
+            continue
+        for slot in automatic:
+            if not any(_interferes(sensor, other) for _, other in slot):
+                slot.append((device_id, sensor))
+                break
+        else:
+            automatic.append([(device_id, sensor)])
+    return slots + automatic
+
+
+def _current_plan():
+    """Etkin sensörler için planı döndür (sensör kümesi değişince yeniden hesaplanır)"""
+    sensors = {device_id: sensor for device_id, sensor in cihazlar.of_type("ultrasonic").items()
+               if sensor.is_active}
+    key = tuple((device_id, sensor.heading, sensor.group) for device_id, sensor in sensors.items())
+    with state_lock:
+        if plan_cache["key"] != key:
+            plan_cache["key"] = key
+            plan_cache["slots"] = plan(sensors)
+        return plan_cache["slots"]
+
+
+def _is_crosstalk(sensor, distance, slot_raw):
+    """Okuma aynı slottaki başka sensörün yankısına mı benziyor?"""
+    previous = sensor.last_distance
+    if not previous or abs(distance - previous) <= JUMP_THRESHOLD:
+        return False
+    return any(other is not sensor and raw is not None
+               and abs(raw - distance) <= CROSSTALK_TOLERANCE
+               for other, raw in slot_raw.items())
+
+
+def measure_frame():
+    """
+    Tüm etkin sensörleri slot slot ölçüp bir dizi çerçevesi üret
+    
+    Returns:
+        dict: {"seq", "time", "duration_ms", "slots", "readings": {id: cm veya -1},
+               "rejected": [id, ...]}
+    """
+    global last_frame
+    
+    started = time.monotonic()
+    readings = {}
+    rejected = []
+    slots = _current_plan()
+    
+    for index, slot in enumerate(slots):
+        if index > 0 and SLOT_GAP > 0:
+            time.sleep(SLOT_GAP)  # Önceki slotun yankıları sönümlensin
+        
+        raw = dijital_metre.ping_group([sensor for _, sensor in slot])
+        for device_id, sensor in slot:
+            distance = raw.get(sensor)
+            if distance is not None and len(slot) > 1 and _is_crosstalk(sensor, distance, raw):
+                rejected.append(device_id)
+                readings[device_id] = -1
+                continue
+            readings[device_id] = sensor.record_measurement(distance)
+    
+    finished = time.monotonic()
+    with state_lock:
+        stats["frames"] += 1
+        stats["readings"] += len(readings)
+        stats["rejected"] += len(rejected)
+        stats["last_frame_ms"] = round((finished - started) * 1000, 2)
+        frame_times.append(finished)
+        while frame_times and finished - frame_times[0] > RATE_WINDOW:
+            frame_times.popleft()
+        
+        last_frame = {
+            "seq": stats["frames"],
+            "time": time.time(),
+            "duration_ms": stats["last_frame_ms"],
+            "slots": [[device_id for device_id, _ in slot] for slot in slots],
+            "readings": readings,
+            "rejected": rejected
+        }
+        frame = last_frame
+        listeners = list(frame_listeners)
+    
+    for callback in listeners:
+        try:
+            callback(frame)
+        except Exception as e:
+            logger.error("Dizi çerçevesi dinleyicisi hatası: %s", e)
+    return frame
+
+
+def add_frame_listener(callback):
+    """Her çerçeve sonunda callback(frame) çağrılsın (ölçüm thread'inde)"""
+    with state_lock:
+        if callback not in frame_listeners:
+            frame_listeners.append(callback)
+
+
+def remove_frame_listener(callback):
+    """Çerçeve dinleyicisini kaldır"""
+    with state_lock:
+        if callback in frame_listeners:
+            frame_listeners.remove(callback)
+
+
+def get_frame():
+    """Son dizi çerçevesini döndür (henüz yoksa None)"""
+    return last_frame
+
+
+def configure(crosstalk_angle=None, slot_gap=None):
+    """
+    Zamanlayıcı ayarlarını güncelle (plan bir sonraki çerçevede yenilenir)
+    
+    Raises:
+        ValueError: Değerler aralık dışındaysa
+    """
+    global CROSSTALK_ANGLE, SLOT_GAP
+    
+    if crosstalk_angle is not None:
+        crosstalk_angle = float(crosstalk_angle)
+        if not 0 <= crosstalk_angle <= 180:
+            raise ValueError("crosstalk_angle 0-180 derece arasında olmalı")
+        CROSSTALK_ANGLE = crosstalk_angle
+    if slot_gap is not None:
+        slot_gap = float(slot_gap)
+        if not 0 <= slot_gap <= 0.1:
+            raise ValueError("slot_gap 0-0.1 saniye arasında olmalı")
+        SLOT_GAP = slot_gap
+    
+    with state_lock:
+        plan_cache["key"] = None
+    return get_status()
+
+
+def get_status():
+    """Dizi planı, çerçeve hızı ve yankı reddetme oranını döndür"""
+    slots = _current_plan()
+    with state_lock:
+        if len(frame_times) > 1:
+            span = frame_times[-1] - frame_times[0]
+            frame_rate = (len(frame_times) - 1) / span if span > 0 else 0.0
+        else:
+            frame_rate = 0.0
+        readings = stats["readings"]
+        return {
+            "crosstalk_angle": CROSSTALK_ANGLE,
+            "slot_gap": SLOT_GAP,
+            "slots": [[device_id for device_id, _ in slot] for slot in slots],
+            "frames": stats["frames"],
+            "frame_rate": round(frame_rate, 2),
+            "last_frame_ms": stats["last_frame_ms"],
+            "readings": readings,
+            "rejected": stats["rejected"],
+            "rejection_rate": round(stats["rejected"] / readings, 4) if readings else 0.0,
+            "last_frame": last_frame
+        }
@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+MQTT Telemetri Yayıncısı
+Sensör örneklerini toplu mesajlar halinde MQTT broker'ına gönderir
+
+Örnekleyici sadece bir kuyruğa ekleme yapar (add_sample, asla bloklamaz);
+yayıncı thread'i her BATCH_INTERVAL'da biriken örnekleri cihaz başına tek
+bir mesajda toplar ve <TOPIC_PREFIX>/<düğüm>/<cihaz id> konusuna yayınlar.
+Mesaj sütun düzenindedir:
+
+    {"node": "pi1", "device": "ultrasonic", "type": "ultrasonic",
+     "t": [1700000000.1, 1700000000.2], "distance": [41.2, 40.8], ...}
+
+Broker'a ulaşılamazken mesajlar diskteki sınırlı bir kuyruğa (segment
+dosyaları, kayıt başına CRC) yazılır; bağlantı geri geldiğinde önce
+bu kuyruk eskiden yeniye boşaltılır, sıra korunur. Segment dosyası
+içindeki tüm mesajlar onaylandıktan sonra silinir (QoS 1/2'de en az bir
+kez teslim). Kuyruk SPOOL_MAX_BYTES'ı aşarsa en eski segment düşürülür.
+
+Broker MQTT_BROKER ortam değişkeniyle verilir ("host" veya "host:port");
+tanımlı değilse veya paho-mqtt kurulu değilse yayıncı başlatılmaz.
+
+Yerel broker ile deneme:
+    mosquitto -p 1883 &
+    MQTT_BROKER=localhost python app.py
+    mosquitto_sub -t 'gomulu/#' -v
+    python mqtt_yayinci.py bench localhost      # yayın hızı ve örnekleyici maliyeti
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import queue
+import socket
+import struct
+import zlib
+import logging
+import threading
+from collections import deque
+
+import izleme
+
+logger = logging.getLogger(__name__)
+
+try:
+    import paho.mqtt.client as mqtt
+    PAHO_AVAILABLE = True
+except ImportError:
+    PAHO_AVAILABLE = False
+
+# ==================== AYARLAR ====================
+BROKER_ENV = "MQTT_BROKER"  # "host" veya "host:port"
+DEFAULT_PORT = 1883
+TOPIC_PREFIX = "gomulu"     # Konu: <önek>/<düğüm>/<cihaz id>
+NODE_ID = socket.gethostname()
+QOS = 1                     # 0: en fazla bir kez, 1: en az bir kez, 2: tam bir kez
+BATCH_INTERVAL = 1.0        # Örneklerin tek mesajda toplandığı süre (saniye)
+QUEUE_SIZE = 4096           # Örnekleyici kuyruğu kapasitesi
+MAX_PENDING = 100           # Onay bekleyen en fazla mesaj (fazlası diske yazılır)
+KEEPALIVE = 30              # MQTT keep-alive (saniye)
+SPOOL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mqtt_kuyruk")
+SPOOL_SEGMENT_BYTES = 256 * 1024    # Disk kuyruğu segment boyutu
+SPOOL_MAX_BYTES = 16 * 1024 * 1024  # Disk kuyruğunun en fazla boyutu
+SHUTDOWN_WAIT = 2.0         # Kapanışta onay bekleme süresi (saniye)
+LATENCY_SAMPLES = 500
+
+# Disk kuyruğu kaydı: yük uzunluğu, konu uzunluğu, CRC32(konu + yük)
+SPOOL_HEADER = struct.Struct("<IHI")
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+sample_queue = queue.Queue(maxsize=QUEUE_SIZE)
+publisher_thread = None
+publisher_running = False
+client = None
+broker = None               # (host, port)
+connected = False
+state_lock = threading.Lock()
+
+pending = {}                # mid -> {"topic", "payload", "segment", "sent"}
+early_acks = set()          # publish() dönmeden gelen onaylar
+segments = {}               # segment no -> {"path", "bytes", "records"} (eskiden yeniye)
+spool_file = None           # Yazılan (en yeni) segment
+drain = None                # Boşaltılan segment: {"index", "records", "position", "outstanding"}
+
+sampler_cost = deque(maxlen=LATENCY_SAMPLES)    # add_sample süresi (µs)
+ack_latency = deque(maxlen=LATENCY_SAMPLES)     # publish -> onay (ms)
+stats = {"samples": 0, "dropped_samples": 0, "messages": 0, "published": 0, "acked": 0,
+         "spooled": 0, "drained": 0, "spool_dropped": 0, "connects": 0, "disconnects": 0,
+         "started": None, "last_error": None}
+
+
+# ==================== MESAJ OLUŞTURMA ====================
+
+def build_messages(samples):
+    """
+    Örnekleri cihaz başına sütun düzenli mesajlara dönüştür
+    
+    Args:
+        samples: Sensör döngüsü örnekleri ("wall" ve "devices" alanları)
+    
+    Returns:
+        list: [(konu, yük bytes), ...]
+    """
+    columns = {}
+    for sample in samples:
+        for device_id, device in (sample.get("devices") or {}).items():
+            message = columns.get(device_id)
+            if message is None:
+                message = columns[device_id] = {"node": NODE_ID, "device": device_id,
+                                                 "type": device.get("type"), "t": []}
+            index = len(message["t"])
+            message["t"].append(round(sample.get("wall", 0.0), 3))
+            for field, value in device.items():
+                if field != "type":
+                    # Sonradan görünen alan önceki örnekler için None ile doldurulur
+                    message.setdefault(field, [None] * index).append(value)
+            for field, values in message.items():
+                if isinstance(values, list) and len(values) == index:
+                    values.append(None)
+    
+    return [(f"{TOPIC_PREFIX}/{NODE_ID}/{device_id}",
+             json.dumps(message, separators=(",", ":"), default=str).encode())
+            for device_id, message in columns.items()]
+
+
+# ==================== DİSK KUYRUĞU ====================
+
+def _segment_path(index):
+    return os.path.join(SPOOL_DIR, f"mq_{index:06d}.spool")
+
+
+def _read_segment(path):
+    """Segmentteki geçerli kayıtları oku (ilk bozuk/yarım kayıtta durur)"""
+    records = []
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return records
+    
+    offset = 0
+    while offset + SPOOL_HEADER.size <= len(data):
+        length, topic_length, crc = SPOOL_HEADER.unpack_from(data, offset)
+        start = offset + SPOOL_HEADER.size
+        end = start + topic_length + length
+        if end > len(data) or zlib.crc32(data[start:end]) != crc:
+            break
+        records.append((data[start:start + topic_length].decode(), data[start + topic_length:end]))
+        offset = end
+    return records
+
+
+def _load_spool():
+    """Önceki çalışmadan kalan segmentleri bul"""
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    segments.clear()
+    for path in sorted(glob.glob(os.path.join(SPOOL_DIR, "mq_*.spool"))):
+        records = len(_read_segment(path))
+        if records:
+            segments[int(os.path.basename(path)[3:9])] = {
+                "path": path, "bytes": os.path.getsize(path), "records": records}
+        else:
+            os.remove(path)
+    if segments:
+        logger.info("MQTT disk kuyruğunda %d mesaj bekliyor",
+                    sum(segment["records"] for segment in segments.values()))
+
+
+def _close_spool_file():
+    global spool_file
+    
+    if spool_file is not None:
+        spool_file.close()
+        spool_file = None
+
+
+def _spool(topic, payload):
+    """Mesajı disk kuyruğuna ekle (state_lock altında)"""
+    global spool_file
+    
+    newest = next(reversed(segments), None)
+    if (spool_file is None or newest is None
+            or (drain is not None and drain["index"] == newest)
+            or segments[newest]["bytes"] >= SPOOL_SEGMENT_BYTES):
+        _close_spool_file()
+        newest = (newest + 1) if newest is not None else 0
+        segments[newest] = {"path": _segment_path(newest), "bytes": 0, "records": 0}
+        spool_file = open(segments[newest]["path"], "ab")
+    
+    topic_bytes = topic.encode()
+    record = (SPOOL_HEADER.pack(len(payload), len(topic_bytes), zlib.crc32(topic_bytes + payload))
+              + topic_bytes + payload)
+    spool_file.write(record)
+    spool_file.flush()
+    segments[newest]["bytes"] += len(record)
+    segments[newest]["records"] += 1
+    stats["spooled"] += 1
+    
+    # Boyut sınırı: en eski segment(ler) düşürülür
+    while len(segments) > 1 and sum(segment["bytes"] for segment in segments.values()) > SPOOL_MAX_BYTES:
+        _remove_segment(next(iter(segments)), dropped=True)
+
+
+def _remove_segment(index, dropped=False):
+    global drain
+    
+    segment = segments.pop(index)
+    if dropped:
+        stats["spool_dropped"] += segment["records"]
+        logger.warning("MQTT disk kuyruğu dolu, %d eski mesaj düşürüldü", segment["records"])
+    if drain is not None and drain["index"] == index:
+        drain = None
+    try:
+        os.remove(segment["path"])
+    except OSError:
+        pass
+
+
+def _drain_spool():
+    """Bağlıyken disk kuyruğunu eskiden yeniye gönder (onay penceresi kadar)"""
+    global drain
+    
+    while True:
+        with state_lock:
+            if not connected or len(pending) >= MAX_PENDING:
+                return
+            if drain is None:
+                if not segments:
+                    return
+                index = next(iter(segments))
+                if spool_file is not None and index == next(reversed(segments)):
+                    _close_spool_file()     # Boşaltılan segmente artık yazılmaz
+                drain = {"index": index, "records": _read_segment(segments[index]["path"]),
+                         "position": 0, "outstanding": 0}
+            if drain["position"] >= len(drain["records"]):
+                if drain["outstanding"] == 0:
+                    _remove_segment(drain["index"])
+                    continue
+                return      # Son mesajların onayı bekleniyor
+            topic, payload = drain["records"][drain["position"]]
+            drain["position"] += 1
+            drain["outstanding"] += 1
+            index = drain["index"]
+        
+        if not _send(topic, payload, segment=index):
+            with state_lock:
+                if drain is not None and drain["index"] == index:
+                    drain["position"] -= 1
+                    drain["outstanding"] -= 1
+            return
+
+
+# ==================== YAYIN ====================
+
+def _send(topic, payload, segment=None):
+    """
+    Mesajı paho'ya ver ve onayını takip et
+    
+    Returns:
+        bool: paho mesajı kabul ettiyse True
+    """
+    sent = time.perf_counter()
+    info = client.publish(topic, payload, qos=QOS)
+    if info.rc != mqtt.MQTT_ERR_SUCCESS and not (QOS > 0 and info.rc == mqtt.MQTT_ERR_NO_CONN):
+        # QoS 0 bağlantı yokken düşürülür; QoS>0'ı paho yeniden bağlanınca gönderir
+        stats["last_error"] = mqtt.error_string(info.rc)
+        return False
+    
+    with state_lock:
+        stats["published"] += 1
+        if info.mid in early_acks:
+            early_acks.discard(info.mid)
+            _acknowledged({"segment": segment, "sent": sent})
+        else:
+            pending[info.mid] = {"topic": topic, "payload": payload, "segment": segment, "sent": sent}
+    return True
+
+
+def _acknowledged(entry):
+    """Onaylanan mesajın kaydını düş (state_lock altında)"""
+    stats["acked"] += 1
+    ack_latency.append(round((time.perf_counter() - entry["sent"]) * 1000, 3))
+    if entry["segment"] is not None:
+        stats["drained"] += 1
+        if drain is not None and drain["index"] == entry["segment"]:
+            drain["outstanding"] -= 1
+
+
+def _on_publish(_client, _userdata, mid, *args):
+    with state_lock:
+        entry = pending.pop(mid, None)
+        if entry is None:
+            early_acks.add(mid)
+        else:
+            _acknowledged(entry)
+
+
+def _on_connect(_client, _userdata, _flags, reason_code, *args):
+    global connected
+    
+    failed = getattr(reason_code, "is_failure", reason_code != 0)
+    if failed:
+        stats["last_error"] = str(reason_code)
+        logger.warning("MQTT bağlantısı reddedildi: %s", reason_code)
+        return
+    
+    with state_lock:
+        connected = True
+        stats["connects"] += 1
+    # Son vasiyet "offline"; bağlanınca "online" (retain)
+    _client.publish(f"{TOPIC_PREFIX}/{NODE_ID}/status", "online", qos=1, retain=True)
+    logger.info("MQTT broker'ına bağlanıldı: %s:%d", *broker)
+
+
+def _on_disconnect(_client, _userdata, *args):
+    global connected
+    
+    with state_lock:
+        was_connected, connected = connected, False
+        if was_connected:
+            stats["disconnects"] += 1
+    if was_connected and publisher_running:
+        logger.warning("MQTT bağlantısı koptu, mesajlar diske yazılacak")
+
+
+def _route(messages):
+    """
+    Mesajları gönder veya disk kuyruğuna yaz
+    
+    Disk kuyruğunda bekleyen varsa sıra bozulmasın diye yeni mesajlar
+    da kuyruğun sonuna eklenir.
+    """
+    for topic, payload in messages:
+        with state_lock:
+            live = connected and not segments and len(pending) < MAX_PENDING
+            if not live:
+                _spool(topic, payload)
+                continue
+        if not _send(topic, payload):
+            with state_lock:
+                _spool(topic, payload)
+
+
+def publisher_loop():
+    """Örnekleri topla, aralık dolunca cihaz başına mesaj olarak gönder"""
+    batch = []
+    deadline = time.monotonic() + BATCH_INTERVAL
+    
+    while publisher_running:
+        try:
+            batch.append(sample_queue.get(timeout=max(0.0, min(0.2, deadline - time.monotonic()))))
+        except queue.Empty:
+            pass
+        
+        try:
+            if time.monotonic() >= deadline:
+                deadline += BATCH_INTERVAL
+                if deadline < time.monotonic():
+                    deadline = time.monotonic() + BATCH_INTERVAL
+                while True:
+                    try:
+                        batch.append(sample_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch:
+                    messages = build_messages(batch)
+                    stats["messages"] += len(messages)
+                    batch = []
+                    _route(messages)
+            _drain_spool()
+        except Exception as e:
+            stats["last_error"] = str(e)
+            logger.error("MQTT yayın hatası: %s", e)
+    
+    # Kapanış: kalan örnekleri son bir mesajla gönder
+    while True:
+        try:
+            batch.append(sample_queue.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        messages = build_messages(batch)
+        stats["messages"] += len(messages)
+        _route(messages)
+
+
+def add_sample(sample):
+    """
+    Örneği yayın kuyruğuna ekle (sensör döngüsünden, asla bloklamaz)
+    
+    Returns:
+        bool: Kuyruğa eklendiyse True, kuyruk doluysa veya yayıncı kapalıysa False
+    """
+    if not publisher_running:
+        return False
+    
+    started = time.perf_counter()
+    try:
+        sample_queue.put_nowait(sample)
+    except queue.Full:
+        stats["dropped_samples"] += 1
+        return False
+    stats["samples"] += 1
+    sampler_cost.append(round((time.perf_counter() - started) * 1e6, 2))
+    return True
+
+
+def parse_broker(text):
+    """
+    "host" veya "host:port" metnini çözümle
+    
+    Raises:
+        ValueError: Port geçersizse
+    """
+    host, _, port = (text or "").strip().rpartition(":")
+    if not host:
+        return port, DEFAULT_PORT
+    if not port.isdigit():
+        raise ValueError(f"Geçersiz broker adresi: {text}")
+    return host, int(port)
+
+
+def start(address=None):
+    """
+    Yayıncıyı başlat
+    
+    Args:
+        address: "host[:port]" (None ise MQTT_BROKER ortam değişkeni)
+    
+    Returns:
+        bool: Başlatıldıysa True (broker tanımlı değilse veya paho yoksa False)
+    """
+    global publisher_thread, publisher_running, client, broker
+    
+    if publisher_running:
+        return False
+    address = address or os.environ.get(BROKER_ENV)
+    if not address:
+        return False
+    if not PAHO_AVAILABLE:
+        logger.warning("paho-mqtt bulunamadı, MQTT yayıncısı devre dışı (pip install paho-mqtt)")
+        return False
+    
+    broker = parse_broker(address)
+    with state_lock:
+        _load_spool()
+    
+    client_id = f"{TOPIC_PREFIX}-{NODE_ID}"
+    if hasattr(mqtt, "CallbackAPIVersion"):
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=client_id)
+    else:
+        client = mqtt.Client(client_id=client_id)
+    client.on_connect = _on_connect
+    client.on_disconnect = _on_disconnect
+    client.on_publish = _on_publish
+    client.will_set(f"{TOPIC_PREFIX}/{NODE_ID}/status", "offline", qos=1, retain=True)
+    client.reconnect_delay_set(min_delay=1, max_delay=30)
+    client.connect_async(broker[0], broker[1], keepalive=KEEPALIVE)
+    client.loop_start()
+    
+    stats["started"] = time.monotonic()
+    publisher_running = True
+    publisher_thread = threading.Thread(target=publisher_loop, daemon=True)
+    publisher_thread.start()
+    logger.info("MQTT yayıncısı başlatıldı: %s:%d, QoS %d, %gs toplu gönderim",
+                broker[0], broker[1], QOS, BATCH_INTERVAL)
+    return True
+
+
+def stop():
+    """Kalan örnekleri gönder, onay bekleyenleri diske yaz ve bağlantıyı kapat"""
+    global publisher_thread, publisher_running, client, connected
+    
+    if not publisher_running:
+        return False
+    
+    publisher_running = False
+    if publisher_thread:
+        publisher_thread.join(timeout=5.0)
+    publisher_thread = None
+    
+    deadline = time.monotonic() + SHUTDOWN_WAIT
+    while time.monotonic() < deadline:
+        with state_lock:
+            if not connected or not any(entry["segment"] is None for entry in pending.values()):
+                break
+        time.sleep(0.05)
+    
+    with state_lock:
+        # Onaylanmamış canlı mesajlar sonraki çalışmada gönderilir
+        # (disk kuyruğundan gelenlerin segmenti zaten silinmedi)
+        for entry in pending.values():
+            if entry["segment"] is None:
+                _spool(entry["topic"], entry["payload"])
+        pending.clear()
+        early_acks.clear()
+        _close_spool_file()
+        connected = False
+    
+    client.publish(f"{TOPIC_PREFIX}/{NODE_ID}/status", "offline", qos=1, retain=True)
+    client.disconnect()
+    client.loop_stop()
+    client = None
+    logger.info("MQTT yayıncısı durduruldu.")
+    return True
+
+
+def configure(qos=None, batch_interval=None):
+    """
+    Yayın ayarlarını güncelle (bir sonraki mesajdan itibaren geçerli)
+    
+    Raises:
+        ValueError: Değerler aralık dışındaysa
+    """
+    global QOS, BATCH_INTERVAL
+    
+    if qos is not None:
+        qos = int(qos)
+        if qos not in (0, 1, 2):
+            raise ValueError("qos 0, 1 veya 2 olmalı")
+        QOS = qos
+    if batch_interval is not None:
+        batch_interval = float(batch_interval)
+        if not 0.05 <= batch_interval <= 60:
+            raise ValueError("batch_interval 0.05-60 saniye arasında olmalı")
+        BATCH_INTERVAL = batch_interval
+    return get_status()
+
+
+def get_status():
+    """Bağlantı, disk kuyruğu, yayın hızı ve örnekleyiciye eklenen gecikme"""
+    uptime = time.monotonic() - stats["started"] if stats["started"] else None
+    with state_lock:
+        spool = {
+            "segments": len(segments),
+            "messages": sum(segment["records"] for segment in segments.values()),
+            "bytes": sum(segment["bytes"] for segment in segments.values()),
+            "max_bytes": SPOOL_MAX_BYTES,
+            "draining": drain is not None
+        }
+        in_flight = len(pending)
+    return {
+        "available": PAHO_AVAILABLE,
+        "running": publisher_running,
+        "connected": connected,
+        "broker": f"{broker[0]}:{broker[1]}" if broker else None,
+        "topic": f"{TOPIC_PREFIX}/{NODE_ID}/<cihaz>",
+        "qos": QOS,
+        "batch_interval": BATCH_INTERVAL,
+        "queue_depth": sample_queue.qsize(),
+        "pending": in_flight,
+        "spool": spool,
+        "messages_per_s": round(stats["acked"] / uptime, 2) if uptime else None,
+        "samples_per_s": round(stats["samples"] / uptime, 2) if uptime else None,
+        "sampler_cost_us": izleme.percentiles(sampler_cost),
+        "ack_latency_ms": izleme.percentiles(ack_latency),
+        "stats": {key: value for key, value in stats.items() if key != "started"}
+    }
+
+
+# Modül doğrudan çalıştırılırsa yayın hızı testi
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else "bench"
+    address = sys.argv[2] if len(sys.argv) > 2 else "localhost"
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 1000.0
+    duration = float(sys.argv[4]) if len(sys.argv) > 4 else 5.0
+    
+    if command != "bench":
+        print("Kullanım: python mqtt_yayinci.py bench [broker] [örnek/s] [süre]")
+        sys.exit(1)
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if not start(address):
+        print("Yayıncı başlatılamadı (paho-mqtt kurulu mu?)")
+        sys.exit(1)
+    
+    print(f"{rate:g} örnek/s, {duration:g} saniye, QoS {QOS}...")
+    device = {"type": "ultrasonic", "active": True, "distance": 0.0, "stale": False}
+    interval = 1.0 / rate
+    next_tick = time.monotonic()
+    end = next_tick + duration
+    while time.monotonic() < end:
+        add_sample({"wall": time.time(), "devices": {
+            "ultrasonic": dict(device, distance=round(time.time() % 100, 1)),
+            "imu": {"type": "imu", "accel_x": 0.0, "accel_y": 0.0, "accel_z": 9.81}}})
+        next_tick += interval
+        time.sleep(max(0.0, next_tick - time.monotonic()))
+    time.sleep(BATCH_INTERVAL * 1.5)
+    
+    status = get_status()
+    stop()
+    print(json.dumps({key: status[key] for key in ("connected", "samples_per_s", "messages_per_s",
+                                                   "sampler_cost_us", "ack_latency_ms", "spool", "stats")},
+                     indent=2))
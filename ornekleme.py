@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Talebe Bağlı Örnekleme Modülü
+Sensör okuma hızını bağlı tüketicilerin ihtiyacına göre ayarlar
+
+Her tüketici (web istemcisi, PID, refleks, sekans...) ihtiyaç duyduğu
+hızı bildirir. Sensör döngüsü tüketicilerin istediği en yüksek hızda
+örnekler; kimse dinlemiyorsa IDLE_RATE'e düşer (0 ise tamamen durur).
+Bu sayede ekran kapalıyken ultrasonik ping ve I2C trafiği boşuna
+yapılmaz.
+
+Abonelik hızı sabit bir sayı veya o anki ihtiyacı döndüren bir
+fonksiyon olabilir. ttl verilen abonelikler yenilenmezse düşer
+(HTTP istemcileri her istekte aboneliklerini yeniler).
+"""
+
+import time
+import threading
+
+# ==================== AYARLAR ====================
+MAX_RATE = 16.0             # HC-SR04 için en az ~60ms ölçüm döngüsü (Hz)
+IDLE_RATE = 0.5             # Kimse dinlemiyorken örnekleme hızı (0 = dur)
+CLIENT_TTL = 3.0            # HTTP istemci aboneliğinin geçerlilik süresi (saniye)
+DEFAULT_CLIENT_RATE = 2.0   # Hız bildirmeyen HTTP istemcileri için (500ms polling)
+MAX_WAIT = 1.0              # Bekleme bu süreyi aşmaz (durdurma isteği kontrol edilir)
+DEMAND_POLL = 0.05          # Fonksiyonla bildirilen talepler bu aralıkla yeniden okunur
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+subscribers = {}            # ad -> {"rate", "expires"}
+subscribers_lock = threading.Lock()
+demand_changed = threading.Event()
+stats = {"samples": 0, "idle_waits": 0}
+
+
+def subscribe(name, rate, ttl=None):
+    """
+    Tüketici kaydet veya aboneliğini yenile
+    
+    Args:
+        name: Tüketici adı (aynı adla çağrı aboneliği günceller)
+        rate: İstenen hız (Hz) veya hızı döndüren fonksiyon
+        ttl: Abonelik süresi (saniye, None ise süresiz)
+    """
+    expires = time.monotonic() + ttl if ttl else None
+    with subscribers_lock:
+        previous = subscribers.get(name)
+        subscribers[name] = {"rate": rate, "expires": expires}
+    # Yeni veya hızlanan tüketici beklemeyi hemen bozsun
+    if previous is None or previous["rate"] != rate:
+        demand_changed.set()
+
+
+def unsubscribe(name):
+    """Tüketiciyi kaldır"""
+    with subscribers_lock:
+        removed = subscribers.pop(name, None)
+    if removed is not None:
+        demand_changed.set()
+    return removed is not None
+
+
+def _rate_of(entry):
+    rate = entry["rate"]
+    if callable(rate):
+        rate = rate()
+    return max(0.0, float(rate or 0.0))
+
+
+def get_demand():
+    """
+    Tüketicilerin o anki hız taleplerini döndür (süresi dolanlar silinir)
+    
+    Returns:
+        dict: ad -> hız (Hz)
+    """
+    now = time.monotonic()
+    with subscribers_lock:
+        expired = [name for name, entry in subscribers.items()
+                   if entry["expires"] is not None and entry["expires"] < now]
+        for name in expired:
+            del subscribers[name]
+        entries = list(subscribers.items())
+    return {name: _rate_of(entry) for name, entry in entries}
+
+
+def has_demand():
+    """En az bir tüketici sıfırdan büyük hız istiyor mu?"""
+    return max(get_demand().values(), default=0.0) > 0
+
+
+def _has_dynamic_demand():
+    with subscribers_lock:
+        return any(callable(entry["rate"]) for entry in subscribers.values())
+
+
+def current_rate():
+    """Örnekleme hızı: en yüksek talep, talep yoksa IDLE_RATE"""
+    demand = max(get_demand().values(), default=0.0)
+    if demand <= 0:
+        return IDLE_RATE
+    return min(MAX_RATE, demand)
+
+
+def wait_for_next(previous_tick):
+    """
+    Bir sonraki örnekleme anına kadar bekle
+    
+    Talep değişirse (yeni abone) bekleme yeniden hesaplanır, böylece
+    boşta bekleyen döngü yeni istemci gelince hemen hızlanır. Fonksiyonla
+    bildirilen talepler (ör. motor ileri giderken refleks) olay
+    üretmediği için DEMAND_POLL aralığıyla yeniden okunur.
+    
+    Args:
+        previous_tick: Önceki örneğin planlanan anı (time.monotonic)
+    
+    Returns:
+        float | None: Örnek alınacak an; MAX_WAIT içinde örnek zamanı
+                      gelmediyse None (çağıran durdurma bayrağını kontrol eder)
+    """
+    deadline = time.monotonic() + MAX_WAIT
+    while True:
+        demand_changed.clear()
+        rate = current_rate()
+        now = time.monotonic()
+        if now >= deadline:
+            return None
+        limit = DEMAND_POLL if _has_dynamic_demand() else MAX_WAIT
+        
+        if rate <= 0:
+            stats["idle_waits"] += 1
+            demand_changed.wait(min(limit, deadline - now))
+            continue
+        
+        period = 1.0 / rate
+        target = previous_tick + period
+        if target < now - period:
+            # Geride kaldıysak kaçırılan örnekleri telafi etmeye çalışma
+            target = now
+        if target <= now:
+            stats["samples"] += 1
+            return target
+        demand_changed.wait(min(target - now, limit, deadline - now))
+
+
+def configure(idle_rate=None, max_rate=None):
+    """Boşta ve en yüksek örnekleme hızlarını ayarla"""
+    global IDLE_RATE, MAX_RATE
+    
+    if idle_rate is not None:
+        IDLE_RATE = max(0.0, float(idle_rate))
+    if max_rate is not None:
+        MAX_RATE = max(0.5, float(max_rate))
+    demand_changed.set()
+
+
+def get_status():
+    """Örnekleme hızını ve tüketici taleplerini döndür"""
+    demand = get_demand()
+    return {
+        "rate": current_rate(),
+        "idle_rate": IDLE_RATE,
+        "max_rate": MAX_RATE,
+        "idle": max(demand.values(), default=0.0) <= 0,
+        "subscribers": {name: round(rate, 2) for name, rate in demand.items()},
+        "samples": stats["samples"],
+        "idle_waits": stats["idle_waits"]
+    }
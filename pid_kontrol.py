@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Mesafe Tutma PID Kontrol Modülü
+Ultrasonik sensörden gelen son mesafeyi okuyarak DC motoru
+belirlenen hedef mesafede tutmak için sabit frekanslı PID döngüsü çalıştırır
+
+Hata pozitifse (engel hedeften uzaksa) motor ileri, negatifse geri sürülür.
+Sensör verisi eskidiğinde motor durdurulur ve integral sıfırlanır.
+Refleks fren eşiğinin içindeyken motor ileri sürülmez; hedef mesafe
+refleksin temel fren mesafesinden kısa olamaz.
+"""
+
+import logging
+import time
+import threading
+
+import dcmotor
+import dijital_metre
+import ornekleme
+import refleks
+
+logger = logging.getLogger(__name__)
+
+# ==================== VARSAYILAN AYARLAR ====================
+LOOP_RATE = 20.0          # Kontrol döngüsü frekansı (Hz)
+SETPOINT = 30.0           # Hedef mesafe (cm)
+KP = 2.0                  # Oransal kazanç
+KI = 0.5                  # İntegral kazancı
+KD = 0.1                  # Türev kazancı
+OUTPUT_LIMIT = 60.0       # Maksimum motor hızı (%)
+MIN_OUTPUT = 15.0         # Motorun dönmeye başladığı minimum hız (%)
+DEADBAND = 1.0            # Bu hatanın altında motor durur (cm)
+INTEGRAL_LIMIT = 100.0    # İntegral teriminin mutlak sınırı (anti-windup)
+STALE_TIMEOUT = 1.0       # Bu süreden eski mesafe verisi kullanılmaz (saniye)
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+config_lock = threading.Lock()
+pid_thread = None
+pid_running = False
+
+# Kontrolcü iç durumu
+integral = 0.0
+last_measurement = None
+
+# Telemetri
+telemetry = {
+    "loops": 0,
+    "distance": None,
+    "error": None,
+    "output": 0.0,
+    "p_term": 0.0,
+    "i_term": 0.0,
+    "d_term": 0.0,
+    "stale": False,
+    "stale_events": 0,
+    "loop_period_ms": 0.0,
+    "max_jitter_ms": 0.0,
+    "max_compute_ms": 0.0,
+    "overruns": 0,
+    "reflex_blocked": 0
+}
+
+
+def configure(setpoint=None, kp=None, ki=None, kd=None, output_limit=None,
+              min_output=None, deadband=None, stale_timeout=None, loop_rate=None):
+    """
+    PID ayarlarını çalışma anında güncelle
+    
+    Returns:
+        dict: Güncel ayarlar
+    
+    Raises:
+        ValueError: Hedef mesafe refleks fren mesafesinden kısaysa
+    """
+    global SETPOINT, KP, KI, KD, OUTPUT_LIMIT, MIN_OUTPUT, DEADBAND
+    global STALE_TIMEOUT, LOOP_RATE, integral
+    
+    with config_lock:
+        if setpoint is not None:
+            setpoint = float(setpoint)
+            if setpoint < refleks.STOP_DISTANCE:
+                raise ValueError(f"Hedef mesafe refleks fren mesafesinden "
+                                 f"({refleks.STOP_DISTANCE}cm) kısa olamaz")
+            SETPOINT = min(400.0, setpoint)
+        if kp is not None:
+            KP = float(kp)
+        if ki is not None:
+            KI = float(ki)
+            integral = 0.0
+        if kd is not None:
+            KD = float(kd)
+        if output_limit is not None:
+            OUTPUT_LIMIT = max(0.0, min(100.0, float(output_limit)))
+        if min_output is not None:
+            MIN_OUTPUT = max(0.0, min(100.0, float(min_output)))
+        if deadband is not None:
+            DEADBAND = max(0.0, float(deadband))
+        if stale_timeout is not None:
+            STALE_TIMEOUT = max(0.05, float(stale_timeout))
+        if loop_rate is not None:
+            LOOP_RATE = max(1.0, min(200.0, float(loop_rate)))
+    
+    return get_config()
+
+
+def get_config():
+    """PID ayarlarını döndür"""
+    with config_lock:
+        return {
+            "setpoint": SETPOINT,
+            "kp": KP,
+            "ki": KI,
+            "kd": KD,
+            "output_limit": OUTPUT_LIMIT,
+            "min_output": MIN_OUTPUT,
+            "deadband": DEADBAND,
+            "stale_timeout": STALE_TIMEOUT,
+            "loop_rate": LOOP_RATE
+        }
+
+
+def reset():
+    """Kontrolcü iç durumunu sıfırla"""
+    global integral, last_measurement
+    integral = 0.0
+    last_measurement = None
+
+
+def compute(distance, dt):
+    """
+    Tek bir PID adımı hesapla
+    
+    Args:
+        distance: Ölçülen mesafe (cm)
+        dt: Bir önceki adımdan bu yana geçen süre (saniye)
+    
+    Returns:
+        float: Motor çıkışı (-OUTPUT_LIMIT..OUTPUT_LIMIT), pozitif = ileri
+    """
+    global integral, last_measurement
+    
+    with config_lock:
+        setpoint, kp, ki, kd = SETPOINT, KP, KI, KD
+        limit, deadband = OUTPUT_LIMIT, DEADBAND
+    
+    error = distance - setpoint
+    
+    # Türev ölçüm üzerinden alınır (setpoint değişiminde sıçrama olmaz)
+    if last_measurement is None or dt <= 0:
+        derivative = 0.0
+    else:
+        derivative = -(distance - last_measurement) / dt
+    last_measurement = distance
+    
+    p_term = kp * error
+    d_term = kd * derivative
+    
+    # Anti-windup: çıkış doymuşsa ve hata aynı yöne itiyorsa integrali büyütme
+    candidate = integral + error * dt
+    candidate = max(-INTEGRAL_LIMIT, min(INTEGRAL_LIMIT, candidate))
+    unclamped = p_term + ki * candidate + d_term
+    if abs(unclamped) <= limit or (unclamped > 0) != (error > 0):
+        integral = candidate
+    i_term = ki * integral
+    
+    output = max(-limit, min(limit, p_term + i_term + d_term))
+    if abs(error) < deadband:
+        output = 0.0
+    
+    telemetry["error"] = round(error, 2)
+    telemetry["p_term"] = round(p_term, 2)
+    telemetry["i_term"] = round(i_term, 2)
+    telemetry["d_term"] = round(d_term, 2)
+    telemetry["output"] = round(output, 2)
+    
+    return output
+
+
+def apply_output(output):
+    """PID çıkışını motor komutuna çevir"""
+    with config_lock:
+        min_output = MIN_OUTPUT
+    
+    speed = abs(output)
+    if speed < 0.5:
+        if dcmotor.get_current_state() != "stopped":
+            dcmotor.stop()
+        return
+    
+    # Motorun ölü bölgesini atlamak için minimum hıza yükselt
+    speed = int(round(max(min_output, speed)))
+    direction = "forward" if output > 0 else "backward"
+    
+    try:
+        if dcmotor.get_current_state() != direction:
+            if direction == "forward":
+                dcmotor.forward(speed)
+            else:
+                dcmotor.backward(speed)
+        elif dcmotor.get_current_speed() != speed:
+            dcmotor.set_speed(speed)
+    except dcmotor.ForwardBlocked:
+        # Engel refleks eşiğinin içinde: frenlenen motoru yeniden ileri sürme
+        telemetry["reflex_blocked"] += 1
+        if dcmotor.get_current_state() == "forward":
+            dcmotor.stop()
+
+
+def pid_loop():
+    """Sabit frekanslı PID kontrol döngüsü"""
+    reset()
+    last = time.monotonic()
+    next_tick = last
+    
+    while pid_running:
+        loop_start = time.monotonic()
+        dt = loop_start - last
+        last = loop_start
+        
+        with config_lock:
+            period = 1.0 / LOOP_RATE
+            stale_timeout = STALE_TIMEOUT
+        
+        # Döngü zamanlama telemetrisi
+        if telemetry["loops"] > 0:
+            telemetry["loop_period_ms"] = round(dt * 1000, 2)
+            jitter = abs(dt - period) * 1000
+            if jitter > telemetry["max_jitter_ms"]:
+                telemetry["max_jitter_ms"] = round(jitter, 2)
+        
+        distance = dijital_metre.get_last_distance()
+        age = dijital_metre.get_distance_age()
+        
+        if age is None or age > stale_timeout or not dijital_metre.is_sensor_active():
+            # Veri eski: güvenli duruma geç
+            if not telemetry["stale"]:
+                telemetry["stale_events"] += 1
+                logger.warning("Mesafe verisi eski, motor durduruluyor")
+                dcmotor.stop()
+            telemetry["stale"] = True
+            telemetry["output"] = 0.0
+            reset()
+        else:
+            telemetry["stale"] = False
+            telemetry["distance"] = distance
+            output = compute(distance, dt)
+            apply_output(output)
+        
+        telemetry["loops"] += 1
+        compute_ms = (time.monotonic() - loop_start) * 1000
+        if compute_ms > telemetry["max_compute_ms"]:
+            telemetry["max_compute_ms"] = round(compute_ms, 3)
+        
+        next_tick += period
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            telemetry["overruns"] += 1
+            next_tick = time.monotonic()
+
+
+def start():
+    """PID kontrol döngüsünü başlat"""
+    global pid_thread, pid_running
+    
+    if pid_running:
+        return False
+    
+    for key in ("loops", "stale_events", "overruns", "reflex_blocked"):
+        telemetry[key] = 0
+    for key in ("max_jitter_ms", "max_compute_ms"):
+        telemetry[key] = 0.0
+    
+    pid_running = True
+    # Mesafe örneklerine döngü hızında ihtiyaç var (örnekleyici en fazla MAX_RATE'e çıkar)
+    ornekleme.subscribe("pid", lambda: LOOP_RATE)
+    pid_thread = threading.Thread(target=pid_loop, daemon=True)
+    pid_thread.start()
+    logger.info("PID mesafe kontrolü başlatıldı.")
+    return True
+
+
+def stop():
+    """PID kontrol döngüsünü durdur ve motoru durdur"""
+    global pid_thread, pid_running
+    
+    was_running = pid_running
+    pid_running = False
+    ornekleme.unsubscribe("pid")
+    if pid_thread and pid_thread is not threading.current_thread():
+        pid_thread.join(timeout=1.0)
+    pid_thread = None
+    
+    if was_running:
+        dcmotor.stop()
+        logger.info("PID mesafe kontrolü durduruldu.")
+    return was_running
+
+
+def is_running():
+    """PID döngüsü çalışıyor mu?"""
+    return pid_running
+
+
+def get_status():
+    """PID durumunu ve telemetriyi döndür"""
+    return {
+        "running": pid_running,
+        "config": get_config(),
+        "telemetry": dict(telemetry)
+    }
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Güvenlik Refleksi Modülü
+Ultrasonik ölçümü yapan thread içinde her yeni örnekte çalışır.
+Motor engele doğru hareket ederken mesafe eşiğin altına düşerse
+motoru beklemeden frenler ve olayı kaydeder.
+"""
+
+import logging
+import time
+import threading
+from collections import deque
+
+import dcmotor
+import dijital_metre
+import ornekleme
+
+logger = logging.getLogger(__name__)
+
+# ==================== VARSAYILAN AYARLAR ====================
+STOP_DISTANCE = 20.0     # Temel fren mesafesi (cm)
+SPEED_MARGIN = 0.2       # Duty cycle başına ek mesafe (cm/%), hızlıyken erken frenle
+SAMPLE_RATE = 16.0       # Motor ileri giderken istenen örnekleme hızı (Hz)
+MAX_EVENTS = 50          # Saklanan en fazla refleks olayı
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+config_lock = threading.Lock()
+is_enabled = False
+events = deque(maxlen=MAX_EVENTS)
+last_sample_time = None
+last_distance = None     # Son ölçülen mesafe (ileri komut kilidi için)
+
+stats = {
+    "samples": 0,
+    "triggers": 0,
+    "last_latency_ms": None,
+    "max_latency_ms": 0.0,
+    "max_sample_interval_ms": 0.0,
+    "worst_case_ms": 0.0
+}
+
+
+def configure(stop_distance=None, speed_margin=None):
+    """
+    Refleks eşiklerini güncelle
+    
+    Args:
+        stop_distance: Temel fren mesafesi (cm)
+        speed_margin: Duty cycle başına ek mesafe (cm/%)
+    
+    Returns:
+        dict: Güncel ayarlar
+    """
+    global STOP_DISTANCE, SPEED_MARGIN
+    
+    with config_lock:
+        if stop_distance is not None:
+            STOP_DISTANCE = max(2.0, min(400.0, float(stop_distance)))
+        if speed_margin is not None:
+            SPEED_MARGIN = max(0.0, float(speed_margin))
+    
+    return get_config()
+
+
+def get_config():
+    """Refleks ayarlarını döndür"""
+    with config_lock:
+        return {
+            "enabled": is_enabled,
+            "stop_distance": STOP_DISTANCE,
+            "speed_margin": SPEED_MARGIN
+        }
+
+
+def threshold_for(duty):
+    """Verilen duty cycle için fren eşiğini hesapla (cm)"""
+    with config_lock:
+        return STOP_DISTANCE + SPEED_MARGIN * duty
+
+
+def forward_blocked(duty):
+    """
+    İleri komut fren eşiğinin içinde mi? (refleks freni mandallanır)
+    
+    Birincil motorun ileri koruması olarak kaydedilir; HTTP, toplu komut,
+    sekans, kumanda ve PID frenlenen motoru engele doğru yeniden süremez.
+    
+    Args:
+        duty: Komut verilecek hız (%)
+    """
+    distance = last_distance
+    if not is_enabled or distance is None:
+        return False
+    return distance < threshold_for(duty)
+
+
+def on_sample(distance, timestamp):
+    """
+    Yeni ultrasonik örnek geldiğinde çağrılır (ölçüm thread'i içinde)
+    
+    Args:
+        distance: Ölçülen mesafe (cm)
+        timestamp: Ölçümün tamamlandığı an (time.monotonic)
+    """
+    global last_sample_time, last_distance
+    
+    stats["samples"] += 1
+    last_distance = distance
+    if last_sample_time is not None:
+        interval_ms = (timestamp - last_sample_time) * 1000
+        if interval_ms > stats["max_sample_interval_ms"]:
+            stats["max_sample_interval_ms"] = round(interval_ms, 2)
+    previous_sample_time = last_sample_time
+    last_sample_time = timestamp
+    
+    status = dcmotor.get_status()
+    moving_forward = (status["state"] == "forward"
+                      or status["output_direction"] == "forward")
+    if not moving_forward:
+        return
+    
+    threshold = threshold_for(max(status["duty"], status["speed"]))
+    if distance >= threshold:
+        return
+    
+    dcmotor.brake(immediate=True)
+    braked_at = time.monotonic()
+    
+    # Örnek anından GPIO yazımına kadar geçen süre
+    latency_ms = (braked_at - timestamp) * 1000
+    # En kötü durum: engel bir önceki örnekten hemen sonra eşiği geçmiş olabilir
+    if previous_sample_time is not None:
+        worst_ms = (braked_at - previous_sample_time) * 1000
+    else:
+        worst_ms = latency_ms
+    
+    stats["triggers"] += 1
+    stats["last_latency_ms"] = round(latency_ms, 3)
+    if latency_ms > stats["max_latency_ms"]:
+        stats["max_latency_ms"] = round(latency_ms, 3)
+    if worst_ms > stats["worst_case_ms"]:
+        stats["worst_case_ms"] = round(worst_ms, 2)
+    
+    events.append({
+        "time": time.time(),
+        "distance": distance,
+        "threshold": round(threshold, 2),
+        "duty": status["duty"],
+        "speed": status["speed"],
+        "latency_ms": round(latency_ms, 3)
+    })
+    logger.warning("Engel %scm (eşik %.1fcm), motor frenlendi (%.2fms)",
+                   distance, threshold, latency_ms)
+
+
+def sampling_demand():
+    """
+    Örnekleme talebi: yalnızca motor ileri giderken hızlı örnek gerekir
+    
+    Returns:
+        float: İstenen hız (Hz), motor duruyorsa 0
+    """
+    if dcmotor.is_moving_forward():
+        return SAMPLE_RATE
+    return 0.0
+
+
+def enable():
+    """Refleksi ultrasonik örnek akışına bağla"""
+    global is_enabled
+    dijital_metre.add_sample_listener(on_sample)
+    ornekleme.subscribe("refleks", sampling_demand)
+    dcmotor.default.forward_guard = forward_blocked
+    is_enabled = True
+    return True
+
+
+def disable():
+    """Refleksi devre dışı bırak"""
+    global is_enabled, last_sample_time, last_distance
+    dijital_metre.remove_sample_listener(on_sample)
+    ornekleme.unsubscribe("refleks")
+    dcmotor.default.forward_guard = None
+    is_enabled = False
+    last_sample_time = None
+    last_distance = None
+    return False
+
+
+def get_events():
+    """Son refleks olaylarını döndür (en yenisi sonda)"""
+    return list(events)
+
+
+def get_status():
+    """Refleks durumunu, istatistikleri ve son olayları döndür"""
+    return {
+        "config": get_config(),
+        "stats": dict(stats),
+        "events": get_events()
+    }
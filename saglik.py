@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Cihaz Sağlık Yönetimi Modülü
+Her sensör için devre kesici (circuit breaker) ve arka planda yeniden başlatma
+
+Durumlar:
+    closed    - Normal çalışma, her okuma cihaza gider
+    open      - Art arda hata sonrası cihaza hiç gidilmez (okuma maliyeti sıfır),
+                geri çekilme süresi dolunca arka plan thread'i cihazı yeniden başlatır
+    half_open - Yeniden başlatma başarılı, ilk okuma deneme olarak yapılır;
+                başarılıysa closed, değilse geri çekilme süresi ikiye katlanıp open
+
+Örnekleyici thread'i yalnızca allow() / record_success() / record_failure()
+çağırır; yavaş yeniden başlatma işi her zaman recovery thread'inde yapılır.
+"""
+
+import logging
+import time
+import threading
+
+logger = logging.getLogger(__name__)
+
+# ==================== AYARLAR ====================
+FAILURE_THRESHOLD = 3       # Devreyi açan art arda hata sayısı
+BASE_BACKOFF = 0.5          # İlk geri çekilme süresi (saniye)
+MAX_BACKOFF = 30.0          # En uzun geri çekilme süresi (saniye)
+RECOVERY_INTERVAL = 0.1     # Recovery thread'inin kontrol aralığı (saniye)
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+breakers = {}               # ad -> CircuitBreaker
+recovery_thread = None
+recovery_running = False
+
+
+class CircuitBreaker:
+    """Tek bir cihaz için devre kesici"""
+
+    def __init__(self, name, reinit=None, failure_threshold=FAILURE_THRESHOLD,
+                 base_backoff=BASE_BACKOFF, max_backoff=MAX_BACKOFF):
+        self.name = name
+        self.reinit = reinit
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.lock = threading.Lock()
+        
+        self.state = "closed"
+        self.failures = 0           # Art arda hata sayısı
+        self.backoff = base_backoff
+        self.retry_at = None        # Yeniden başlatma denemesinin zamanı (monotonic)
+        self.last_error = None
+        self.last_failure = None    # Son hatanın zamanı (unix)
+        self.opened_at = None
+        self.stats = {"failures": 0, "opens": 0, "skipped": 0,
+                      "reinit_attempts": 0, "recoveries": 0}
+
+    def allow(self):
+        """Cihaza erişilebilir mi? (open durumunda hiç I/O yapılmaz)"""
+        with self.lock:
+            if self.state == "open":
+                self.stats["skipped"] += 1
+                return False
+            return True
+
+    def is_healthy(self):
+        """Devre kapalı mı? (open/half_open verisi bayat kabul edilir)"""
+        return self.state == "closed"
+
+    def record_success(self):
+        """Başarılı erişimi kaydet"""
+        if self.state == "closed" and self.failures == 0:
+            return
+        with self.lock:
+            recovered = self.state != "closed"
+            self.state = "closed"
+            self.failures = 0
+            self.backoff = self.base_backoff
+            self.retry_at = None
+        if recovered:
+            self.stats["recoveries"] += 1
+            logger.info("%s tekrar çalışıyor", self.name)
+
+    def record_failure(self, error=None):
+        """
+        Başarısız erişimi kaydet
+        
+        Returns:
+            bool: Bu hatayla devre açıldıysa True
+        """
+        with self.lock:
+            self.failures += 1
+            self.stats["failures"] += 1
+            self.last_error = str(error) if error is not None else None
+            self.last_failure = time.time()
+            
+            if self.state == "half_open":
+                # Yeniden başlatma sonrası deneme başarısız: daha uzun bekle
+                self.backoff = min(self.max_backoff, self.backoff * 2)
+            elif self.state == "open" or self.failures < self.failure_threshold:
+                return False
+            
+            self.state = "open"
+            self.opened_at = time.time()
+            self.retry_at = time.monotonic() + self.backoff
+            self.stats["opens"] += 1
+            backoff = self.backoff
+        
+        logger.warning("%s devre dışı (%s), %.1fs sonra yeniden denenecek",
+                       self.name, self.last_error, backoff)
+        return True
+
+    def try_recover(self):
+        """
+        Geri çekilme süresi dolduysa cihazı yeniden başlatmayı dene
+        (recovery thread'inde çağrılır)
+        """
+        with self.lock:
+            if self.state != "open" or time.monotonic() < self.retry_at:
+                return
+        
+        self.stats["reinit_attempts"] += 1
+        try:
+            if self.reinit is not None:
+                self.reinit()
+        except Exception as e:
+            with self.lock:
+                self.last_error = str(e)
+                self.backoff = min(self.max_backoff, self.backoff * 2)
+                self.retry_at = time.monotonic() + self.backoff
+            return
+        
+        # Yeniden başlatma başarılı, bir sonraki okuma deneme olacak
+        with self.lock:
+            self.state = "half_open"
+
+    def reset(self):
+        """Devreyi elle kapat"""
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+            self.backoff = self.base_backoff
+            self.retry_at = None
+
+    def status(self):
+        """Devre durumunu döndür"""
+        with self.lock:
+            retry_in = None
+            if self.state == "open" and self.retry_at is not None:
+                retry_in = round(max(0.0, self.retry_at - time.monotonic()), 2)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "backoff": self.backoff,
+                "retry_in": retry_in,
+                "last_error": self.last_error,
+                "last_failure": self.last_failure,
+                "opened_at": self.opened_at,
+                **self.stats
+            }
+
+
+def register(name, reinit=None, **options):
+    """
+    Cihaz için devre kesici oluştur
+    
+    Aynı adla tekrar çağrılırsa mevcut devre döner ve yeniden başlatma
+    fonksiyonu yenisiyle değiştirilir (cihaz nesnesi yeniden oluşturulduğunda
+    istatistikler korunur).
+    
+    Args:
+        name: Cihaz adı
+        reinit: Cihazı yeniden başlatan fonksiyon (hata durumunda exception fırlatmalı)
+        **options: failure_threshold, base_backoff, max_backoff
+    """
+    if name not in breakers:
+        breakers[name] = CircuitBreaker(name, reinit=reinit, **options)
+    elif reinit is not None:
+        breakers[name].reinit = reinit
+    return breakers[name]
+
+
+def recovery_loop():
+    """Açık devreleri geri çekilme süresi dolunca yeniden başlatmayı dene"""
+    while recovery_running:
+        for breaker in list(breakers.values()):
+            try:
+                breaker.try_recover()
+            except Exception as e:
+                logger.error("%s kurtarma hatası: %s", breaker.name, e)
+        time.sleep(RECOVERY_INTERVAL)
+
+
+def start():
+    """Recovery thread'ini başlat"""
+    global recovery_thread, recovery_running
+    
+    if recovery_running:
+        return False
+    recovery_running = True
+    recovery_thread = threading.Thread(target=recovery_loop, daemon=True)
+    recovery_thread.start()
+    return True
+
+
+def stop():
+    """Recovery thread'ini durdur"""
+    global recovery_thread, recovery_running
+    
+    recovery_running = False
+    if recovery_thread:
+        recovery_thread.join(timeout=1.0)
+    recovery_thread = None
+
+
+def is_healthy(name):
+    """Cihazın devresi kapalı mı? (kayıtlı değilse sağlıklı kabul edilir)"""
+    breaker = breakers.get(name)
+    return breaker is None or breaker.is_healthy()
+
+
+def get_status():
+    """Tüm cihazların sağlık durumunu döndür"""
+    return {
+        "recovery_running": recovery_running,
+        "devices": {name: breaker.status() for name, breaker in breakers.items()}
+    }
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Hareket Sekansı (Makro) Modülü
+JSON olarak yüklenen servo/motor/bekleme/koşullu dallanma adımlarını
+cihaz üzerinde monotonic saat tabanlı bir zamanlayıcı ile çalıştırır
+
+Adım tipleri:
+    {"type": "servo", "angle": 45}
+    {"type": "motor", "action": "forward", "speed": 40}
+    {"type": "wait", "duration": 0.5}
+    {"type": "branch", "if": {"field": "distance", "op": "<", "value": 30},
+     "goto": "geri"}
+    {"type": "goto", "target": "bas"}
+    {"type": "end"}
+
+Her adım opsiyonel "label" alanı taşıyabilir. Bekleme süreleri zaman
+çizelgesine eklenir; adımlar gerçek çalışma süresine göre değil planlanan
+zamana göre çalıştırıldığından gecikme birikmez.
+"""
+
+import logging
+import time
+import threading
+
+import servo
+import dcmotor
+import dijital_metre
+import imu
+import pid_kontrol
+import ornekleme
+
+logger = logging.getLogger(__name__)
+
+# ==================== AYARLAR ====================
+MAX_STEPS = 200             # Bir sekanstaki en fazla adım
+MAX_EXECUTED_STEPS = 10000  # Tek çalıştırmada en fazla adım (sonsuz döngü koruması)
+MAX_WAIT = 60.0             # Tek beklemenin üst sınırı (saniye)
+MAX_REPORT = 500            # Saklanan en fazla adım zamanlama kaydı
+SAMPLE_RATE = 10.0          # Koşullu dallanma içeren sekanslar için örnekleme hızı (Hz)
+
+STEP_TYPES = ("servo", "motor", "wait", "branch", "goto", "end")
+MOTOR_ACTIONS = ("forward", "backward", "stop", "brake", "speed")
+CONDITION_FIELDS = ("distance", "servo_angle", "motor_speed", "accel_x",
+                    "accel_y", "accel_z", "gyro_x", "gyro_y", "gyro_z")
+CONDITION_OPS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b
+}
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+sequences = {}              # İsim -> doğrulanmış adım listesi
+state_lock = threading.Lock()
+wake_event = threading.Event()
+run_thread = None
+
+run_state = {
+    "name": None,
+    "status": "idle",       # idle, running, paused, finished, aborted, error
+    "step": None,
+    "executed": 0,
+    "started_at": None,
+    "message": None
+}
+step_report = []            # Her çalıştırılan adımın zamanlama kaydı
+pause_requested = False
+abort_requested = False
+
+
+class SequenceError(ValueError):
+    """Geçersiz sekans tanımı"""
+
+
+# ==================== DOĞRULAMA ====================
+
+def validate(steps):
+    """
+    Sekans adımlarını doğrula ve normalize et
+    
+    Args:
+        steps: Adım sözlüklerinden oluşan liste
+    
+    Returns:
+        list: Normalize edilmiş adımlar
+    
+    Raises:
+        SequenceError: Tanım geçersizse
+    """
+    if not isinstance(steps, list) or not steps:
+        raise SequenceError("Sekans boş olmayan bir adım listesi olmalı")
+    if len(steps) > MAX_STEPS:
+        raise SequenceError(f"Sekans en fazla {MAX_STEPS} adım içerebilir")
+    
+    normalized = []
+    labels = {}
+    
+    for i, step in enumerate(steps):
+        if not isinstance(step, dict):
+            raise SequenceError(f"Adım {i}: nesne olmalı")
+        
+        kind = step.get("type")
+        if kind not in STEP_TYPES:
+            raise SequenceError(f"Adım {i}: bilinmeyen adım tipi")
+        
+        item = {"type": kind}
+        label = step.get("label")
+        if label is not None:
+            label = str(label)
+            if label in labels:
+                raise SequenceError(f"Adım {i}: '{label}' etiketi tekrar kullanılmış")
+            labels[label] = i
+            item["label"] = label
+        
+        try:
+            if kind == "servo":
+                item["angle"] = int(step["angle"])
+                if not 0 <= item["angle"] <= 180:
+                    raise SequenceError(f"Adım {i}: açı 0-180 arasında olmalı")
+            elif kind == "motor":
+                if step.get("action") not in MOTOR_ACTIONS:
+                    raise SequenceError(f"Adım {i}: geçersiz motor komutu")
+                item["action"] = step["action"]
+                if item["action"] in ("forward", "backward", "speed"):
+                    item["speed"] = int(step.get("speed", 50))
+                    if not 0 <= item["speed"] <= 100:
+                        raise SequenceError(f"Adım {i}: hız 0-100 arasında olmalı")
+            elif kind == "wait":
+                item["duration"] = float(step["duration"])
+                if not 0 <= item["duration"] <= MAX_WAIT:
+                    raise SequenceError(f"Adım {i}: bekleme 0-{MAX_WAIT:g} saniye olmalı")
+            elif kind == "branch":
+                condition = step["if"]
+                if condition.get("field") not in CONDITION_FIELDS:
+                    raise SequenceError(f"Adım {i}: geçersiz koşul alanı")
+                if condition.get("op") not in CONDITION_OPS:
+                    raise SequenceError(f"Adım {i}: geçersiz karşılaştırma")
+                item["if"] = {
+                    "field": condition["field"],
+                    "op": condition["op"],
+                    "value": float(condition["value"])
+                }
+                item["goto"] = str(step["goto"])
+            elif kind == "goto":
+                item["target"] = str(step["target"])
+        except SequenceError:
+            raise
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise SequenceError(f"Adım {i}: eksik veya geçersiz alan")
+        
+        normalized.append(item)
+    
+    # Atlama hedeflerini kontrol et
+    for i, item in enumerate(normalized):
+        target = item.get("goto") or item.get("target")
+        if target is not None and target not in labels:
+            raise SequenceError(f"Adım {i}: '{target}' etiketi bulunamadı")
+    
+    return normalized
+
+
+# ==================== SEKANS YÖNETİMİ ====================
+
+def save(name, steps):
+    """Sekansı doğrula ve kaydet"""
+    normalized = validate(steps)
+    with state_lock:
+        sequences[name] = normalized
+    return normalized
+
+
+def delete(name):
+    """Sekansı sil (çalışıyorsa silinmez)"""
+    with state_lock:
+        if run_state["name"] == name and run_state["status"] in ("running", "paused"):
+            return False
+        return sequences.pop(name, None) is not None
+
+
+def list_sequences():
+    """Kayıtlı sekansların özetini döndür"""
+    with state_lock:
+        return {
+            name: {
+                "steps": len(steps),
+                "planned_duration": round(sum(s.get("duration", 0) for s in steps), 3)
+            }
+            for name, steps in sequences.items()
+        }
+
+
+def get_sequence(name):
+    """Kayıtlı sekansın adımlarını döndür"""
+    with state_lock:
+        return sequences.get(name)
+
+
+# ==================== ÇALIŞTIRMA ====================
+
+def _read_field(field):
+    """Koşul alanının güncel değerini oku"""
+    if field == "distance":
+        return dijital_metre.get_last_distance()
+    if field == "servo_angle":
+        return servo.get_current_angle()
+    if field == "motor_speed":
+        return dcmotor.get_current_speed()
+    return imu.get_last_reading().get(field, 0.0)
+
+
+def _execute_step(step):
+    """Aktüatör adımını çalıştır"""
+    if step["type"] == "servo":
+        servo.set_angle(step["angle"], wait=False)
+    elif step["type"] == "motor":
+        action = step["action"]
+        if action == "forward":
+            dcmotor.forward(step["speed"])
+        elif action == "backward":
+            dcmotor.backward(step["speed"])
+        elif action == "stop":
+            dcmotor.stop()
+        elif action == "brake":
+            dcmotor.brake()
+        else:
+            dcmotor.set_speed(step["speed"])
+
+
+def _wait_until(target, timeline):
+    """
+    Planlanan zamana kadar bekle, duraklatma ve iptali işle
+    
+    Args:
+        target: Hedef zaman (başlangıca göre saniye)
+        timeline: {"origin": monotonic başlangıç} sözlüğü, duraklatmada kaydırılır
+    
+    Returns:
+        bool: İptal edildiyse False
+    """
+    while True:
+        if abort_requested:
+            return False
+        
+        if pause_requested:
+            paused_at = time.monotonic()
+            # Duraklatma süresi sınırsız olabilir: motor duraklatmada durdurulur,
+            # devamda sekansın verdiği yön ve hız geri yüklenir
+            motor = dcmotor.get_status()
+            dcmotor.stop()
+            with state_lock:
+                run_state["status"] = "paused"
+            while pause_requested and not abort_requested:
+                wake_event.wait(0.1)
+                wake_event.clear()
+            if abort_requested:
+                return False
+            if motor["state"] == "forward":
+                dcmotor.forward(motor["speed"])
+            elif motor["state"] == "backward":
+                dcmotor.backward(motor["speed"])
+            # Duraklatılan süre kadar zaman çizelgesini kaydır
+            timeline["origin"] += time.monotonic() - paused_at
+            with state_lock:
+                run_state["status"] = "running"
+            continue
+        
+        remaining = timeline["origin"] + target - time.monotonic()
+        if remaining <= 0:
+            return True
+        wake_event.wait(remaining)
+        wake_event.clear()
+
+
+def _run(name, steps):
+    """Sekansı çalıştıran thread fonksiyonu"""
+    labels = {step["label"]: i for i, step in enumerate(steps) if "label" in step}
+    timeline = {"origin": time.monotonic()}
+    planned = 0.0
+    index = 0
+    executed = 0
+    status = "finished"
+    message = None
+    
+    try:
+        while index < len(steps):
+            if executed >= MAX_EXECUTED_STEPS:
+                status, message = "error", "Adım sınırı aşıldı (sonsuz döngü?)"
+                break
+            
+            step = steps[index]
+            if not _wait_until(planned, timeline):
+                status = "aborted"
+                break
+            
+            actual = time.monotonic() - timeline["origin"]
+            planned_at = planned
+            next_index = index + 1
+            
+            if step["type"] == "wait":
+                planned += step["duration"]
+            elif step["type"] == "branch":
+                condition = step["if"]
+                value = _read_field(condition["field"])
+                if CONDITION_OPS[condition["op"]](value, condition["value"]):
+                    next_index = labels[step["goto"]]
+            elif step["type"] == "goto":
+                next_index = labels[step["target"]]
+            elif step["type"] == "end":
+                next_index = len(steps)
+            else:
+                _execute_step(step)
+            
+            executed += 1
+            record = {
+                "index": index,
+                "type": step["type"],
+                "planned_ms": round(planned_at * 1000, 2),
+                "actual_ms": round(actual * 1000, 2)
+            }
+            record["error_ms"] = round(record["actual_ms"] - record["planned_ms"], 2)
+            with state_lock:
+                run_state["step"] = index
+                run_state["executed"] = executed
+                step_report.append(record)
+                if len(step_report) > MAX_REPORT:
+                    del step_report[0]
+            
+            index = next_index
+    except Exception as e:
+        status, message = "error", str(e)
+        logger.error("Sekans hatası (%s): %s", name, e)
+    
+    if status != "finished":
+        dcmotor.stop()
+    servo.release()
+    ornekleme.unsubscribe("sekans")
+    
+    with state_lock:
+        run_state["status"] = status
+        run_state["message"] = message
+    logger.info("Sekans '%s' sona erdi: %s", name, status)
+
+
+def start(name):
+    """
+    Kayıtlı sekansı başlat
+    
+    Returns:
+        tuple: (başarılı mı, mesaj)
+    """
+    global run_thread, pause_requested, abort_requested
+    
+    with state_lock:
+        if run_state["status"] in ("running", "paused"):
+            return False, "Başka bir sekans çalışıyor"
+        steps = sequences.get(name)
+        if steps is None:
+            return False, "Sekans bulunamadı"
+        
+        pause_requested = False
+        abort_requested = False
+        wake_event.clear()
+        step_report.clear()
+        run_state.update({
+            "name": name,
+            "status": "running",
+            "step": None,
+            "executed": 0,
+            "started_at": time.time(),
+            "message": None
+        })
+    
+    # Sekans motoru doğrudan sürdüğü için PID kontrolünü bırak
+    pid_kontrol.stop()
+    
+    # Koşullu dallanmalar güncel sensör değerlerine ihtiyaç duyar
+    if any(step["type"] == "branch" for step in steps):
+        ornekleme.subscribe("sekans", SAMPLE_RATE)
+    
+    run_thread = threading.Thread(target=_run, args=(name, steps), daemon=True)
+    run_thread.start()
+    return True, f"Sekans '{name}' başlatıldı"
+
+
+def pause():
+    """Çalışan sekansı duraklat (motor durdurulur, devamda geri yüklenir)"""
+    global pause_requested
+    with state_lock:
+        if run_state["status"] != "running":
+            return False
+        pause_requested = True
+    wake_event.set()
+    return True
+
+
+def resume():
+    """Duraklatılmış sekansı devam ettir"""
+    global pause_requested
+    with state_lock:
+        if not pause_requested:
+            return False
+        pause_requested = False
+    wake_event.set()
+    return True
+
+
+def abort():
+    """Çalışan sekansı iptal et ve motoru durdur"""
+    global abort_requested
+    with state_lock:
+        if run_state["status"] not in ("running", "paused"):
+            return False
+        abort_requested = True
+    wake_event.set()
+    if run_thread and run_thread is not threading.current_thread():
+        run_thread.join(timeout=2.0)
+    return True
+
+
+def is_running():
+    """Bir sekans çalışıyor veya duraklatılmış mı?"""
+    return run_state["status"] in ("running", "paused")
+
+
+def get_status():
+    """Çalışma durumunu ve adım zamanlama raporunu döndür"""
+    with state_lock:
+        report = list(step_report)
+        status = dict(run_state)
+    
+    errors = [abs(r["error_ms"]) for r in report]
+    status["timing"] = {
+        "steps": len(report),
+        "max_error_ms": max(errors) if errors else None,
+        "mean_error_ms": round(sum(errors) / len(errors), 3) if errors else None
+    }
+    status["report"] = report
+    return status
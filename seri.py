@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Grafik Serisi Örnek Azaltma Modülü
+Arşivden okunan zaman serisini istenen nokta sayısına indirger
+
+Yöntemler:
+    lttb   - Largest-Triangle-Three-Buckets (görsel şekli koruyan seçim)
+    minmax - Her kova için min/max zarfı (tepe değerleri kaybolmaz)
+
+numpy kuruluysa hesaplama vektörize yapılır, yoksa saf Python
+yedeğine düşülür. Sonuçlar zaman penceresi başına önbelleğe alınır.
+"""
+
+import math
+import time
+import threading
+from collections import OrderedDict
+
+import arsiv
+
+# numpy opsiyonel: varsa vektörize hesaplama yapılır
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# ==================== AYARLAR ====================
+METHODS = ("lttb", "minmax")
+MAX_POINTS = 5000           # İstenebilecek en fazla nokta
+CACHE_SIZE = 64             # Önbellekteki en fazla seri
+CACHE_TTL_RECENT = 5.0      # Güncel veri içeren pencereler için önbellek süresi (saniye)
+CACHE_TTL_CLOSED = 600.0    # Tamamen geçmişte kalan pencereler için önbellek süresi
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+cache = OrderedDict()
+cache_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+# ==================== LTTB ====================
+
+def _lttb_python(ts, values, n):
+    """Saf Python LTTB"""
+    size = len(ts)
+    every = (size - 2) / (n - 2)
+    selected = [0]
+    a = 0
+    
+    for i in range(n - 2):
+        # Sonraki kovanın ortalaması (üçgenin üçüncü köşesi)
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, size)
+        count = next_end - next_start
+        avg_t = sum(ts[next_start:next_end]) / count
+        avg_v = sum(values[next_start:next_end]) / count
+        
+        # Bu kovada üçgen alanını en büyük yapan nokta
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        at, av = ts[a], values[a]
+        for j in range(start, end):
+            area = abs((at - avg_t) * (values[j] - av) - (at - ts[j]) * (avg_v - av))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    
+    selected.append(size - 1)
+    return [[ts[i], values[i]] for i in selected]
+
+
+def _lttb_numpy(ts, values, n):
+    """numpy ile vektörize LTTB (kova içi alan hesabı vektörize)"""
+    t = np.asarray(ts, dtype=np.float64)
+    v = np.asarray(values, dtype=np.float64)
+    size = len(t)
+    
+    # Kova sınırları saf Python sürümüyle aynı ifadeden hesaplanır
+    edges = (np.arange(n - 1) * ((size - 2) / (n - 2))).astype(np.int64) + 1
+    # Kova ortalamaları tek seferde; cumsum farkı yerine kova başına toplam
+    # (reduceat) alınır ki yuvarlama saf Python'daki sum() ile aynı olsun
+    counts = np.diff(np.append(edges, size))
+    avg_t = np.add.reduceat(t, edges) / counts
+    avg_v = np.add.reduceat(v, edges) / counts
+    
+    selected = np.empty(n, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = size - 1
+    a = 0
+    
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        at, av = t[a], v[a]
+        areas = np.abs((at - avg_t[i + 1]) * (v[start:end] - av)
+                       - (at - t[start:end]) * (avg_v[i + 1] - av))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    
+    return np.column_stack((t[selected], v[selected])).tolist()
+
+
+def lttb(ts, values, n):
+    """
+    Seriyi LTTB ile n noktaya indirge
+    
+    Args:
+        ts: Zaman damgaları (artan sırada)
+        values: Değerler
+        n: Hedef nokta sayısı
+    
+    Returns:
+        list: [[t, değer], ...]
+    """
+    if n >= len(ts) or n < 3:
+        return [[t, value] for t, value in zip(ts, values)]
+    if NUMPY_AVAILABLE:
+        return _lttb_numpy(ts, values, n)
+    return _lttb_python(ts, values, n)
+
+
+# ==================== MIN/MAX ZARFI ====================
+
+def _minmax_python(ts, mins, maxs, buckets, start, width):
+    """Saf Python min/max kovalama"""
+    rows = {}
+    for t, low, high in zip(ts, mins, maxs):
+        index = min(buckets - 1, int((t - start) / width))
+        row = rows.get(index)
+        if row is None:
+            rows[index] = [start + index * width, low, high]
+        else:
+            row[1] = min(row[1], low)
+            row[2] = max(row[2], high)
+    return [rows[index] for index in sorted(rows)]
+
+
+def _minmax_numpy(ts, mins, maxs, buckets, start, width):
+    """numpy reduceat ile vektörize min/max kovalama"""
+    t = np.asarray(ts, dtype=np.float64)
+    index = np.minimum(((t - start) / width).astype(np.int64), buckets - 1)
+    # Zaman sıralı olduğundan her kovanın ilk elemanı reduceat sınırıdır
+    starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+    low = np.minimum.reduceat(np.asarray(mins, dtype=np.float64), starts)
+    high = np.maximum.reduceat(np.asarray(maxs, dtype=np.float64), starts)
+    bucket_t = start + index[starts] * width
+    return np.column_stack((bucket_t, low, high)).tolist()
+
+
+def minmax(ts, mins, maxs, n, start, end):
+    """
+    Seriyi n kovaya bölüp her kova için min/max döndür
+    
+    Returns:
+        list: [[kova başlangıcı, min, max], ...]
+    """
+    if not ts:
+        return []
+    width = max((end - start) / n, 1e-9)
+    if NUMPY_AVAILABLE:
+        return _minmax_numpy(ts, mins, maxs, n, start, width)
+    return _minmax_python(ts, mins, maxs, n, start, width)
+
+
+# ==================== SERİ ÜRETİMİ ====================
+
+def _cache_get(key):
+    with cache_lock:
+        entry = cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            stats["misses"] += 1
+            return None
+        cache.move_to_end(key)
+        stats["hits"] += 1
+        return entry[1]
+
+
+def _cache_put(key, value, ttl):
+    with cache_lock:
+        cache[key] = (time.monotonic() + ttl, value)
+        cache.move_to_end(key)
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _nice_step(step):
+    """Adımı 1-2-5 x 10^k dizisindeki bir üst değere yuvarla"""
+    magnitude = 10 ** math.floor(math.log10(step))
+    for factor in (1, 2, 5, 10):
+        if step <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def get_series(field, start, end, points=500, method="lttb", tier=None):
+    """
+    Arşivden alanı oku ve istenen nokta sayısına indirge
+    
+    Args:
+        field: Alan adı
+        start, end: Unix zaman aralığı (saniye)
+        points: Hedef nokta sayısı
+        method: "lttb" veya "minmax"
+        tier: Arşiv katmanı (None ise aralığa göre seçilir)
+    
+    Returns:
+        dict: {"field", "tier", "method", "source_points", "points"}
+    """
+    if method not in METHODS:
+        raise ValueError("Yöntem 'lttb' veya 'minmax' olmalı")
+    if end <= start:
+        raise ValueError("Bitiş zamanı başlangıçtan büyük olmalı")
+    points = max(3, min(MAX_POINTS, int(points)))
+    
+    # Pencereyi yuvarlak bir kova genişliğine hizala ki birkaç saniye
+    # kayan yenileme istekleri aynı önbellek girdisini kullansın
+    step = _nice_step((end - start) / points)
+    start = start - start % step
+    end = end - end % step + step
+    key = (field, round(start, 3), round(end, 3), points, method, tier)
+    
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    
+    data = arsiv.query(field, start, end, tier=tier)
+    rows = data["points"]
+    ts = [row[0] for row in rows]
+    
+    if data["tier"] == "raw":
+        values = [row[1] for row in rows]
+        mins = maxs = values
+    else:
+        # Rollup satırı: [t, min, max, ortalama, adet]
+        values = [row[3] for row in rows]
+        mins = [row[1] for row in rows]
+        maxs = [row[2] for row in rows]
+    
+    if method == "lttb":
+        reduced = lttb(ts, values, points)
+    else:
+        reduced = minmax(ts, mins, maxs, points, start, end)
+    
+    result = {
+        "field": field,
+        "tier": data["tier"],
+        "method": method,
+        "from": start,
+        "to": end,
+        "source_points": len(rows),
+        "points": reduced
+    }
+    
+    closed = end < time.time() - arsiv.FLUSH_INTERVAL
+    _cache_put(key, result, CACHE_TTL_CLOSED if closed else CACHE_TTL_RECENT)
+    return result
+
+
+def get_stats():
+    """Önbellek istatistiklerini döndür"""
+    with cache_lock:
+        return {
+            "numpy": NUMPY_AVAILABLE,
+            "cached": len(cache),
+            "hits": stats["hits"],
+            "misses": stats["misses"]
+        }
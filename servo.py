@@ -4,7 +4,14 @@ Servo Motor Kontrol Modülü
 Web arayüzünden gelen komutlarla servo motoru kontrol eder
 """
 
+import logging
 import time
+import threading
+
+import config
+import izleme
+
+logger = logging.getLogger(__name__)
 
 # Raspberry Pi üzerinde çalışıp çalışmadığını kontrol et
 try:
@@ -12,68 +19,23 @@ try:
     RPI_AVAILABLE = True
 except ImportError:
     RPI_AVAILABLE = False
-    print("UYARI: RPi.GPIO bulunamadı. Servo simülasyon modu aktif.")
-
-# GPIO pin tanımları
-SERVO_PIN = 18
-BUTTON_PIN = 25  # Opsiyonel: Manuel kontrol butonu (dijital_metre ile çakışma önlendi)
-LED_PIN = 12     # Opsiyonel: Durum LED'i (dijital_metre ile çakışma önlendi)
+    logger.warning("RPi.GPIO bulunamadı. Servo simülasyon modu aktif.")
 
-# Global değişkenler
-servo_pwm = None
-current_angle = 90  # Mevcut servo açısı
-is_initialized = False
+# GPIO pin tanımları (config.py, birincil servo)
+SERVO_PIN = config.SERVO_PIN
+BUTTON_PIN = config.SERVO_BUTTON_PIN  # Opsiyonel: Manuel kontrol butonu
+LED_PIN = config.SERVO_LED_PIN        # Opsiyonel: Durum LED'i
+PWM_FREQ = config.SERVO_PWM_FREQ
 
-
-def setup_servo():
-    """Servo motor GPIO kurulumunu yap"""
-    global servo_pwm, is_initialized
-    
-    if not RPI_AVAILABLE:
-        print("Servo simülasyon modunda başlatıldı")
-        is_initialized = True
-        return True
-    
-    try:
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-        
-        # Servo motor pini (PWM çıkışı)
-        GPIO.setup(SERVO_PIN, GPIO.OUT)
-        servo_pwm = GPIO.PWM(SERVO_PIN, 50)  # 50 Hz frekans
-        servo_pwm.start(0)
-        
-        # Opsiyonel: Buton ve LED pinleri
-        GPIO.setup(BUTTON_PIN, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
-        GPIO.setup(LED_PIN, GPIO.OUT)
-        GPIO.output(LED_PIN, GPIO.LOW)
-        
-        is_initialized = True
-        print("Servo GPIO kurulumu tamamlandı.")
-        return True
-        
-    except Exception as e:
-        print(f"Servo kurulum hatası: {e}")
-        return False
-
-
-def cleanup_servo():
-    """Servo GPIO kaynaklarını temizle"""
-    global servo_pwm, is_initialized
-    
-    if not RPI_AVAILABLE:
-        is_initialized = False
-        return
-    
-    try:
-        if servo_pwm:
-            servo_pwm.stop()
-        # Sadece servo ile ilgili pinleri temizle
-        GPIO.cleanup([SERVO_PIN, BUTTON_PIN, LED_PIN])
-        is_initialized = False
-        print("Servo kaynakları temizlendi.")
-    except Exception as e:
-        print(f"Servo temizleme hatası: {e}")
+# Önceden tanımlı pozisyonlar
+POSITIONS = {
+    'min': 0,
+    'center': 90,
+    'max': 180,
+    'left': 0,
+    'middle': 90,
+    'right': 180
+}
 
 
 def angle_to_duty_cycle(angle):
@@ -84,115 +46,256 @@ def angle_to_duty_cycle(angle):
     return 2 + (angle / 18)
 
 
-def set_angle(angle):
+class Servo:
     """
-    Servo motoru belirtilen açıya getir
-    
-    Args:
-        angle: Hedef açı (0-180 derece)
+    Tek bir servo motor
     
-    Returns:
-        int: Gerçekleştirilen açı değeri
+    Durum (açı, PWM) cihazın kendi kilidiyle korunur; farklı cihazlara
+    gelen komutlar birbirini beklemez. Hareket beklemesi kilit dışında
+    yapılır, böylece hareket sürerken durum okunabilir.
     """
-    global current_angle
-    
-    # Açıyı sınırla (0-180)
-    angle = max(0, min(180, int(angle)))
-    
-    if RPI_AVAILABLE and servo_pwm and is_initialized:
+
+    def __init__(self, name="servo", pin=SERVO_PIN, button_pin=BUTTON_PIN, led_pin=LED_PIN):
+        self.name = name
+        self.pin = pin
+        self.button_pin = button_pin
+        self.led_pin = led_pin
+        self.lock = threading.Lock()
+        
+        self.pwm = None
+        self.is_initialized = False
+        self.angle = 90             # Mevcut servo açısı
+        self.moving = False
+        self.move_id = 0            # Son hareket komutunun numarası
+
+    def setup(self):
+        """Servo motor GPIO kurulumunu yap"""
+        if not RPI_AVAILABLE:
+            logger.info("Servo simülasyon modunda başlatıldı")
+            self.is_initialized = True
+            return True
+        
         try:
-            duty = angle_to_duty_cycle(angle)
-            servo_pwm.ChangeDutyCycle(duty)
-            time.sleep(0.5)  # Servo'nun hareket etmesi için bekle
-            servo_pwm.ChangeDutyCycle(0)  # Titreşimi önle
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setwarnings(False)
             
-            # LED ile göster (opsiyonel)
-            if angle > 0:
-                GPIO.output(LED_PIN, GPIO.HIGH)
-            else:
-                GPIO.output(LED_PIN, GPIO.LOW)
+            with self.lock:
+                # Servo motor pini (PWM çıkışı)
+                GPIO.setup(self.pin, GPIO.OUT)
+                self.pwm = GPIO.PWM(self.pin, PWM_FREQ)
+                self.pwm.start(0)
+                
+                # Opsiyonel: Buton ve LED pinleri
+                if self.button_pin is not None:
+                    GPIO.setup(self.button_pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+                if self.led_pin is not None:
+                    GPIO.setup(self.led_pin, GPIO.OUT)
+                    GPIO.output(self.led_pin, GPIO.LOW)
                 
+                self.is_initialized = True
+            logger.info("Servo GPIO kurulumu tamamlandı.")
+            return True
+        
         except Exception as e:
-            print(f"Servo hareket hatası: {e}")
-    else:
-        # Simülasyon modu
-        print(f"[SİMÜLASYON] Servo {angle}° konumuna hareket ediyor...")
-        time.sleep(0.3)
-    
-    current_angle = angle
-    print(f"Servo açısı: {angle}°")
-    return angle
+            logger.error("Servo kurulum hatası: %s", e)
+            return False
+
+    def cleanup(self):
+        """Servo GPIO kaynaklarını temizle"""
+        if not RPI_AVAILABLE:
+            self.is_initialized = False
+            return
+        
+        try:
+            with self.lock:
+                if self.pwm:
+                    self.pwm.stop()
+                # Sadece bu servo ile ilgili pinleri temizle
+                pins = [p for p in (self.pin, self.button_pin, self.led_pin) if p is not None]
+                GPIO.cleanup(pins)
+                self.is_initialized = False
+            logger.info("Servo kaynakları temizlendi.")
+        except Exception as e:
+            logger.error("Servo temizleme hatası: %s", e)
+
+    def set_angle(self, angle, wait=True):
+        """
+        Servo motoru belirtilen açıya getir
+        
+        Args:
+            angle: Hedef açı (0-180 derece)
+            wait: True ise servo'nun hareketi için beklenir ve ardından PWM
+                  kesilir. False ise darbe açık bırakılır ve hemen dönülür
+                  (zamanlaması hassas sekanslar için)
+        
+        Returns:
+            int: Gerçekleştirilen açı değeri
+        """
+        # Açıyı sınırla (0-180)
+        angle = max(0, min(180, int(angle)))
+        
+        with self.lock:
+            izleme.mark("queue")
+            self.move_id += 1
+            move = self.move_id
+            hardware = RPI_AVAILABLE and self.pwm and self.is_initialized
+            if hardware:
+                try:
+                    self.pwm.ChangeDutyCycle(angle_to_duty_cycle(angle))
+                    
+                    # LED ile göster (opsiyonel)
+                    if self.led_pin is not None:
+                        GPIO.output(self.led_pin, GPIO.HIGH if angle > 0 else GPIO.LOW)
+                except Exception as e:
+                    logger.error("Servo hareket hatası: %s", e)
+            else:
+                # Simülasyon modu
+                logger.debug("[SİMÜLASYON] Servo %s° konumuna hareket ediyor...", angle)
+            izleme.mark("gpio")
+            self.angle = angle
+            self.moving = wait
+        
+        if wait:
+            time.sleep(0.5 if hardware else 0.3)  # Servo'nun hareket etmesi için bekle
+            with self.lock:
+                # Beklerken yeni komut geldiyse onun darbesini kesme
+                if self.move_id == move:
+                    self.moving = False
+                    if hardware:
+                        self._release_locked()  # Titreşimi önle
+            izleme.mark("complete")
+        
+        logger.info("Servo açısı: %s°", angle)
+        return angle
+
+    def _release_locked(self):
+        if RPI_AVAILABLE and self.pwm and self.is_initialized:
+            try:
+                self.pwm.ChangeDutyCycle(0)
+            except Exception as e:
+                logger.error("Servo bırakma hatası: %s", e)
+
+    def release(self):
+        """PWM darbesini kes (set_angle(wait=False) sonrası titreşimi önler)"""
+        with self.lock:
+            self._release_locked()
+
+    def get_angle(self):
+        """Mevcut servo açısını döndür"""
+        return self.angle
+
+    def move_to_position(self, position):
+        """
+        Önceden tanımlı pozisyonlara hareket et
+        
+        Args:
+            position: 'min', 'center', 'max' veya açı değeri
+        
+        Returns:
+            int: Gerçekleştirilen açı değeri
+        """
+        if isinstance(position, str) and position.lower() in POSITIONS:
+            return self.set_angle(POSITIONS[position.lower()])
+        elif isinstance(position, (int, float)):
+            return self.set_angle(int(position))
+        else:
+            logger.warning("Geçersiz pozisyon: %s", position)
+            return self.angle
+
+    def sweep(self, start=0, end=180, step=10, delay=0.1):
+        """
+        Servo'yu belirtilen aralıkta süpür
+        
+        Args:
+            start: Başlangıç açısı
+            end: Bitiş açısı
+            step: Adım büyüklüğü
+            delay: Her adım arası bekleme (saniye)
+        """
+        if start < end:
+            angles = range(start, end + 1, step)
+        else:
+            angles = range(start, end - 1, -step)
+        
+        for angle in angles:
+            self.set_angle(angle)
+            time.sleep(delay)
+        
+        return self.angle
+
+    def check_button(self):
+        """
+        Fiziksel butonu kontrol et
+        
+        Returns:
+            bool: Butona basılıysa True
+        """
+        if not RPI_AVAILABLE or not self.is_initialized or self.button_pin is None:
+            return False
+        
+        try:
+            return GPIO.input(self.button_pin) == GPIO.HIGH
+        except:
+            return False
+
+    def status(self):
+        """Servo durumunun tutarlı anlık görüntüsü"""
+        with self.lock:
+            return {
+                "angle": self.angle,
+                "moving": self.moving,
+                "initialized": self.is_initialized,
+                "pin": self.pin
+            }
+
+
+# Varsayılan cihaz (modül fonksiyonları bu örneğe yönlendirilir)
+default = Servo()
+
+
+def setup_servo():
+    """Servo motor GPIO kurulumunu yap"""
+    return default.setup()
+
+
+def cleanup_servo():
+    """Servo GPIO kaynaklarını temizle"""
+    default.cleanup()
+
+
+def set_angle(angle, wait=True):
+    """Servo motoru belirtilen açıya getir (bkz. Servo.set_angle)"""
+    return default.set_angle(angle, wait)
+
+
+def release():
+    """PWM darbesini kes (set_angle(wait=False) sonrası titreşimi önler)"""
+    default.release()
 
 
 def get_current_angle():
     """Mevcut servo açısını döndür"""
-    return current_angle
+    return default.get_angle()
 
 
 def move_to_position(position):
-    """
-    Önceden tanımlı pozisyonlara hareket et
-    
-    Args:
-        position: 'min', 'center', 'max' veya açı değeri
-    
-    Returns:
-        int: Gerçekleştirilen açı değeri
-    """
-    positions = {
-        'min': 0,
-        'center': 90,
-        'max': 180,
-        'left': 0,
-        'middle': 90,
-        'right': 180
-    }
-    
-    if isinstance(position, str) and position.lower() in positions:
-        return set_angle(positions[position.lower()])
-    elif isinstance(position, (int, float)):
-        return set_angle(int(position))
-    else:
-        print(f"Geçersiz pozisyon: {position}")
-        return current_angle
+    """Önceden tanımlı pozisyonlara hareket et (bkz. Servo.move_to_position)"""
+    return default.move_to_position(position)
 
 
 def sweep(start=0, end=180, step=10, delay=0.1):
-    """
-    Servo'yu belirtilen aralıkta süpür
-    
-    Args:
-        start: Başlangıç açısı
-        end: Bitiş açısı
-        step: Adım büyüklüğü
-        delay: Her adım arası bekleme (saniye)
-    """
-    if start < end:
-        angles = range(start, end + 1, step)
-    else:
-        angles = range(start, end - 1, -step)
-    
-    for angle in angles:
-        set_angle(angle)
-        time.sleep(delay)
-    
-    return current_angle
+    """Servo'yu belirtilen aralıkta süpür (bkz. Servo.sweep)"""
+    return default.sweep(start, end, step, delay)
 
 
 def check_button():
-    """
-    Fiziksel butonu kontrol et
-    
-    Returns:
-        bool: Butona basılıysa True
-    """
-    if not RPI_AVAILABLE or not is_initialized:
-        return False
-    
-    try:
-        return GPIO.input(BUTTON_PIN) == GPIO.HIGH
-    except:
-        return False
+    """Fiziksel butona basılıysa True"""
+    return default.check_button()
+
+
+def get_status():
+    """Servo durumunu döndür"""
+    return default.status()
 
 
 # Modül doğrudan çalıştırılırsa test modu
@@ -222,7 +325,7 @@ if __name__ == '__main__':
             time.sleep(0.1)
         
         print("\nTest tamamlandı.")
-        
+    
     except KeyboardInterrupt:
         print("\nTest sonlandırılıyor...")
     
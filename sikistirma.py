@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+HTTP Yanıt Sıkıştırma Modülü
+Büyük metin yanıtlarını ve statik dosyaları gzip/brotli ile sıkıştırır
+
+İstemcinin Accept-Encoding başlığına göre brotli (kuruluysa) veya gzip
+seçilir. Eşik değerinden küçük yanıtlar olduğu gibi gönderilir çünkü
+sıkıştırma başlığı ve CPU maliyeti kazancı aşar. Statik dosyaların
+sıkıştırılmış hali ETag başına önbelleğe alınır.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+
+# brotli opsiyonel: kurulu değilse yalnızca gzip kullanılır
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# ==================== AYARLAR ====================
+MIN_SIZE = 1024             # Bu boyutun altındaki yanıtlar sıkıştırılmaz (bayt)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5          # Dinamik yanıtlar için hız/oran dengesi
+STATIC_BROTLI_QUALITY = 11  # Statik dosyalar bir kez sıkıştırılıp önbelleğe alınır
+STATIC_CACHE_SIZE = 32
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+static_cache = OrderedDict()    # (yol, etag, kodlama) -> sıkıştırılmış içerik
+cache_lock = threading.Lock()
+stats = {"compressed": 0, "skipped_small": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+def choose_encoding(accept_encodings):
+    """
+    İstemcinin kabul ettiği en iyi kodlamayı seç
+    
+    Args:
+        accept_encodings: werkzeug Accept nesnesi (request.accept_encodings)
+    
+    Returns:
+        str | None: "br", "gzip" veya None
+    """
+    offered = ["br", "gzip"] if BROTLI_AVAILABLE else ["gzip"]
+    return accept_encodings.best_match(offered)
+
+
+def compress(data, encoding, static=False):
+    """Veriyi seçilen kodlamayla sıkıştır"""
+    if encoding == "br":
+        quality = STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY
+        return brotli.compress(data, quality=quality)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _is_compressible(response):
+    mimetype = response.mimetype or ""
+    return any(mimetype.startswith(prefix) for prefix in COMPRESSIBLE_TYPES)
+
+
+def _static_compressed(key, data, encoding):
+    """Statik dosyanın sıkıştırılmış halini önbellekten al veya üret"""
+    with cache_lock:
+        cached = static_cache.get(key)
+        if cached is not None:
+            static_cache.move_to_end(key)
+            return cached
+    
+    compressed = compress(data, encoding, static=True)
+    with cache_lock:
+        static_cache[key] = compressed
+        while len(static_cache) > STATIC_CACHE_SIZE:
+            static_cache.popitem(last=False)
+    return compressed
+
+
+def compress_response(response, request):
+    """
+    Uygunsa yanıtı yerinde sıkıştır (Flask after_request kancası)
+    
+    Akış yanıtları, kısmi içerik ve zaten kodlanmış yanıtlar atlanır.
+    """
+    # Statik dosyalar dosya sarmalayıcısıyla (direct_passthrough) gelir;
+    # bunlar akış gibi görünse de boyutları bilinir ve sıkıştırılabilir
+    is_static = response.direct_passthrough
+    if (response.status_code != 200
+            or (response.is_streamed and not is_static)
+            or "Content-Encoding" in response.headers
+            or not _is_compressible(response)):
+        return response
+    
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    
+    response.direct_passthrough = False
+    data = response.get_data()
+    
+    if len(data) < MIN_SIZE:
+        stats["skipped_small"] += 1
+        return response
+    
+    if is_static:
+        etag = response.headers.get("ETag", "")
+        compressed = _static_compressed((request.path, etag, encoding), data, encoding)
+    else:
+        compressed = compress(data, encoding)
+    
+    stats["compressed"] += 1
+    stats["bytes_in"] += len(data)
+    stats["bytes_out"] += len(compressed)
+    
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    # Kodlanmış gövde bayt düzeyinde farklı olduğundan ETag zayıf işaretlenir
+    # (koşullu istekler zayıf karşılaştırmayla yine 304 alır)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def get_status():
+    """Sıkıştırma istatistiklerini döndür"""
+    with cache_lock:
+        cached = len(static_cache)
+    ratio = stats["bytes_in"] / stats["bytes_out"] if stats["bytes_out"] else 0.0
+    return {
+        "brotli": BROTLI_AVAILABLE,
+        "min_size": MIN_SIZE,
+        "compressed": stats["compressed"],
+        "skipped_small": stats["skipped_small"],
+        "ratio": round(ratio, 2),
+        "static_cached": cached
+    }
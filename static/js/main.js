@@ -8,15 +8,28 @@ const POLLING_INTERVAL = 500; // 500ms polling aralığı
 let pollingTimer = null;
 let isConnected = false;
 
+// İkili telemetri (sunucu /api/schema ile düzeni bildirir)
+const BINARY_MIME = 'application/vnd.telemetri+bin';
+let telemetrySchema = null;
+
+// JSON modunda fark (delta) takibi: son bilinen sıra numarası ve tam durum
+let lastSeq = null;
+let lastData = null;
+
 // ==================== SAYFA YÜKLENME ====================
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Raspberry Pi Kontrol Paneli başlatılıyor...');
     
-    // İlk veri çekme
-    fetchSensorData();
-    
-    // Polling başlat
-    startPolling();
+    // Sayfaya gömülü ilk durum varsa ilk değerler istek beklemeden gösterilir
+    if (applyInitialState()) {
+        startPolling();
+    } else {
+        // Şemayı yükle, ardından veri çekmeye başla (şema yoksa JSON kullanılır)
+        loadSchema().finally(() => {
+            fetchSensorData();
+            startPolling();
+        });
+    }
     
     // Enter tuşu ile servo açısı gönderme
     document.getElementById('custom-angle-input').addEventListener('keypress', function(e) {
@@ -57,17 +70,33 @@ function stopPolling() {
  * Sensör verilerini API'dan çek ve UI'ı güncelle
  */
 function fetchSensorData() {
-    fetch('/api/data', {
+    // Şema yüklendiyse ikili format iste, sunucu desteklemiyorsa JSON döner
+    const accept = telemetrySchema
+        ? `${BINARY_MIME}, application/json;q=0.5`
+        : 'application/json';
+    
+    // JSON'da yalnızca son bilinen durumdan bu yana değişen alanları iste
+    // rate: sunucu sensörleri polling hızımıza göre örneklesin
+    const rate = 1000 / POLLING_INTERVAL;
+    const url = (!telemetrySchema && lastSeq !== null)
+        ? `/api/data?rate=${rate}&since=${lastSeq}`
+        : `/api/data?rate=${rate}`;
+    
+    fetch(url, {
         method: 'GET',
         headers: {
-            'Content-Type': 'application/json'
+            'Accept': accept
         }
     })
     .then(response => {
         if (!response.ok) {
             throw new Error('Ağ hatası');
         }
-        return response.json();
+        const contentType = response.headers.get('Content-Type') || '';
+        if (contentType.startsWith(BINARY_MIME)) {
+            return response.arrayBuffer().then(decodeSample);
+        }
+        return response.json().then(applyDelta);
     })
     .then(data => {
         updateUI(data);
@@ -79,6 +108,140 @@ function fetchSensorData() {
     });
 }
 
+/**
+ * JSON yanıtını (tam veya fark) tam duruma çevir
+ * @param {Object} payload - /api/data yanıtı
+ */
+function applyDelta(payload) {
+    if (payload.delta === undefined) {
+        // Tam belge
+        lastData = payload;
+    } else if (payload.delta && lastData) {
+        mergeChanges(lastData, payload.changes);
+    } else {
+        lastData = payload.data;
+    }
+    lastSeq = payload.seq;
+    return lastData;
+}
+
+/**
+ * Değişen alanları iç içe yapıyı koruyarak birleştir
+ */
+function mergeChanges(target, changes) {
+    Object.keys(changes).forEach(key => {
+        const value = changes[key];
+        if (value && typeof value === 'object' && !Array.isArray(value)
+                && target[key] && typeof target[key] === 'object') {
+            mergeChanges(target[key], value);
+        } else {
+            target[key] = value;
+        }
+    });
+}
+
+// ==================== İKİLİ KODLAMA ====================
+
+/**
+ * Sunucunun sayfaya gömdüğü anlık görüntüyü ve şemayı uygula
+ * @returns {boolean} İlk durum bulunduysa true
+ */
+function applyInitialState() {
+    const element = document.getElementById('initial-state');
+    if (!element) {
+        return false;
+    }
+    try {
+        const state = JSON.parse(element.textContent);
+        telemetrySchema = state.schema || null;
+        updateUI(applyDelta(state.data));
+        setConnectionStatus(true);
+        return true;
+    } catch (error) {
+        console.error('İlk durum okunamadı:', error);
+        return false;
+    }
+}
+
+/**
+ * İkili düzen şemasını yükle
+ */
+function loadSchema() {
+    return fetch('/api/schema')
+        .then(response => response.ok ? response.json() : null)
+        .then(schema => {
+            telemetrySchema = schema;
+        })
+        .catch(() => {
+            telemetrySchema = null;
+        });
+}
+
+/**
+ * DataView üzerinden şemadaki tipte değer oku
+ */
+function readField(view, type, offset) {
+    switch (type) {
+        case 'f64': return view.getFloat64(offset, true);
+        case 'f32': return view.getFloat32(offset, true);
+        case 'i16': return view.getInt16(offset, true);
+        case 'u16': return view.getUint16(offset, true);
+        case 'u32': return view.getUint32(offset, true);
+        case 'u8': return view.getUint8(offset);
+        default: throw new Error(`Bilinmeyen tip: ${type}`);
+    }
+}
+
+/**
+ * Tek örnek mesajını /api/data JSON yapısına çevir
+ * @param {ArrayBuffer} buffer - Sunucudan gelen ikili yanıt
+ */
+function decodeSample(buffer) {
+    const view = new DataView(buffer);
+    const schema = telemetrySchema;
+    const version = view.getUint8(0);
+    const type = view.getUint8(1);
+    
+    if (version !== schema.version || type !== schema.types.sample) {
+        // Sunucu güncellenmiş olabilir, sonraki istekte şemayı tazele
+        telemetrySchema = null;
+        loadSchema();
+        throw new Error(`Desteklenmeyen ikili mesaj (sürüm ${version}, tip ${type})`);
+    }
+    
+    const base = schema.header.size;
+    const flat = {};
+    schema.sample.fields.forEach(field => {
+        flat[field.name] = readField(view, field.type, base + field.offset);
+    });
+    
+    const state = schema.motor_states[flat.motor_state] || 'stopped';
+    return {
+        distance: flat.distance,
+        imu: {
+            accel_x: flat.accel_x,
+            accel_y: flat.accel_y,
+            accel_z: flat.accel_z,
+            gyro_x: flat.gyro_x,
+            gyro_y: flat.gyro_y,
+            gyro_z: flat.gyro_z
+        },
+        sensor_active: Boolean(flat.flags & schema.flags.sensor_active),
+        stale: {
+            distance: Boolean(flat.flags & schema.flags.distance_stale),
+            imu: Boolean(flat.flags & schema.flags.imu_stale)
+        },
+        servo_angle: flat.servo_angle,
+        motor: {
+            state: state,
+            speed: flat.motor_speed,
+            duty: flat.motor_duty,
+            is_running: Boolean(flat.flags & schema.flags.motor_running),
+            direction: state === 'stopped' ? null : state
+        }
+    };
+}
+
 // ==================== UI GÜNCELLEME ====================
 
 /**
@@ -266,6 +429,58 @@ function setConnectionStatus(connected) {
     }
 }
 
+// ==================== GECİKME İZLEME ====================
+
+/**
+ * Kısa rastgele iz id'si üret
+ */
+function newTraceId() {
+    if (window.crypto && crypto.getRandomValues) {
+        const bytes = crypto.getRandomValues(new Uint8Array(8));
+        return Array.from(bytes, b => b.toString(16).padStart(2, '0')).join('');
+    }
+    return Math.random().toString(16).slice(2, 18);
+}
+
+/**
+ * Komutu tetikleyen olayın (tıklama) zamanı, olay yoksa şu an
+ */
+function eventTime() {
+    const event = window.event;
+    const now = performance.now();
+    return (event && event.timeStamp > 0 && event.timeStamp <= now) ? event.timeStamp : now;
+}
+
+/**
+ * Komut isteğini iz id'si ile gönder ve gidiş-dönüş süresini sunucuya bildir
+ * Aşama dökümü: /api/debug/latency
+ * @param {string} url - İstek adresi
+ * @param {Object} options - fetch seçenekleri
+ * @param {number} clickTime - Tıklama anı (performance.now())
+ */
+function tracedFetch(url, options, clickTime) {
+    const traceId = newTraceId();
+    const sent = performance.now();
+    const clientMs = sent - clickTime;
+    options.headers = Object.assign({}, options.headers, {
+        'X-Trace-Id': traceId,
+        'X-Trace-Client': clientMs.toFixed(2)
+    });
+    
+    return fetch(url, options).then(response => {
+        const report = JSON.stringify({
+            id: traceId,
+            rtt_ms: performance.now() - sent,
+            client_ms: clientMs
+        });
+        // Ölçüm bildirimi komutu bekletmez
+        if (navigator.sendBeacon) {
+            navigator.sendBeacon('/api/debug/latency', report);
+        }
+        return response;
+    });
+}
+
 // ==================== KONTROL FONKSİYONLARI ====================
 
 /**
@@ -278,12 +493,13 @@ function sensorControl(turnOn) {
     
     console.log(`Sensör ${action}...`);
     
-    fetch(endpoint, {
+    const clickTime = eventTime();
+    tracedFetch(endpoint, {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         }
-    })
+    }, clickTime)
     .then(response => {
         if (!response.ok) {
             throw new Error('İstek başarısız');
@@ -311,13 +527,14 @@ function sensorControl(turnOn) {
 function moveServo(angle) {
     console.log(`Servo ${angle}° konumuna hareket ettiriliyor...`);
     
-    fetch('/api/servo/move', {
+    const clickTime = eventTime();
+    tracedFetch('/api/servo/move', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
         body: JSON.stringify({ angle: angle })
-    })
+    }, clickTime)
     .then(response => {
         if (!response.ok) {
             throw new Error('İstek başarısız');
@@ -365,6 +582,7 @@ function moveServoCustom() {
  * @param {string} action - Aksiyon: 'forward', 'backward', 'stop', 'brake'
  */
 function motorControl(action) {
+    const clickTime = eventTime();
     const speedSlider = document.getElementById('motor-speed');
     const speed = speedSlider ? parseInt(speedSlider.value) : 50;
     
@@ -387,13 +605,13 @@ function motorControl(action) {
         ? JSON.stringify({ speed: speed }) 
         : null;
     
-    fetch(endpoint, {
+    tracedFetch(endpoint, {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
         body: body
-    })
+    }, clickTime)
     .then(response => {
         if (!response.ok) {
             throw new Error('İstek başarısız');
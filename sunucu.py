@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Asyncio / ASGI Sunucu Modu
+Werkzeug geliştirme sunucusu yerine tek olay döngülü sunucu
+
+app.run(threaded=True) her bağlantı için bir thread açar; çok sayıda
+dashboard'un uzun süreli akış bağlantıları Pi'de thread ve bellek
+tüketir. Bu modülün ASGI uygulamasında:
+
+- /api/stream doğrudan olay döngüsünde karşılanır: her bağlantı bir
+  asyncio görevi ve yayın merkezinde sınırlı bir kuyruktur, thread
+  tutmaz. Yüzlerce akış aynı kodlanmış mesajı paylaşır.
+- /ws/control WebSocket kumanda kanalıdır: joystick ayar noktaları
+  istemciden gelir, onaylar ve telemetri aynı soketten geri gider
+  (bkz. kumanda.py).
+- Diğer tüm route'lar değişmeden Flask uygulamasına, sınırlı bir thread
+  havuzu üzerinden WSGI köprüsüyle iletilir.
+
+Çalıştırma (uvicorn gerekir, WebSocket için uvicorn[standard]):
+    python sunucu.py
+    uvicorn sunucu:application --host 0.0.0.0 --port 5000
+"""
+
+import io
+import sys
+import json
+import time
+import asyncio
+import logging
+import contextvars
+from urllib.parse import parse_qsl
+from concurrent.futures import ThreadPoolExecutor
+
+import app as flask_app
+import cihazlar
+import gunluk
+import kumanda
+import ornekleme
+import yayin
+
+logger = logging.getLogger(__name__)
+
+try:
+    import uvicorn
+    UVICORN_AVAILABLE = True
+except ImportError:
+    UVICORN_AVAILABLE = False
+
+# ==================== AYARLAR ====================
+HOST = "0.0.0.0"
+PORT = 5000
+WSGI_THREADS = 8            # Flask route'larını çalıştıran thread sayısı
+STREAM_PATH = "/api/stream"
+CONTROL_PATH = "/ws/control"
+CONTROL_TELEMETRY_RATE = 10.0   # Kumanda soketinden gönderilen varsayılan telemetri hızı (Hz)
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+executor = ThreadPoolExecutor(max_workers=WSGI_THREADS, thread_name_prefix="wsgi")
+# Aktüatör yazımları uzun süren HTTP isteklerinin arkasında beklemesin
+control_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="kumanda")
+
+
+# ==================== WSGI KÖPRÜSÜ ====================
+
+def _environ(scope, body):
+    """ASGI scope'undan WSGI environ sözlüğü oluştur"""
+    server = scope.get("server") or ("localhost", PORT)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    # Gövde tamamen okunduğundan uzunluk her zaman bilinir (chunked istekler dahil)
+    environ["CONTENT_LENGTH"] = str(len(body))
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1")
+        value = value.decode("latin-1")
+        if name == "content-type":
+            environ["CONTENT_TYPE"] = value
+        elif name != "content-length":
+            key = "HTTP_" + name.upper().replace("-", "_")
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _start_wsgi(environ):
+    """Flask uygulamasını çağır ve ilk parçayı al (thread havuzunda)"""
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                              for name, value in headers]
+    
+    iterable = flask_app.app(environ, start_response)
+    iterator = iter(iterable)
+    return started, iterable, iterator, next(iterator, None)
+
+
+async def _wsgi(scope, receive, send):
+    """İsteği Flask'a ilet; akış yanıtları parça parça gönderilir"""
+    body = bytearray()
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    
+    loop = asyncio.get_running_loop()
+    # Parçalar havuzun hangi thread'i boşsa onda üretilir; Flask'ın istek
+    # bağlamı (stream_with_context) contextvars'ta tutulduğundan her adım
+    # isteğe ait aynı bağlamda çalıştırılır
+    context = contextvars.copy_context()
+    started, iterable, iterator, chunk = await loop.run_in_executor(
+        executor, context.run, _start_wsgi, _environ(scope, bytes(body)))
+    try:
+        await send({"type": "http.response.start", "status": started["status"],
+                    "headers": started["headers"]})
+        while chunk is not None:
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            chunk = await loop.run_in_executor(executor, context.run, next, iterator, None)
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    finally:
+        close = getattr(iterable, "close", None)
+        if close is not None:
+            await loop.run_in_executor(executor, context.run, close)
+
+
+# ==================== CANLI AKIŞ ====================
+
+async def _send_json(send, status, payload):
+    body = flask_app.app.json.dumps(payload).encode()
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _stream(scope, receive, send):
+    """/api/stream: yayın merkezine asyncio aboneliği (bağlantı başına thread yok)"""
+    args = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+    try:
+        rate, mode = flask_app.stream_params(args)
+    except ValueError as e:
+        await _send_json(send, 400, {"success": False, "message": str(e)})
+        return
+    
+    subscriber = yayin.subscribe(("sample",), mode=mode, loop=asyncio.get_running_loop())
+    name = f"stream:{subscriber.id}"
+    ornekleme.subscribe(name, rate)
+    
+    async def watch_disconnect():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        subscriber.close()
+    
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream"),
+                                (b"cache-control", b"no-cache"),
+                                (b"x-accel-buffering", b"no")]})
+        await send({"type": "http.response.body", "body": b"retry: 2000\n\n", "more_body": True})
+        while not subscriber.closed:
+            message = await subscriber.aget(timeout=yayin.KEEPALIVE)
+            if subscriber.closed:
+                break
+            payload = message.sse() if message is not None else b": keepalive\n\n"
+            await send({"type": "http.response.body", "body": payload, "more_body": True})
+    except OSError:
+        pass    # İstemci bağlantıyı kapattı
+    finally:
+        watcher.cancel()
+        yayin.unsubscribe(subscriber)
+        ornekleme.unsubscribe(name)
+
+
+# ==================== KUMANDA (WEBSOCKET) ====================
+
+async def _control(scope, receive, send):
+    """
+    /ws/control: sıra numaralı ayar noktaları, onaylar ve telemetri tek sokette
+    
+    Sorgu parametreleri: motor, servo (cihaz id'leri, varsayılan birincil),
+    rate (telemetri hızı Hz, 0 = telemetri yok)
+    """
+    args = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+    if (await receive())["type"] != "websocket.connect":
+        return
+    motor = cihazlar.get(args.get("motor"), "motor")
+    servo = cihazlar.get(args.get("servo"), "servo")
+    try:
+        rate = float(args.get("rate", CONTROL_TELEMETRY_RATE))
+    except ValueError:
+        rate = None
+    if motor is None or servo is None or rate is None:
+        await send({"type": "websocket.close", "code": 1008})
+        return
+    await send({"type": "websocket.accept"})
+    
+    loop = asyncio.get_running_loop()
+    session = kumanda.ControlSession(motor, servo, on_motor_control=flask_app._take_manual_control)
+    subscriber = yayin.subscribe(("sample",), loop=loop) if rate > 0 else None
+    name = f"control:{id(session)}"
+    if subscriber is not None:
+        ornekleme.subscribe(name, rate)
+    send_lock = asyncio.Lock()
+    wake = asyncio.Event()
+    
+    async def send_text(text):
+        async with send_lock:
+            await send({"type": "websocket.send", "text": text})
+    
+    async def applier():
+        # Uygulama sürerken gelen ayar noktaları birikir, yalnızca en yenisi yazılır
+        while True:
+            await wake.wait()
+            wake.clear()
+            ack = await loop.run_in_executor(control_executor, session.apply_pending)
+            if ack is not None:
+                await send_text(json.dumps(ack, separators=(",", ":"), ensure_ascii=False))
+    
+    async def watchdog():
+        while True:
+            await asyncio.sleep(kumanda.DEADMAN_TIMEOUT / 5)
+            await loop.run_in_executor(control_executor, session.check_deadman)
+    
+    async def telemetry():
+        while not subscriber.closed:
+            message = await subscriber.aget(timeout=yayin.KEEPALIVE)
+            if message is not None:
+                await send_text(message.json())
+    
+    tasks = [asyncio.ensure_future(applier()), asyncio.ensure_future(watchdog())]
+    if subscriber is not None:
+        tasks.append(asyncio.ensure_future(telemetry()))
+    try:
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            received = time.perf_counter()
+            try:
+                setpoint = kumanda.parse(message.get("text"), message.get("bytes"))
+            except ValueError as e:
+                session.reject()
+                await send_text(json.dumps({"type": "error", "message": str(e)},
+                                           separators=(",", ":"), ensure_ascii=False))
+                continue
+            if session.accept(setpoint, received):
+                wake.set()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if subscriber is not None:
+            yayin.unsubscribe(subscriber)
+            ornekleme.unsubscribe(name)
+        await loop.run_in_executor(control_executor, session.close)
+
+
+# ==================== ASGI UYGULAMASI ====================
+
+async def _lifespan(receive, send):
+    """Sunucu açılış/kapanışında donanım ve thread'leri yönet"""
+    loop = asyncio.get_running_loop()
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await loop.run_in_executor(executor, flask_app.start_services)
+            except Exception as e:
+                logger.error("Başlatma hatası: %s", e)
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await loop.run_in_executor(executor, flask_app.stop_services)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI giriş noktası"""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+    elif scope["type"] == "http":
+        if scope["path"] == STREAM_PATH and scope["method"] == "GET":
+            await _stream(scope, receive, send)
+        else:
+            await _wsgi(scope, receive, send)
+    elif scope["type"] == "websocket":
+        if scope["path"] == CONTROL_PATH:
+            await _control(scope, receive, send)
+        else:
+            await send({"type": "websocket.close", "code": 1008})
+
+
+if __name__ == '__main__':
+    if not UVICORN_AVAILABLE:
+        print("uvicorn bulunamadı. Kurulum: pip install uvicorn")
+        print("Thread'li Flask sunucusu için: python app.py")
+        sys.exit(1)
+    
+    gunluk.setup()
+    try:
+        print("\n" + "="*50)
+        print("Asyncio (ASGI) Sunucusu Başlatılıyor...")
+        print(f"URL: http://{HOST}:{PORT}")
+        print("="*50 + "\n")
+        
+        # Donanım lifespan olaylarıyla başlatılıp kapatılır
+        uvicorn.run(application, host=HOST, port=PORT, log_config=None, lifespan="on")
+    finally:
+        executor.shutdown(wait=False)
+        control_executor.shutdown(wait=False)
+        gunluk.shutdown()
+        print("Uygulama sonlandırıldı.")
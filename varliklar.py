@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Statik Varlık Modülü
+Arayüz dosyalarını içerik özetli adlarla ve önceden sıkıştırılmış sunar
+
+Yapım adımı (python varliklar.py build) her varlığın içerik özetini
+dosya adına ekleyerek static/dist/ altına kopyalar (ör. js/main.3f2a9c1d0b.js)
+ve yanına en yüksek seviyede sıkıştırılmış .gz / .br (brotli kuruluysa)
+sürümlerini yazar. Adlar manifest.json'a kaydedilir.
+
+İçerik değişince ad da değiştiğinden bu dosyalar tarayıcıda süresiz
+(immutable) önbelleğe alınır; sayfa yeniden yüklenince tünel üzerinden
+ne dosya ne de doğrulama isteği gider. Sıkıştırma istek başına değil
+yapım sırasında bir kez yapılır.
+
+Sunucu açılırken manifest yoksa veya kaynak dosyalar yapımdan sonra
+değiştiyse yapım otomatik tekrarlanır. Yazılamıyorsa varlıklar normal
+/static/ adresinden (önbelleksiz) sunulur.
+"""
+
+import os
+import re
+import gzip
+import json
+import hashlib
+import logging
+import mimetypes
+import threading
+
+logger = logging.getLogger(__name__)
+
+# brotli opsiyonel: kurulu değilse yalnızca gzip sürümü üretilir
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# ==================== AYARLAR ====================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_FILE = os.path.join(DIST_DIR, "manifest.json")
+ASSETS = ("css/style.css", "js/main.js")
+URL_PREFIX = "/assets/"
+HASH_LENGTH = 10
+MAX_AGE = 365 * 24 * 3600   # Özetli dosyalar için önbellek süresi (saniye)
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+ENCODINGS = {"br": ".br", "gzip": ".gz"}    # Kodlama -> dosya uzantısı
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+manifest = None             # Kaynak adı -> varlık bilgisi (yüklenmediyse None)
+by_file = {}                # Özetli dosya adı -> varlık bilgisi
+manifest_lock = threading.Lock()
+stats = {"builds": 0, "served": 0, "served_compressed": 0}
+
+
+def fingerprint(data):
+    """İçerik özeti (dosya adına eklenen kısa sha256)"""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def _hashed_name(name, digest):
+    base, ext = os.path.splitext(name)
+    return f"{base}.{digest}{ext}"
+
+
+def _write(path, data):
+    """Dosyayı geçici ad üzerinden yaz (yarım dosya sunulmasın)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+    os.replace(temp, path)
+
+
+def _remove_old(name, keep):
+    """Varlığın önceki yapımlardan kalan özetli sürümlerini sil"""
+    base, ext = os.path.splitext(os.path.basename(name))
+    directory = os.path.join(DIST_DIR, os.path.dirname(name))
+    pattern = re.compile(rf"{re.escape(base)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}(\.gz|\.br)?")
+    for entry in os.listdir(directory):
+        if pattern.fullmatch(entry) and not entry.startswith(os.path.basename(keep)):
+            os.remove(os.path.join(directory, entry))
+
+
+def build(names=ASSETS):
+    """
+    Varlıkların özetli ve sıkıştırılmış sürümlerini üret
+    
+    Args:
+        names: static/ altındaki kaynak dosyalar
+    
+    Returns:
+        dict: Yazılan manifest (kaynak adı -> varlık bilgisi)
+    
+    Raises:
+        OSError: Kaynak okunamazsa veya dist/ yazılamazsa
+    """
+    assets = {}
+    for name in names:
+        with open(os.path.join(STATIC_DIR, name), "rb") as f:
+            data = f.read()
+        digest = fingerprint(data)
+        hashed = _hashed_name(name, digest)
+        
+        variants = {"gzip": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+        if BROTLI_AVAILABLE:
+            variants["br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+        
+        _write(os.path.join(DIST_DIR, hashed), data)
+        for encoding, compressed in variants.items():
+            _write(os.path.join(DIST_DIR, hashed + ENCODINGS[encoding]), compressed)
+        _remove_old(name, hashed)
+        
+        assets[name] = {
+            "file": hashed,
+            "hash": digest,
+            "size": len(data),
+            "mimetype": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "encodings": {encoding: len(compressed) for encoding, compressed in variants.items()}
+        }
+    
+    _write(MANIFEST_FILE, json.dumps(assets, indent=2).encode())
+    stats["builds"] += 1
+    return assets
+
+
+def _is_current(assets, names):
+    """Manifest kaynak dosyaların güncel içeriğini mi gösteriyor?"""
+    for name in names:
+        entry = assets.get(name)
+        if entry is None or not os.path.isfile(os.path.join(DIST_DIR, entry["file"])):
+            return False
+        with open(os.path.join(STATIC_DIR, name), "rb") as f:
+            if fingerprint(f.read()) != entry["hash"]:
+                return False
+    return True
+
+
+def load(names=ASSETS):
+    """
+    Manifesti yükle; yoksa veya kaynaklar değiştiyse yeniden yap
+    
+    Returns:
+        bool: Özetli varlıklar kullanılabiliyorsa True
+    """
+    global manifest, by_file
+    with manifest_lock:
+        try:
+            try:
+                with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+                    assets = json.load(f)
+            except (OSError, ValueError):
+                assets = {}
+            if not _is_current(assets, names):
+                logger.info("Statik varlıklar yeniden yapılıyor: %s", ", ".join(names))
+                assets = build(names)
+        except OSError as e:
+            logger.warning("Statik varlıklar yapılamadı, /static/ kullanılacak: %s", e)
+            assets = {}
+        manifest = assets
+        by_file = {entry["file"]: entry for entry in assets.values()}
+        return bool(assets)
+
+
+def url(name):
+    """
+    Şablon için varlık adresi
+    
+    Returns:
+        str | None: Özetli adres (ör. "/assets/js/main.3f2a9c1d0b.js"),
+            varlık yapılmadıysa None
+    """
+    if manifest is None:
+        load()
+    entry = manifest.get(name)
+    return URL_PREFIX + entry["file"] if entry else None
+
+
+def resolve(filename, accept_encodings):
+    """
+    İstenen özetli dosyanın sunulacak sürümünü seç
+    
+    Args:
+        filename: URL_PREFIX sonrası yol (ör. "js/main.3f2a9c1d0b.js")
+        accept_encodings: werkzeug Accept nesnesi (request.accept_encodings)
+    
+    Returns:
+        tuple | None: (dist/ altındaki dosya, mimetype, kodlama veya None);
+            dosya manifestte yoksa None
+    """
+    if manifest is None:
+        load()
+    entry = by_file.get(filename)
+    if entry is None:
+        return None
+    
+    encoding = accept_encodings.best_match(
+        [encoding for encoding in ENCODINGS if encoding in entry["encodings"]])
+    stats["served"] += 1
+    if encoding is None:
+        return entry["file"], entry["mimetype"], None
+    stats["served_compressed"] += 1
+    return entry["file"] + ENCODINGS[encoding], entry["mimetype"], encoding
+
+
+def get_status():
+    """Yapılan varlıklar, boyutları ve sunum istatistikleri"""
+    assets = manifest or {}
+    return {
+        "built": bool(assets),
+        "brotli": BROTLI_AVAILABLE,
+        "max_age": MAX_AGE,
+        "assets": {name: {"url": URL_PREFIX + entry["file"], "size": entry["size"],
+                          "encodings": entry["encodings"]}
+                   for name, entry in assets.items()},
+        **stats
+    }
+
+
+if __name__ == '__main__':
+    import sys
+    
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print("Kullanım: python varliklar.py build")
+        sys.exit(1)
+    
+    for name, entry in build().items():
+        sizes = ", ".join(f"{encoding} {size}" for encoding, size in entry["encodings"].items())
+        print(f"{name} -> {URL_PREFIX}{entry['file']}  ({entry['size']} bayt; {sizes})")
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+I2C Veriyolu Yöneticisi
+Her I2C bus'ını tek bir işçi thread'i üzerinden paylaştırır
+
+Cihazlar smbus.SMBus'ı kendileri açmaz; open_device() ile bir tutamaç
+alır. Bus başına bir işçi thread'i kuyruğa gelen işlemleri sırayla
+yürütür, böylece farklı thread'lerdeki cihazların register erişimleri
+birbirine karışmaz. Bir işlemin adımları arasına başka işlem girmez.
+
+Kuyrukta art arda bekleyen, aynı cihazın yakın register'larına yapılan
+blok okumalar tek bir I2C okumasında birleştirilir (ör. MPU-6050 ivme ve
+gyro blokları tek 14 byte'lık okuma). TCA9548A çoğaltıcı (multiplexer)
+arkasındaki cihazlar için seçili kanal hatırlanır; kanal zaten seçiliyse
+çoğaltıcıya yeniden yazılmaz.
+
+Her cihaz için son UTILIZATION_WINDOW saniyede bus'ı meşgul ettiği süre
+oranı (kullanım) ve işlem istatistikleri tutulur.
+"""
+
+import time
+import queue
+import logging
+import threading
+from collections import deque
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Raspberry Pi üzerinde çalışıp çalışmadığını kontrol et
+try:
+    import smbus
+    SMBUS_AVAILABLE = True
+except ImportError:
+    SMBUS_AVAILABLE = False
+    logger.warning("smbus bulunamadı. I2C simülasyon modu aktif.")
+
+# ==================== AYARLAR ====================
+I2C_BUS = config.I2C_BUS
+MAX_BLOCK = 32              # SMBus blok okuma sınırı (byte)
+MERGE_GAP = 2               # Birleştirilen iki okuma arasında atlanabilecek register sayısı
+TRANSACTION_TIMEOUT = 1.0   # İşlem sonucunu bekleme süresi (saniye)
+UTILIZATION_WINDOW = 5.0    # Kullanım oranı penceresi (saniye)
+MUX_ADDRESSES = range(0x70, 0x78)   # TCA9548A adres aralığı (A0-A2)
+MUX_CHANNELS = 8
+MUX_UNKNOWN = -1            # Hata sonrası kanalı bilinmeyen çoğaltıcı (kapatılması gerekir)
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+buses = {}                  # bus numarası -> I2CBus
+buses_lock = threading.Lock()
+
+
+class Transaction:
+    """Kuyruktaki tek işlem: aynı cihaza sırayla yürütülecek adımlar"""
+
+    def __init__(self, device, ops):
+        self.device = device
+        self.ops = ops
+        self.results = [None] * len(ops)
+        self.remaining = len(ops)
+        self.error = None
+        self.queued_at = time.perf_counter()
+        self.done = threading.Event()
+
+    def complete(self, index, result):
+        self.results[index] = result
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.done.set()
+
+    def fail(self, error):
+        self.error = error
+        self.done.set()
+
+
+class BusDevice:
+    """
+    Bir cihazın paylaşımlı bus üzerindeki tutamacı
+    
+    Metotlar smbus.SMBus ile aynı adları taşır, yalnızca adres parametresi
+    yoktur. Hatalar (OSError vb.) çağıran thread'de yeniden fırlatılır.
+    """
+
+    def __init__(self, bus, name, address, mux_address=None, mux_channel=None):
+        if mux_address is not None:
+            if mux_address not in MUX_ADDRESSES:
+                raise ValueError(f"{name}: çoğaltıcı adresi 0x70-0x77 arasında olmalı")
+            if mux_channel is None or not 0 <= mux_channel < MUX_CHANNELS:
+                raise ValueError(f"{name}: çoğaltıcı kanalı 0-{MUX_CHANNELS - 1} arasında olmalı")
+        self.bus = bus
+        self.name = name
+        self.address = address
+        self.mux_address = mux_address
+        self.mux_channel = mux_channel
+        
+        # İşçi thread'i günceller, bus.lock ile okunur
+        self.stats = {"transactions": 0, "reads": 0, "writes": 0, "bytes": 0,
+                      "errors": 0, "busy_ms": 0.0}
+        self.busy = deque()         # (bitiş, süre) - kullanım penceresi
+
+    def transaction(self, ops):
+        """
+        Adımları tek işlem olarak yürüt (araya başka cihazın erişimi girmez)
+        
+        Args:
+            ops: [("read_byte", reg), ("write_byte", reg, değer),
+                  ("read_block", reg, uzunluk), ...]
+        
+        Returns:
+            list: Adım sonuçları (yazmalar için None)
+        """
+        return self.bus.submit(self, ops)
+
+    def read_byte_data(self, register):
+        return self.transaction([("read_byte", register)])[0]
+
+    def write_byte_data(self, register, value):
+        self.transaction([("write_byte", register, value)])
+
+    def read_i2c_block_data(self, register, length):
+        return self.transaction([("read_block", register, length)])[0]
+
+    def read_blocks(self, blocks):
+        """Birden fazla bloğu tek işlemde oku (yakın bloklar tek okumada birleşir)"""
+        return self.transaction([("read_block", register, length) for register, length in blocks])
+
+    def reopen(self):
+        """Bus'ı kapatıp yeniden aç (sağlık recovery thread'inden çağrılır)"""
+        self.transaction([("reopen",)])
+
+    def close(self):
+        """Tutamacı bırak (bus'ın son cihazıysa bus kapatılır)"""
+        self.bus.release(self)
+
+    def status(self):
+        """Cihazın bus kullanımı ve işlem istatistikleri"""
+        return self.bus.device_status(self)
+
+
+class I2CBus:
+    """Tek bir I2C bus'ı ve işçi thread'i"""
+
+    def __init__(self, number):
+        self.number = number
+        self.smbus = None
+        self.queue = queue.Queue()
+        self.worker = None
+        self.lock = threading.Lock()    # Cihaz listesi ve istatistikler
+        self.devices = {}               # ad -> BusDevice
+        self.mux_channels = {}          # çoğaltıcı adresi -> seçili kanal (None = kapalı, -1 = bilinmiyor)
+        self.stats = {"transactions": 0, "batches": 0, "merged_reads": 0,
+                      "mux_switches": 0, "mux_switches_skipped": 0, "errors": 0,
+                      "reopens": 0, "wait_ms_total": 0.0, "max_wait_ms": 0.0}
+
+    def start(self):
+        self.smbus = smbus.SMBus(self.number)
+        self.worker = threading.Thread(target=self._run, name=f"i2c-{self.number}", daemon=True)
+        self.worker.start()
+
+    def stop(self):
+        if self.worker is not None:
+            self.queue.put(None)
+            self.worker.join(timeout=TRANSACTION_TIMEOUT)
+            self.worker = None
+        if self.smbus is not None:
+            try:
+                self.smbus.close()
+            except Exception:
+                pass
+            self.smbus = None
+
+    def attach(self, name, address, mux_address=None, mux_channel=None):
+        device = BusDevice(self, name, address, mux_address, mux_channel)
+        with self.lock:
+            self.devices[name] = device
+        return device
+
+    def release(self, device):
+        with buses_lock:
+            with self.lock:
+                if self.devices.get(device.name) is device:
+                    del self.devices[device.name]
+                empty = not self.devices
+            if empty and buses.get(self.number) is self:
+                del buses[self.number]
+                self.stop()
+                logger.info("I2C bus %d kapatıldı.", self.number)
+
+    def submit(self, device, ops):
+        if self.worker is None:
+            raise IOError(f"I2C bus {self.number} kapalı")
+        transaction = Transaction(device, ops)
+        self.queue.put(transaction)
+        if not transaction.done.wait(TRANSACTION_TIMEOUT):
+            raise IOError(f"I2C işlem zaman aşımı ({device.name})")
+        if transaction.error is not None:
+            raise transaction.error
+        return transaction.results
+    
+    # ==================== İŞÇİ THREAD'İ ====================
+
+    def _run(self):
+        """Kuyruktaki işlemleri sırayla yürüt (bekleyenler tek partide işlenir)"""
+        while True:
+            pending = [self.queue.get()]
+            while True:
+                try:
+                    pending.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            transactions = [transaction for transaction in pending if transaction is not None]
+            if transactions:
+                try:
+                    self._execute(transactions)
+                except Exception as e:
+                    logger.error("I2C bus %d işçi hatası: %s", self.number, e)
+                    for transaction in transactions:
+                        if not transaction.done.is_set():
+                            transaction.fail(e)
+            if len(transactions) < len(pending):
+                return
+
+    def _execute(self, transactions):
+        started = time.perf_counter()
+        with self.lock:
+            self.stats["batches"] += 1
+            self.stats["transactions"] += len(transactions)
+            for transaction in transactions:
+                wait_ms = (started - transaction.queued_at) * 1000
+                self.stats["wait_ms_total"] += wait_ms
+                self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], wait_ms)
+                transaction.device.stats["transactions"] += 1
+        
+        steps = [(transaction, index, op)
+                 for transaction in transactions for index, op in enumerate(transaction.ops)]
+        position = 0
+        while position < len(steps):
+            transaction, index, op = steps[position]
+            if transaction.error is not None:
+                position += 1
+                continue
+            if op[0] == "read_block":
+                group = self._merge_group(steps, position)
+                self._run_steps(transaction.device, group)
+                position += len(group)
+            else:
+                self._run_steps(transaction.device, [steps[position]])
+                position += 1
+
+    def _merge_group(self, steps, position):
+        """position'dan başlayıp tek okumada birleştirilebilecek blok okumaları"""
+        device = steps[position][0].device
+        start = steps[position][2][1]
+        end = start + steps[position][2][2]
+        group = [steps[position]]
+        for step in steps[position + 1:]:
+            transaction, _, op = step
+            if transaction.device is not device or transaction.error is not None or op[0] != "read_block":
+                break
+            register, length = op[1], op[2]
+            if register < start or register > end + MERGE_GAP or \
+                    max(end, register + length) - start > MAX_BLOCK:
+                break
+            end = max(end, register + length)
+            group.append(step)
+        return group
+
+    def _run_steps(self, device, group):
+        """Tek bir fiziksel I2C erişimi (birleştirilmiş blok okuma veya tek adım)"""
+        op = group[0][2]
+        started = time.perf_counter()
+        try:
+            self._select(device)
+            if op[0] == "read_block":
+                start = op[1]
+                end = max(step[2][1] + step[2][2] for step in group)
+                data = self.smbus.read_i2c_block_data(device.address, start, end - start)
+                results = [data[step[2][1] - start:step[2][1] - start + step[2][2]] for step in group]
+                transferred = end - start
+            elif op[0] == "read_byte":
+                results = [self.smbus.read_byte_data(device.address, op[1])]
+                transferred = 1
+            elif op[0] == "write_byte":
+                self.smbus.write_byte_data(device.address, op[1], op[2])
+                results = [None]
+                transferred = 1
+            elif op[0] == "reopen":
+                self._reopen()
+                results = [None]
+                transferred = 0
+            else:
+                raise ValueError(f"Bilinmeyen I2C adımı: {op[0]}")
+        except Exception as e:
+            # Hata sonrası çoğaltıcının hangi kanalda kaldığı bilinmez
+            self._forget_mux_channels()
+            with self.lock:
+                self.stats["errors"] += 1
+                device.stats["errors"] += 1
+            for transaction, _, _ in group:
+                transaction.fail(e)
+            return
+        
+        finished = time.perf_counter()
+        with self.lock:
+            device.stats["writes" if op[0] == "write_byte" else "reads"] += 1
+            device.stats["bytes"] += transferred
+            device.stats["busy_ms"] += (finished - started) * 1000
+            device.busy.append((finished, finished - started))
+            while device.busy and finished - device.busy[0][0] > UTILIZATION_WINDOW:
+                device.busy.popleft()
+            self.stats["merged_reads"] += len(group) - 1
+        
+        for (transaction, index, _), result in zip(group, results):
+            transaction.complete(index, result)
+
+    def _select(self, device):
+        """
+        Cihaz çoğaltıcı arkasındaysa kanalını seç (zaten seçiliyse yazma)
+        
+        Doğrudan bus'a bağlı cihazdan önce açık kalan tüm kanallar kapatılır;
+        aksi halde kanal arkasındaki aynı adresli cihaz da yanıt verir.
+        """
+        for address, channel in list(self.mux_channels.items()):
+            if address != device.mux_address and channel is not None:
+                self.smbus.write_byte(address, 0x00)
+                self.mux_channels[address] = None
+        if device.mux_address is None:
+            return
+        
+        if self.mux_channels.get(device.mux_address) == device.mux_channel:
+            with self.lock:
+                self.stats["mux_switches_skipped"] += 1
+            return
+        self.smbus.write_byte(device.mux_address, 1 << device.mux_channel)
+        self.mux_channels[device.mux_address] = device.mux_channel
+        with self.lock:
+            self.stats["mux_switches"] += 1
+
+    def _forget_mux_channels(self):
+        """Çoğaltıcı durumları bilinmiyor: sonraki erişimde yeniden yazılsın"""
+        for address in self.mux_channels:
+            self.mux_channels[address] = MUX_UNKNOWN
+
+    def _reopen(self):
+        try:
+            self.smbus.close()
+        except Exception:
+            pass
+        self.smbus = smbus.SMBus(self.number)
+        self._forget_mux_channels()
+        with self.lock:
+            self.stats["reopens"] += 1
+    
+    # ==================== DURUM ====================
+
+    def _utilization(self, device, now):
+        busy = sum(duration for finished, duration in device.busy
+                   if now - finished <= UTILIZATION_WINDOW)
+        return busy / UTILIZATION_WINDOW
+
+    def device_status(self, device):
+        now = time.perf_counter()
+        with self.lock:
+            return {
+                "bus": self.number,
+                "address": device.address,
+                "mux": {"address": device.mux_address, "channel": device.mux_channel}
+                       if device.mux_address is not None else None,
+                "utilization": round(self._utilization(device, now), 4),
+                **{key: round(value, 2) if isinstance(value, float) else value
+                   for key, value in device.stats.items()}
+            }
+
+    def status(self):
+        now = time.perf_counter()
+        with self.lock:
+            devices = list(self.devices.values())
+            stats = dict(self.stats)
+            utilization = sum(self._utilization(device, now) for device in devices)
+            mux_channels = dict(self.mux_channels)
+        transactions = stats.pop("transactions")
+        wait_total = stats.pop("wait_ms_total")
+        return {
+            "queue_depth": self.queue.qsize(),
+            "transactions": transactions,
+            "avg_wait_ms": round(wait_total / transactions, 3) if transactions else 0.0,
+            "max_wait_ms": round(stats.pop("max_wait_ms"), 3),
+            "utilization": round(utilization, 4),
+            "mux_channels": {f"{address:#x}": channel for address, channel in mux_channels.items()},
+            **stats,
+            "devices": {device.name: self.device_status(device) for device in devices}
+        }
+
+
+def open_device(name, address, bus_number=I2C_BUS, mux_address=None, mux_channel=None):
+    """
+    Paylaşımlı bus üzerinde cihaz tutamacı al (bus ilk cihazda açılır)
+    
+    Args:
+        name: Cihaz adı (istatistiklerde görünür)
+        address: Cihazın I2C adresi
+        bus_number: I2C bus numarası
+        mux_address: Cihaz TCA9548A arkasındaysa çoğaltıcının adresi
+        mux_channel: Çoğaltıcı kanalı (0-7)
+    
+    Raises:
+        IOError: smbus yoksa veya bus açılamazsa
+        ValueError: Çoğaltıcı adresi/kanalı geçersizse
+    """
+    if not SMBUS_AVAILABLE:
+        raise IOError("smbus bulunamadı")
+    
+    with buses_lock:
+        bus = buses.get(bus_number)
+        if bus is None:
+            bus = I2CBus(bus_number)
+            bus.start()
+            buses[bus_number] = bus
+            logger.info("I2C bus %d açıldı.", bus_number)
+    return bus.attach(name, address, mux_address, mux_channel)
+
+
+def shutdown():
+    """Tüm bus'ları kapat"""
+    with buses_lock:
+        closing = list(buses.values())
+        buses.clear()
+    for bus in closing:
+        bus.stop()
+
+
+def get_status():
+    """Açık bus'ların kuyruk, birleştirme, çoğaltıcı ve cihaz kullanım istatistikleri"""
+    with buses_lock:
+        open_buses = dict(buses)
+    return {
+        "available": SMBUS_AVAILABLE,
+        "merge_gap": MERGE_GAP,
+        "buses": {number: bus.status() for number, bus in open_buses.items()}
+    }
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Yayın (Pub/Sub) Merkezi
+Sensör döngüsünün ürettiği örnekleri çok sayıda canlı akış istemcisine dağıtır
+
+Üretici (sensör thread'i) publish() ile mesajı bırakır ve hiç beklemez:
+her abonenin kendi sınırlı kuyruğu vardır, kuyruk doluysa en eski mesaj
+düşürülür. "latest" kipindeki aboneler yalnızca en son mesajı tutar
+(birleştirme / conflation); yavaş bir dashboard eski örnekleri sırayla
+almak yerine her zaman güncel durumu görür.
+
+Mesaj bir kez kodlanır ve tüm abonelerin kuyruklarında aynı nesne
+paylaşılır; abone başına bellek kuyruk boyutu kadar referansla sınırlıdır.
+
+Aboneler iki türlü bekleyebilir: thread'ler get(), asyncio görevleri
+aget() ile. Bir yayında uyanması gereken tüm asyncio aboneleri olay
+döngüsüne tek bir call_soon_threadsafe çağrısıyla bildirilir (yüzlerce
+abonede abone başına uyandırma üreticiyi yavaşlatır).
+"""
+
+import json
+import time
+import asyncio
+import threading
+import itertools
+from collections import deque
+
+# ==================== AYARLAR ====================
+QUEUE_SIZE = 8              # "queue" kipinde abone başına bekleyen en fazla mesaj
+KEEPALIVE = 15.0            # Mesaj gelmezse akışa yorum satırı gönderme aralığı (saniye)
+MODES = ("latest", "queue")
+
+# ==================== GLOBAL DEĞİŞKENLER ====================
+subscribers = {}            # id -> Subscriber
+subscribers_lock = threading.Lock()
+sequence = itertools.count(1)       # Mesaj sıra numaraları
+subscriber_ids = itertools.count(1)
+stats = {"published": 0, "delivered": 0, "dropped": 0, "peak_subscribers": 0}
+
+
+class Message:
+    """Yayınlanan tek mesaj (kodlanmış biçimleri ilk istekte bir kez üretilir)"""
+    
+    __slots__ = ("seq", "topic", "data", "time", "_payload", "_sse", "_json")
+
+    def __init__(self, seq, topic, data):
+        self.seq = seq
+        self.topic = topic
+        self.data = data
+        self.time = time.time()
+        self._payload = None
+        self._sse = None
+        self._json = None
+
+    def payload(self):
+        """Verinin JSON metni"""
+        if self._payload is None:
+            self._payload = json.dumps(self.data, separators=(",", ":"), default=str)
+        return self._payload
+
+    def sse(self):
+        """Server-Sent Events çerçevesi (bytes)"""
+        if self._sse is None:
+            self._sse = f"id: {self.seq}\nevent: {self.topic}\ndata: {self.payload()}\n\n".encode()
+        return self._sse
+
+    def json(self):
+        """WebSocket metin çerçevesi: {"type": konu, "seq": ..., "data": ...}"""
+        if self._json is None:
+            self._json = f'{{"type":"{self.topic}","seq":{self.seq},"data":{self.payload()}}}'
+        return self._json
+
+
+class Subscriber:
+    """
+    Tek bir akış istemcisinin sınırlı kuyruğu
+    
+    loop verilirse asyncio aboneliğidir (aget), verilmezse thread
+    aboneliğidir (get).
+    """
+
+    def __init__(self, subscriber_id, topics, mode="latest", size=QUEUE_SIZE, loop=None):
+        if mode not in MODES:
+            raise ValueError(f"Geçersiz kip: {mode}")
+        self.id = subscriber_id
+        self.topics = frozenset(topics)
+        self.mode = mode
+        self.queue = deque(maxlen=1 if mode == "latest" else max(1, int(size)))
+        self.lock = threading.Lock()
+        self.loop = loop
+        self.ready = asyncio.Event() if loop is not None else threading.Event()
+        self.closed = False
+        self.created = time.time()
+        self.stats = {"delivered": 0, "dropped": 0}
+
+    def offer(self, message):
+        """
+        Mesajı kuyruğa bırak (üretici thread'inde, asla beklemez)
+        
+        Returns:
+            bool: asyncio abonesinin olay döngüsünde uyandırılması gerekiyorsa True
+        """
+        with self.lock:
+            if self.closed:
+                return False
+            was_empty = not self.queue
+            if len(self.queue) == self.queue.maxlen:
+                self.stats["dropped"] += 1
+                stats["dropped"] += 1
+            self.queue.append(message)
+            if not was_empty:
+                return False
+            if self.loop is None:
+                self.ready.set()
+                return False
+            return True
+
+    def _wake(self):
+        if self.loop is None:
+            self.ready.set()
+        else:
+            try:
+                self.loop.call_soon_threadsafe(self.ready.set)
+            except RuntimeError:
+                # Olay döngüsü kapandı, abonelik birazdan kaldırılacak
+                self.closed = True
+
+    def _pop(self):
+        with self.lock:
+            if not self.queue:
+                self.ready.clear()
+                return None
+            message = self.queue.popleft()
+            if not self.queue:
+                self.ready.clear()
+            self.stats["delivered"] += 1
+            stats["delivered"] += 1
+            return message
+
+    def get(self, timeout=None):
+        """
+        Sıradaki mesajı bekle (thread aboneliği)
+        
+        Returns:
+            Message | None: Zaman aşımında veya abonelik kapandıysa None
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while not self.closed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            if self.ready.wait(remaining):
+                message = self._pop()
+                if message is not None:
+                    return message
+        return None
+    
+    async def aget(self, timeout=None):
+        """
+        Sıradaki mesajı bekle (asyncio aboneliği)
+        
+        Returns:
+            Message | None: Zaman aşımında veya abonelik kapandıysa None
+        """
+        deadline = self.loop.time() + timeout if timeout is not None else None
+        while not self.closed:
+            remaining = None if deadline is None else deadline - self.loop.time()
+            if remaining is not None and remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self.ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            message = self._pop()
+            if message is not None:
+                return message
+        return None
+
+    def close(self):
+        """Aboneliği kapat ve bekleyen get()/aget() çağrısını uyandır"""
+        with self.lock:
+            self.closed = True
+            self.queue.clear()
+            self._wake()
+
+    def status(self):
+        with self.lock:
+            return {
+                "topics": sorted(self.topics),
+                "mode": self.mode,
+                "pending": len(self.queue),
+                "async": self.loop is not None,
+                "age": round(time.time() - self.created, 1),
+                **self.stats
+            }
+
+
+def _set_ready(targets):
+    """Olay döngüsünde bekleyen asyncio abonelerini uyandır"""
+    for subscriber in targets:
+        subscriber.ready.set()
+
+
+def subscribe(topics, mode="latest", size=QUEUE_SIZE, loop=None):
+    """
+    Yeni abone oluştur
+    
+    Args:
+        topics: Dinlenecek konular (ör. ("sample",))
+        mode: "latest" (yalnızca son mesaj) veya "queue" (sınırlı kuyruk)
+        size: "queue" kipinde kuyruk boyutu
+        loop: asyncio olay döngüsü (asyncio aboneliği için)
+    
+    Raises:
+        ValueError: Kip geçersizse
+    """
+    with subscribers_lock:
+        subscriber = Subscriber(next(subscriber_ids), topics, mode, size, loop)
+        subscribers[subscriber.id] = subscriber
+        stats["peak_subscribers"] = max(stats["peak_subscribers"], len(subscribers))
+    return subscriber
+
+
+def unsubscribe(subscriber):
+    """Aboneliği kapat ve kaldır"""
+    subscriber.close()
+    with subscribers_lock:
+        subscribers.pop(subscriber.id, None)
+
+
+def publish(topic, data):
+    """
+    Mesajı konunun tüm abonelerine dağıt (üretici hiç beklemez)
+    
+    Returns:
+        int: Mesajın bırakıldığı abone sayısı
+    """
+    with subscribers_lock:
+        targets = [subscriber for subscriber in subscribers.values() if topic in subscriber.topics]
+    if not targets:
+        return 0
+    
+    message = Message(next(sequence), topic, data)
+    stats["published"] += 1
+    wake = {}                   # olay döngüsü -> uyandırılacak aboneler
+    for subscriber in targets:
+        if subscriber.offer(message):
+            wake.setdefault(subscriber.loop, []).append(subscriber)
+    for loop, waiting in wake.items():
+        try:
+            loop.call_soon_threadsafe(_set_ready, waiting)
+        except RuntimeError:
+            # Olay döngüsü kapandı, abonelikler birazdan kaldırılacak
+            for subscriber in waiting:
+                subscriber.closed = True
+    return len(targets)
+
+
+def has_subscribers(topic):
+    """Konuyu dinleyen abone var mı? (mesaj hazırlamaya değip değmediği)"""
+    with subscribers_lock:
+        return any(topic in subscriber.topics for subscriber in subscribers.values())
+
+
+def get_status(details=False):
+    """Abone sayısı, dağıtım ve düşürme istatistikleri"""
+    with subscribers_lock:
+        current = list(subscribers.values())
+    status = {
+        "subscribers": len(current),
+        "queue_size": QUEUE_SIZE,
+        "keepalive": KEEPALIVE,
+        **stats
+    }
+    if details:
+        status["clients"] = {subscriber.id: subscriber.status() for subscriber in current}
+    return status